@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark the token-aware chunker against the character splitters it replaced.
+
+For every input text, reports chunk count, total embedding tokens, largest
+chunk and split throughput.
+
+Usage:
+    python scripts/benchmark_chunking.py [file.txt ...]
+
+Without arguments a synthetic Thai legal text (มาตรา sections) and an English
+text are used.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from src.config.settings import Settings, get_settings
+from src.shared.text import TokenChunker, count_tokens
+
+THAI_SENTENCES = [
+    "นายจ้างต้องจ่ายค่าจ้างให้แก่ลูกจ้างตามที่ตกลงกันไว้",
+    "ลูกจ้างมีสิทธิหยุดพักผ่อนประจำปีไม่น้อยกว่าหกวันทำงาน",
+    "ในกรณีที่นายจ้างเลิกจ้างโดยไม่มีความผิด ให้จ่ายค่าชดเชยตามอัตราที่กำหนด",
+    "ให้พนักงานตรวจแรงงานมีอำนาจเข้าไปในสถานประกอบการในเวลาทำการ",
+    "ผู้ใดฝ่าฝืนบทบัญญัติแห่งพระราชบัญญัตินี้ต้องระวางโทษจำคุกหรือปรับหรือทั้งจำทั้งปรับ",
+]
+
+ENGLISH_PARAGRAPH = (
+    "Snow White and the Seven Dwarfs is a classic fairy tale about a young princess who is forced "
+    "to flee into the forest after her jealous stepmother orders her execution. She finds refuge "
+    "with seven dwarfs, but the Queen tricks her into eating a poisoned apple. "
+)
+
+
+def thai_legal_text(sections: int = 400) -> str:
+    """Build a Thai statute-like text with sections of varying length."""
+    parts = []
+    for number in range(1, sections + 1):
+        if number % 40 == 1:
+            parts.append(f"หมวด {number // 40 + 1} บททั่วไป")
+        sentences = [THAI_SENTENCES[(number + i) % len(THAI_SENTENCES)] for i in range(1 + number % 7)]
+        parts.append(f"มาตรา {number} " + " ".join(sentences))
+    return "\n".join(parts)
+
+
+def english_text(paragraphs: int = 300) -> str:
+    return "\n\n".join(ENGLISH_PARAGRAPH * (1 + i % 4) for i in range(paragraphs))
+
+
+def measure(name: str, split, text: str) -> dict:
+    started = time.perf_counter()
+    chunks = split(text)
+    seconds = time.perf_counter() - started
+    tokens = [count_tokens(chunk) for chunk in chunks]
+    return {
+        "splitter": name,
+        "chunks": len(chunks),
+        "embedding_tokens": sum(tokens),
+        "max_chunk_tokens": max(tokens, default=0),
+        "kb_per_second": len(text.encode("utf-8")) / 1024 / seconds if seconds else 0.0,
+    }
+
+
+def main():
+    if len(sys.argv) > 1:
+        inputs = {path: Path(path).read_text(encoding="utf-8") for path in sys.argv[1:]}
+    else:
+        inputs = {"thai_legal (synthetic)": thai_legal_text(), "english (synthetic)": english_text()}
+
+    try:
+        profiles = get_settings().CHUNKING_PROFILES
+    except Exception:
+        # No .env: benchmark the default profiles
+        profiles = Settings.model_fields["CHUNKING_PROFILES"].default
+    splitters = {
+        "chars 1000/100 (old file)": RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100).split_text,
+        "chars 10000/100 (old webpage)": RecursiveCharacterTextSplitter(chunk_size=10000, chunk_overlap=100).split_text,
+        **{
+            f"tokens {profile['max_tokens']}/{profile['overlap_tokens']} ({data_type})": TokenChunker(**profile).split_text
+            for data_type, profile in profiles.items()
+        },
+    }
+
+    for input_name, text in inputs.items():
+        print(f"\n{input_name}: {len(text)} characters, {count_tokens(text)} tokens")
+        print(f"{'splitter':<42}{'chunks':>8}{'emb. tokens':>13}{'max chunk':>11}{'KB/s':>10}")
+        for name, split in splitters.items():
+            row = measure(name, split, text)
+            print(
+                f"{row['splitter']:<42}{row['chunks']:>8}{row['embedding_tokens']:>13}"
+                f"{row['max_chunk_tokens']:>11}{row['kb_per_second']:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
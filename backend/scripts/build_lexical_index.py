@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Backfill the local lexical index from MongoDB.
+
+Usage:
+    python scripts/build_lexical_index.py
+
+Adds every data ingestion item the index at LEXICAL_INDEX_PATH is missing,
+indexed from its title, specified text, content and keywords, and removes
+items that no longer exist. Servers run the same backfill at startup when
+LEXICAL_INDEX_ENABLED is set; run this to prepare the index before enabling
+it. Safe to rerun: indexed items are kept as they are.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.config.settings import get_settings
+from src.interface.repository.database.db_repository import (
+    ensure_db_connected, index_alias_repository, pinecone_repository
+)
+from src.interface.repository.local.lexical_index import LexicalIndex
+from src.usecase.data_ingestion.data_ingestion_usecase import DataIngestionUseCase
+
+
+async def run():
+    await ensure_db_connected()
+    await index_alias_repository().get()
+    repository = pinecone_repository()
+    repository.lexical_index = LexicalIndex.get_instance(get_settings().LEXICAL_INDEX_PATH)
+    started = time.perf_counter()
+    counts = await DataIngestionUseCase(vector_repository=repository).backfill_lexical_index()
+    print(
+        f"Added {counts['added']} and removed {counts['removed']} items in "
+        f"{time.perf_counter() - started:.1f}s ({len(repository.lexical_index)} indexed)"
+    )
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Add the n-gram token fields behind substring filters to existing documents.
+
+Usage:
+    python scripts/build_ngram_index.py [--batch-size N]
+
+Data ingestion titles and keywords and file resource names get their tokens
+on every write; this is only needed once for documents written before, which
+substring filters (title_like, keywords_like, file_name_like) do not find.
+The indexes themselves are built at server startup.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.interface.repository.database.db_repository import (
+    data_ingestion_repository,
+    ensure_db_connected,
+    file_resource_repository,
+)
+
+
+async def run(args):
+    await ensure_db_connected()
+
+    started = time.perf_counter()
+    items = await data_ingestion_repository().backfill_substring_tokens(batch_size=args.batch_size)
+    files = await file_resource_repository().backfill_substring_tokens(batch_size=args.batch_size)
+    print(f"Added tokens to {items} data ingestion items and {files} file resources in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000, help="Documents per bulk write")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
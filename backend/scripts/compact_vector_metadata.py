@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Shrink the metadata of existing vectors to the compact schema.
+
+Usage:
+    python scripts/compact_vector_metadata.py [--batch-size N]
+
+Vectors keep only IDs, data_type, user_id, chunk position and embedding
+profile; titles, texts and loader fields are dropped, since search results
+are hydrated from MongoDB. Vectors are fetched and upserted again with their
+stored values, so nothing is re-embedded. Safe to rerun: compact vectors are
+skipped.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.interface.repository.database.db_repository import (
+    ensure_db_connected, index_alias_repository, pinecone_repository
+)
+
+
+async def run(args):
+    await ensure_db_connected()
+    await index_alias_repository().get()
+    repository = pinecone_repository()
+    repository.compact_metadata = True
+
+    started = time.perf_counter()
+    counts = await repository.compact_stored_metadata(batch_size=args.batch_size)
+    print(
+        f"Scanned {counts['scanned']} vectors in {repository.index_name}, "
+        f"rewrote {counts['rewritten']} in {time.perf_counter() - started:.1f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=100, help="Vectors per fetch and upsert")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Script to submit sample data to the data ingestion API.
-This script reads sample data from sample_data_ingestion.json and submits it to the API.
+This script reads sample data from sample_data_ingestion.json and submits it
+to the bulk endpoint in one request.
 """
 
 import json
@@ -11,7 +12,8 @@ from pathlib import Path
 
 # Configuration
 API_BASE_URL = "http://localhost:8000"  # Change this to your actual API URL
-DATA_INGESTION_ENDPOINT = f"{API_BASE_URL}/api/data-ingestion/"
+BULK_INGESTION_ENDPOINT = f"{API_BASE_URL}/api/data-ingestion/bulk"
+API_TOKEN = os.environ.get("API_TOKEN")  # Bearer token of the submitting user
 SCRIPTS_DIR = Path(__file__).parent
 RESOURCES_DIR = SCRIPTS_DIR.parent / "../resources"
 
@@ -21,56 +23,33 @@ def load_sample_data():
     with open(sample_data_path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def submit_data_ingestion(data_item):
-    """Submit a single data ingestion item to the API."""
-    # Prepare form data
-    form_data = {
-        "title": data_item["title"],
-        "specified_text": data_item["specified_text"],
-        "data_type": data_item["data_type"],
-        "content": data_item.get("content", ""),  # New content field
-        "reference": data_item["reference"],
-        "keywords": json.dumps(data_item["keywords"])  # Convert list to JSON string for form data
-    }
-    
-    # Check if we should attach a file
-    files = None
-    if data_item.get("file_url"):
-        # If file_url is provided, add it to the form data
-        form_data["file_url"] = data_item["file_url"]
-        print(f"   Using file URL: {data_item['file_url']}")
-    # elif data_item.get("data_type") == "ตัวบทกฎหมาย" or data_item.get("data_type") == "FICTION":
-    #     # For legal text or fiction, attach the sample document
-    #     sample_doc_path = RESOURCES_DIR / "sample_document.txt"
-    #     if sample_doc_path.exists():
-    #         files = {
-    #             "file": ("sample_document.pdf", open(sample_doc_path, "rb"), "application/pdf")
-    #         }
+def submit_data_ingestion_bulk(data_items):
+    """Submit all data ingestion items to the API in one request."""
+    headers = {"Authorization": f"Bearer {API_TOKEN}"} if API_TOKEN else {}
     
     try:
         # Make the API request
-        response = requests.post(
-            DATA_INGESTION_ENDPOINT,
-            data=form_data,
-            files=files
-        )
+        response = requests.post(BULK_INGESTION_ENDPOINT, json=data_items, headers=headers)
         
         # Check response
-        if response.status_code == 201:
-            print(f"✅ Successfully submitted: {data_item['title']}")
-            print(f"   Response: {response.json()}")
-        else:
-            print(f"❌ Failed to submit: {data_item['title']}")
+        if response.status_code != 200:
+            print(f"❌ Failed to submit {len(data_items)} items")
             print(f"   Status code: {response.status_code}")
             print(f"   Response: {response.text}")
+            return
+        
+        result = response.json()
+        for item in result["items"]:
+            title = data_items[item["index"]].get("title")
+            if item["status"] == "created":
+                print(f"✅ Successfully submitted: {title} ({item['id']}, {item['chunks']} chunks)")
+            else:
+                print(f"❌ Failed to submit: {title}")
+                print(f"   Error: {item['error']}")
+        print(f"\n📊 {result['created']} created, {result['failed']} failed")
     
     except Exception as e:
-        print(f"❌ Error submitting {data_item['title']}: {str(e)}")
-    
-    finally:
-        # Close file if opened
-        if files and "file" in files:
-            files["file"][1].close()
+        print(f"❌ Error submitting data: {str(e)}")
 
 def main():
     """Main function to submit all sample data."""
@@ -80,12 +59,10 @@ def main():
     sample_data = load_sample_data()
     print(f"📋 Loaded {len(sample_data)} sample data items")
     
-    # Submit each data item
-    for i, data_item in enumerate(sample_data, 1):
-        print(f"\n[{i}/{len(sample_data)}] Submitting: {data_item['title']}")
-        submit_data_ingestion(data_item)
+    # Submit every data item at once
+    submit_data_ingestion_bulk(sample_data)
     
     print("\n✨ Data ingestion submission completed!")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Extract keywords for data ingestion items in bulk with the local keyword extractor.
+
+Usage:
+    python scripts/extract_keywords.py [--rebuild-stats] [--overwrite] [--batch-size N]
+
+--rebuild-stats recounts the keyword corpus statistics from the data_ingestion
+collection first (needed once before the first run, and after bulk imports
+that bypassed the API). Without --overwrite only items without keywords are
+processed.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.interface.repository.database.db_repository import ensure_db_connected
+from src.usecase.data_ingestion.data_ingestion_usecase import DataIngestionUseCase
+
+
+async def run(args):
+    await ensure_db_connected()
+    use_case = DataIngestionUseCase()
+
+    if args.rebuild_stats:
+        started = time.perf_counter()
+        counted = await use_case.rebuild_keyword_statistics(batch_size=args.batch_size)
+        print(f"Counted {counted} items into keyword statistics in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    counts = await use_case.backfill_keywords(batch_size=args.batch_size, overwrite=args.overwrite)
+    seconds = time.perf_counter() - started
+    print(
+        f"Processed {counts['processed']} items, updated {counts['updated']} "
+        f"in {seconds:.1f}s ({counts['processed'] / seconds if seconds else 0:.0f} items/s)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild-stats", action="store_true", help="Recount corpus statistics first")
+    parser.add_argument("--overwrite", action="store_true", help="Redo items that already have keywords")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Items per batch")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
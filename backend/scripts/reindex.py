@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Rebuild the vector index under another embedding profile and switch reads to it.
+
+Usage:
+    python scripts/reindex.py --profile small-512 [--index-name NAME] [--no-switch] [--concurrency N] [--restart]
+    python scripts/reindex.py --switch-only --profile small-1536 --index-name NAME
+
+The new index is filled from MongoDB while the current one keeps serving.
+Progress is checkpointed in MongoDB: running the same command again after a
+crash resumes where the job stopped, unless --restart is given.
+--switch-only points reads at an existing index without copying, e.g. to roll
+back to the previous index.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.interface.repository.database.db_repository import ensure_db_connected
+from src.usecase.data_ingestion.reindex_usecase import ReindexUseCase
+
+
+async def run(args):
+    await ensure_db_connected()
+    use_case = ReindexUseCase()
+
+    if args.switch_only:
+        if not args.index_name:
+            raise SystemExit("--switch-only needs --index-name")
+        target = await use_case.switch(args.index_name, args.profile)
+        print(f"Reads now served from {target['index_name']} ({target['profile']})")
+        return
+
+    started = time.perf_counter()
+    result = await use_case.reindex(
+        args.profile,
+        index_name=args.index_name,
+        switch=not args.no_switch,
+        concurrency=args.concurrency,
+        resume=not args.restart
+    )
+    seconds = time.perf_counter() - started
+    print(
+        f"Copied {result['copied']} items into {result['index_name']} ({result['profile']}) "
+        f"in {seconds:.1f}s ({result['copied'] / seconds if seconds else 0:.1f} items/s), job {result['job_id']}"
+    )
+    if result["failed"]:
+        print(f"{len(result['failed'])} items failed: {', '.join(result['failed'][:20])}")
+    previous = result["previous"]
+    if result["switched"]:
+        print(f"Switched reads; roll back with: --switch-only --profile {previous['profile']} --index-name {previous['index_name']}")
+    else:
+        print(f"Reads still served from {previous['index_name']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", required=True, help="Embedding profile (EMBEDDING_PROFILES key)")
+    parser.add_argument("--index-name", help="Target index; derived from the profile by default")
+    parser.add_argument("--no-switch", action="store_true", help="Build the index but keep serving the current one")
+    parser.add_argument("--concurrency", type=int, help="Items processed at once (default: REINDEX_CONCURRENCY)")
+    parser.add_argument("--restart", action="store_true", help="Start over instead of resuming an unfinished job")
+    parser.add_argument("--switch-only", action="store_true", help="Only point reads at an existing index")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import List, Union, Any
+from typing import Dict, List, Union, Any
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,6 +21,8 @@ class Settings(BaseSettings):
     MONGO_DB: str = "backend_db"
     MONGO_USER: str = ""
     MONGO_PASSWORD: str = ""
+    # Build the indexes repositories declare (IndexRegistry) at startup
+    MONGO_ENSURE_INDEXES: bool = True
 
     # JWT settings
     JWT_SECRET_KEY: str
@@ -58,6 +60,111 @@ class Settings(BaseSettings):
     PINECONE_ENVIRONMENT: str = "us-west-2"
     PINECONE_INDEX_NAME: str = ""
     PINECONE_CLOUD: str = "aws"
+    PINECONE_UPSERT_BATCH_SIZE: int = 100
+    PINECONE_MAX_WORKERS: int = 8
+    # Store only IDs, data_type, user_id and chunk position on vectors; display
+    # fields are hydrated from MongoDB (scripts/compact_vector_metadata.py migrates)
+    VECTOR_METADATA_COMPACT: bool = True
+    # Pinecone namespace per vector: "none" (one namespace), "data_type" or "user";
+    # changing it on an existing index needs a reindex
+    VECTOR_NAMESPACE_POLICY: str = "none"
+
+    # Vector store backend: "pinecone" or "local" (memory-mapped NumPy store)
+    VECTOR_STORE_BACKEND: str = "pinecone"
+    LOCAL_VECTOR_STORE_PATH: str = "data/vector_store"
+    LOCAL_VECTOR_STORE_HNSW_THRESHOLD: int = 50000
+
+    # Raw webpage responses kept for conditional re-fetching (ETag/Last-Modified):
+    # "local" (bounded directory), "s3" (S3_BUCKET_NAME under the prefix) or "none"
+    WEBPAGE_CACHE_BACKEND: str = "local"
+    WEBPAGE_CACHE_PATH: str = "data/webpage_cache"
+    WEBPAGE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    WEBPAGE_CACHE_S3_PREFIX: str = "webpage-cache/"
+
+    # Site crawls (scripts/crawl.py): fetches at once overall and per host,
+    # pages per crawl, and pages chunked and embedded at once
+    CRAWL_MAX_CONCURRENCY: int = 16
+    CRAWL_PER_HOST_CONCURRENCY: int = 4
+    CRAWL_MAX_PAGES: int = 1000
+    CRAWL_INGEST_CONCURRENCY: int = 4
+
+    # Ingestion job queue: workers per server, runs per job, exponential retry
+    # backoff, idle polling, and heartbeats (a job silent for
+    # INGESTION_JOB_STALE_SECONDS is taken over by another worker)
+    INGESTION_JOB_WORKERS: int = 2
+    INGESTION_JOB_MAX_ATTEMPTS: int = 3
+    INGESTION_JOB_RETRY_BASE_SECONDS: float = 10.0
+    INGESTION_JOB_RETRY_MAX_SECONDS: float = 600.0
+    INGESTION_JOB_POLL_SECONDS: float = 2.0
+    INGESTION_JOB_HEARTBEAT_SECONDS: float = 5.0
+    INGESTION_JOB_STALE_SECONDS: float = 120.0
+
+    # Bulk ingestion (POST /api/data-ingestion/bulk): items written, keyworded
+    # and embedded together per batch, and files/webpages loaded at once
+    BULK_INGESTION_BATCH_SIZE: int = 500
+    BULK_INGESTION_SOURCE_CONCURRENCY: int = 4
+
+    # Embedding profiles: model, output dimensions and whether vectors are
+    # scaled to unit length. EMBEDDING_PROFILE applies until a reindex points
+    # the index alias at an index of another profile (scripts/reindex.py)
+    EMBEDDING_PROFILES: Dict[str, Dict[str, Any]] = {
+        "small-1536": {"model": "text-embedding-3-small", "dimensions": 1536, "normalize": False},
+        "small-512": {"model": "text-embedding-3-small", "dimensions": 512, "normalize": True},
+        "large-1024": {"model": "text-embedding-3-large", "dimensions": 1024, "normalize": True},
+    }
+    EMBEDDING_PROFILE: str = "small-1536"
+    INDEX_ALIAS_REFRESH_SECONDS: int = 30
+    REINDEX_CONCURRENCY: int = 8  # Items re-extracted, chunked and embedded at once
+    REINDEX_CHECKPOINT_EVERY: int = 100  # Items between progress checkpoints
+
+    # Embedding batching settings
+    EMBEDDING_BATCH_MAX_TOKENS: int = 100000
+    EMBEDDING_BATCH_MAX_SIZE: int = 256
+    EMBEDDING_MAX_CONCURRENCY: int = 4
+    
+    # Streaming ingestion pipeline settings
+    INGESTION_QUEUE_SIZE: int = 8
+    INGESTION_EMBED_BATCH_SIZE: int = 64
+    
+    # Chunk sizes in tokens per data type; "default" covers the rest
+    CHUNKING_PROFILES: Dict[str, Dict[str, int]] = {
+        "default": {"max_tokens": 500, "overlap_tokens": 50},
+        "ตัวบทกฎหมาย": {"max_tokens": 400, "overlap_tokens": 40},
+        "FAQ": {"max_tokens": 300, "overlap_tokens": 0},
+        "คำแนะนำ": {"max_tokens": 400, "overlap_tokens": 40},
+        "FICTION": {"max_tokens": 600, "overlap_tokens": 60},
+    }
+
+    # Embedding cache settings
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 100000
+
+    # Semantic search query cache settings
+    QUERY_CACHE_ENABLED: bool = True
+    QUERY_CACHE_MAX_ENTRIES: int = 1024
+    QUERY_CACHE_TTL_SECONDS: int = 300
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: int = 3600
+    QUERY_CACHE_SINGLE_FLIGHT: bool = True
+
+    # Search session settings (ranked result lists reused for paging and counts)
+    SEARCH_SESSION_MAX_SESSIONS: int = 256
+    SEARCH_SESSION_TTL_SECONDS: int = 600
+    SEARCH_SESSION_MAX_RESULTS: int = 1000
+
+    # Maximal Marginal Relevance for diversified searches (assistant context)
+    SEARCH_MMR_LAMBDA: float = 0.5
+    SEARCH_MMR_FETCH_FACTOR: int = 4
+
+    # Keyword extraction settings (local TF-IDF extractor, LLM as fallback)
+    KEYWORD_EXTRACTION_MAX_KEYWORDS: int = 5
+    KEYWORD_EXTRACTION_MIN_KEYWORDS: int = 3
+    KEYWORD_EXTRACTION_LLM_FALLBACK: bool = True
+
+    # Lexical (keyword) index used alongside vector search. It is local to each
+    # process and backfilled from MongoDB at startup (scripts/build_lexical_index.py)
+    LEXICAL_INDEX_ENABLED: bool = False
+    LEXICAL_INDEX_PATH: str = "data/lexical_index"
+    LEXICAL_RRF_K: int = 60
 
     @field_validator("ALLOWED_ORIGINS", mode="before")
     @classmethod
@@ -19,6 +19,7 @@ class StandardizedResponse(BaseModel, Generic[T]):
         total_page: Total number of pages
         total_data: Total number of items
         data_schema: Optional schema information for frontend filtering/rendering
+        next_cursor: Optional cursor for the next page of a search
     """
     code: int = 0
     message: str = ""
@@ -28,6 +29,7 @@ class StandardizedResponse(BaseModel, Generic[T]):
     total_page: int
     total_data: int
     data_schema: Optional[Dict[str, Any]] = None
+    next_cursor: Optional[str] = None
     
     class Config:
         """Pydantic configuration"""
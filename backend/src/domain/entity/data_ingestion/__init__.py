@@ -1,6 +1,12 @@
 from src.domain.entity.data_ingestion.data_ingestion_schema import (
     DataTypeEnum,
     SearchRequest,
+    DataIngestionUpdateRequest,
+    CrawlRequest,
+    IngestionJobAccepted,
+    IngestionJobStatus,
+    BulkIngestionItemResult,
+    BulkIngestionResponse,
     ListDataIngestionResponse,
     get_data_ingestion_schema
 )
@@ -10,6 +16,12 @@ __all__ = [
     "DataTypeEnum",
     "DataIngestion",
     "SearchRequest",
+    "DataIngestionUpdateRequest",
+    "CrawlRequest",
+    "IngestionJobAccepted",
+    "IngestionJobStatus",
+    "BulkIngestionItemResult",
+    "BulkIngestionResponse",
     "ListDataIngestionResponse",
     "get_data_ingestion_schema"
 ]
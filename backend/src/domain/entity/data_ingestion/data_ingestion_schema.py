@@ -18,6 +18,65 @@ class SearchRequest(BaseModel):
     page: int = Field(default=1, description="Page number")
     page_size: int = Field(default=10, description="Number of items per page")
     
+# Update request schema; omitted fields are left unchanged
+class DataIngestionUpdateRequest(BaseModel):
+    title: Optional[str] = Field(default=None, description="New title")
+    specified_text: Optional[str] = Field(default=None, description="New specified text")
+    data_type: Optional[DataType] = Field(default=None, description="New data type")
+    content: Optional[str] = Field(default=None, description="New content")
+    reference: Optional[str] = Field(default=None, description="New reference")
+    keywords: Optional[List[str]] = Field(default=None, description="New keywords")
+    file_url: Optional[str] = Field(default=None, description="New file URL")
+    webpage_url: Optional[str] = Field(default=None, description="New webpage URL")
+    
+# Crawl request schema; pages are ingested by a queued job
+class CrawlRequest(BaseModel):
+    seed_url: str = Field(description="First page, or the sitemap when sitemap is true")
+    data_type: DataType = Field(description="Data type of the created items")
+    reference: str = Field(description="Reference of the created items")
+    include_pattern: Optional[str] = Field(default=None, description="Regular expression page URLs must match; the seed's host by default")
+    depth: int = Field(default=1, ge=0, description="Link hops followed from the seed")
+    sitemap: bool = Field(default=False, description="Whether seed_url is a sitemap")
+    max_pages: Optional[int] = Field(default=None, gt=0, description="Pages fetched at most")
+    
+# Response to a queued ingestion job (202 Accepted)
+class IngestionJobAccepted(BaseModel):
+    job_id: str
+    status: str
+    data_ingestion_id: Optional[str] = None
+    status_url: str
+    
+# Ingestion job status
+class IngestionJobStatus(BaseModel):
+    job_id: str
+    kind: str
+    status: str  # queued, running, completed or failed
+    priority: int
+    attempts: int
+    max_attempts: int
+    progress: Dict[str, Any]  # stage, chunks_done, chunks_total, chunks_per_second, counts, stages
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    run_after: Optional[datetime] = None
+    
+# Outcome of one item of a bulk submission
+class BulkIngestionItemResult(BaseModel):
+    index: int  # Position of the item in the request
+    id: Optional[str] = None
+    status: str  # created or failed
+    chunks: int = 0
+    error: Optional[str] = None
+    
+# Bulk submission response
+class BulkIngestionResponse(BaseModel):
+    total: int
+    created: int
+    failed: int
+    items: List[BulkIngestionItemResult]
+    
 # List data ingestion response class
 class ListDataIngestionResponse(BaseModel):
     """Response class for process_list_data_ingestion method."""
@@ -26,6 +85,7 @@ class ListDataIngestionResponse(BaseModel):
     page_size: int
     total_page: int
     total_data: int
+    next_cursor: Optional[str] = None
     
     class Config:
         arbitrary_types_allowed = True
@@ -27,6 +27,7 @@ class DataIngestion(BaseModel):
     file_size: Optional[int] = None  # File size in bytes
     webpage_url: Optional[str] = None  # URL for webpage content
     pinecone_id: Optional[str] = None  # Vector ID in Pinecone
+    chunk_ids: List[str] = Field(default_factory=list)  # Vector IDs of all chunks, in document order
     user_id: Optional[str] = None  # ID of the user who created this data ingestion
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,102 @@
+"""
+Vector store interface for embedding storage and similarity search.
+"""
+from abc import ABC, abstractmethod
+from typing import List, Optional, Dict, Any
+
+
+class VectorStore(ABC):
+    """Interface for vector store operations."""
+
+    @abstractmethod
+    async def upsert_vectors(self, vectors: List[Dict[str, Any]]) -> bool:
+        """
+        Insert or update vectors.
+
+        Args:
+            vectors: List of vector dictionaries with 'id', 'values', and 'metadata'
+
+        Returns:
+            True if operation successful
+        """
+        pass
+
+    @abstractmethod
+    async def query_vectors(
+        self,
+        query_vector: List[float],
+        top_k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+        include_values: bool = False,
+        include_metadata: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the vectors most similar to a query vector.
+
+        Args:
+            query_vector: The query embedding vector
+            top_k: Number of results to return
+            filter: Optional metadata filter (Pinecone filter syntax)
+            include_values: Whether to return the stored vector values
+            include_metadata: Whether to return the stored metadata (an empty
+                'metadata' dict otherwise)
+
+        Returns:
+            List of matches with 'id', 'score' and 'metadata' (and 'values' if requested),
+            best match first
+        """
+        pass
+
+    @abstractmethod
+    async def delete_vectors(self, ids: List[str]) -> bool:
+        """
+        Delete vectors by ID.
+
+        Args:
+            ids: List of vector IDs to delete
+
+        Returns:
+            True if operation successful
+        """
+        pass
+
+    @abstractmethod
+    async def update_metadata(self, updates: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Merge fields into the metadata of stored vectors, keeping their values.
+
+        Given fields are overwritten; fields not given are left as they are.
+
+        Args:
+            updates: Metadata fields to set, keyed by vector ID
+
+        Returns:
+            True if operation successful
+        """
+        pass
+
+    @abstractmethod
+    async def list_vector_ids(self, prefix: str) -> List[str]:
+        """
+        List the IDs of stored vectors starting with a prefix.
+
+        Args:
+            prefix: ID prefix
+
+        Returns:
+            Matching vector IDs
+        """
+        pass
+
+    @abstractmethod
+    async def fetch_vectors(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get stored vectors by ID.
+
+        Args:
+            ids: List of vector IDs
+
+        Returns:
+            Vectors with 'id', 'values' and 'metadata', keyed by ID
+        """
+        pass
@@ -12,7 +12,8 @@ from langgraph.prebuilt import ToolNode
 from langchain_openai import ChatOpenAI
 
 from src.infrastructure.ai.model import create_llm
-from src.interface.repository.database.db_repository import pinecone_repository
+from src.interface.repository.database.db_repository import data_ingestion_repository, pinecone_repository
+from src.domain.models.data_ingestion import DataType
 
 logger = logging.getLogger(__name__)
 
@@ -89,15 +90,25 @@ async def search_fiction_sources(state: AssistantState) -> AssistantState:
         # Import and initialize Pinecone repository
         pinecone_repo = pinecone_repository()
         
-        # Query Pinecone
-        search_results = await pinecone_repo.search(last_user_message, limit=5)
+        # Query Pinecone for fiction only, so all 5 results are usable sources;
+        # MMR keeps near-duplicate passages from filling the context
+        fiction_results = await pinecone_repo.search(
+            last_user_message,
+            limit=5,
+            filter=pinecone_repo.build_metadata_filter(data_type=DataType.FICTION),
+            diversify=True
+        )
         
-        # Filter results to only include fiction
-        fiction_results = [
-            result for result in search_results 
-            if result.get("data_type") == "FICTION" or 
-               result.get("source_type") == "fiction"
-        ]
+        # Vectors carry compact metadata; load the display fields in one query
+        documents = await data_ingestion_repository().find_by_ids(
+            [result["id"] for result in fiction_results],
+            projection={"title": 1, "specified_text": 1, "content": 1, "reference": 1}
+        )
+        documents = {document["id"]: document for document in documents}
+        for result in fiction_results:
+            for field, value in documents.get(result["id"], {}).items():
+                if value is not None:
+                    result[field] = value
         
         # Ensure each result has a similarity_score field
         for result in fiction_results:
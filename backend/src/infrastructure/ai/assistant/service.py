@@ -97,8 +97,12 @@ class AssistantUIService:
         """Initialize the service."""
         # The repository will be lazily loaded when needed
         self._thread_repository = None
-        # Initialize MongoDB connection in the background
-        asyncio.create_task(self._init_mongodb())
+        # Initialize MongoDB connection in the background; without a running
+        # loop (e.g. on import by a script or test) it connects on first use
+        try:
+            asyncio.get_running_loop().create_task(self._init_mongodb())
+        except RuntimeError:
+            pass
     
     async def _init_mongodb(self):
         """Initialize MongoDB connection in the background."""
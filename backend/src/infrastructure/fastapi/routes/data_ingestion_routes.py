@@ -1,5 +1,5 @@
-from typing import List, Optional, Union
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, Body, Response
+from typing import Any, AsyncIterator, List, Optional, Tuple, Union
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, Body, Response, Query, Request
 from fastapi.responses import JSONResponse
 import json
 from pathlib import Path
@@ -8,12 +8,19 @@ from src.domain.models.data_ingestion import DataType, DataIngestion
 from src.domain.models.user import User
 from src.domain.entity.data_ingestion import (
     SearchRequest,
+    DataIngestionUpdateRequest,
+    CrawlRequest,
+    IngestionJobAccepted,
+    IngestionJobStatus,
+    BulkIngestionItemResult,
+    BulkIngestionResponse,
     DataTypeEnum,
     ListDataIngestionResponse,
     get_data_ingestion_schema
 )
+from src.config.settings import get_settings
 from src.domain.entity.common import StandardizedResponse, SingleItemResponse
-from src.usecase.data_ingestion import DataIngestionUseCase
+from src.usecase.data_ingestion import DataIngestionUseCase, IngestionJobUseCase
 from src.infrastructure.services.s3_service import S3Service
 from src.infrastructure.fastapi.routes.user_routes import get_current_user
 
@@ -29,20 +36,39 @@ async def get_data_ingestion_usecase():
     return DataIngestionUseCase()
 
 
+async def get_ingestion_job_usecase():
+    """Dependency for ingestion job use case."""
+    return IngestionJobUseCase()
+
+
+def _accepted(job: dict, data_ingestion_id: Optional[str] = None) -> IngestionJobAccepted:
+    return IngestionJobAccepted(
+        job_id=job["_id"],
+        status=job["status"],
+        data_ingestion_id=data_ingestion_id,
+        status_url=f"{router.prefix}/jobs/{job['_id']}"
+    )
+
+
 @router.post(
     "/",
-    response_model=DataIngestion,
-    status_code=status.HTTP_201_CREATED,
+    response_model=IngestionJobAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Submit data ingestion with JSON"
 )
 async def submit_data_ingestion(
     data_ingestion: DataIngestion,
+    priority: int = Query(0, description="Higher runs first"),
     current_user: User = Depends(get_current_user),
-    data_ingestion_usecase: DataIngestionUseCase = Depends(get_data_ingestion_usecase)
+    ingestion_job_usecase: IngestionJobUseCase = Depends(get_ingestion_job_usecase)
 ):
     """
     Submit data ingestion with JSON payload.
     
+    The item is queued and ingested by a background worker (file download,
+    keywords, chunking, embedding and upsert). The response carries the job
+    ID and the ID the item will have; poll **status_url** for progress.
+    
     Example request:
     ```json
     {
@@ -67,14 +93,151 @@ async def submit_data_ingestion(
     - **webpage_url**: URL to a webpage (optional)
     """
     try:
-        # Submit the data ingestion
-        result = await data_ingestion_usecase.submit_data_ingestion(
-            data_ingestion=data_ingestion,
-            user=current_user
+        job = await ingestion_job_usecase.submit(data_ingestion, user=current_user, priority=priority)
+        return _accepted(job, data_ingestion.id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _parse_bulk_item(raw: Any) -> Union[DataIngestion, str]:
+    """Validate one item of a bulk submission, returning the error message if it is invalid."""
+    try:
+        if isinstance(raw, (str, bytes)):
+            raw = json.loads(raw)
+        return DataIngestion.model_validate(raw)
+    except ValueError as e:
+        return str(e)
+
+
+async def _bulk_items(request: Request) -> AsyncIterator[Union[DataIngestion, str]]:
+    """
+    Read the items of a bulk submission.
+    
+    An NDJSON body (application/x-ndjson) is read line by line as it
+    arrives; any other body must be a JSON array.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield _parse_bulk_item(line)
+        if buffer.strip():
+            yield _parse_bulk_item(buffer)
+        return
+    
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if not isinstance(body, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    for raw in body:
+        yield _parse_bulk_item(raw)
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkIngestionResponse,
+    summary="Submit many data ingestion items"
+)
+async def submit_data_ingestion_bulk(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    data_ingestion_usecase: DataIngestionUseCase = Depends(get_data_ingestion_usecase)
+):
+    """
+    Submit many data ingestion items in one request, e.g. a whole FAQ sheet.
+    
+    The body is a JSON array of items (same fields as **POST /**) or an NDJSON
+    stream with one item per line (Content-Type: application/x-ndjson).
+    Items are written, keyworded and embedded together in batches of
+    BULK_INGESTION_BATCH_SIZE, so each batch costs one MongoDB insert, shared
+    embedding requests and one vector upsert.
+    
+    The response reports every item by its position in the request: its ID
+    and chunk count once created, or why it failed. Failed items are not
+    stored; the others are.
+    """
+    batch_size = max(1, get_settings().BULK_INGESTION_BATCH_SIZE)
+    items: List[BulkIngestionItemResult] = []
+    pending: List[Tuple[int, DataIngestion]] = []
+    
+    async def flush():
+        outcomes = await data_ingestion_usecase.submit_data_ingestion_bulk(
+            [data_ingestion for _, data_ingestion in pending], user=current_user
         )
-        
-        # Return the data_ingestion object directly
-        return result
+        items.extend(BulkIngestionItemResult(index=index, **outcome) for (index, _), outcome in zip(pending, outcomes))
+        pending.clear()
+    
+    try:
+        index = 0
+        async for item in _bulk_items(request):
+            if isinstance(item, str):
+                items.append(BulkIngestionItemResult(index=index, status="failed", error=item))
+            else:
+                pending.append((index, item))
+                if len(pending) >= batch_size:
+                    await flush()
+            index += 1
+        if pending:
+            await flush()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    items.sort(key=lambda item: item.index)
+    created = sum(1 for item in items if item.status == "created")
+    return BulkIngestionResponse(total=len(items), created=created, failed=len(items) - created, items=items)
+
+
+@router.post(
+    "/crawl",
+    response_model=IngestionJobAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Ingest the pages of a site"
+)
+async def crawl_data_ingestion(
+    crawl_request: CrawlRequest,
+    priority: int = Query(0, description="Higher runs first"),
+    current_user: User = Depends(get_current_user),
+    ingestion_job_usecase: IngestionJobUseCase = Depends(get_ingestion_job_usecase)
+):
+    """
+    Queue a crawl that ingests every page reachable from a seed page (or
+    listed in a sitemap) as one item per page.
+    """
+    try:
+        job = await ingestion_job_usecase.crawl(**crawl_request.dict(), user=current_user, priority=priority)
+        return _accepted(job)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=IngestionJobStatus,
+    summary="Get ingestion job status"
+)
+async def get_ingestion_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    ingestion_job_usecase: IngestionJobUseCase = Depends(get_ingestion_job_usecase)
+):
+    """
+    Get the status of an ingestion job: stage, chunks done out of total,
+    throughput, attempts, and the result or last error.
+    
+    - **job_id**: Job ID
+    """
+    try:
+        return await ingestion_job_usecase.get_job(job_id, user=current_user)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -190,6 +353,44 @@ async def search_data_ingestion(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.put(
+    "/{data_id}",
+    response_model=SingleItemResponse[DataIngestion],
+    summary="Update and re-ingest data ingestion"
+)
+async def update_data_ingestion(
+    data_id: str,
+    update_request: DataIngestionUpdateRequest,
+    current_user: User = Depends(get_current_user),
+    data_ingestion_usecase: DataIngestionUseCase = Depends(get_data_ingestion_usecase)
+):
+    """
+    Update data ingestion and re-ingest its source.
+    
+    Only chunks whose text changed are embedded again; chunks that disappeared
+    are removed. Send an empty body to refresh a changed file or webpage.
+    
+    - **data_id**: Data ingestion ID
+    """
+    try:
+        data_ingestion = await data_ingestion_usecase.update_data_ingestion(
+            data_id,
+            update_request.dict(exclude_none=True),
+            user=current_user
+        )
+        
+        return SingleItemResponse[DataIngestion](
+            code=0,
+            message="",
+            data=data_ingestion,
+            data_schema=get_data_ingestion_schema()
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete(
     "/{data_id}",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -240,6 +441,7 @@ async def list_data_ingestion(
     _pageSize: Optional[int] = None,
     _sort: Optional[str] = None,
     _order: Optional[str] = None,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     data_ingestion_usecase: DataIngestionUseCase = Depends(get_data_ingestion_usecase)
 ):
@@ -258,6 +460,7 @@ async def list_data_ingestion(
     - **_pageSize**: Alternative page size parameter (used by refine)
     - **_sort**: Field to sort by (used by refine)
     - **_order**: Sort order (asc or desc, used by refine)
+    - **cursor**: Cursor from the previous page of a query (next_cursor); pages the same ranked results
     """
     try:
         # Process the request using the usecase
@@ -274,6 +477,7 @@ async def list_data_ingestion(
             _pageSize=_pageSize,
             _sort=_sort,
             _order=_order,
+            cursor=cursor,
             user=current_user
         )
         
@@ -289,7 +493,8 @@ async def list_data_ingestion(
             page_size=result.page_size,
             total_page=result.total_page,
             total_data=result.total_data,
-            data_schema=data_schema
+            data_schema=data_schema,
+            next_cursor=result.next_cursor
         )
     except Exception as e:
         import traceback
@@ -345,14 +550,9 @@ async def insert_sample_data(
             )
         ]
         
-        # Create data ingestion items
-        created_items = []
-        for item in sample_data:
-            data_ingestion = await data_ingestion_usecase.submit_data_ingestion(
-                data_ingestion=item
-            )
-            created_items.append(data_ingestion)
+        # Create data ingestion items together
+        await data_ingestion_usecase.submit_data_ingestion_bulk(sample_data)
         
-        return created_items
+        return [item for item in sample_data if item.chunk_ids]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
@@ -155,9 +155,9 @@ async def list_files(
         # Add additional filters if provided
         if file_name:
             filter_params["file_name"] = file_name
-            
-        if file_name_like:
-            filter_params["file_name"] = {"$regex": file_name_like, "$options": "i"}
+        
+        # Partial file name matches go through the n-gram index
+        like = {"file_name": file_name_like} if file_name_like else None
         
         if file_type:
             filter_params["file_type"] = file_type
@@ -180,7 +180,8 @@ async def list_files(
             limit=page_size, 
             offset=offset,
             filter_params=filter_params,
-            sort_params=sort_params
+            sort_params=sort_params,
+            like=like
         )
         
         # Calculate total pages
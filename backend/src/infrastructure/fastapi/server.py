@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Response
@@ -12,6 +13,24 @@ from src.infrastructure.ai.assistant import assistant_service
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+async def refresh_index_alias():
+    """Follow index alias switches made by other processes."""
+    from src.interface.repository.database.db_repository import index_alias_repository
+    while True:
+        await asyncio.sleep(settings.INDEX_ALIAS_REFRESH_SECONDS)
+        try:
+            await index_alias_repository().get()
+        except Exception as e:
+            logger.warning(f"Failed to refresh index alias: {str(e)}")
+
+async def backfill_lexical_index():
+    """Add items written before this process started, or by other processes, to its lexical index."""
+    from src.usecase.data_ingestion import DataIngestionUseCase
+    try:
+        await DataIngestionUseCase().backfill_lexical_index()
+    except Exception as e:
+        logger.warning(f"Failed to backfill lexical index: {str(e)}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -19,6 +38,9 @@ async def lifespan(app: FastAPI):
     This handles database connections at startup and shutdown.
     """
     # Startup: Initialize database connection
+    alias_refresh_task = None
+    ingestion_workers_task = None
+    lexical_backfill_task = None
     try:
         logger.info("Starting up: Connecting to MongoDB...")
         # Try to connect multiple times with backoff
@@ -36,11 +58,33 @@ async def lifespan(app: FastAPI):
                 wait_time = 2 ** retry_count  # Exponential backoff
                 logger.warning(f"Failed to connect to MongoDB (attempt {retry_count}/{max_retries}): {str(e)}")
                 logger.warning(f"Retrying in {wait_time} seconds...")
-                import asyncio
                 await asyncio.sleep(wait_time)
         
         if not connected:
             logger.error("Failed to connect to MongoDB after multiple attempts")
+        else:
+            # Build the indexes the repositories declare; drift is only reported
+            if settings.MONGO_ENSURE_INDEXES:
+                from src.interface.repository.database import db_repository  # noqa: F401 (registers indexes)
+                from src.interface.repository.mongodb.index_registry import IndexRegistry
+                try:
+                    await IndexRegistry.reconcile(MongoDB.get_db())
+                except Exception as e:
+                    logger.warning(f"Failed to reconcile MongoDB indexes: {str(e)}")
+            
+            # Resolve the vector index serving reads before the first request
+            from src.interface.repository.database.db_repository import index_alias_repository
+            target = await index_alias_repository().get()
+            if target:
+                logger.info(f"Serving vectors from index {target['index_name']} ({target['profile']})")
+            alias_refresh_task = asyncio.create_task(refresh_index_alias())
+            
+            if settings.LEXICAL_INDEX_ENABLED:
+                lexical_backfill_task = asyncio.create_task(backfill_lexical_index())
+            
+            # Run queued ingestion jobs in the background
+            from src.usecase.data_ingestion import IngestionJobUseCase
+            ingestion_workers_task = asyncio.create_task(IngestionJobUseCase().run_workers())
         
         # Force initialize the user_usecase to ensure it has a valid repository
         from src.usecase.user import get_user_usecase_async
@@ -66,6 +110,13 @@ async def lifespan(app: FastAPI):
     yield  # Application runs here
     
     # Shutdown: Close database connection
+    if alias_refresh_task:
+        alias_refresh_task.cancel()
+    if lexical_backfill_task:
+        lexical_backfill_task.cancel()
+    if ingestion_workers_task:
+        # Interrupted jobs are taken over once their heartbeat is stale
+        ingestion_workers_task.cancel()
     try:
         logger.info("Shutting down: Closing MongoDB connection...")
         await MongoDB.close_database_connection()
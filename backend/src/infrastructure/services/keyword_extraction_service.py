@@ -0,0 +1,140 @@
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from src.interface.repository.mongodb.keyword_stats_repository import KeywordStatsRepository
+from src.shared.text.keywords import KeywordExtractor
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordExtractionService:
+    """
+    Service for generating keywords of data ingestion items in process.
+
+    Keywords are ranked by KeywordExtractor against the corpus statistics of
+    the data_ingestion collection. The language model is only asked when the
+    local extractor finds fewer than min_keywords keywords.
+    """
+
+    def __init__(
+        self,
+        stats_repository: Optional[KeywordStatsRepository] = None,
+        llm_fallback: Optional[Callable[[str, int], Awaitable[List[str]]]] = None,
+        min_keywords: int = 3,
+        extractor: Optional[KeywordExtractor] = None
+    ):
+        """
+        Args:
+            stats_repository: Corpus statistics; without it keywords are ranked by term frequency only
+            llm_fallback: Async function generating keywords from (text, max_keywords)
+            min_keywords: Fewest local keywords accepted before falling back to the LLM
+            extractor: Keyword extractor to use
+        """
+        self.stats_repository = stats_repository
+        self.llm_fallback = llm_fallback
+        self.min_keywords = min_keywords
+        self.extractor = extractor or KeywordExtractor()
+
+    @staticmethod
+    def corpus_text(title: str = "", specified_text: str = "", content: Optional[str] = None) -> str:
+        """
+        Build the text of an item that corpus statistics are counted over.
+
+        Args:
+            title: Item title
+            specified_text: Item specified text
+            content: Item content
+
+        Returns:
+            str: Text of the item
+        """
+        return "\n".join(part for part in (title, specified_text, content) if part)
+
+    async def _frequencies(self, terms: Set[str]) -> Tuple[int, Dict[str, int]]:
+        if self.stats_repository is None or not terms:
+            return 0, {}
+        try:
+            return await self.stats_repository.get_frequencies(terms)
+        except Exception as e:
+            logger.warning(f"Keyword statistics lookup failed: {str(e)}")
+            return 0, {}
+
+    async def extract(self, text: str, title: str = "", max_keywords: int = 5) -> List[str]:
+        """
+        Generate keywords for one item.
+
+        Args:
+            text: Text of the item (including the title)
+            title: Item title
+            max_keywords: Maximum number of keywords
+
+        Returns:
+            List[str]: Keywords, best first
+        """
+        return (await self.extract_batch([{"text": text, "title": title}], max_keywords, use_fallback=True))[0]
+
+    async def extract_batch(
+        self,
+        documents: List[Dict[str, Any]],
+        max_keywords: int = 5,
+        use_fallback: bool = False
+    ) -> List[List[str]]:
+        """
+        Generate keywords for many items in one pass.
+
+        Document frequencies of all candidates are fetched with a single query,
+        so the cost per item is the in-process extraction alone.
+
+        Args:
+            documents: Items as dicts with 'text' and optional 'title'
+            max_keywords: Maximum number of keywords per item
+            use_fallback: Whether items with too few local keywords go to the LLM
+
+        Returns:
+            List[List[str]]: Keywords per item, in input order
+        """
+        term_sets = [self.extractor.terms(document["text"]) for document in documents]
+        document_count, frequencies = await self._frequencies(set().union(*term_sets))
+
+        results = []
+        for document in documents:
+            keywords = self.extractor.extract(
+                document["text"],
+                title=document.get("title") or "",
+                max_keywords=max_keywords,
+                document_count=document_count,
+                document_frequencies=frequencies
+            )
+            if use_fallback and self.llm_fallback is not None and len(keywords) < min(self.min_keywords, max_keywords):
+                logger.info(f"Local extraction found {len(keywords)} keywords; asking the LLM")
+                keywords = await self.llm_fallback(document["text"], max_keywords) or keywords
+            results.append(keywords)
+        return results
+
+    async def add_to_corpus(self, texts: List[str]):
+        """
+        Count items in the corpus statistics.
+
+        Args:
+            texts: Corpus texts of the items (see corpus_text)
+        """
+        if self.stats_repository is None:
+            return
+        try:
+            await self.stats_repository.add_documents([self.extractor.terms(text) for text in texts])
+        except Exception as e:
+            logger.warning(f"Keyword statistics update failed: {str(e)}")
+
+    async def remove_from_corpus(self, texts: List[str]):
+        """
+        Remove items from the corpus statistics.
+
+        Args:
+            texts: Corpus texts of the items, as they were added
+        """
+        if self.stats_repository is None:
+            return
+        try:
+            await self.stats_repository.remove_documents([self.extractor.terms(text) for text in texts])
+        except Exception as e:
+            logger.warning(f"Keyword statistics update failed: {str(e)}")
@@ -9,8 +9,23 @@ from src.interface.repository.mongodb.thread_repository import MongoDBThreadRepo
 from src.interface.repository.s3.s3_repository import S3Repository
 from src.interface.repository.file.file_repository import S3FileRepository
 from src.interface.repository.pinecone.pinecone_repository import PineconeRepository
+from src.interface.repository.pinecone.embedding_profile import EmbeddingProfile
+from src.interface.repository.mongodb.embedding_cache_repository import EmbeddingCacheRepository
+from src.interface.repository.mongodb.keyword_stats_repository import KeywordStatsRepository
+from src.interface.repository.mongodb.index_alias_repository import IndexAliasRepository
+from src.interface.repository.mongodb.reindex_job_repository import ReindexJobRepository
+from src.interface.repository.mongodb.ingestion_job_repository import IngestionJobRepository
+from src.interface.repository.local.local_vector_store import LocalVectorStore
+from src.interface.repository.local.lexical_index import LexicalIndex
+from src.interface.repository.webpage.webpage_cache import LocalWebpageCache, S3WebpageCache, WebpageCache
+from src.interface.repository.webpage.webpage_fetcher import WebpageFetcher
+from src.domain.repository.vector_store import VectorStore
+from src.config.settings import get_settings
+import boto3
 import logging
 import asyncio
+import os
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
@@ -131,13 +146,180 @@ def file_repository():
         logger.error(f"Failed to create file repository: {str(e)}")
         raise
 
-def pinecone_repository() -> PineconeRepository:
+def embedding_cache_repository() -> Optional[EmbeddingCacheRepository]:
+    """
+    Factory function that returns an EmbeddingCacheRepository implementation.
+    
+    Returns None when the cache is disabled or the database is not connected,
+    so embedding generation keeps working without it.
+    """
+    settings = get_settings()
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return None
+    try:
+        db = MongoDB.get_db()
+        return EmbeddingCacheRepository(db, max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES)
+    except RuntimeError as e:
+        logger.warning(f"Embedding cache unavailable: {str(e)}")
+        return None
+
+def keyword_stats_repository() -> Optional[KeywordStatsRepository]:
+    """
+    Factory function that returns a KeywordStatsRepository implementation.
+    
+    Returns None when the database is not connected, so keyword extraction
+    keeps working without corpus statistics.
+    """
+    try:
+        db = MongoDB.get_db()
+        return KeywordStatsRepository(db)
+    except RuntimeError as e:
+        logger.warning(f"Keyword statistics unavailable: {str(e)}")
+        return None
+
+def index_alias_repository() -> IndexAliasRepository:
+    """
+    Factory function that returns an IndexAliasRepository implementation.
+    
+    Note: Make sure the database is connected by calling ensure_db_connected()
+    before using this function.
+    """
+    try:
+        db = MongoDB.get_db()
+        return IndexAliasRepository(db)
+    except RuntimeError as e:
+        logger.error(f"Failed to create index alias repository: {str(e)}")
+        raise
+
+def reindex_job_repository() -> ReindexJobRepository:
+    """
+    Factory function that returns a ReindexJobRepository implementation.
+    
+    Note: Make sure the database is connected by calling ensure_db_connected()
+    before using this function.
+    """
+    try:
+        db = MongoDB.get_db()
+        return ReindexJobRepository(db)
+    except RuntimeError as e:
+        logger.error(f"Failed to create reindex job repository: {str(e)}")
+        raise
+
+def ingestion_job_repository() -> IngestionJobRepository:
+    """
+    Factory function that returns an IngestionJobRepository implementation.
+    
+    Note: Make sure the database is connected by calling ensure_db_connected()
+    before using this function.
+    """
+    try:
+        db = MongoDB.get_db()
+        return IngestionJobRepository(db)
+    except RuntimeError as e:
+        logger.error(f"Failed to create ingestion job repository: {str(e)}")
+        raise
+
+def vector_store(index_name: Optional[str] = None, dimension: Optional[int] = None) -> Optional[VectorStore]:
+    """
+    Factory function that returns the configured VectorStore backend.
+    
+    Returns None for the default "pinecone" backend, which PineconeRepository
+    implements itself; returns the shared LocalVectorStore for "local".
+    
+    Args:
+        index_name: Index the store stands in for; indexes other than
+            PINECONE_INDEX_NAME (reindex targets) get their own directory
+        dimension: Embedding dimensions; those of EMBEDDING_PROFILE by default
+    """
+    settings = get_settings()
+    backend = settings.VECTOR_STORE_BACKEND.lower()
+    if backend == "pinecone":
+        return None
+    if backend == "local":
+        path = settings.LOCAL_VECTOR_STORE_PATH
+        if index_name and index_name != settings.PINECONE_INDEX_NAME:
+            path = os.path.join(path, index_name)
+        return LocalVectorStore.get_instance(
+            path,
+            dimension=dimension or EmbeddingProfile.from_settings().dimensions,
+            hnsw_threshold=settings.LOCAL_VECTOR_STORE_HNSW_THRESHOLD
+        )
+    raise ValueError(f"Unknown vector store backend: {settings.VECTOR_STORE_BACKEND}")
+
+def lexical_index() -> Optional[LexicalIndex]:
+    """
+    Factory function that returns the shared LexicalIndex.
+    
+    Returns None when the lexical index is disabled, in which case search is
+    vector-only.
+    """
+    settings = get_settings()
+    if not settings.LEXICAL_INDEX_ENABLED:
+        return None
+    return LexicalIndex.get_instance(settings.LEXICAL_INDEX_PATH)
+
+def webpage_cache() -> Optional[WebpageCache]:
+    """
+    Factory function that returns the configured WebpageCache backend.
+    
+    Returns None when WEBPAGE_CACHE_BACKEND is "none", in which case every
+    webpage ingestion downloads and re-embeds the page.
+    """
+    settings = get_settings()
+    backend = settings.WEBPAGE_CACHE_BACKEND.lower()
+    if backend == "none":
+        return None
+    if backend == "local":
+        return LocalWebpageCache.get_instance(settings.WEBPAGE_CACHE_PATH, settings.WEBPAGE_CACHE_MAX_BYTES)
+    if backend == "s3":
+        return S3WebpageCache(
+            settings.S3_BUCKET_NAME,
+            settings.WEBPAGE_CACHE_S3_PREFIX,
+            boto3.client(
+                "s3",
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                region_name=settings.AWS_REGION
+            )
+        )
+    raise ValueError(f"Unknown webpage cache backend: {settings.WEBPAGE_CACHE_BACKEND}")
+
+def webpage_fetcher() -> WebpageFetcher:
+    """
+    Factory function that returns a WebpageFetcher over the configured cache.
+    """
+    return WebpageFetcher(webpage_cache())
+
+def pinecone_repository(
+    index_name: Optional[str] = None,
+    profile_name: Optional[str] = None
+) -> PineconeRepository:
     """
     Factory function that returns a PineconeRepository implementation.
     This centralizes the creation of repository instances.
+    
+    Without arguments the repository serves the index the default index alias
+    points to (see IndexAliasRepository), falling back to PINECONE_INDEX_NAME
+    and EMBEDDING_PROFILE before any reindex.
+    
+    Args:
+        index_name: Index to use instead of the aliased one (e.g. a reindex target)
+        profile_name: Embedding profile of that index
     """
+    if index_name is None:
+        target = IndexAliasRepository.cached()
+        if target:
+            index_name, profile_name = target["index_name"], target["profile"]
     try:
-        return PineconeRepository()
+        profile = EmbeddingProfile.from_settings(profile_name)
+        return PineconeRepository(
+            embedding_cache=embedding_cache_repository(),
+            vector_store=vector_store(index_name, profile.dimensions),
+            lexical_index=lexical_index(),
+            webpage_fetcher=webpage_fetcher(),
+            index_name=index_name,
+            embedding_profile=profile
+        )
     except Exception as e:
         logger.error(f"Failed to create Pinecone repository: {str(e)}")
         raise
@@ -178,6 +360,15 @@ def get_repository(repository_name: str):
         "s3": s3_repository,
         "file": file_repository,
         "pinecone": pinecone_repository,
+        "embedding_cache": embedding_cache_repository,
+        "keyword_stats": keyword_stats_repository,
+        "vector_store": vector_store,
+        "index_alias": index_alias_repository,
+        "reindex_job": reindex_job_repository,
+        "ingestion_job": ingestion_job_repository,
+        "lexical_index": lexical_index,
+        "webpage_cache": webpage_cache,
+        "webpage_fetcher": webpage_fetcher,
         "thread": thread_repository
     }
     
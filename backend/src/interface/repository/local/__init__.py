@@ -0,0 +1,4 @@
+from src.interface.repository.local.lexical_index import LexicalIndex
+from src.interface.repository.local.local_vector_store import LocalVectorStore
+
+__all__ = ["LexicalIndex", "LocalVectorStore"]
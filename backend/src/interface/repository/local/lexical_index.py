@@ -0,0 +1,266 @@
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from src.interface.repository.local.metadata_filter import matches_filter
+from src.shared.text.lexical import legal_anchors, normalize, tokenize
+
+logger = logging.getLogger(__name__)
+
+
+class LexicalIndex:
+    """
+    BM25 inverted index over data ingestion items, kept on local disk.
+
+    Every item is one document: its title, keywords and specified text
+    (weighted up) plus the text of all its chunks. Documents are persisted in a
+    SQLite file and mirrored in memory as posting lists. Besides ranked
+    search, the index reports "strong" matches: items whose title or a keyword
+    equals the query, whose title contains it, or that contain every legal
+    section reference ("มาตรา 420") the query names.
+
+    The index is per process and only sees the writes of its own process, so
+    it is backfilled from MongoDB at startup and search never relies on it
+    alone: its rankings are always fused with the vector index's.
+    """
+
+    INDEX_FILE = "lexical.sqlite"
+
+    # Term weights per field; chunk text counts once
+    FIELD_WEIGHTS = {"title": 3.0, "keywords": 3.0, "specified_text": 2.0}
+
+    # BM25 parameters
+    K1 = 1.2
+    B = 0.75
+
+    # Shortest query that counts as a strong match when a title contains it
+    MIN_TITLE_MATCH_LENGTH = 6
+
+    # One instance per directory; repositories are created per request
+    _instances: Dict[str, "LexicalIndex"] = {}
+
+    def __init__(self, path: str):
+        """
+        Open or create a lexical index.
+
+        Args:
+            path: Directory holding the index file
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+
+        self._db = sqlite3.connect(os.path.join(path, self.INDEX_FILE), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS documents (id TEXT PRIMARY KEY, metadata TEXT NOT NULL, terms TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._terms: Dict[str, List[str]] = {}
+        self._lengths: Dict[str, float] = {}
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+        self._exact: Dict[str, Set[str]] = {}
+        self._anchors: Dict[str, Set[str]] = {}
+        self._total_length = 0.0
+        for doc_id, metadata, terms in self._db.execute("SELECT id, metadata, terms FROM documents"):
+            self._add(doc_id, json.loads(metadata), json.loads(terms))
+
+        # Term counts of documents being streamed in, not yet searchable
+        self._pending: Dict[str, Counter] = {}
+        logger.info(f"Opened lexical index at {path} with {len(self._metadata)} documents")
+
+    @classmethod
+    def get_instance(cls, path: str) -> "LexicalIndex":
+        """
+        Get the shared index for a directory, opening it on first use.
+
+        Args:
+            path: Directory holding the index file
+
+        Returns:
+            LexicalIndex: The index for path
+        """
+        key = os.path.abspath(path)
+        if key not in cls._instances:
+            cls._instances[key] = cls(path)
+        return cls._instances[key]
+
+    def __len__(self) -> int:
+        return len(self._metadata)
+
+    def document_ids(self) -> List[str]:
+        """Get the IDs of the searchable documents."""
+        with self._lock:
+            return list(self._metadata)
+
+    @staticmethod
+    def _exact_keys(metadata: Dict[str, Any]) -> Set[str]:
+        keys = {normalize(metadata.get("title") or "")}
+        keys.update(normalize(keyword) for keyword in metadata.get("keywords") or [])
+        keys.discard("")
+        return keys
+
+    def _field_terms(self, metadata: Dict[str, Any]) -> Counter:
+        terms: Counter = Counter()
+        for field, weight in self.FIELD_WEIGHTS.items():
+            value = metadata.get(field) or ""
+            text = " ".join(value) if isinstance(value, list) else str(value)
+            for term in tokenize(text):
+                terms[term] += weight
+        return terms
+
+    @staticmethod
+    def _text_terms(text: str) -> Counter:
+        terms = Counter(tokenize(text))
+        terms.update(legal_anchors(text))
+        return terms
+
+    def _add(self, doc_id: str, metadata: Dict[str, Any], terms: Dict[str, float]):
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        self._terms[doc_id] = list(terms)
+        length = sum(frequency for term, frequency in terms.items() if not term.startswith("มาตรา:"))
+        self._lengths[doc_id] = length
+        self._total_length += length
+        self._metadata[doc_id] = metadata
+        self._exact[doc_id] = self._exact_keys(metadata)
+        self._anchors[doc_id] = {term for term in terms if term.startswith("มาตรา:")}
+
+    def _remove(self, doc_id: str):
+        if doc_id not in self._metadata:
+            return
+        for term in self._terms.pop(doc_id):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+        del self._metadata[doc_id]
+        del self._exact[doc_id]
+        del self._anchors[doc_id]
+
+    def index_document(self, doc_id: str, metadata: Dict[str, Any], texts: Iterable[str]):
+        """
+        Add or replace a document.
+
+        Args:
+            doc_id: MongoDB ID of the item
+            metadata: Item metadata (title, keywords, specified_text, data_type, ...)
+            texts: Chunk texts of the item
+        """
+        self.begin_document(doc_id)
+        for text in texts:
+            self.add_text(doc_id, text)
+        self.commit_document(doc_id, metadata)
+
+    def begin_document(self, doc_id: str):
+        """Start streaming the chunk texts of a document in."""
+        with self._lock:
+            self._pending[doc_id] = Counter()
+
+    def add_text(self, doc_id: str, text: str):
+        """Add one chunk text of a document being streamed in."""
+        with self._lock:
+            self._pending.setdefault(doc_id, Counter()).update(self._text_terms(text))
+
+    def discard_document(self, doc_id: str):
+        """Drop a streamed document without touching its indexed version."""
+        with self._lock:
+            self._pending.pop(doc_id, None)
+
+    def commit_document(self, doc_id: str, metadata: Dict[str, Any]):
+        """
+        Make a streamed document searchable, replacing its previous version.
+
+        Args:
+            doc_id: MongoDB ID of the item
+            metadata: Item metadata
+        """
+        with self._lock:
+            terms = self._pending.pop(doc_id, Counter())
+            terms.update(self._field_terms(metadata))
+            terms.update(legal_anchors(str(metadata.get("title") or "")))
+            metadata = {key: value for key, value in metadata.items() if value is not None}
+
+            self._remove(doc_id)
+            self._add(doc_id, metadata, dict(terms))
+            self._db.execute(
+                "INSERT OR REPLACE INTO documents (id, metadata, terms) VALUES (?, ?, ?)",
+                (doc_id, json.dumps(metadata, ensure_ascii=False, default=str), json.dumps(terms, ensure_ascii=False))
+            )
+            self._db.commit()
+
+    def remove_document(self, doc_id: str):
+        """
+        Remove a document.
+
+        Args:
+            doc_id: MongoDB ID of the item
+        """
+        with self._lock:
+            self._pending.pop(doc_id, None)
+            self._remove(doc_id)
+            self._db.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+            self._db.commit()
+
+    def search(self, query: str, top_k: int = 10, filter: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Rank documents for a query with BM25.
+
+        Args:
+            query: Query text
+            top_k: Maximum number of results
+            filter: Optional metadata filter (Pinecone filter syntax)
+
+        Returns:
+            Dict[str, Any]: 'results' as dicts with 'id', 'score', 'strong' and
+                'metadata', best first, and 'strong' telling whether any result
+                is a strong match
+        """
+        with self._lock:
+            if not self._metadata or top_k <= 0:
+                return {"results": [], "strong": False}
+
+            normalized_query = normalize(query)
+            query_anchors = legal_anchors(query)
+            query_terms = Counter(tokenize(query))
+            query_terms.update(query_anchors)
+
+            document_count = len(self._metadata)
+            average_length = self._total_length / document_count or 1.0
+            scores: Dict[str, float] = {}
+            for term, query_frequency in query_terms.items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    if term.startswith("มาตรา:"):
+                        # Section references are matched exactly, not by frequency
+                        scores[doc_id] = scores.get(doc_id, 0.0) + idf * (self.K1 + 1)
+                        continue
+                    norm = self.K1 * (1 - self.B + self.B * self._lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + query_frequency * idf * frequency * (self.K1 + 1) / (frequency + norm)
+
+            results = []
+            for doc_id, score in scores.items():
+                metadata = self._metadata[doc_id]
+                if filter and not matches_filter(metadata, filter):
+                    continue
+                strong = bool(normalized_query) and (
+                    normalized_query in self._exact[doc_id]
+                    or len(normalized_query) >= self.MIN_TITLE_MATCH_LENGTH
+                    and normalized_query in normalize(metadata.get("title") or "")
+                    or bool(query_anchors) and query_anchors <= self._anchors[doc_id]
+                )
+                results.append({"id": doc_id, "score": score, "strong": strong, "metadata": dict(metadata)})
+
+            results.sort(key=lambda result: (result["strong"], result["score"]), reverse=True)
+            results = results[:top_k]
+            return {"results": results, "strong": any(result["strong"] for result in results)}
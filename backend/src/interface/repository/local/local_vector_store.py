@@ -0,0 +1,394 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.domain.repository.vector_store import VectorStore
+from src.interface.repository.local.metadata_filter import matches_filter
+
+# HNSW is optional; without it every query is an exact brute-force scan
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Vector store kept on local disk.
+
+    Vectors live in a memory-mapped float32 matrix (one row per vector, stored
+    L2-normalized so cosine similarity is a dot product) and their IDs and
+    metadata in a SQLite sidecar table. Queries are exact top-k scans with
+    vectorized NumPy; once the store holds hnsw_threshold vectors and hnswlib
+    is installed, unfiltered queries use an in-memory HNSW graph instead.
+    SQLite, memmap, NumPy and HNSW work runs on the store's own thread, so
+    it never blocks the event loop.
+    """
+
+    MATRIX_FILE = "vectors.f32"
+    METADATA_FILE = "metadata.sqlite"
+    INITIAL_CAPACITY = 1024
+
+    # One instance per directory; repositories are created per request
+    _instances: Dict[str, "LocalVectorStore"] = {}
+
+    def __init__(self, path: str, dimension: int, hnsw_threshold: int = 50000):
+        """
+        Open or create a local vector store.
+
+        Args:
+            path: Directory holding the matrix and metadata files
+            dimension: Embedding dimensions
+            hnsw_threshold: Number of vectors above which the HNSW graph is used
+        """
+        self.path = path
+        self.dimension = dimension
+        self.hnsw_threshold = hnsw_threshold
+        self._lock = threading.RLock()
+        # Operations hold the lock anyway, so one thread is enough
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="local-vector-store")
+        os.makedirs(path, exist_ok=True)
+
+        self._db = sqlite3.connect(os.path.join(path, self.METADATA_FILE), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS vectors (id TEXT PRIMARY KEY, row INTEGER NOT NULL, metadata TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+        # In-memory mirror of the sidecar table
+        self._row_by_id: Dict[str, int] = {}
+        self._id_by_row: Dict[int, str] = {}
+        self._metadata_by_row: Dict[int, Dict[str, Any]] = {}
+        for vector_id, row, metadata in self._db.execute("SELECT id, row, metadata FROM vectors"):
+            self._row_by_id[vector_id] = row
+            self._id_by_row[row] = vector_id
+            self._metadata_by_row[row] = json.loads(metadata)
+
+        self._row_count = max(self._id_by_row, default=-1) + 1
+        self._free_rows = sorted(set(range(self._row_count)) - set(self._id_by_row), reverse=True)
+        self._active = np.zeros(0, dtype=bool)
+        self._open_matrix(max(self.INITIAL_CAPACITY, self._row_count))
+
+        self._hnsw = None
+        logger.info(f"Opened local vector store at {path} with {len(self._row_by_id)} vectors")
+
+    @classmethod
+    def get_instance(cls, path: str, dimension: int, hnsw_threshold: int = 50000) -> "LocalVectorStore":
+        """
+        Get the shared store for a directory, opening it on first use.
+
+        Args:
+            path: Directory holding the matrix and metadata files
+            dimension: Embedding dimensions
+            hnsw_threshold: Number of vectors above which the HNSW graph is used
+
+        Returns:
+            LocalVectorStore: The store for path
+        """
+        key = os.path.abspath(path)
+        if key not in cls._instances:
+            cls._instances[key] = cls(path, dimension, hnsw_threshold)
+        return cls._instances[key]
+
+    def _open_matrix(self, capacity: int):
+        """Map the matrix file, growing it to hold at least capacity rows."""
+        matrix_path = os.path.join(self.path, self.MATRIX_FILE)
+        size = capacity * self.dimension * 4
+        with open(matrix_path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        capacity = os.path.getsize(matrix_path) // (self.dimension * 4)
+        self._matrix = np.memmap(matrix_path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension))
+
+        active = np.zeros(capacity, dtype=bool)
+        active[:len(self._active)] = self._active
+        for row in self._id_by_row:
+            active[row] = True
+        self._active = active
+
+    def _ensure_capacity(self, rows: int):
+        capacity = self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        self._matrix.flush()
+        del self._matrix
+        self._open_matrix(max(rows, capacity * 2))
+
+    @staticmethod
+    def _normalize(values: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(values, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return values / norms
+
+    def __len__(self) -> int:
+        return len(self._row_by_id)
+
+    async def _run(self, fn, *args):
+        """
+        Run a blocking operation on the store's thread.
+
+        Args:
+            fn: Blocking callable working on the matrix, metadata or HNSW graph
+
+        Returns:
+            Any: The callable's result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args))
+
+    async def upsert_vectors(self, vectors: List[Dict[str, Any]]) -> bool:
+        """
+        Insert or update vectors.
+
+        Args:
+            vectors: List of vector dictionaries with 'id', 'values', and 'metadata'
+
+        Returns:
+            bool: True if operation successful
+        """
+        return await self._run(self._upsert, vectors)
+
+    def _upsert(self, vectors: List[Dict[str, Any]]) -> bool:
+        if not vectors:
+            return True
+
+        with self._lock:
+            rows = []
+            for vector in vectors:
+                row = self._row_by_id.get(vector["id"])
+                if row is None:
+                    row = self._free_rows.pop() if self._free_rows else self._row_count
+                    self._row_count = max(self._row_count, row + 1)
+                rows.append(row)
+                self._row_by_id[vector["id"]] = row
+                self._id_by_row[row] = vector["id"]
+                self._metadata_by_row[row] = vector.get("metadata") or {}
+
+            self._ensure_capacity(self._row_count)
+            values = self._normalize(np.asarray([vector["values"] for vector in vectors], dtype=np.float32))
+            row_index = np.asarray(rows)
+            self._matrix[row_index] = values
+            self._active[row_index] = True
+            self._matrix.flush()
+
+            self._db.executemany(
+                "INSERT OR REPLACE INTO vectors (id, row, metadata) VALUES (?, ?, ?)",
+                [
+                    (vector["id"], row, json.dumps(vector.get("metadata") or {}, ensure_ascii=False))
+                    for vector, row in zip(vectors, rows)
+                ]
+            )
+            self._db.commit()
+
+            if self._hnsw is not None:
+                self._hnsw_add(row_index, values)
+        return True
+
+    async def delete_vectors(self, ids: List[str]) -> bool:
+        """
+        Delete vectors by ID. Freed rows are reused by later inserts.
+
+        Args:
+            ids: List of vector IDs to delete
+
+        Returns:
+            bool: True if operation successful
+        """
+        return await self._run(self._delete, ids)
+
+    def _delete(self, ids: List[str]) -> bool:
+        with self._lock:
+            for vector_id in ids:
+                row = self._row_by_id.pop(vector_id, None)
+                if row is None:
+                    continue
+                del self._id_by_row[row]
+                del self._metadata_by_row[row]
+                self._active[row] = False
+                self._free_rows.append(row)
+                if self._hnsw is not None:
+                    self._hnsw.mark_deleted(row)
+
+            self._db.executemany("DELETE FROM vectors WHERE id = ?", [(vector_id,) for vector_id in ids])
+            self._db.commit()
+        return True
+
+    async def update_metadata(self, updates: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Merge fields into the metadata of stored vectors, keeping their values.
+
+        Args:
+            updates: Metadata fields to set, keyed by vector ID
+
+        Returns:
+            bool: True if operation successful
+        """
+        return await self._run(self._write_metadata, updates)
+
+    def _write_metadata(self, updates: Dict[str, Dict[str, Any]]) -> bool:
+        with self._lock:
+            rows = []
+            for vector_id, metadata in updates.items():
+                row = self._row_by_id.get(vector_id)
+                if row is None:
+                    continue
+                merged = {**self._metadata_by_row[row], **(metadata or {})}
+                self._metadata_by_row[row] = merged
+                rows.append((json.dumps(merged, ensure_ascii=False), vector_id))
+
+            self._db.executemany("UPDATE vectors SET metadata = ? WHERE id = ?", rows)
+            self._db.commit()
+        return True
+
+    async def list_vector_ids(self, prefix: str) -> List[str]:
+        """
+        List the IDs of stored vectors starting with a prefix.
+
+        Args:
+            prefix: ID prefix
+
+        Returns:
+            List[str]: Matching vector IDs
+        """
+        return await self._run(self._list_ids, prefix)
+
+    def _list_ids(self, prefix: str) -> List[str]:
+        with self._lock:
+            return [vector_id for vector_id in self._row_by_id if vector_id.startswith(prefix)]
+
+    async def fetch_vectors(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get stored vectors by ID.
+
+        Args:
+            ids: List of vector IDs
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Vectors with 'id', 'values' and 'metadata', keyed by ID
+        """
+        return await self._run(self._fetch, ids)
+
+    def _fetch(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for vector_id in ids:
+                row = self._row_by_id.get(vector_id)
+                if row is not None:
+                    result[vector_id] = {
+                        "id": vector_id,
+                        "values": self._matrix[row].tolist(),
+                        "metadata": dict(self._metadata_by_row[row])
+                    }
+            return result
+
+    async def query_vectors(
+        self,
+        query_vector: List[float],
+        top_k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+        include_values: bool = False,
+        include_metadata: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the vectors most similar to a query vector by cosine similarity.
+
+        Args:
+            query_vector: The query embedding vector
+            top_k: Number of results to return
+            filter: Optional metadata filter (Pinecone filter syntax)
+            include_values: Whether to return the stored vector values
+            include_metadata: Whether to return the stored metadata
+
+        Returns:
+            List[Dict[str, Any]]: Matches with 'id', 'score' and 'metadata', best first
+        """
+        return await self._run(self._query, query_vector, top_k, filter, include_values, include_metadata)
+
+    def _query(
+        self,
+        query_vector: List[float],
+        top_k: int,
+        filter: Optional[Dict[str, Any]],
+        include_values: bool,
+        include_metadata: bool
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            if not self._row_by_id or top_k <= 0:
+                return []
+
+            query = self._normalize(np.asarray(query_vector, dtype=np.float32))
+            rows, scores = None, None
+
+            if not filter and self._use_hnsw():
+                rows, scores = self._hnsw_query(query, top_k)
+            if rows is None:
+                rows, scores = self._exact_query(query, top_k, filter)
+
+            return [
+                {
+                    "id": self._id_by_row[row],
+                    "score": float(score),
+                    "metadata": dict(self._metadata_by_row[row]) if include_metadata else {},
+                    **({"values": self._matrix[row].tolist()} if include_values else {})
+                }
+                for row, score in zip(rows, scores)
+            ]
+
+    def _exact_query(self, query: np.ndarray, top_k: int, filter: Optional[Dict[str, Any]]):
+        """Brute-force top-k over the active (and filter-matching) rows."""
+        candidates = np.flatnonzero(self._active[:self._row_count])
+        if filter:
+            candidates = np.asarray(
+                [row for row in candidates if matches_filter(self._metadata_by_row[row], filter)],
+                dtype=np.int64
+            )
+        if len(candidates) == 0:
+            return [], []
+
+        scores = self._matrix[candidates] @ query
+        k = min(top_k, len(candidates))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return candidates[best].tolist(), scores[best].tolist()
+
+    def _use_hnsw(self) -> bool:
+        if hnswlib is None or len(self._row_by_id) < self.hnsw_threshold:
+            return False
+        if self._hnsw is None:
+            self._build_hnsw()
+        return True
+
+    def _build_hnsw(self):
+        """Build the HNSW graph over all active rows."""
+        rows = np.flatnonzero(self._active[:self._row_count])
+        self._hnsw = hnswlib.Index(space="ip", dim=self.dimension)
+        self._hnsw.init_index(max_elements=max(self._matrix.shape[0], 1), ef_construction=200, M=16)
+        self._hnsw.add_items(np.asarray(self._matrix[rows]), rows)
+        self._hnsw.set_ef(100)
+        logger.info(f"Built HNSW graph over {len(rows)} local vectors")
+
+    def _hnsw_add(self, rows: np.ndarray, values: np.ndarray):
+        if self._hnsw.get_max_elements() < self._matrix.shape[0]:
+            self._hnsw.resize_index(self._matrix.shape[0])
+        for row in rows:
+            try:
+                self._hnsw.unmark_deleted(int(row))
+            except RuntimeError:
+                pass
+        self._hnsw.add_items(values, rows)
+
+    def _hnsw_query(self, query: np.ndarray, top_k: int):
+        k = min(top_k, len(self._row_by_id))
+        labels, distances = self._hnsw.knn_query(query, k=k)
+        # hnswlib's inner-product space reports 1 - similarity
+        return labels[0].tolist(), (1.0 - distances[0]).tolist()
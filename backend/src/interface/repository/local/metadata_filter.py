@@ -0,0 +1,71 @@
+"""
+Evaluation of Pinecone-style metadata filters against local metadata.
+"""
+from typing import Any, Dict, Optional
+
+
+def _as_list(value: Any) -> list:
+    return value if isinstance(value, list) else [value]
+
+
+def _compare(value: Any, operator: str, operand: Any) -> bool:
+    """Apply one comparison operator. List-valued metadata matches if any element does."""
+    if operator == "$exists":
+        return (value is not None) == bool(operand)
+    if value is None:
+        return operator in ("$ne", "$nin")
+
+    values = _as_list(value)
+    if operator == "$eq":
+        return operand in values
+    if operator == "$ne":
+        return operand not in values
+    if operator == "$in":
+        return any(item in operand for item in values)
+    if operator == "$nin":
+        return not any(item in operand for item in values)
+    try:
+        if operator == "$gt":
+            return any(item > operand for item in values)
+        if operator == "$gte":
+            return any(item >= operand for item in values)
+        if operator == "$lt":
+            return any(item < operand for item in values)
+        if operator == "$lte":
+            return any(item <= operand for item in values)
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+def matches_filter(metadata: Dict[str, Any], filter: Optional[Dict[str, Any]]) -> bool:
+    """
+    Check whether metadata satisfies a Pinecone metadata filter.
+
+    Supports field equality shorthand, $eq, $ne, $in, $nin, $gt, $gte, $lt,
+    $lte, $exists, and the $and / $or combinators.
+
+    Args:
+        metadata: Vector metadata
+        filter: Filter expression, or None to match everything
+
+    Returns:
+        bool: True if the metadata matches
+    """
+    if not filter:
+        return True
+
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            if not all(_compare(value, operator, operand) for operator, operand in condition.items()):
+                return False
+        elif not _compare(metadata.get(key), "$eq", condition):
+            return False
+    return True
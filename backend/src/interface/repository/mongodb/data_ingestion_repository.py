@@ -1,30 +1,66 @@
-from typing import List, Optional, Dict, Any
+import logging
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple, Union
 from datetime import datetime
 from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 from src.domain.models.data_ingestion import DataIngestion, DataType
+from src.interface.repository.mongodb.index_registry import IndexRegistry
+from src.interface.repository.mongodb.substring_filter import SubstringFilter
+
+logger = logging.getLogger(__name__)
+
+# Filtered and unfiltered lists newest first, and lookups by vector ID and webpage
+IndexRegistry.register("data_ingestion", [("data_type", 1), ("created_at", -1)])
+IndexRegistry.register("data_ingestion", [("created_at", -1)])
+IndexRegistry.register("data_ingestion", [("pinecone_id", 1)])
+IndexRegistry.register("data_ingestion", [("webpage_url", 1)])
+# "Contains" filters on titles and keywords (see SubstringFilter)
+IndexRegistry.register("data_ingestion", [("title_ngrams", 1)])
+IndexRegistry.register("data_ingestion", [("keywords_ngrams", 1)])
 
 
 class DataIngestionRepository:
     """Repository for data ingestion using MongoDB."""
 
+    # Bulk lookup counters, shared by all instances; repositories are created per request
+    stats: Dict[str, int] = {"batches": 0, "documents": 0, "round_trips_saved": 0}
+    
+    # Fields filtered by substring, with n-gram token fields kept up to date on write
+    SUBSTRING_FIELDS = ("title", "keywords")
+    
+    # Token fields are only for lookups; entries are read without them
+    _WITHOUT_TOKENS = {SubstringFilter.token_field(field): 0 for field in SUBSTRING_FIELDS}
+
     def __init__(self, database):
         """Initialize the repository with a MongoDB database connection."""
         self.collection = database["data_ingestion"]
 
-    async def create(self, data_ingestion: DataIngestion) -> DataIngestion:
-        """Create a new data ingestion entry."""
+    def _to_document(self, data_ingestion: DataIngestion, now: datetime) -> Dict[str, Any]:
+        """Convert an entry to its MongoDB document, keeping its ID if one was assigned."""
         # Convert DataIngestion model to dictionary
         data_dict = data_ingestion.dict(exclude={"id"})
+        if data_ingestion.id:
+            data_dict["_id"] = ObjectId(data_ingestion.id)
         
         # Convert enum to string for MongoDB storage
         if isinstance(data_dict.get("data_type"), DataType):
             data_dict["data_type"] = data_dict["data_type"].value
         
         # Set timestamps
-        now = datetime.utcnow()
         data_dict["created_at"] = now
         data_dict["updated_at"] = now
+        data_dict.update(self._tokens(data_dict))
+        return data_dict
+    
+    def _tokens(self, data: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Get the n-gram token fields of the substring fields present in data."""
+        return SubstringFilter.tokens({field: data[field] for field in self.SUBSTRING_FIELDS if field in data})
+
+    async def create(self, data_ingestion: DataIngestion) -> DataIngestion:
+        """Create a new data ingestion entry, keeping its ID if one was assigned."""
+        data_dict = self._to_document(data_ingestion, datetime.utcnow())
         
         # Insert into MongoDB
         result = await self.collection.insert_one(data_dict)
@@ -34,6 +70,35 @@ class DataIngestionRepository:
         
         return data_ingestion
     
+    async def create_many(self, data_ingestions: List[DataIngestion]) -> Dict[int, str]:
+        """
+        Create many entries with one unordered insert_many.
+        
+        Every entry gets its ID before the write, so entries that were stored
+        are known even when others are rejected.
+        
+        Args:
+            data_ingestions: Entries to create; their id is set in place
+            
+        Returns:
+            Dict[int, str]: Error messages of the rejected entries, keyed by
+                their position in data_ingestions
+        """
+        if not data_ingestions:
+            return {}
+        now = datetime.utcnow()
+        for data_ingestion in data_ingestions:
+            data_ingestion.id = data_ingestion.id or str(ObjectId())
+            data_ingestion.created_at = data_ingestion.updated_at = now
+        try:
+            await self.collection.insert_many(
+                [self._to_document(data_ingestion, now) for data_ingestion in data_ingestions],
+                ordered=False
+            )
+        except BulkWriteError as e:
+            return {error["index"]: error.get("errmsg", "Insert failed") for error in e.details.get("writeErrors", [])}
+        return {}
+    
     async def get_by_id(self, id: str) -> Optional[DataIngestion]:
         """Get data ingestion by ID."""
         result = await self.collection.find_one({"_id": ObjectId(id)})
@@ -54,10 +119,10 @@ class DataIngestionRepository:
         if "data_type" in data and isinstance(data["data_type"], DataType):
             data["data_type"] = data["data_type"].value
         
-        # Update document in MongoDB
+        # Update document in MongoDB, with the tokens of changed substring fields
         result = await self.collection.update_one(
             {"_id": ObjectId(id)},
-            {"$set": data}
+            {"$set": {**data, **self._tokens(data)}}
         )
         
         if result.modified_count == 0:
@@ -71,6 +136,21 @@ class DataIngestionRepository:
         result = await self.collection.delete_one({"_id": ObjectId(id)})
         return result.deleted_count > 0
     
+    async def delete_many(self, ids: List[str]) -> int:
+        """
+        Delete many entries with one query.
+        
+        Args:
+            ids: Entry IDs
+            
+        Returns:
+            int: Number of entries deleted
+        """
+        if not ids:
+            return 0
+        result = await self.collection.delete_many({"_id": {"$in": [ObjectId(id) for id in ids]}})
+        return result.deleted_count
+    
     async def get_all(self, limit: int = 100, skip: int = 0) -> List[DataIngestion]:
         """Get all data ingestion entries with pagination."""
         cursor = self.collection.find().sort("created_at", -1).skip(skip).limit(limit)
@@ -92,6 +172,16 @@ class DataIngestionRepository:
         result["id"] = str(result.pop("_id"))
         return DataIngestion(**result)
     
+    async def get_by_webpage_url(self, webpage_url: str) -> Optional[DataIngestion]:
+        """Get the oldest data ingestion loaded from a webpage URL."""
+        result = await self.collection.find_one({"webpage_url": webpage_url}, sort=[("_id", 1)])
+        
+        if not result:
+            return None
+        
+        result["id"] = str(result.pop("_id"))
+        return DataIngestion(**result)
+    
     async def find_all(self, skip: int = 0, limit: int = 10, sort: Optional[Dict[str, int]] = None) -> List[DataIngestion]:
         """
         Find all data ingestion entries with pagination and optional sorting.
@@ -105,7 +195,7 @@ class DataIngestionRepository:
             List[DataIngestion]: List of data ingestion items
         """
         # Create a cursor with pagination
-        cursor = self.collection.find()
+        cursor = self.collection.find({}, self._WITHOUT_TOKENS)
         
         # Apply sorting if provided
         if sort:
@@ -142,7 +232,7 @@ class DataIngestionRepository:
             List[DataIngestion]: List of data ingestion items matching the criteria
         """
         # Create a cursor with the filter criteria
-        cursor = self.collection.find(criteria)
+        cursor = self.collection.find(criteria, self._WITHOUT_TOKENS)
         
         # Apply sorting if provided
         if sort:
@@ -165,6 +255,75 @@ class DataIngestionRepository:
         
         return result
     
+    async def _substring_matches(
+        self,
+        criteria: Dict[str, Any],
+        substring_filter: SubstringFilter,
+        sort: Optional[Dict[str, int]] = None
+    ) -> List[str]:
+        """
+        Get the IDs of the entries passing the criteria and the substring filter, in sort order.
+        
+        Candidates come from the indexed n-gram lookup, reading only the
+        filtered fields, and are checked exactly in memory.
+        """
+        cursor = self.collection.find(
+            {**criteria, **substring_filter.criteria()},
+            {field: 1 for field in substring_filter.patterns}
+        ).sort(list((sort or {"created_at": -1}).items()))
+        return [str(document["_id"]) async for document in cursor if substring_filter.matches(document)]
+    
+    async def find_page(
+        self,
+        criteria: Optional[Dict[str, Any]] = None,
+        skip: int = 0,
+        limit: int = 10,
+        sort: Optional[Dict[str, int]] = None,
+        like: Optional[Dict[str, str]] = None
+    ) -> Tuple[List[DataIngestion], int]:
+        """
+        Find one page of entries and the total number of matches in one round trip.
+        
+        A $facet stage pages and counts the same matched, sorted documents,
+        instead of a count_documents followed by a find. With substring
+        filters, the matching IDs are found first (see SubstringFilter) and
+        the page is loaded by ID.
+        
+        Args:
+            criteria: Dictionary of field names and values to filter by
+            skip: Number of documents to skip
+            limit: Maximum number of documents to return
+            sort: Dictionary of field names and sort directions (1 for ascending,
+                -1 for descending); created_at descending by default
+            like: Case-insensitive substring each field in SUBSTRING_FIELDS must contain
+            
+        Returns:
+            Tuple[List[DataIngestion], int]: Entries of the page and the total count
+        """
+        substring_filter = SubstringFilter(like or {})
+        if substring_filter:
+            ids = await self._substring_matches(criteria or {}, substring_filter, sort)
+            return await self.find_by_ids(ids[skip:skip + limit]), len(ids)
+        
+        pipeline = [
+            {"$match": criteria or {}},
+            {"$sort": dict(sort) if sort else {"created_at": -1}},
+            {"$facet": {
+                "items": [{"$skip": skip}, {"$limit": limit}, {"$project": self._WITHOUT_TOKENS}],
+                "total": [{"$count": "count"}],
+            }},
+        ]
+        result = {"items": [], "total": []}
+        async for document in self.collection.aggregate(pipeline):
+            result = document
+        
+        DataIngestionRepository.stats["round_trips_saved"] += 1
+        items = []
+        for document in result["items"]:
+            document["id"] = str(document.pop("_id"))
+            items.append(DataIngestion(**document))
+        return items, result["total"][0]["count"] if result["total"] else 0
+    
     async def find_by_id(self, id: str) -> Optional[DataIngestion]:
         """
         Find data ingestion by ID.
@@ -177,6 +336,135 @@ class DataIngestionRepository:
         """
         return await self.get_by_id(id)
     
+    async def find_by_ids(
+        self,
+        ids: List[str],
+        projection: Optional[Dict[str, int]] = None
+    ) -> List[Union[DataIngestion, Dict[str, Any]]]:
+        """
+        Find many data ingestion entries with one $in query, in the order of ids.
+        
+        Missing entries and invalid IDs are skipped; duplicate IDs are returned once.
+        
+        Args:
+            ids: MongoDB IDs, e.g. search hits in rank order
+            projection: Optional fields to read. Projected documents may lack
+                required fields, so they are returned as dicts with 'id'
+                instead of DataIngestion models.
+            
+        Returns:
+            List[Union[DataIngestion, Dict[str, Any]]]: Found entries in the order of ids
+        """
+        unique_ids = list(dict.fromkeys(id for id in ids if ObjectId.is_valid(id)))
+        if not unique_ids:
+            return []
+        
+        documents = {}
+        cursor = self.collection.find(
+            {"_id": {"$in": [ObjectId(id) for id in unique_ids]}},
+            projection if projection is not None else self._WITHOUT_TOKENS
+        )
+        async for document in cursor:
+            document["id"] = str(document.pop("_id"))
+            documents[document["id"]] = document
+        
+        DataIngestionRepository.stats["batches"] += 1
+        DataIngestionRepository.stats["documents"] += len(documents)
+        DataIngestionRepository.stats["round_trips_saved"] += len(unique_ids) - 1
+        logger.debug(f"Loaded {len(documents)}/{len(unique_ids)} entries in one query ({len(unique_ids) - 1} round trips saved)")
+        
+        if projection is not None:
+            return [documents[id] for id in unique_ids if id in documents]
+        return [DataIngestion(**documents[id]) for id in unique_ids if id in documents]
+    
+    @classmethod
+    def get_stats(cls) -> Dict[str, int]:
+        """
+        Get bulk lookup totals across all calls in this process.
+        
+        Returns:
+            Dict[str, int]: Batches, documents loaded and MongoDB round trips
+                saved compared to one find_by_id per ID
+        """
+        return dict(cls.stats)
+    
+    async def stream(self, criteria: Optional[Dict[str, Any]] = None) -> AsyncIterator[DataIngestion]:
+        """
+        Stream data ingestion entries in ID order with a single cursor.
+        
+        Args:
+            criteria: Optional filter
+            
+        Yields:
+            DataIngestion: Matching entries
+        """
+        async for document in self.collection.find(criteria or {}).sort("_id", 1):
+            document["id"] = str(document.pop("_id"))
+            yield DataIngestion(**document)
+    
+    async def iter_text_fields(self, criteria: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the text fields of data ingestion entries in ID order.
+        
+        Only the fields keyword extraction needs are read, so a full pass over
+        the collection stays cheap.
+        
+        Args:
+            criteria: Optional filter
+            
+        Yields:
+            Dict[str, Any]: Entry with 'id', 'title', 'specified_text', 'content' and 'keywords'
+        """
+        projection = {"title": 1, "specified_text": 1, "content": 1, "keywords": 1}
+        async for document in self.collection.find(criteria or {}, projection).sort("_id", 1):
+            document["id"] = str(document.pop("_id"))
+            yield document
+    
+    async def set_keywords_many(self, keywords_by_id: Dict[str, List[str]]) -> int:
+        """
+        Set the keywords of many entries with one bulk write.
+        
+        Args:
+            keywords_by_id: Keywords keyed by entry ID
+            
+        Returns:
+            int: Number of entries modified
+        """
+        if not keywords_by_id:
+            return 0
+        now = datetime.utcnow()
+        result = await self.collection.bulk_write([
+            UpdateOne(
+                {"_id": ObjectId(id)},
+                {"$set": {"keywords": keywords, **self._tokens({"keywords": keywords}), "updated_at": now}}
+            )
+            for id, keywords in keywords_by_id.items()
+        ], ordered=False)
+        return result.modified_count
+    
+    async def set_chunk_ids_many(self, chunk_ids_by_id: Dict[str, List[str]]) -> int:
+        """
+        Record the vector IDs of many entries with one bulk write.
+        
+        Vector IDs are bookkeeping, so updated_at is left alone.
+        
+        Args:
+            chunk_ids_by_id: Vector IDs in document order, keyed by entry ID
+            
+        Returns:
+            int: Number of entries modified
+        """
+        if not chunk_ids_by_id:
+            return 0
+        result = await self.collection.bulk_write([
+            UpdateOne(
+                {"_id": ObjectId(id)},
+                {"$set": {"chunk_ids": chunk_ids, "pinecone_id": chunk_ids[0] if chunk_ids else None}}
+            )
+            for id, chunk_ids in chunk_ids_by_id.items()
+        ], ordered=False)
+        return result.modified_count
+    
     async def count(self) -> int:
         """
         Count all data ingestion entries.
@@ -186,14 +474,45 @@ class DataIngestionRepository:
         """
         return await self.collection.count_documents({})
     
-    async def count_by_criteria(self, criteria: Dict[str, Any]) -> int:
+    async def count_by_criteria(self, criteria: Dict[str, Any], like: Optional[Dict[str, str]] = None) -> int:
         """
         Count data ingestion entries matching the criteria.
         
         Args:
             criteria: Dictionary of field names and values to filter by
+            like: Case-insensitive substring each field in SUBSTRING_FIELDS must contain
             
         Returns:
             int: Count of data ingestion items matching the criteria
         """
-        return await self.collection.count_documents(criteria) 
\ No newline at end of file
+        substring_filter = SubstringFilter(like or {})
+        if substring_filter:
+            return len(await self._substring_matches(criteria, substring_filter))
+        return await self.collection.count_documents(criteria)
+    
+    async def backfill_substring_tokens(self, batch_size: int = 1000) -> int:
+        """
+        Add the n-gram token fields to entries written before they existed.
+        
+        Args:
+            batch_size: Entries updated per bulk write
+            
+        Returns:
+            int: Number of entries updated
+        """
+        missing = {"$or": [
+            {SubstringFilter.token_field(field): {"$exists": False}} for field in self.SUBSTRING_FIELDS
+        ]}
+        updated = 0
+        batch = []
+        cursor = self.collection.find(missing, {field: 1 for field in self.SUBSTRING_FIELDS})
+        async for document in cursor:
+            batch.append(UpdateOne({"_id": document["_id"]}, {"$set": self._tokens(
+                {field: document.get(field) for field in self.SUBSTRING_FIELDS}
+            )}))
+            if len(batch) >= batch_size:
+                updated += (await self.collection.bulk_write(batch, ordered=False)).modified_count
+                batch = []
+        if batch:
+            updated += (await self.collection.bulk_write(batch, ordered=False)).modified_count
+        return updated 
\ No newline at end of file
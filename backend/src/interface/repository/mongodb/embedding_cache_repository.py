@@ -0,0 +1,178 @@
+import hashlib
+import logging
+import re
+import unicodedata
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bson import Binary
+from pymongo import UpdateOne
+from src.interface.repository.mongodb.index_registry import IndexRegistry
+
+logger = logging.getLogger(__name__)
+
+# Least recently used entries, for eviction
+IndexRegistry.register("embedding_cache", [("last_used_at", 1)])
+
+
+class EmbeddingCacheRepository:
+    """
+    Content-addressed embedding cache stored in MongoDB.
+
+    Entries are keyed by (model, dimensions, SHA-256 of the normalized text),
+    stored as packed float32 values, and evicted least-recently-used once the
+    collection grows past max_entries.
+    """
+
+    # Hit/miss counters are shared by all instances; repositories are created per request
+    stats: Dict[str, int] = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def __init__(self, db, max_entries: int = 100000):
+        """Initialize with MongoDB database instance"""
+        self.db = db
+        self.collection = db["embedding_cache"]
+        self.max_entries = max_entries
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """
+        Normalize text so that trivially different copies share a cache entry.
+
+        Args:
+            text: Text to normalize
+
+        Returns:
+            str: NFC-normalized text with collapsed whitespace
+        """
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text or "")).strip()
+
+    @classmethod
+    def make_key(cls, model: str, dimensions: int, text: str) -> str:
+        """
+        Build the cache key for a text.
+
+        Args:
+            model: Embedding model name
+            dimensions: Embedding dimensions
+            text: Text that is embedded
+
+        Returns:
+            str: Cache key
+        """
+        digest = hashlib.sha256(cls.normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{model}:{dimensions}:{digest}"
+
+    async def get_many(self, model: str, dimensions: int, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up cached embeddings for many texts with one query.
+
+        Args:
+            model: Embedding model name
+            dimensions: Embedding dimensions
+            texts: Texts to look up
+
+        Returns:
+            List[Optional[List[float]]]: Cached embedding per text, None on a miss
+        """
+        keys = [self.make_key(model, dimensions, text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        try:
+            cursor = self.collection.find({"_id": {"$in": list(set(keys))}}, {"embedding": 1})
+            async for document in cursor:
+                found[document["_id"]] = array("f", bytes(document["embedding"])).tolist()
+
+            if found:
+                await self.collection.update_many(
+                    {"_id": {"$in": list(found)}},
+                    {"$set": {"last_used_at": datetime.utcnow()}}
+                )
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed: {str(e)}")
+
+        results = [found.get(key) for key in keys]
+        hits = sum(1 for result in results if result is not None)
+        EmbeddingCacheRepository.stats["hits"] += hits
+        EmbeddingCacheRepository.stats["misses"] += len(results) - hits
+        return results
+
+    async def set_many(self, model: str, dimensions: int, texts: List[str], embeddings: List[List[float]]) -> int:
+        """
+        Store embeddings for many texts and evict old entries if over capacity.
+
+        Args:
+            model: Embedding model name
+            dimensions: Embedding dimensions
+            texts: Texts that were embedded
+            embeddings: Embedding per text
+
+        Returns:
+            int: Number of entries written
+        """
+        now = datetime.utcnow()
+        operations = {}
+        for text, embedding in zip(texts, embeddings):
+            if embedding is None:
+                continue
+            key = self.make_key(model, dimensions, text)
+            operations[key] = UpdateOne(
+                {"_id": key},
+                {
+                    "$set": {
+                        "model": model,
+                        "dimensions": dimensions,
+                        "embedding": Binary(array("f", embedding).tobytes()),
+                        "last_used_at": now
+                    },
+                    "$setOnInsert": {"created_at": now}
+                },
+                upsert=True
+            )
+
+        if not operations:
+            return 0
+
+        try:
+            await self.collection.bulk_write(list(operations.values()), ordered=False)
+            EmbeddingCacheRepository.stats["writes"] += len(operations)
+            await self.evict_overflow()
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {str(e)}")
+            return 0
+        return len(operations)
+
+    async def evict_overflow(self) -> int:
+        """
+        Delete the least recently used entries above max_entries.
+
+        Returns:
+            int: Number of entries evicted
+        """
+        total = await self.collection.estimated_document_count()
+        overflow = total - self.max_entries
+        if overflow <= 0:
+            return 0
+
+        cursor = self.collection.find({}, {"_id": 1}).sort("last_used_at", 1).limit(overflow)
+        stale_ids = [document["_id"] async for document in cursor]
+        if not stale_ids:
+            return 0
+
+        result = await self.collection.delete_many({"_id": {"$in": stale_ids}})
+        EmbeddingCacheRepository.stats["evictions"] += result.deleted_count
+        logger.info(f"Evicted {result.deleted_count} embedding cache entries")
+        return result.deleted_count
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """
+        Get cache hit/miss counters.
+
+        Returns:
+            Dict[str, Any]: Counters and hit ratio
+        """
+        lookups = cls.stats["hits"] + cls.stats["misses"]
+        return {
+            **cls.stats,
+            "hit_ratio": cls.stats["hits"] / lookups if lookups else 0.0
+        }
@@ -2,11 +2,22 @@ import logging
 from typing import List, Dict, Any, Optional, Tuple
 from bson import ObjectId
 from datetime import datetime
+from pymongo import UpdateOne
 
 from src.domain.models.file import FileResource, FileType
+from src.interface.repository.mongodb.index_registry import IndexRegistry
+from src.interface.repository.mongodb.substring_filter import SubstringFilter
 
 logger = logging.getLogger(__name__)
 
+# A user's files newest first
+IndexRegistry.register("file_resources", [("user_create", 1), ("created_at", -1)])
+# A user's files by partial name (see SubstringFilter)
+IndexRegistry.register("file_resources", [("user_create", 1), ("file_name_ngrams", 1)])
+
+# The file name tokens are only for lookups; resources are read without them
+_WITHOUT_TOKENS = {SubstringFilter.token_field("file_name"): 0}
+
 class FileResourceRepository:
     """Repository for file resources in MongoDB"""
     
@@ -33,6 +44,9 @@ class FileResourceRepository:
             if "_id" in file_dict and file_dict["_id"] is None:
                 del file_dict["_id"]
             
+            # Keep the file name searchable by substring
+            file_dict.update(SubstringFilter.tokens({"file_name": file_dict["file_name"]}))
+            
             # Insert into MongoDB
             result = await self.collection.insert_one(file_dict)
             
@@ -69,7 +83,8 @@ class FileResourceRepository:
             logger.error(f"Error finding file resource by ID: {str(e)}")
             raise
     
-    async def find(self, filter_params: Dict[str, Any], limit: int = 10, offset: int = 0, sort: List[Tuple[str, int]] = None) -> List[FileResource]:
+    async def find(self, filter_params: Dict[str, Any], limit: int = 10, offset: int = 0, sort: List[Tuple[str, int]] = None,
+                   like: Optional[Dict[str, str]] = None) -> List[FileResource]:
         """
         Find file resources by filter parameters
         
@@ -78,19 +93,27 @@ class FileResourceRepository:
             limit: Maximum number of results
             offset: Number of results to skip
             sort: List of (field, direction) tuples for sorting
+            like: Case-insensitive substring each field (file_name) must contain
             
         Returns:
             List of FileResource objects
         """
         try:
-            cursor = self.collection.find(filter_params)
-            
-            # Apply sorting if provided
-            if sort:
-                cursor = cursor.sort(sort)
-            
-            # Apply pagination
-            cursor = cursor.skip(offset).limit(limit)
+            substring_filter = SubstringFilter(like or {})
+            if substring_filter:
+                ids = await self._substring_matches(filter_params, substring_filter, sort)
+                cursor = self.collection.find({"_id": {"$in": ids[offset:offset + limit]}}, _WITHOUT_TOKENS)
+                if sort:
+                    cursor = cursor.sort(sort)
+            else:
+                cursor = self.collection.find(filter_params, _WITHOUT_TOKENS)
+                
+                # Apply sorting if provided
+                if sort:
+                    cursor = cursor.sort(sort)
+                
+                # Apply pagination
+                cursor = cursor.skip(offset).limit(limit)
             
             # Convert results to FileResource objects
             results = []
@@ -110,17 +133,36 @@ class FileResourceRepository:
             logger.error(f"Error finding file resources: {str(e)}")
             raise
     
-    async def count(self, filter_params: Dict[str, Any]) -> int:
+    async def _substring_matches(
+        self,
+        filter_params: Dict[str, Any],
+        substring_filter: SubstringFilter,
+        sort: List[Tuple[str, int]] = None
+    ) -> List[ObjectId]:
+        """Get the IDs of the resources passing the filters, checked exactly, in sort order."""
+        cursor = self.collection.find(
+            {**filter_params, **substring_filter.criteria()},
+            {field: 1 for field in substring_filter.patterns}
+        )
+        if sort:
+            cursor = cursor.sort(sort)
+        return [document["_id"] async for document in cursor if substring_filter.matches(document)]
+    
+    async def count(self, filter_params: Dict[str, Any], like: Optional[Dict[str, str]] = None) -> int:
         """
         Count file resources by filter parameters
         
         Args:
             filter_params: Filter parameters
+            like: Case-insensitive substring each field (file_name) must contain
             
         Returns:
             Count of matching file resources
         """
         try:
+            substring_filter = SubstringFilter(like or {})
+            if substring_filter:
+                return len(await self._substring_matches(filter_params, substring_filter))
             return await self.collection.count_documents(filter_params)
         except Exception as e:
             logger.error(f"Error counting file resources: {str(e)}")
@@ -140,6 +182,8 @@ class FileResourceRepository:
         try:
             # Add updated_at timestamp
             update_data["updated_at"] = datetime.utcnow()
+            if "file_name" in update_data:
+                update_data.update(SubstringFilter.tokens({"file_name": update_data["file_name"]}))
             
             # Update in MongoDB
             result = await self.collection.find_one_and_update(
@@ -192,4 +236,33 @@ class FileResourceRepository:
             return result.deleted_count
         except Exception as e:
             logger.error(f"Error deleting file resources by filter: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+    
+    async def backfill_substring_tokens(self, batch_size: int = 1000) -> int:
+        """
+        Add the file name tokens to resources created before they existed
+        
+        Args:
+            batch_size: Resources updated per bulk write
+            
+        Returns:
+            Number of updated file resources
+        """
+        token_field = SubstringFilter.token_field("file_name")
+        updated = 0
+        batch = []
+        try:
+            async for doc in self.collection.find({token_field: {"$exists": False}}, {"file_name": 1}):
+                batch.append(UpdateOne(
+                    {"_id": doc["_id"]},
+                    {"$set": SubstringFilter.tokens({"file_name": doc.get("file_name")})}
+                ))
+                if len(batch) >= batch_size:
+                    updated += (await self.collection.bulk_write(batch, ordered=False)).modified_count
+                    batch = []
+            if batch:
+                updated += (await self.collection.bulk_write(batch, ordered=False)).modified_count
+            return updated
+        except Exception as e:
+            logger.error(f"Error backfilling file name tokens: {str(e)}")
+            raise
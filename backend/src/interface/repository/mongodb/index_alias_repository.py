@@ -0,0 +1,76 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class IndexAliasRepository:
+    """
+    Named pointers to the vector index that serves reads and writes, stored in MongoDB.
+
+    An alias document holds the index name and embedding profile. Switching
+    an alias is a single-document update, so every reader sees either the old
+    or the new index. The last known value of each alias is kept per process,
+    because repositories are created synchronously per request; it is
+    refreshed at startup, periodically and on every switch.
+    """
+
+    DEFAULT_ALIAS = "default"
+
+    # Last known alias documents, shared by all instances
+    active: Dict[str, Dict[str, Any]] = {}
+
+    def __init__(self, db):
+        """Initialize with MongoDB database instance"""
+        self.db = db
+        self.collection = db["vector_index_aliases"]
+
+    @classmethod
+    def cached(cls, alias: str = DEFAULT_ALIAS) -> Optional[Dict[str, Any]]:
+        """
+        Get the last known target of an alias without a database round trip.
+
+        Args:
+            alias: Alias name
+
+        Returns:
+            Optional[Dict[str, Any]]: 'index_name' and 'profile', or None if unknown
+        """
+        return cls.active.get(alias)
+
+    async def get(self, alias: str = DEFAULT_ALIAS) -> Optional[Dict[str, Any]]:
+        """
+        Read the target of an alias and remember it.
+
+        Args:
+            alias: Alias name
+
+        Returns:
+            Optional[Dict[str, Any]]: 'index_name', 'profile' and 'switched_at', or None if not set
+        """
+        document = await self.collection.find_one({"_id": alias})
+        if document is None:
+            IndexAliasRepository.active.pop(alias, None)
+            return None
+        target = {key: document.get(key) for key in ("index_name", "profile", "switched_at")}
+        IndexAliasRepository.active[alias] = target
+        return target
+
+    async def switch(self, index_name: str, profile: str, alias: str = DEFAULT_ALIAS) -> Dict[str, Any]:
+        """
+        Point an alias at another index.
+
+        Args:
+            index_name: Index to serve from
+            profile: Embedding profile of the index
+            alias: Alias name
+
+        Returns:
+            Dict[str, Any]: The new target
+        """
+        target = {"index_name": index_name, "profile": profile, "switched_at": datetime.utcnow()}
+        await self.collection.update_one({"_id": alias}, {"$set": target}, upsert=True)
+        IndexAliasRepository.active[alias] = target
+        logger.info(f"Index alias '{alias}' now points to {index_name} ({profile})")
+        return target
@@ -0,0 +1,140 @@
+import logging
+from typing import Any, Dict, List, Sequence, Tuple
+
+from pymongo import IndexModel
+
+logger = logging.getLogger(__name__)
+
+# Index options compared when checking an existing index for drift
+_COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+
+class IndexSpec:
+    """One declared index of a collection."""
+
+    def __init__(self, collection: str, keys: Sequence[Tuple[str, int]], **options: Any):
+        """
+        Args:
+            collection: Collection name
+            keys: Fields and directions (1 or -1), in index order
+            **options: Index options passed to MongoDB (e.g. unique, sparse, name)
+        """
+        self.collection = collection
+        self.keys = [(field, direction) for field, direction in keys]
+        self.options = options
+        self.name = options.get("name") or "_".join(f"{field}_{direction}" for field, direction in self.keys)
+
+    def to_model(self) -> IndexModel:
+        return IndexModel(self.keys, **{**self.options, "name": self.name})
+
+    def drift(self, info: Dict[str, Any]) -> List[str]:
+        """
+        Compare the spec with an existing index of the same name.
+
+        Args:
+            info: The index's entry in Collection.index_information()
+
+        Returns:
+            List[str]: Differences, empty when the index matches
+        """
+        differences = []
+        existing_keys = [
+            (field, int(direction) if isinstance(direction, (int, float)) else direction)
+            for field, direction in info.get("key", [])
+        ]
+        if existing_keys != self.keys:
+            differences.append(f"keys {existing_keys} instead of {self.keys}")
+        for option in _COMPARED_OPTIONS:
+            if info.get(option) != self.options.get(option):
+                differences.append(f"{option}={info.get(option)!r} instead of {self.options.get(option)!r}")
+        return differences
+
+
+class IndexRegistry:
+    """
+    Indexes every MongoDB repository needs, declared next to the queries
+    that use them and reconciled once at startup.
+
+    Repositories register their indexes at import time. reconcile builds the
+    missing ones and only warns about indexes that differ from their spec
+    or are not declared, since rebuilding or dropping a live index is a
+    decision for an operator.
+    """
+
+    _specs: Dict[Tuple[str, str], IndexSpec] = {}
+
+    @classmethod
+    def register(cls, collection: str, keys: Sequence[Tuple[str, int]], **options: Any) -> IndexSpec:
+        """
+        Declare an index; declaring the same index again replaces it.
+
+        Args:
+            collection: Collection name
+            keys: Fields and directions (1 or -1), in index order
+            **options: Index options (e.g. unique, sparse, name)
+
+        Returns:
+            IndexSpec: The declared index
+        """
+        spec = IndexSpec(collection, keys, **options)
+        cls._specs[(collection, spec.name)] = spec
+        return spec
+
+    @classmethod
+    def specs(cls) -> Dict[str, List[IndexSpec]]:
+        """
+        Get the declared indexes.
+
+        Returns:
+            Dict[str, List[IndexSpec]]: Indexes keyed by collection name
+        """
+        by_collection: Dict[str, List[IndexSpec]] = {}
+        for spec in cls._specs.values():
+            by_collection.setdefault(spec.collection, []).append(spec)
+        return by_collection
+
+    @classmethod
+    async def reconcile(cls, db) -> Dict[str, List[str]]:
+        """
+        Build missing indexes and report the ones that drifted.
+
+        Args:
+            db: MongoDB database instance
+
+        Returns:
+            Dict[str, List[str]]: 'created', 'drifted' and 'undeclared' index
+                names as 'collection.name'
+        """
+        report: Dict[str, List[str]] = {"created": [], "drifted": [], "undeclared": []}
+        for collection_name, specs in cls.specs().items():
+            collection = db[collection_name]
+            existing = await collection.index_information()
+
+            missing = []
+            for spec in specs:
+                if spec.name not in existing:
+                    missing.append(spec)
+                    continue
+                differences = spec.drift(existing[spec.name])
+                if differences:
+                    report["drifted"].append(f"{collection_name}.{spec.name}")
+                    logger.warning(f"Index {collection_name}.{spec.name} differs from its declaration: {'; '.join(differences)}")
+
+            declared = {spec.name for spec in specs}
+            for name in existing:
+                if name != "_id_" and name not in declared:
+                    report["undeclared"].append(f"{collection_name}.{name}")
+                    logger.warning(f"Index {collection_name}.{name} is not declared by any repository")
+
+            if missing:
+                try:
+                    await collection.create_indexes([spec.to_model() for spec in missing])
+                    report["created"].extend(f"{collection_name}.{spec.name}" for spec in missing)
+                except Exception as e:
+                    logger.error(f"Failed to build indexes of {collection_name}: {str(e)}")
+
+        logger.info(
+            f"MongoDB indexes reconciled: {len(report['created'])} built, "
+            f"{len(report['drifted'])} drifted, {len(report['undeclared'])} undeclared"
+        )
+        return report
@@ -0,0 +1,184 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from src.interface.repository.mongodb.index_registry import IndexRegistry
+
+logger = logging.getLogger(__name__)
+
+# Claiming: runnable queued jobs by priority, and running jobs by heartbeat
+IndexRegistry.register("ingestion_jobs", [("status", 1), ("priority", -1), ("run_after", 1)])
+IndexRegistry.register("ingestion_jobs", [("status", 1), ("heartbeat_at", 1)])
+
+
+class IngestionJobRepository:
+    """
+    Queue of ingestion jobs, stored in MongoDB so every server shares it.
+
+    Workers claim the most urgent runnable job atomically with
+    find_one_and_update: queued jobs whose retry time has come, highest
+    priority first, then oldest first. A running job whose heartbeat stopped
+    (its worker crashed) can be claimed again.
+
+    Only the worker holding a running job may record its progress and
+    outcome; the writes of a worker whose job was taken over match nothing.
+    """
+
+    def __init__(self, db):
+        """Initialize with MongoDB database instance"""
+        self.db = db
+        self.collection = db["ingestion_jobs"]
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        user_id: Optional[str] = None,
+        priority: int = 0,
+        max_attempts: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Add a job to the queue.
+
+        Args:
+            kind: What the job does (e.g. 'submit', 'crawl')
+            payload: Arguments of the job, JSON-serializable
+            user_id: User who submitted the job
+            priority: Higher runs first
+            max_attempts: Runs before the job is given up
+
+        Returns:
+            Dict[str, Any]: The job document
+        """
+        now = datetime.utcnow()
+        job = {
+            "_id": str(ObjectId()),
+            "kind": kind,
+            "payload": payload,
+            "user_id": user_id,
+            "status": "queued",
+            "priority": priority,
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "run_after": now,
+            "progress": {"stage": "queued"},
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "started_at": None,
+            "finished_at": None,
+            "heartbeat_at": None,
+        }
+        await self.collection.insert_one(job)
+        return job
+
+    async def claim(self, worker_id: str, stale_after: float) -> Optional[Dict[str, Any]]:
+        """
+        Take the most urgent runnable job.
+
+        Args:
+            worker_id: Worker taking the job
+            stale_after: Seconds without heartbeat after which a running job is taken over
+
+        Returns:
+            Optional[Dict[str, Any]]: The claimed job, or None if nothing is runnable
+        """
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {"$or": [
+                {"status": "queued", "run_after": {"$lte": now}},
+                {"status": "running", "heartbeat_at": {"$lt": now - timedelta(seconds=stale_after)}},
+            ]},
+            {
+                "$set": {"status": "running", "worker_id": worker_id, "started_at": now, "heartbeat_at": now, "updated_at": now},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("priority", -1), ("run_after", 1), ("_id", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _update_owned(self, job_id: str, worker_id: str, update: Dict[str, Any]) -> bool:
+        """Update a job only while worker_id is running it."""
+        result = await self.collection.update_one(
+            {"_id": job_id, "worker_id": worker_id, "status": "running"},
+            {"$set": update}
+        )
+        return result.matched_count > 0
+
+    async def heartbeat(self, job_id: str, worker_id: str, progress: Dict[str, Any]) -> bool:
+        """
+        Record a running job's progress and that its worker is alive.
+
+        Args:
+            job_id: Job ID
+            worker_id: Worker running the job
+            progress: Current progress
+
+        Returns:
+            bool: Whether the worker still holds the job
+        """
+        now = datetime.utcnow()
+        return await self._update_owned(job_id, worker_id, {"progress": progress, "heartbeat_at": now, "updated_at": now})
+
+    async def complete(self, job_id: str, worker_id: str, result: Dict[str, Any], progress: Dict[str, Any]) -> bool:
+        """
+        Mark a job done.
+
+        Args:
+            job_id: Job ID
+            worker_id: Worker running the job
+            result: What the job produced
+            progress: Final progress
+
+        Returns:
+            bool: Whether the worker still held the job
+        """
+        now = datetime.utcnow()
+        return await self._update_owned(job_id, worker_id, {
+            "status": "completed", "result": result, "progress": progress, "error": None,
+            "finished_at": now, "updated_at": now,
+        })
+
+    async def fail(
+        self,
+        job_id: str,
+        worker_id: str,
+        error: str,
+        progress: Dict[str, Any],
+        retry_at: Optional[datetime] = None
+    ) -> bool:
+        """
+        Record a failed run, queueing the job again or giving it up.
+
+        Args:
+            job_id: Job ID
+            worker_id: Worker running the job
+            error: Error message
+            progress: Progress when the run failed
+            retry_at: When to run again; None gives the job up
+
+        Returns:
+            bool: Whether the worker still held the job
+        """
+        now = datetime.utcnow()
+        update = {"error": error, "progress": progress, "updated_at": now}
+        if retry_at:
+            update.update({"status": "queued", "run_after": retry_at})
+        else:
+            update.update({"status": "failed", "finished_at": now})
+        return await self._update_owned(job_id, worker_id, update)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Optional[Dict[str, Any]]: The job document, or None
+        """
+        return await self.collection.find_one({"_id": job_id})
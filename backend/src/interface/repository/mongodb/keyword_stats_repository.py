@@ -0,0 +1,113 @@
+import logging
+from typing import AsyncIterator, Dict, Iterable, List, Set, Tuple
+
+from pymongo import UpdateOne
+from src.interface.repository.mongodb.index_registry import IndexRegistry
+
+logger = logging.getLogger(__name__)
+
+# Terms no longer used by any item, removed after corpus updates
+IndexRegistry.register("keyword_stats", [("df", 1)])
+
+
+class KeywordStatsRepository:
+    """
+    Corpus statistics for keyword extraction, stored in MongoDB.
+
+    Holds one document per keyword candidate with the number of data ingestion
+    items containing it ('df'), plus a counter document with the number of
+    items. Kept up to date as items are created, updated and deleted, and
+    rebuilt from the data_ingestion collection by scripts/extract_keywords.py.
+    """
+
+    # _id of the document holding the item count; never a keyword candidate
+    COUNT_ID = "__documents__"
+
+    def __init__(self, db):
+        """Initialize with MongoDB database instance"""
+        self.db = db
+        self.collection = db["keyword_stats"]
+
+    async def get_frequencies(self, terms: Iterable[str]) -> Tuple[int, Dict[str, int]]:
+        """
+        Look up document frequencies with one query.
+
+        Args:
+            terms: Keyword candidates
+
+        Returns:
+            Tuple[int, Dict[str, int]]: Number of items, and the number of items
+                containing each known term
+        """
+        ids = list(set(terms) | {self.COUNT_ID})
+        frequencies: Dict[str, int] = {}
+        async for document in self.collection.find({"_id": {"$in": ids}}, {"df": 1}):
+            frequencies[document["_id"]] = document.get("df", 0)
+        return frequencies.pop(self.COUNT_ID, 0), frequencies
+
+    async def _increment(self, term_sets: List[Set[str]], sign: int) -> int:
+        counts: Dict[str, int] = {}
+        for terms in term_sets:
+            for term in terms:
+                counts[term] = counts.get(term, 0) + sign
+        counts[self.COUNT_ID] = sign * len(term_sets)
+
+        operations = [
+            UpdateOne({"_id": term}, {"$inc": {"df": count}}, upsert=True)
+            for term, count in counts.items()
+        ]
+        await self.collection.bulk_write(operations, ordered=False)
+        if sign < 0:
+            await self.collection.delete_many({"df": {"$lte": 0}, "_id": {"$ne": self.COUNT_ID}})
+        return len(term_sets)
+
+    async def add_documents(self, term_sets: List[Set[str]]) -> int:
+        """
+        Count new items in the corpus.
+
+        Args:
+            term_sets: Distinct keyword candidates of each item
+
+        Returns:
+            int: Number of items added
+        """
+        if not term_sets:
+            return 0
+        return await self._increment(term_sets, 1)
+
+    async def remove_documents(self, term_sets: List[Set[str]]) -> int:
+        """
+        Remove items from the corpus counts.
+
+        Args:
+            term_sets: Distinct keyword candidates of each item, as they were added
+
+        Returns:
+            int: Number of items removed
+        """
+        if not term_sets:
+            return 0
+        return await self._increment(term_sets, -1)
+
+    async def rebuild(self, term_sets: AsyncIterator[Set[str]], batch_size: int = 1000) -> int:
+        """
+        Replace the statistics with counts over a full pass of the corpus.
+
+        Args:
+            term_sets: Distinct keyword candidates of every item
+            batch_size: Items counted per bulk write
+
+        Returns:
+            int: Number of items counted
+        """
+        await self.collection.delete_many({})
+        total = 0
+        batch: List[Set[str]] = []
+        async for terms in term_sets:
+            batch.append(terms)
+            if len(batch) >= batch_size:
+                total += await self.add_documents(batch)
+                batch = []
+        total += await self.add_documents(batch)
+        logger.info(f"Rebuilt keyword statistics over {total} items")
+        return total
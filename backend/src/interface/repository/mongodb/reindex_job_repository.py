@@ -0,0 +1,147 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from src.interface.repository.mongodb.index_registry import IndexRegistry
+
+logger = logging.getLogger(__name__)
+
+# The unfinished job of a target index, and the items of a job
+IndexRegistry.register("reindex_jobs", [("index_name", 1), ("profile", 1), ("created_at", -1)])
+IndexRegistry.register("reindex_job_items", [("job_id", 1)])
+
+
+class ReindexJobRepository:
+    """
+    Progress of reindex jobs, stored in MongoDB so a crashed job can resume.
+
+    A job document holds the checkpoint (the highest data ingestion _id below
+    which every item is done), counters and the IDs of items that failed. The
+    vector IDs each item got in the target index are kept in a separate
+    collection, one document per item, because they are only needed again
+    when the job switches reads to the new index.
+    """
+
+    def __init__(self, db):
+        """Initialize with MongoDB database instance"""
+        self.db = db
+        self.collection = db["reindex_jobs"]
+        self.items_collection = db["reindex_job_items"]
+
+    async def create(self, index_name: str, profile: str, total: int) -> Dict[str, Any]:
+        """
+        Start a job.
+
+        Args:
+            index_name: Target index
+            profile: Embedding profile of the target index
+            total: Number of items to copy
+
+        Returns:
+            Dict[str, Any]: The job document
+        """
+        now = datetime.utcnow()
+        job = {
+            "_id": str(ObjectId()),
+            "index_name": index_name,
+            "profile": profile,
+            "status": "running",
+            "checkpoint_id": None,
+            "processed": 0,
+            "failed_ids": [],
+            "total": total,
+            "created_at": now,
+            "updated_at": now,
+        }
+        await self.collection.insert_one(job)
+        return job
+
+    async def find_unfinished(self, index_name: str, profile: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest job into an index that did not complete.
+
+        Args:
+            index_name: Target index
+            profile: Embedding profile of the target index
+
+        Returns:
+            Optional[Dict[str, Any]]: The job document, or None
+        """
+        return await self.collection.find_one(
+            {"index_name": index_name, "profile": profile, "status": {"$ne": "completed"}},
+            sort=[("created_at", -1)]
+        )
+
+    async def save_chunk_ids(self, job_id: str, chunk_ids: Dict[str, List[str]]):
+        """
+        Record the vector IDs items got in a job's target index.
+
+        Args:
+            job_id: Job ID
+            chunk_ids: Vector IDs keyed by item ID
+        """
+        if not chunk_ids:
+            return
+        await self.items_collection.bulk_write([
+            UpdateOne(
+                {"_id": f"{job_id}:{item_id}"},
+                {"$set": {"job_id": job_id, "item_id": item_id, "chunk_ids": ids}},
+                upsert=True
+            )
+            for item_id, ids in chunk_ids.items()
+        ], ordered=False)
+
+    async def checkpoint(self, job_id: str, checkpoint_id: Optional[str], processed: int, failed_ids: List[str]):
+        """
+        Record a job's progress.
+
+        Args:
+            job_id: Job ID
+            checkpoint_id: Highest item ID below which every item is done
+            processed: Number of items done
+            failed_ids: IDs of items that failed so far
+        """
+        await self.collection.update_one(
+            {"_id": job_id},
+            {"$set": {
+                "checkpoint_id": checkpoint_id,
+                "processed": processed,
+                "failed_ids": failed_ids,
+                "updated_at": datetime.utcnow(),
+            }}
+        )
+
+    async def load_chunk_ids(self, job_id: str) -> Dict[str, List[str]]:
+        """
+        Get the vector IDs in the target index of every item a job has done.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Dict[str, List[str]]: Vector IDs keyed by item ID
+        """
+        chunk_ids = {}
+        async for document in self.items_collection.find({"job_id": job_id}, {"item_id": 1, "chunk_ids": 1}):
+            chunk_ids[document["item_id"]] = document["chunk_ids"]
+        return chunk_ids
+
+    async def finish(self, job_id: str, status: str = "completed", failed_ids: Optional[List[str]] = None):
+        """
+        Close a job; completed jobs drop their per-item records.
+
+        Jobs with another status ('built', 'interrupted') can still be resumed.
+
+        Args:
+            job_id: Job ID
+            status: Final status
+            failed_ids: IDs of items that could not be copied
+        """
+        update: Dict[str, Any] = {"status": status, "updated_at": datetime.utcnow()}
+        if failed_ids is not None:
+            update["failed_ids"] = failed_ids
+        await self.collection.update_one({"_id": job_id}, {"$set": update})
+        if status == "completed":
+            await self.items_collection.delete_many({"job_id": job_id})
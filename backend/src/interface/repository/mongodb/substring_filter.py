@@ -0,0 +1,84 @@
+import re
+from typing import Any, Dict, List, Optional
+
+from src.shared.text.lexical import normalize
+from src.shared.text.ngrams import ngram_tokens, ngrams
+
+
+class SubstringFilter:
+    """
+    Case-insensitive "contains" filters on fields that have an n-gram token field.
+
+    criteria() turns each pattern into an indexed $all lookup on the field's
+    tokens (see token_field); patterns too short to have an n-gram fall back
+    to an escaped regex. Token lookups can match texts holding all n-grams
+    in another order, so matches() makes the final exact check on the
+    candidates.
+    """
+
+    TOKEN_SUFFIX = "_ngrams"
+
+    def __init__(self, patterns: Dict[str, Optional[str]]):
+        """
+        Args:
+            patterns: Substring each field must contain; empty patterns are ignored
+        """
+        self.patterns = {field: pattern for field, pattern in patterns.items() if pattern}
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    @classmethod
+    def token_field(cls, field: str) -> str:
+        """Name of the field holding the n-gram tokens of field."""
+        return f"{field}{cls.TOKEN_SUFFIX}"
+
+    @classmethod
+    def tokens(cls, fields: Dict[str, Any]) -> Dict[str, List[str]]:
+        """
+        Get the token fields to store with a document.
+
+        Args:
+            fields: Indexed fields and their values (a string or a list of strings)
+
+        Returns:
+            Dict[str, List[str]]: Token lists keyed by token field name
+        """
+        return {
+            cls.token_field(field): ngram_tokens(value if isinstance(value, list) else [value])
+            for field, value in fields.items()
+        }
+
+    def criteria(self) -> Dict[str, Any]:
+        """
+        Get the MongoDB criteria narrowing documents to candidates.
+
+        Returns:
+            Dict[str, Any]: Criteria to combine with the other filters
+        """
+        criteria = {}
+        for field, pattern in self.patterns.items():
+            grams = ngrams(pattern)
+            if grams:
+                criteria[self.token_field(field)] = {"$all": grams}
+            else:
+                criteria[field] = {"$regex": re.escape(pattern), "$options": "i"}
+        return criteria
+
+    def matches(self, document: Dict[str, Any]) -> bool:
+        """
+        Check a candidate exactly.
+
+        Args:
+            document: Document with the filtered fields
+
+        Returns:
+            bool: Whether every field contains its pattern (any element, for lists)
+        """
+        for field, pattern in self.patterns.items():
+            pattern = normalize(pattern)
+            value = document.get(field)
+            values = value if isinstance(value, list) else [value]
+            if not any(pattern in normalize(str(item)) for item in values if item is not None):
+                return False
+        return True
@@ -10,9 +10,14 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from src.domain.repository.thread_repository import ThreadRepository
 from src.domain.models.thread import ThreadModel
 from src.infrastructure.database.mongodb import MongoDB
+from src.interface.repository.mongodb.index_registry import IndexRegistry
 
 logger = logging.getLogger(__name__)
 
+# Thread lookups by ID, and a user's active threads newest first
+IndexRegistry.register("threads", [("thread_id", 1)])
+IndexRegistry.register("threads", [("user_id", 1), ("is_archived", 1), ("updated_at", -1)])
+
 class MongoDBThreadRepository(ThreadRepository):
     """MongoDB implementation of the ThreadRepository."""
     
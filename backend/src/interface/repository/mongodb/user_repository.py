@@ -8,9 +8,14 @@ import logging
 from src.domain.models.user import User
 from src.domain.repository.user_repository import UserRepository
 from src.infrastructure.database.mongodb import MongoDB
+from src.interface.repository.mongodb.index_registry import IndexRegistry
 
 logger = logging.getLogger(__name__)
 
+# Login by email, and token refresh by a stored refresh token (multikey)
+IndexRegistry.register("users", [("email", 1)])
+IndexRegistry.register("users", [("refresh_tokens", 1)])
+
 
 class MongoDBUserRepository(UserRepository):
     """MongoDB implementation of UserRepository."""
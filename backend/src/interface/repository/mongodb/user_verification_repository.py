@@ -7,9 +7,15 @@ from bson import ObjectId
 from src.domain.models.user_verification import UserVerification
 from src.domain.repository.user_verification_repository import UserVerificationRepository
 import logging
+from src.interface.repository.mongodb.index_registry import IndexRegistry
 
 logger = logging.getLogger(__name__)
 
+# Verification lookups by email and code, and the expiry sweep
+IndexRegistry.register("user_verifications", [("email", 1)])
+IndexRegistry.register("user_verifications", [("verification_code", 1)])
+IndexRegistry.register("user_verifications", [("expires_at", 1)])
+
 class MongoDBUserVerificationRepository(UserVerificationRepository):
     """MongoDB implementation of UserVerificationRepository."""
 
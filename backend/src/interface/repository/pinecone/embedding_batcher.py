@@ -0,0 +1,138 @@
+"""
+Token-aware batching of embedding requests and bulk vector upserts.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.shared.text import count_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+# Hard limits of the OpenAI embeddings endpoint
+MAX_INPUT_TOKENS = 8191
+MAX_INPUTS_PER_REQUEST = 2048
+
+
+class EmbeddingBatcher:
+    """
+    Groups texts into embedding requests sized by token count and runs the
+    requests concurrently under a limit.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], Awaitable[List[List[float]]]],
+        max_batch_tokens: int = 100000,
+        max_batch_size: int = 256,
+        max_concurrency: int = 4
+    ):
+        """
+        Args:
+            embed_batch: Coroutine that embeds one batch of texts, preserving order
+            max_batch_tokens: Maximum total tokens per embedding request
+            max_batch_size: Maximum number of inputs per embedding request
+            max_concurrency: Maximum number of embedding requests in flight
+        """
+        self.embed_batch = embed_batch
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = min(max_batch_size, MAX_INPUTS_PER_REQUEST)
+        self.max_concurrency = max(1, max_concurrency)
+        self.logger = logging.getLogger(__name__)
+
+    def plan_batches(self, texts: List[str]) -> List[List[int]]:
+        """
+        Split text positions into batches that respect the token and size limits.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List[List[int]]: Batches of indexes into texts, in input order
+        """
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+
+        for i, text in enumerate(texts):
+            tokens = min(count_tokens(text), MAX_INPUT_TOKENS)
+            if current and (
+                current_tokens + tokens > self.max_batch_tokens
+                or len(current) >= self.max_batch_size
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(i)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+        return batches
+
+    async def embed(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Embed all texts using batched, concurrency-limited requests.
+
+        A failed batch is logged and its positions are returned as None so that
+        callers can skip those items, as the per-chunk loop used to.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List[Optional[List[float]]]: One embedding (or None) per input text
+        """
+        if not texts:
+            return []
+
+        # Inputs above the model limit would fail the whole request
+        texts = [truncate_to_tokens(text, MAX_INPUT_TOKENS) for text in texts]
+        batches = self.plan_batches(texts)
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(batch_number: int, positions: List[int]):
+            async with semaphore:
+                try:
+                    embeddings = await self.embed_batch([texts[i] for i in positions])
+                    for position, embedding in zip(positions, embeddings):
+                        results[position] = embedding
+                except Exception as e:
+                    self.logger.error(f"Embedding batch {batch_number + 1}/{len(batches)} failed: {str(e)}")
+
+        self.logger.info(f"Embedding {len(texts)} texts in {len(batches)} batch(es)")
+        await asyncio.gather(*(run(n, positions) for n, positions in enumerate(batches)))
+        return results
+
+
+async def upsert_in_batches(
+    upsert_batch: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+    vectors: List[Dict[str, Any]],
+    batch_size: int = 100,
+    max_concurrency: int = 4
+) -> int:
+    """
+    Upsert vectors in bulk requests of batch_size, concurrently under a limit.
+
+    Args:
+        upsert_batch: Coroutine that upserts one list of vectors
+        vectors: Vectors with 'id', 'values' and 'metadata'
+        batch_size: Number of vectors per upsert request
+        max_concurrency: Maximum number of upsert requests in flight
+
+    Returns:
+        int: Number of vectors upserted
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(batch: List[Dict[str, Any]]) -> int:
+        async with semaphore:
+            await upsert_batch(batch)
+            return len(batch)
+
+    counts = await asyncio.gather(*(
+        run(vectors[start:start + batch_size])
+        for start in range(0, len(vectors), batch_size)
+    ))
+    return sum(counts)
@@ -0,0 +1,87 @@
+import math
+from typing import Any, Dict, List, Optional
+
+from src.config.settings import get_settings
+
+
+class EmbeddingProfile:
+    """
+    A named embedding configuration: model, output dimensions and normalization.
+
+    text-embedding-3 models can return shortened vectors (e.g. 512 instead
+    of 1536 dimensions), which shrinks the index, query payloads and cost.
+    Vectors of different profiles are not comparable, so every index holds
+    vectors of exactly one profile, and each vector records its profile name
+    in its metadata.
+    """
+
+    # Metadata field recording the profile of a vector
+    METADATA_FIELD = "embedding_profile"
+
+    def __init__(self, name: str, model: str, dimensions: int, normalize: bool = False):
+        """
+        Args:
+            name: Profile name, as configured in EMBEDDING_PROFILES
+            model: OpenAI embedding model
+            dimensions: Output dimensions
+            normalize: Whether vectors are scaled to unit length after generation
+        """
+        if dimensions <= 0:
+            raise ValueError("Embedding dimensions must be positive")
+        self.name = name
+        self.model = model
+        self.dimensions = dimensions
+        self.normalize = normalize
+
+    @classmethod
+    def from_settings(cls, name: Optional[str] = None, profiles: Optional[Dict[str, Dict[str, Any]]] = None) -> "EmbeddingProfile":
+        """
+        Get a configured profile.
+
+        Args:
+            name: Profile name; EMBEDDING_PROFILE when not given
+            profiles: Profile definitions; EMBEDDING_PROFILES when not given
+
+        Returns:
+            EmbeddingProfile: The profile
+
+        Raises:
+            ValueError: If the profile is not configured
+        """
+        if name is None or profiles is None:
+            settings = get_settings()
+            name = name or settings.EMBEDDING_PROFILE
+            profiles = profiles if profiles is not None else settings.EMBEDDING_PROFILES
+        if name not in profiles:
+            raise ValueError(f"Unknown embedding profile: {name}")
+        return cls(name=name, **profiles[name])
+
+    def request_kwargs(self) -> Dict[str, Any]:
+        """
+        Get the arguments of an OpenAI embeddings request for this profile.
+
+        Returns:
+            Dict[str, Any]: 'model', and 'dimensions' for models that can shorten vectors
+        """
+        kwargs: Dict[str, Any] = {"model": self.model}
+        if self.model.startswith("text-embedding-3"):
+            kwargs["dimensions"] = self.dimensions
+        return kwargs
+
+    def prepare(self, embedding: List[float]) -> List[float]:
+        """
+        Apply the profile's post-processing to a generated embedding.
+
+        Args:
+            embedding: Embedding returned by the model
+
+        Returns:
+            List[float]: Embedding to store or query with
+        """
+        if not self.normalize:
+            return embedding
+        norm = math.sqrt(sum(value * value for value in embedding))
+        return [value / norm for value in embedding] if norm else embedding
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "model": self.model, "dimensions": self.dimensions, "normalize": self.normalize}
@@ -0,0 +1,343 @@
+"""
+Staged document ingestion: extraction -> chunking -> embedding -> upsert,
+connected by bounded queues.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a queue's input
+_DONE = object()
+
+
+class StageMetrics:
+    """Item counts and timings of one pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def start(self):
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+
+    def record(self, items: int, seconds: float):
+        """Count items produced by the stage and the time spent producing them."""
+        self.items += items
+        self.busy_seconds += seconds
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the stage metrics.
+
+        Returns:
+            Dict[str, Any]: Items, busy and elapsed seconds, and throughput in
+                items per elapsed second
+        """
+        elapsed = self.elapsed_seconds
+        return {
+            "items": self.items,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "elapsed_seconds": round(elapsed, 4),
+            "items_per_second": round(self.items / elapsed, 2) if elapsed else 0.0
+        }
+
+
+class IngestionProgress:
+    """
+    Live progress of one ingestion job, read while the job runs.
+
+    Callers mark coarse steps (keywords, chunking, saving) with set_stage;
+    pipelines count chunks as they are produced and processed, and attach
+    their stage metrics.
+    """
+
+    def __init__(self):
+        self.stage = "queued"
+        self.chunks_total = 0
+        self.chunks_done = 0
+        self.counts: Dict[str, int] = {}
+        self.stages: Dict[str, StageMetrics] = {}
+        self.started_at = time.perf_counter()
+
+    def set_stage(self, name: str):
+        self.stage = name
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the progress.
+
+        Returns:
+            Dict[str, Any]: Current 'stage', 'chunks_done' out of 'chunks_total'
+                (known once chunking finished), 'chunks_per_second', other
+                'counts' and per-stage metrics under 'stages'
+        """
+        elapsed = time.perf_counter() - self.started_at
+        return {
+            "stage": self.stage,
+            "chunks_done": self.chunks_done,
+            "chunks_total": self.chunks_total,
+            "chunks_per_second": round(self.chunks_done / elapsed, 2) if elapsed else 0.0,
+            "counts": dict(self.counts),
+            "stages": {name: stage.to_dict() for name, stage in self.stages.items()}
+        }
+
+
+class IngestionPipeline:
+    """
+    Streams documents through extraction, chunking, embedding and upsert.
+
+    Stages run concurrently and hand work over through bounded queues, so
+    memory use depends on the queue sizes rather than the document size, and
+    early chunks are embedded while later pages are still being parsed.
+
+    Chunks whose ID is among previous_ids are not embedded again (see
+    PineconeRepository.sync_chunks); previous chunks that were not produced
+    again are deleted once the source is exhausted.
+    """
+
+    # Totals across runs, per stage
+    stats: Dict[str, Dict[str, float]] = {}
+
+    def __init__(
+        self,
+        repository,
+        queue_size: int = 8,
+        embed_batch_size: int = 64,
+        upsert_batch_size: int = 100,
+        embed_workers: int = 4
+    ):
+        """
+        Args:
+            repository: PineconeRepository used to embed, upsert, update and delete
+            queue_size: Capacity of each queue between stages
+            embed_batch_size: Chunks per embedding request
+            upsert_batch_size: Vectors per upsert request
+            embed_workers: Embedding requests in flight
+        """
+        self.repository = repository
+        self.queue_size = max(1, queue_size)
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.upsert_batch_size = max(1, upsert_batch_size)
+        self.embed_workers = max(1, embed_workers)
+
+    async def run(
+        self,
+        documents: AsyncIterator[Any],
+        split: Callable[[Any], List[Any]],
+        build_record: Callable[[Any, int, Dict[str, int]], Dict[str, Any]],
+        previous_ids: Optional[List[str]] = None,
+        refresh_metadata: bool = False,
+        metrics: Optional[List[StageMetrics]] = None,
+        progress: Optional[IngestionProgress] = None
+    ) -> Dict[str, Any]:
+        """
+        Ingest a stream of documents.
+
+        Args:
+            documents: Async iterator of LangChain documents (e.g. one per page)
+            split: Blocking function splitting one document into chunks
+            build_record: Builds the record of a chunk from (chunk, index, seen IDs)
+            previous_ids: Vector IDs the source had before, in document order
+            refresh_metadata: Whether the parent metadata changed for all chunks
+            metrics: Metrics of stages run before the pipeline (e.g. the download)
+            progress: Progress of the job the run belongs to, updated as chunks pass
+
+        Returns:
+            Dict[str, Any]: 'ids' of the stored chunks in document order, the
+                'embedded', 'updated', 'deleted' and 'failed' counts, and
+                per-stage 'metrics'
+        """
+        previous_positions = {vector_id: i for i, vector_id in enumerate(previous_ids or [])}
+        stages = {name: StageMetrics(name) for name in ("extract", "chunk", "embed", "upsert")}
+        if progress is None:
+            progress = IngestionProgress()
+        progress.stages.update({stage.name: stage for stage in [*(metrics or []), *stages.values()]})
+        page_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        record_queue: asyncio.Queue = asyncio.Queue(self.queue_size * self.embed_batch_size)
+        vector_queue: asyncio.Queue = asyncio.Queue(self.queue_size * self.upsert_batch_size)
+
+        ids: List[str] = []
+        failed_ids = set()
+        new_ids: List[str] = []
+        counts = {"embedded": 0, "updated": 0}
+
+        async def extract():
+            stage = stages["extract"]
+            stage.start()
+            started = time.perf_counter()
+            async for document in documents:
+                stage.record(1, time.perf_counter() - started)
+                await page_queue.put(document)
+                started = time.perf_counter()
+            await page_queue.put(_DONE)
+            stage.finish()
+
+        async def chunk():
+            stage = stages["chunk"]
+            seen: Dict[str, int] = {}
+            while (document := await page_queue.get()) is not _DONE:
+                stage.start()
+                started = time.perf_counter()
+                chunks = await self.repository._run_blocking(split, document)
+                records = []
+                for item in chunks:
+                    record = build_record(item, len(ids), seen)
+                    record["index"] = len(ids)
+                    ids.append(record["id"])
+                    records.append(record)
+                stage.record(len(records), time.perf_counter() - started)
+                progress.chunks_total += len(records)
+                for record in records:
+                    await record_queue.put(record)
+            for _ in range(self.embed_workers):
+                await record_queue.put(_DONE)
+            stage.finish()
+
+        async def embed():
+            stage = stages["embed"]
+            done = False
+            while not done:
+                batch = []
+                while len(batch) < self.embed_batch_size:
+                    record = await record_queue.get()
+                    if record is _DONE:
+                        done = True
+                        break
+                    batch.append(record)
+                if not batch:
+                    break
+                stage.start()
+                started = time.perf_counter()
+
+                # Stored chunks only need their metadata refreshed when they moved
+                kept = [record for record in batch if record["id"] in previous_positions]
+                for record in kept:
+                    if refresh_metadata or previous_positions[record["id"]] != record["index"]:
+                        await vector_queue.put({"update": record})
+
+                fresh = [record for record in batch if record["id"] not in previous_positions]
+                embeddings = await self.repository.generate_embeddings_batch(
+                    [record["text"] for record in fresh]
+                ) if fresh else []
+                for record, embedding in zip(fresh, embeddings):
+                    if embedding is None:
+                        logger.error(f"Error processing chunk {record['id']}: embedding failed")
+                        failed_ids.add(record["id"])
+                        continue
+                    await vector_queue.put({
+                        "vector": {"id": record["id"], "values": embedding, "metadata": record["metadata"]}
+                    })
+                counts["embedded"] += len(fresh) - sum(1 for record in fresh if record["id"] in failed_ids)
+                progress.chunks_done += len(batch)
+                stage.record(len(fresh), time.perf_counter() - started)
+            await vector_queue.put(_DONE)
+
+        async def upsert():
+            stage = stages["upsert"]
+            vectors: List[Dict[str, Any]] = []
+            updates: Dict[str, Dict[str, Any]] = {}
+            finished_workers = 0
+
+            async def flush():
+                started = time.perf_counter()
+                if vectors:
+                    await self.repository.upsert_vectors(list(vectors))
+                    new_ids.extend(vector["id"] for vector in vectors)
+                    stage.record(len(vectors), time.perf_counter() - started)
+                    vectors.clear()
+                if updates:
+                    await self.repository.update_metadata(dict(updates))
+                    counts["updated"] += len(updates)
+                    updates.clear()
+
+            while finished_workers < self.embed_workers:
+                item = await vector_queue.get()
+                if item is _DONE:
+                    finished_workers += 1
+                    continue
+                stage.start()
+                if "vector" in item:
+                    vectors.append(item["vector"])
+                else:
+                    updates[item["update"]["id"]] = item["update"]["metadata"]
+                if len(vectors) >= self.upsert_batch_size or len(updates) >= self.upsert_batch_size:
+                    await flush()
+            await flush()
+            stage.finish()
+
+        tasks = [
+            asyncio.create_task(extract()),
+            asyncio.create_task(chunk()),
+            *[asyncio.create_task(embed()) for _ in range(self.embed_workers)],
+            asyncio.create_task(upsert())
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Do not leave half an ingestion behind
+            if new_ids:
+                await self.repository.delete_vectors(new_ids)
+            raise
+        stages["embed"].finish()
+
+        current_ids = set(ids)
+        orphan_ids = [vector_id for vector_id in previous_ids or [] if vector_id not in current_ids]
+        if orphan_ids:
+            await self.repository.delete_vectors(orphan_ids)
+
+        stage_metrics = {stage.name: stage.to_dict() for stage in [*(metrics or []), *stages.values()]}
+        self._record_stats(stage_metrics)
+        logger.info(f"Ingestion pipeline finished: {stage_metrics}")
+        return {
+            "ids": [vector_id for vector_id in ids if vector_id not in failed_ids],
+            "embedded": counts["embedded"],
+            "updated": counts["updated"],
+            "deleted": len(orphan_ids),
+            "failed": len(failed_ids),
+            "metrics": stage_metrics
+        }
+
+    @classmethod
+    def _record_stats(cls, stage_metrics: Dict[str, Dict[str, Any]]):
+        for name, values in stage_metrics.items():
+            totals = cls.stats.setdefault(name, {"runs": 0, "items": 0, "busy_seconds": 0.0})
+            totals["runs"] += 1
+            totals["items"] += values["items"]
+            totals["busy_seconds"] += values["busy_seconds"]
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-stage totals across all runs in this process.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Runs, items, busy seconds and items per
+                busy second, per stage
+        """
+        return {
+            name: {
+                **totals,
+                "items_per_busy_second": round(totals["items"] / totals["busy_seconds"], 2)
+                if totals["busy_seconds"] else 0.0
+            }
+            for name, totals in cls.stats.items()
+        }
@@ -0,0 +1,127 @@
+import re
+from typing import Any, Dict, List, Optional
+
+from src.config.settings import get_settings
+from src.domain.models.data_ingestion import DataType
+
+
+class NamespacePolicy:
+    """
+    Decides which Pinecone namespace a vector lives in and which namespaces a query reads.
+
+    Policies:
+        none: every vector in the default namespace
+        data_type: one namespace per DataType ("legal_text", "faq", ...)
+        user: one namespace per owner ("user-<user_id>"), "shared" for items without one
+
+    A query whose filter pins the partitioning field reads only the matching
+    namespaces; other queries read all of them. Changing the policy of an
+    existing index needs a reindex (scripts/reindex.py).
+    """
+
+    POLICIES = ("none", "data_type", "user")
+
+    DEFAULT_NAMESPACE = ""
+    SHARED_NAMESPACE = "shared"
+
+    def __init__(self, policy: str = "none"):
+        """
+        Args:
+            policy: One of POLICIES
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown namespace policy: {policy}")
+        self.policy = policy
+
+    @classmethod
+    def from_settings(cls) -> "NamespacePolicy":
+        """Get the policy configured in VECTOR_NAMESPACE_POLICY."""
+        return cls(get_settings().VECTOR_NAMESPACE_POLICY)
+
+    @property
+    def partitioned(self) -> bool:
+        """Whether vectors are spread over several namespaces."""
+        return self.policy != "none"
+
+    @property
+    def field(self) -> Optional[str]:
+        """Metadata field the namespaces are derived from."""
+        return {"data_type": "data_type", "user": "user_id"}.get(self.policy)
+
+    @staticmethod
+    def _data_type_namespace(value: Any) -> str:
+        value = getattr(value, "value", value)
+        for data_type in DataType:
+            if data_type.value == value or data_type.name == value:
+                return data_type.name.lower()
+        return re.sub(r"[^a-z0-9_-]+", "-", str(value).lower()).strip("-") or NamespacePolicy.SHARED_NAMESPACE
+
+    def _namespace_of(self, value: Any) -> str:
+        if self.policy == "data_type":
+            return self._data_type_namespace(value) if value else self.SHARED_NAMESPACE
+        if self.policy == "user":
+            return f"user-{value}" if value else self.SHARED_NAMESPACE
+        return self.DEFAULT_NAMESPACE
+
+    def namespace_for(self, metadata: Optional[Dict[str, Any]]) -> str:
+        """
+        Get the namespace of a vector.
+
+        Args:
+            metadata: Vector metadata
+
+        Returns:
+            str: Namespace
+        """
+        if not self.partitioned:
+            return self.DEFAULT_NAMESPACE
+        return self._namespace_of((metadata or {}).get(self.field))
+
+    def known_namespaces(self) -> Optional[List[str]]:
+        """
+        Get every namespace the policy can produce, when that is a fixed set.
+
+        Returns:
+            Optional[List[str]]: Namespaces, or None if they depend on the data (user policy)
+        """
+        if not self.partitioned:
+            return [self.DEFAULT_NAMESPACE]
+        if self.policy == "data_type":
+            return [data_type.name.lower() for data_type in DataType] + [self.SHARED_NAMESPACE]
+        return None
+
+    def namespaces_for_filter(self, filter: Optional[Dict[str, Any]]) -> Optional[List[str]]:
+        """
+        Get the namespaces a query with a metadata filter has to read.
+
+        Args:
+            filter: Pinecone metadata filter
+
+        Returns:
+            Optional[List[str]]: Namespaces, or None if every namespace has to be read
+        """
+        if not self.partitioned:
+            return [self.DEFAULT_NAMESPACE]
+        values = self._filter_values(filter, self.field)
+        if values is None:
+            return self.known_namespaces()
+        return list(dict.fromkeys(self._namespace_of(value) for value in values))
+
+    @classmethod
+    def _filter_values(cls, filter: Optional[Dict[str, Any]], field: str) -> Optional[List[Any]]:
+        """Values a filter allows for a field ($eq, $in, inside $and), or None if unconstrained."""
+        if not filter:
+            return None
+        condition = filter.get(field)
+        if condition is not None:
+            if not isinstance(condition, dict):
+                return [condition]
+            if "$eq" in condition:
+                return [condition["$eq"]]
+            if "$in" in condition:
+                return list(condition["$in"])
+        for part in filter.get("$and", []):
+            values = cls._filter_values(part, field)
+            if values is not None:
+                return values
+        return None
@@ -1,345 +1,1329 @@
 import os
 import uuid
+import asyncio
+import hashlib
 import logging
 import tempfile
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from fastapi import HTTPException
-import requests
+import httpx
 import re
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from pinecone import Pinecone, ServerlessSpec
-from openai import OpenAI
+from openai import AsyncOpenAI
 from langchain_community.document_loaders import (
     PyPDFLoader,
     Docx2txtLoader,
     TextLoader,
-    UnstructuredFileLoader,
-    WebBaseLoader
+    UnstructuredFileLoader
 )
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
 
 from src.config.settings import get_settings
+from src.shared.text import TokenChunker
+from src.domain.repository.vector_store import VectorStore
+from src.interface.repository.pinecone.embedding_batcher import EmbeddingBatcher, upsert_in_batches
+from src.interface.repository.pinecone.embedding_profile import EmbeddingProfile
+from src.interface.repository.pinecone.ingestion_pipeline import IngestionPipeline, IngestionProgress, StageMetrics
+from src.interface.repository.pinecone.mmr import maximal_marginal_relevance
+from src.interface.repository.pinecone.namespace_policy import NamespacePolicy
+from src.interface.repository.mongodb.embedding_cache_repository import EmbeddingCacheRepository
+from src.interface.repository.local.lexical_index import LexicalIndex
+from src.interface.repository.pinecone.query_cache import QueryCache, get_query_cache
+from src.interface.repository.pinecone.search_session import SearchSession, get_search_session_store
+from src.interface.repository.webpage.webpage_fetcher import WebpageFetcher
 
 
-class PineconeRepository:
-    """Repository for interacting with Pinecone vector database."""
+class PineconeRepository(VectorStore):
+    """
+    Repository for interacting with Pinecone vector database.
+    
+    Vector operations go to the Pinecone index unless another VectorStore
+    backend is supplied, in which case the same ingestion and search logic
+    runs against that backend instead.
+    
+    When a LexicalIndex is supplied, ingested items are also indexed by
+    keyword, and searches combine both: strong keyword matches (an exact
+    title, a legal section number) are answered without an embedding, and
+    other queries fuse the keyword and vector rankings.
+    
+    With a partitioning NamespacePolicy, vectors are written to the namespace
+    of their data type or owner, and queries read only the namespaces their
+    filter allows, fanning out in parallel when that is more than one.
+    """
+    
+    # Shared by all instances: repositories are created per request, but the
+    # clients, the index handle and the worker pool should exist once per process
+    _indexes: Dict[str, Any] = {}
+    _openai_clients: Dict[str, AsyncOpenAI] = {}
+    _executor: Optional[ThreadPoolExecutor] = None
+    # Namespaces seen per index, with the time they were listed
+    _namespaces: Dict[str, tuple] = {}
+    
+    NAMESPACE_CACHE_SECONDS = 60.0
+    
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    # IDs per fetch request: Pinecone accepts up to 1000, but they travel in the URL
+    FETCH_BATCH_SIZE = 100
+    DOWNLOAD_TIMEOUT = 60.0
+    
+    # Metadata kept on vectors with the compact schema: what filters and result
+    # grouping need. Display fields are hydrated from MongoDB instead.
+    COMPACT_METADATA_FIELDS = (
+        "mongodb_id", "data_type", "user_id", "chunk_index", "source_type",
+        EmbeddingProfile.METADATA_FIELD
+    )
+    
+    # Set from VECTOR_METADATA_COMPACT, VECTOR_NAMESPACE_POLICY and SEARCH_MMR_* in __init__
+    compact_metadata = False
+    namespace_policy = NamespacePolicy()
+    mmr_lambda = 0.5
+    mmr_fetch_factor = 4
 
-    def __init__(self):
-        """Initialize the Pinecone repository with API key and environment."""
+    def __init__(
+        self,
+        embedding_cache: Optional[EmbeddingCacheRepository] = None,
+        vector_store: Optional[VectorStore] = None,
+        lexical_index: Optional[LexicalIndex] = None,
+        index_name: Optional[str] = None,
+        embedding_profile: Optional[EmbeddingProfile] = None,
+        webpage_fetcher: Optional[WebpageFetcher] = None
+    ):
+        """
+        Initialize the Pinecone repository with API key and environment.
+        
+        Args:
+            embedding_cache: Optional persistent cache of previously generated embeddings
+            vector_store: Optional backend used instead of the Pinecone index
+            lexical_index: Optional keyword index searched alongside the vectors
+            index_name: Index to use instead of PINECONE_INDEX_NAME (e.g. during a reindex)
+            embedding_profile: Embedding profile of the index; EMBEDDING_PROFILE by default
+            webpage_fetcher: Fetcher of webpages; an uncached one by default
+        """
         # Get settings from configuration
         settings = get_settings()
         
         self.api_key = settings.PINECONE_API_KEY
         self.environment = settings.PINECONE_ENVIRONMENT  # Now used as region
         self.cloud = settings.PINECONE_CLOUD
-        self.index_name = settings.PINECONE_INDEX_NAME
+        self.index_name = index_name or settings.PINECONE_INDEX_NAME
         self.openai_api_key = settings.OPENAI_API_KEY
         self.openai_model = settings.OPENAI_MODEL
+        self.upsert_batch_size = settings.PINECONE_UPSERT_BATCH_SIZE
+        self.ingestion_queue_size = settings.INGESTION_QUEUE_SIZE
+        self.ingestion_embed_batch_size = settings.INGESTION_EMBED_BATCH_SIZE
+        self.chunking_profiles = settings.CHUNKING_PROFILES
+        self.embedding_max_concurrency = settings.EMBEDDING_MAX_CONCURRENCY
+        self.embedding_profile = embedding_profile or EmbeddingProfile.from_settings()
+        self.embedding_model = self.embedding_profile.model
+        self.embedding_dimensions = self.embedding_profile.dimensions
+        self.embedding_cache = embedding_cache
+        self.query_cache = get_query_cache()
+        self.search_sessions = get_search_session_store()
+        self.search_session_max_results = settings.SEARCH_SESSION_MAX_RESULTS
+        self.vector_store = vector_store
+        self.lexical_index = lexical_index
+        self.webpage_fetcher = webpage_fetcher or WebpageFetcher()
+        self.rrf_k = settings.LEXICAL_RRF_K
+        self.mmr_lambda = settings.SEARCH_MMR_LAMBDA
+        self.mmr_fetch_factor = settings.SEARCH_MMR_FETCH_FACTOR
+        self.compact_metadata = settings.VECTOR_METADATA_COMPACT
+        self.namespace_policy = NamespacePolicy.from_settings()
         
         self.logger = logging.getLogger(__name__)
         
-        # Log configuration (masked for security)
-        self.logger.info(f"Initializing Pinecone with index: {self.index_name}")
-        self.logger.debug(f"Pinecone cloud: {self.cloud}, region: {self.environment}")
+        # The Pinecone client is synchronous, so every index call runs on a
+        # dedicated bounded thread pool instead of blocking the event loop
+        if PineconeRepository._executor is None:
+            PineconeRepository._executor = ThreadPoolExecutor(
+                max_workers=settings.PINECONE_MAX_WORKERS,
+                thread_name_prefix="pinecone"
+            )
+        
+        if self.vector_store is not None:
+            self.logger.info(f"Using {type(self.vector_store).__name__} as vector store backend")
+            self.index = None
+            if not self.openai_api_key:
+                self.logger.error("Missing OpenAI configuration")
+                raise ValueError("Missing OpenAI configuration")
+        else:
+            # Log configuration (masked for security)
+            self.logger.info(f"Initializing Pinecone with index: {self.index_name}")
+            self.logger.debug(f"Pinecone cloud: {self.cloud}, region: {self.environment}")
+            
+            if not all([self.api_key, self.environment, self.index_name, self.openai_api_key]):
+                self.logger.error("Missing Pinecone or OpenAI configuration")
+                raise ValueError("Missing Pinecone or OpenAI configuration")
+            
+            # Initialize Pinecone with new method
+            try:
+                if self.index_name in PineconeRepository._indexes:
+                    self.index = PineconeRepository._indexes[self.index_name]
+                else:
+                    self.index = self._connect_index()
+                    PineconeRepository._indexes[self.index_name] = self.index
+            except Exception as e:
+                self.logger.error(f"Pinecone initialization error: {str(e)}")
+                raise HTTPException(status_code=500, detail=f"Pinecone initialization error: {str(e)}")
+        
+        # Initialize OpenAI client
+        try:
+            if self.openai_api_key not in PineconeRepository._openai_clients:
+                PineconeRepository._openai_clients[self.openai_api_key] = AsyncOpenAI(api_key=self.openai_api_key)
+                self.logger.info("OpenAI client initialized successfully")
+            self.openai_client = PineconeRepository._openai_clients[self.openai_api_key]
+        except Exception as e:
+            self.logger.error(f"OpenAI client initialization error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"OpenAI client initialization error: {str(e)}")
+        
+        # Batch chunk embeddings by token count instead of one request per chunk
+        self.embedding_batcher = EmbeddingBatcher(
+            embed_batch=self._embed_batch,
+            max_batch_tokens=settings.EMBEDDING_BATCH_MAX_TOKENS,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            max_concurrency=settings.EMBEDDING_MAX_CONCURRENCY
+        )
+    
+    def _connect_index(self):
+        """
+        Connect to the Pinecone index, creating it if it doesn't exist.
+        
+        Returns:
+            Index: Pinecone index handle
+        """
+        # Create Pinecone client
+        pc = Pinecone(api_key=self.api_key)
+        self.logger.info("Pinecone client initialized successfully")
+        
+        # Get the index or create if it doesn't exist
+        if self.index_name not in pc.list_indexes().names():
+            self.logger.info(f"Creating new Pinecone index: {self.index_name}")
+            # Create a new index sized for the embedding profile
+            pc.create_index(
+                name=self.index_name,
+                dimension=self.embedding_dimensions,
+                metric='cosine',
+                spec=ServerlessSpec(
+                    cloud=self.cloud,
+                    region=self.environment
+                )
+            )
+            self.logger.info(f"Created new Pinecone index: {self.index_name}")
+        else:
+            self.logger.info(f"Using existing Pinecone index: {self.index_name}")
+        
+        # Get the index
+        return pc.Index(self.index_name)
+    
+    async def _run_blocking(self, fn, *args, **kwargs):
+        """
+        Run a blocking call on the repository's bounded thread pool.
+        
+        Args:
+            fn: Blocking callable (Pinecone index calls, document loaders, downloads)
+            
+        Returns:
+            Any: The callable's result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(PineconeRepository._executor, partial(fn, *args, **kwargs))
+    
+    async def _download_to_temp_file(
+        self,
+        file_url: str,
+        file_extension: str,
+        metrics: Optional[StageMetrics] = None
+    ) -> str:
+        """
+        Stream a file to a temporary location without loading it into memory.
+        
+        Args:
+            file_url: URL of the file to download
+            file_extension: Extension to give the temporary file
+            metrics: Optional stage metrics counting downloaded bytes
+            
+        Returns:
+            str: Path of the temporary file
+        """
+        if metrics is not None:
+            metrics.start()
+        started = time.perf_counter()
+        # Disk writes go through the worker pool so a slow disk does not stall the event loop
+        temp_file = await self._run_blocking(tempfile.NamedTemporaryFile, suffix=f".{file_extension}", delete=False)
+        try:
+            async with httpx.AsyncClient(follow_redirects=True, timeout=self.DOWNLOAD_TIMEOUT) as client:
+                async with client.stream("GET", file_url) as response:
+                    response.raise_for_status()  # Raise an exception for HTTP errors
+                    
+                    async for chunk in response.aiter_bytes(self.DOWNLOAD_CHUNK_SIZE):
+                        await self._run_blocking(temp_file.write, chunk)
+                        if metrics is not None:
+                            metrics.record(len(chunk), 0.0)
+            await self._run_blocking(temp_file.close)
+        except BaseException:
+            temp_file.close()
+            os.unlink(temp_file.name)
+            raise
+        
+        if metrics is not None:
+            metrics.busy_seconds += time.perf_counter() - started
+            metrics.finish()
+        return temp_file.name
+    
+    async def _iterate_blocking(self, iterable) -> AsyncIterator[Any]:
+        """
+        Iterate a blocking iterator (e.g. a loader's lazy_load) on the worker pool.
+        
+        Args:
+            iterable: Blocking iterable
+            
+        Yields:
+            Items of iterable, one worker call per item
+        """
+        iterator = await self._run_blocking(iter, iterable)
+        done = object()
+        while (item := await self._run_blocking(next, iterator, done)) is not done:
+            yield item
+    
+    def _ingestion_pipeline(self) -> IngestionPipeline:
+        return IngestionPipeline(
+            self,
+            queue_size=self.ingestion_queue_size,
+            embed_batch_size=self.ingestion_embed_batch_size,
+            upsert_batch_size=self.upsert_batch_size,
+            embed_workers=self.embedding_max_concurrency
+        )
+    
+    async def _run_ingestion(self, documents, split, build_record, metadata: dict, **kwargs) -> Dict[str, Any]:
+        """
+        Run the ingestion pipeline, indexing the chunk texts by keyword as they pass.
+        
+        The item only replaces its previous keyword index entry once the
+        pipeline succeeds.
+        
+        Args:
+            documents: Async iterator of LangChain documents
+            split: Blocking function splitting one document into chunks
+            build_record: Builds the record of a chunk (see IngestionPipeline.run)
+            metadata: Metadata of the parent data ingestion item
+            **kwargs: Further IngestionPipeline.run arguments
+            
+        Returns:
+            Dict[str, Any]: Pipeline result (see IngestionPipeline.run)
+        """
+        pipeline = self._ingestion_pipeline()
+        doc_id = metadata.get("mongodb_id")
+        if self.lexical_index is None or not doc_id:
+            return await pipeline.run(documents, split, build_record, **kwargs)
+        
+        def build_indexed_record(chunk, chunk_index: int, seen: Dict[str, int]) -> Dict[str, Any]:
+            self.lexical_index.add_text(doc_id, chunk.page_content)
+            return build_record(chunk, chunk_index, seen)
+        
+        self.lexical_index.begin_document(doc_id)
+        try:
+            result = await pipeline.run(documents, split, build_indexed_record, **kwargs)
+        except BaseException:
+            self.lexical_index.discard_document(doc_id)
+            raise
+        if result["ids"]:
+            await self._run_blocking(self.lexical_index.commit_document, doc_id, metadata)
+            self._invalidate_search_cache()
+        else:
+            self.lexical_index.discard_document(doc_id)
+        return result
+    
+    async def backfill_lexical_index(self, documents: AsyncIterator[Tuple[Dict[str, Any], List[str]]]) -> Dict[str, int]:
+        """
+        Bring the lexical index in line with the items that exist.
+        
+        Items the index lacks (written before it existed, or by another
+        process) are indexed from the given texts; indexed items no longer
+        among the documents are removed. Items already indexed keep their
+        entry, which holds the text of all their chunks.
+        
+        Args:
+            documents: Every item as (vector metadata with 'mongodb_id', texts)
+            
+        Returns:
+            Dict[str, int]: Numbers of items 'added' and 'removed'
+        """
+        if self.lexical_index is None:
+            return {"added": 0, "removed": 0}
+        
+        indexed = set(await self._run_blocking(self.lexical_index.document_ids))
+        seen = set()
+        added = 0
+        async for metadata, texts in documents:
+            seen.add(metadata["mongodb_id"])
+            if metadata["mongodb_id"] not in indexed:
+                await self._index_lexical(metadata, texts)
+                added += 1
+        
+        removed = indexed - seen
+        for doc_id in removed:
+            await self._run_blocking(self.lexical_index.remove_document, doc_id)
+        self.logger.info(f"Lexical index backfill: {added} items added, {len(removed)} removed")
+        return {"added": added, "removed": len(removed)}
+    
+    async def _index_lexical(self, metadata: dict, texts: List[str]):
+        """
+        Add or replace an item in the keyword index.
+        
+        Args:
+            metadata: Metadata of the data ingestion item
+            texts: Texts of the item's chunks
+        """
+        if self.lexical_index is not None and metadata.get("mongodb_id"):
+            await self._run_blocking(self.lexical_index.index_document, metadata["mongodb_id"], metadata, texts)
+            self._invalidate_search_cache()
+    
+    def get_chunker(self, data_type: Optional[str] = None) -> TokenChunker:
+        """
+        Get the chunker configured for a data type in CHUNKING_PROFILES.
+        
+        Args:
+            data_type: Data type of the item being ingested
+            
+        Returns:
+            TokenChunker: Chunker sized for the data type
+        """
+        profiles = self.chunking_profiles
+        profile = profiles.get(getattr(data_type, "value", data_type) or "", profiles.get("default", {}))
+        return TokenChunker(**profile)
+    
+    async def load_webpage(
+        self,
+        webpage_url: str,
+        metadata: dict,
+        progress: Optional[IngestionProgress] = None
+    ) -> List[str]:
+        """
+        Load content from a webpage URL, extract text, and store in Pinecone.
+        
+        Args:
+            webpage_url: URL of the webpage to load
+            metadata: Metadata to store with the vectors
+            progress: Progress of the ingestion job, updated as chunks pass
+            
+        Returns:
+            List[str]: List of vector IDs created in Pinecone
+        """
+        try:
+            vector_ids = (await self.ingest_webpage(webpage_url, metadata, progress=progress))["ids"]
+            
+            if vector_ids:
+                self.logger.info(f"Successfully stored {len(vector_ids)} vectors in Pinecone")
+                return vector_ids
+            else:
+                raise ValueError("Failed to store any chunks in Pinecone")
+                
+        except Exception as e:
+            self.logger.error(f"Error loading webpage from URL: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Error loading webpage from URL: {str(e)}")
+    
+    def _webpage_target(self, metadata: dict) -> str:
+        """Key under which a page records the content its item's vectors in this index were built from."""
+        return f"{self.index_name}:{metadata.get('mongodb_id')}"
+    
+    def webpage_unchanged(
+        self,
+        page: Dict[str, Any],
+        metadata: dict,
+        previous_ids: Optional[List[str]],
+        refresh_metadata: bool = False
+    ) -> bool:
+        """
+        Check whether an item's vectors in this index were built from a page's current content.
+        
+        Args:
+            page: Page fetched with WebpageFetcher.fetch
+            metadata: Metadata of the parent data ingestion item
+            previous_ids: Vector IDs the item has
+            refresh_metadata: Whether the parent metadata changed for all chunks
+            
+        Returns:
+            bool: Whether the page can be skipped
+        """
+        return bool(previous_ids) and not refresh_metadata and (
+            page["ingested"].get(self._webpage_target(metadata)) == page["content_hash"]
+        )
+    
+    async def parse_webpage(self, webpage_url: str, page: Dict[str, Any]) -> Document:
+        """
+        Parse a fetched page on the repository's thread pool (see WebpageFetcher.parse).
+        
+        Args:
+            webpage_url: URL of the page
+            page: Page fetched with WebpageFetcher.fetch
+            
+        Returns:
+            Document: The page text, with its title and description in the metadata
+        """
+        return await self._run_blocking(WebpageFetcher.parse, webpage_url, page["body"], page["encoding"])
+    
+    async def ingest_webpage(
+        self,
+        webpage_url: str,
+        metadata: dict,
+        previous_ids: Optional[List[str]] = None,
+        refresh_metadata: bool = False,
+        page: Optional[Dict[str, Any]] = None,
+        progress: Optional[IngestionProgress] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream a webpage through the ingestion pipeline.
+        
+        The page is fetched through the webpage cache with a conditional
+        request. If the item already has vectors in this index (previous_ids)
+        built from the same content, and its metadata did not change, the page
+        is neither parsed, chunked nor embedded again.
+        
+        Args:
+            webpage_url: URL of the webpage to load
+            metadata: Metadata of the parent data ingestion item
+            previous_ids: Vector IDs the item had before (see sync_chunks)
+            refresh_metadata: Whether the parent metadata changed for all chunks
+            page: Page already fetched with WebpageFetcher.fetch (e.g. by a crawl),
+                optionally with its parsed 'document'
+            progress: Progress of the ingestion job, updated as chunks pass
+            
+        Returns:
+            Dict[str, Any]: Pipeline result (see IngestionPipeline.run); 'unchanged'
+                is True when the page was skipped
+        """
+        self.logger.info(f"Loading webpage from URL: {webpage_url}")
+        
+        # Validate URL format
+        if not re.match(r'^https?://', webpage_url):
+            self.logger.error(f"Invalid URL format: {webpage_url}")
+            raise ValueError(f"Invalid URL format: {webpage_url}. URL must start with http:// or https://")
+        
+        if page is None:
+            page = await self.webpage_fetcher.fetch(webpage_url)
+        if self.webpage_unchanged(page, metadata, previous_ids, refresh_metadata):
+            self.logger.info(f"Webpage unchanged, keeping {len(previous_ids)} vectors: {webpage_url}")
+            return {
+                "ids": list(previous_ids), "embedded": 0, "updated": 0, "deleted": 0, "failed": 0,
+                "metrics": {}, "unchanged": True
+            }
+        
+        async def documents():
+            if page.get("document") is not None:
+                yield page["document"]
+            else:
+                yield await self.parse_webpage(webpage_url, page)
+        
+        text_splitter = self.get_chunker(metadata.get("data_type"))
+        
+        def build_record(chunk, chunk_index: int, seen: Dict[str, int]) -> Dict[str, Any]:
+            # The page title comes with every chunk split from the page
+            return self._build_chunk_record(
+                chunk, chunk_index, metadata, "webpage", seen,
+                default_title=chunk.metadata.get("title", ""),
+                extra_metadata={"webpage_url": webpage_url}
+            )
+        
+        result = await self._run_ingestion(
+            documents(),
+            lambda document: text_splitter.split_documents([document]),
+            build_record,
+            metadata,
+            previous_ids=previous_ids,
+            refresh_metadata=refresh_metadata,
+            progress=progress
+        )
+        if result["ids"] and not result["failed"] and metadata.get("mongodb_id"):
+            await self.webpage_fetcher.mark_ingested(webpage_url, self._webpage_target(metadata), page["content_hash"])
+        return result
+    
+    async def load_file_from_url(
+        self,
+        file_url: str,
+        metadata: dict,
+        progress: Optional[IngestionProgress] = None
+    ) -> List[str]:
+        """
+        Load a file from a URL, extract text, and store in Pinecone.
+        
+        Args:
+            file_url: URL of the file to load
+            metadata: Metadata to store with the vectors
+            progress: Progress of the ingestion job, updated as chunks pass
+            
+        Returns:
+            List[str]: List of vector IDs created in Pinecone
+        """
+        try:
+            vector_ids = (await self.ingest_file(file_url, metadata, progress=progress))["ids"]
+            
+            if vector_ids:
+                self.logger.info(f"Successfully stored {len(vector_ids)} vectors in Pinecone")
+                return vector_ids
+            else:
+                raise ValueError("Failed to store any chunks in Pinecone")
+                
+        except Exception as e:
+            self.logger.error(f"Error loading file from URL: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Error loading file from URL: {str(e)}")
+    
+    async def ingest_file(
+        self,
+        file_url: str,
+        metadata: dict,
+        previous_ids: Optional[List[str]] = None,
+        refresh_metadata: bool = False,
+        progress: Optional[IngestionProgress] = None
+    ) -> Dict[str, Any]:
+        """
+        Download a file and stream it page by page through the ingestion pipeline.
+        
+        Args:
+            file_url: URL of the file to load
+            metadata: Metadata of the parent data ingestion item
+            previous_ids: Vector IDs the item had before (see sync_chunks)
+            refresh_metadata: Whether the parent metadata changed for all chunks
+            progress: Progress of the ingestion job, updated as chunks pass
+            
+        Returns:
+            Dict[str, Any]: Pipeline result (see IngestionPipeline.run)
+        """
+        self.logger.info(f"Loading file from URL: {file_url}")
+        
+        # Determine file type from URL
+        file_extension = file_url.split(".")[-1].lower()
+        
+        if file_extension not in ["pdf", "docx", "doc", "txt"]:
+            self.logger.error(f"Unsupported file type: {file_extension}")
+            raise ValueError(f"Unsupported file type: {file_extension}. Supported types are: pdf, docx, doc, txt")
+        
+        # Download the file to a temporary location
+        download_metrics = StageMetrics("download")
+        temp_file_path = await self._download_to_temp_file(file_url, file_extension, download_metrics)
+        
+        self.logger.info(f"File downloaded to temporary location: {temp_file_path}")
+        
+        # Load the document based on file type
+        try:
+            if file_extension == "pdf":
+                loader = PyPDFLoader(temp_file_path)
+            elif file_extension in ["docx", "doc"]:
+                loader = Docx2txtLoader(temp_file_path)
+            elif file_extension == "txt":
+                loader = TextLoader(temp_file_path)
+            else:
+                # Fallback to unstructured loader
+                loader = UnstructuredFileLoader(temp_file_path)
+            
+            # Split the documents into token-sized chunks
+            text_splitter = self.get_chunker(metadata.get("data_type"))
+            
+            def build_record(chunk, chunk_index: int, seen: Dict[str, int]) -> Dict[str, Any]:
+                return self._build_chunk_record(chunk, chunk_index, metadata, "file", seen)
+            
+            return await self._run_ingestion(
+                self._iterate_blocking(loader.lazy_load()),
+                lambda document: text_splitter.split_documents([document]),
+                build_record,
+                metadata,
+                previous_ids=previous_ids,
+                refresh_metadata=refresh_metadata,
+                metrics=[download_metrics],
+                progress=progress
+            )
+        finally:
+            # Clean up the temporary file
+            if os.path.exists(temp_file_path):
+                os.unlink(temp_file_path)
+    
+    async def generate_embeddings(self, text: str) -> List[float]:
+        """
+        Generate embeddings for text using OpenAI, reusing cached embeddings when available.
+        
+        Args:
+            text: Text to generate embeddings for
+            
+        Returns:
+            List[float]: Embedding vector, prepared for the repository's profile
+        """
+        return self.embedding_profile.prepare(await self._raw_embedding(text))
+    
+    async def _raw_embedding(self, text: str) -> List[float]:
+        """
+        Get the model's embedding of a text, before the profile's post-processing.
+        
+        Caches hold these raw vectors, so profiles sharing a model and dimensions
+        but differing in post-processing can share entries without mixing them up.
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            List[float]: Embedding vector as returned by the model
+        """
+        try:
+            if self.embedding_cache:
+                cached = await self.embedding_cache.get_many(self.embedding_model, self.embedding_dimensions, [text])
+                if cached[0] is not None:
+                    self.logger.debug("Embedding cache hit")
+                    return cached[0]
+            
+            self.logger.debug(f"Generating embeddings for text (length: {len(text)})")
+            # Generate embedding with the profile's model and dimensions
+            response = await self.openai_client.embeddings.create(
+                input=text,
+                **self.embedding_profile.request_kwargs()
+            )
+            
+            # Extract embeddings from response
+            embedding = response.data[0].embedding
+            self.logger.debug(f"Generated embedding with {len(embedding)} dimensions")
+            
+            if self.embedding_cache:
+                await self.embedding_cache.set_many(self.embedding_model, self.embedding_dimensions, [text], [embedding])
+            
+            return embedding
+            
+        except Exception as e:
+            self.logger.error(f"OpenAI embedding generation error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Embedding generation error: {str(e)}")
+    
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for one batch of texts with a single OpenAI request.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            List[List[float]]: Raw embedding vectors in input order
+        """
+        response = await self.openai_client.embeddings.create(
+            input=texts,
+            **self.embedding_profile.request_kwargs()
+        )
+        ordered = sorted(response.data, key=lambda item: item.index)
+        return [item.embedding for item in ordered]
+    
+    async def generate_embeddings_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Generate embeddings for many texts using token-sized, concurrent batches.
+        
+        Args:
+            texts: Texts to generate embeddings for
+            
+        Returns:
+            List[Optional[List[float]]]: One prepared embedding per text, None where its batch failed
+        """
+        embeddings = await self._raw_embeddings_batch(texts)
+        return [None if embedding is None else self.embedding_profile.prepare(embedding) for embedding in embeddings]
+    
+    async def _raw_embeddings_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Get the model's embeddings of many texts, served from the embedding cache where possible.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            List[Optional[List[float]]]: One raw embedding per text, None where its batch failed
+        """
+        if not self.embedding_cache:
+            return await self.embedding_batcher.embed(texts)
+        
+        results = await self.embedding_cache.get_many(self.embedding_model, self.embedding_dimensions, texts)
+        
+        # Embed each distinct missing text once
+        missing: Dict[str, List[int]] = {}
+        for i, (text, result) in enumerate(zip(texts, results)):
+            if result is None:
+                key = EmbeddingCacheRepository.make_key(self.embedding_model, self.embedding_dimensions, text)
+                missing.setdefault(key, []).append(i)
+        
+        if not missing:
+            self.logger.info(f"All {len(texts)} embeddings served from cache")
+            return results
+        
+        missing_texts = [texts[positions[0]] for positions in missing.values()]
+        embeddings = await self.embedding_batcher.embed(missing_texts)
+        await self.embedding_cache.set_many(self.embedding_model, self.embedding_dimensions, missing_texts, embeddings)
+        
+        for positions, embedding in zip(missing.values(), embeddings):
+            for i in positions:
+                results[i] = embedding
+        
+        self.logger.info(
+            f"Embedding cache served {len(texts) - sum(len(p) for p in missing.values())}/{len(texts)} texts"
+        )
+        return results
+    
+    def _combine_text(self, text_data: dict) -> str:
+        """
+        Combine the text fields of an item into the string that gets embedded.
+        
+        Args:
+            text_data: Dictionary with text fields to embed
+            
+        Returns:
+            str: Combined text
+        """
+        return " ".join([
+            text_data.get("title", ""),
+            text_data.get("specified_text", ""),
+            text_data.get("content", ""),
+            text_data.get("file_text", ""),
+            " ".join(text_data.get("keywords", []))
+        ])
+    
+    def _build_chunk_metadata(
+        self,
+        chunk,
+        chunk_id: str,
+        chunk_index: int,
+        metadata: dict,
+        source_type: str,
+        extra_metadata: Optional[dict] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the Pinecone metadata for one document chunk.
+        
+        Args:
+            chunk: LangChain document chunk
+            chunk_id: Vector ID of the chunk
+            chunk_index: Position of the chunk in the document
+            metadata: Metadata of the parent data ingestion item
+            source_type: Source of the chunk ("file" or "webpage")
+            extra_metadata: Additional source-specific metadata
+            
+        Returns:
+            Dict[str, Any]: Chunk metadata
+        """
+        chunk_metadata = metadata.copy()
+        chunk_metadata["chunk_id"] = chunk_id
+        chunk_metadata["chunk_index"] = chunk_index
+        chunk_metadata["source_type"] = source_type
+        if extra_metadata:
+            chunk_metadata.update(extra_metadata)
+        
+        # Handle document metadata safely
+        if hasattr(chunk, "metadata"):
+            # Extract only simple values from metadata
+            safe_metadata = {}
+            for key, value in chunk.metadata.items():
+                # Only include simple types that Pinecone accepts
+                if isinstance(value, (str, int, float, bool)) or (
+                    isinstance(value, list) and all(isinstance(item, str) for item in value)
+                ):
+                    safe_metadata[f"doc_{key}"] = value
+            
+            # Add safe metadata to chunk metadata
+            chunk_metadata.update(safe_metadata)
+        
+        # Filter out None values from metadata
+        return self._filter_none_values(chunk_metadata)
+    
+    @staticmethod
+    def _chunk_id(base_id: str, text: str) -> str:
+        """
+        Build the vector ID of a chunk from its parent ID and the text that gets embedded.
+        
+        IDs are deterministic, so an unchanged chunk keeps its ID (and its
+        vector) across re-ingestions, wherever it moves in the document.
+        
+        Args:
+            base_id: MongoDB ID of the parent data ingestion item
+            text: Embedded text of the chunk
+            
+        Returns:
+            str: Vector ID
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        return f"{base_id}_chunk_{digest}"
+    
+    def _build_chunk_record(
+        self,
+        chunk,
+        chunk_index: int,
+        metadata: dict,
+        source_type: str,
+        seen: Dict[str, int],
+        default_title: str = "",
+        extra_metadata: Optional[dict] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the record to embed and store for one document chunk.
+        
+        Args:
+            chunk: LangChain document chunk
+            chunk_index: Position of the chunk in the document
+            metadata: Metadata of the parent data ingestion item
+            source_type: Source of the chunk ("file" or "webpage")
+            seen: Occurrences of each chunk ID so far in the document; updated
+            default_title: Title to use when metadata has none
+            extra_metadata: Additional source-specific metadata
+            
+        Returns:
+            Dict[str, Any]: Record with 'id', 'text' and 'metadata'
+        """
+        base_id = metadata.get("mongodb_id", str(uuid.uuid4()))
+        text_data = {
+            "title": metadata.get("title", default_title),
+            "specified_text": metadata.get("specified_text", ""),
+            "content": metadata.get("content", ""),
+            "file_text": chunk.page_content,
+            "keywords": []
+        }
+        text = self._combine_text(text_data)
+        
+        # Repeated chunks (boilerplate, empty pages) get an occurrence suffix
+        chunk_id = self._chunk_id(base_id, text)
+        seen[chunk_id] = seen.get(chunk_id, 0) + 1
+        if seen[chunk_id] > 1:
+            chunk_id = f"{chunk_id}_{seen[chunk_id] - 1}"
+        
+        return {
+            "id": chunk_id,
+            "text": text,
+            "metadata": self._build_chunk_metadata(
+                chunk, chunk_id, chunk_index, metadata, source_type, extra_metadata
+            )
+        }
+    
+    def _build_chunk_records(
+        self,
+        chunks: list,
+        metadata: dict,
+        source_type: str,
+        default_title: str = "",
+        extra_metadata: Optional[dict] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the records to embed and store for a document's chunks.
+        
+        Args:
+            chunks: LangChain document chunks
+            metadata: Metadata of the parent data ingestion item
+            source_type: Source of the chunks ("file" or "webpage")
+            default_title: Title to use when metadata has none
+            extra_metadata: Additional source-specific metadata
+            
+        Returns:
+            List[Dict[str, Any]]: Records with 'id', 'text' and 'metadata', in document order
+        """
+        seen: Dict[str, int] = {}
+        return [
+            self._build_chunk_record(
+                chunk, i, metadata, source_type, seen,
+                default_title=default_title,
+                extra_metadata=extra_metadata
+            )
+            for i, chunk in enumerate(chunks)
+        ]
+    
+    def build_text_record(self, text_data: dict, metadata: dict) -> Dict[str, Any]:
+        """
+        Build the single record stored for an item without a file or webpage.
+        
+        Args:
+            text_data: Dictionary with text fields to embed
+            metadata: Metadata to store with the vector
+            
+        Returns:
+            Dict[str, Any]: Record with 'id', 'text' and 'metadata'
+        """
+        text = self._combine_text(text_data)
+        if metadata.get("id"):
+            vector_id = metadata["id"]
+        elif metadata.get("mongodb_id"):
+            vector_id = self._chunk_id(metadata["mongodb_id"], text)
+        else:
+            vector_id = str(uuid.uuid4())
+        return {"id": vector_id, "text": text, "metadata": self._filter_none_values(metadata)}
+    
+    async def sync_chunks(
+        self,
+        records: List[Dict[str, Any]],
+        previous_ids: Optional[List[str]] = None,
+        refresh_metadata: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Bring a document's vectors in line with its current chunk records.
+        
+        Only records whose ID is not among previous_ids are embedded and
+        upserted. Kept chunks get a metadata-only update when their position
+        (chunk_index) changed or refresh_metadata is set, so appending to a
+        document rewrites none of its earlier chunks, and previous chunks that
+        no longer exist are deleted in bulk.
+        
+        Args:
+            records: Current chunk records in document order (see _build_chunk_records)
+            previous_ids: Vector IDs the document had before, in document order
+            refresh_metadata: Whether the parent metadata changed for all chunks
+            
+        Returns:
+            Dict[str, Any]: 'ids' of the stored chunks in document order, and the
+                'embedded', 'updated' and 'deleted' counts
+        """
+        previous_ids = previous_ids or []
+        previous_positions = {vector_id: i for i, vector_id in enumerate(previous_ids)}
+        
+        new_records = [record for record in records if record["id"] not in previous_positions]
+        embeddings = await self.generate_embeddings_batch([record["text"] for record in new_records])
+        
+        vectors = []
+        failed_ids = set()
+        for record, embedding in zip(new_records, embeddings):
+            if embedding is None:
+                self.logger.error(f"Error processing chunk {record['id']}: embedding failed")
+                failed_ids.add(record["id"])
+                continue
+            vectors.append({"id": record["id"], "values": embedding, "metadata": record["metadata"]})
+        if vectors:
+            await self.upsert_vectors(vectors)
+        
+        metadata_updates = {
+            record["id"]: record["metadata"]
+            for i, record in enumerate(records)
+            if record["id"] in previous_positions
+            and (refresh_metadata or previous_positions[record["id"]] != i)
+        }
+        if metadata_updates:
+            await self.update_metadata(metadata_updates)
+        
+        current_ids = {record["id"] for record in records}
+        orphan_ids = [vector_id for vector_id in previous_ids if vector_id not in current_ids]
+        if orphan_ids:
+            await self.delete_vectors(orphan_ids)
+        
+        if records:
+            await self._index_lexical(records[0]["metadata"], [record["text"] for record in records])
+        
+        self.logger.info(
+            f"Synced {len(records)} chunks: {len(vectors)} embedded, "
+            f"{len(metadata_updates)} metadata updates, {len(orphan_ids)} deleted"
+        )
+        return {
+            "ids": [record["id"] for record in records if record["id"] not in failed_ids],
+            "embedded": len(vectors),
+            "updated": len(metadata_updates),
+            "deleted": len(orphan_ids)
+        }
+    
+    async def upsert_vectors(self, vectors: List[Dict[str, Any]]) -> bool:
+        """
+        Insert or update many vectors using bulk upsert requests.
+        
+        Args:
+            vectors: List of vector dictionaries with 'id', 'values', and 'metadata'
+            
+        Returns:
+            bool: True if operation successful
+        """
+        try:
+            vectors = [
+                {**vector, "metadata": self._with_profile(vector.get("metadata"))}
+                for vector in vectors
+            ]
+            if self.vector_store is not None:
+                await self.vector_store.upsert_vectors(vectors)
+                count = len(vectors)
+            else:
+                count = 0
+                for namespace, group in self._group_by_namespace(vectors).items():
+                    async def upsert_batch(batch: List[Dict[str, Any]], namespace=namespace):
+                        await self._run_blocking(self.index.upsert, vectors=batch, **self._namespace_kwargs(namespace))
+                    
+                    count += await upsert_in_batches(
+                        upsert_batch,
+                        group,
+                        batch_size=self.upsert_batch_size,
+                        max_concurrency=self.embedding_max_concurrency
+                    )
+            self._invalidate_search_cache()
+            self.logger.info(f"Successfully upserted {count} vectors")
+            return True
+        except Exception as e:
+            self.logger.error(f"Pinecone bulk upsert error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Pinecone upsert error: {str(e)}")
+    
+    async def query_vectors(
+        self,
+        query_vector: List[float],
+        top_k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+        include_values: bool = False,
+        include_metadata: bool = True,
+        namespaces: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the vectors most similar to a query vector.
+        
+        Namespaces are queried in parallel and their matches merged by score.
+        
+        Args:
+            query_vector: The query embedding vector
+            top_k: Number of results to return
+            filter: Optional metadata filter
+            include_values: Whether to return the stored vector values
+            include_metadata: Whether to return the stored metadata; without
+                it 'metadata' is empty and responses carry IDs and scores only
+            namespaces: Namespaces to read; by default those the namespace
+                policy allows for the filter
+            
+        Returns:
+            List[Dict[str, Any]]: Matches with 'id', 'score' and 'metadata', best first
+        """
+        if self.vector_store is not None:
+            return await self.vector_store.query_vectors(query_vector, top_k, filter, include_values, include_metadata)
+        
+        if namespaces is None:
+            namespaces = self.namespace_policy.namespaces_for_filter(filter)
+            if namespaces is None:
+                namespaces = await self.list_namespaces()
         
-        if not all([self.api_key, self.environment, self.index_name, self.openai_api_key]):
-            self.logger.error("Missing Pinecone or OpenAI configuration")
-            raise ValueError("Missing Pinecone or OpenAI configuration")
+        async def query_namespace(namespace: str) -> List[Dict[str, Any]]:
+            results = await self._run_blocking(
+                self.index.query,
+                vector=query_vector,
+                top_k=top_k,
+                include_metadata=include_metadata,
+                include_values=include_values,
+                filter=filter,
+                **self._namespace_kwargs(namespace)
+            )
+            matches = []
+            for match in results.matches:
+                item = {"id": match.id, "score": match.score, "metadata": match.metadata or {}}
+                if include_values:
+                    item["values"] = match.values
+                matches.append(item)
+            return matches
         
-        # Initialize Pinecone with new method
-        try:
-            # Create Pinecone client
-            self.pc = Pinecone(api_key=self.api_key)
-            self.logger.info("Pinecone client initialized successfully")
-            
-            # Get the index or create if it doesn't exist
-            if self.index_name not in self.pc.list_indexes().names():
-                self.logger.info(f"Creating new Pinecone index: {self.index_name}")
-                # Create a new index with a dimension of 1536 for OpenAI embeddings
-                self.pc.create_index(
-                    name=self.index_name,
-                    dimension=1536,  # OpenAI's text-embedding-3 model uses 1536 dimensions
-                    metric='cosine',
-                    spec=ServerlessSpec(
-                        cloud=self.cloud,
-                        region=self.environment
-                    )
-                )
-                self.logger.info(f"Created new Pinecone index: {self.index_name}")
-            else:
-                self.logger.info(f"Using existing Pinecone index: {self.index_name}")
-                
-            # Get the index
-            self.index = self.pc.Index(self.index_name)
-        except Exception as e:
-            self.logger.error(f"Pinecone initialization error: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Pinecone initialization error: {str(e)}")
+        if len(namespaces) == 1:
+            return await query_namespace(namespaces[0])
         
-        # Initialize OpenAI client
-        try:
-            self.openai_client = OpenAI(api_key=self.openai_api_key)
-            self.logger.info("OpenAI client initialized successfully")
-        except Exception as e:
-            self.logger.error(f"OpenAI client initialization error: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"OpenAI client initialization error: {str(e)}")
+        per_namespace = await asyncio.gather(*[query_namespace(namespace) for namespace in namespaces])
+        matches = [match for namespace_matches in per_namespace for match in namespace_matches]
+        matches.sort(key=lambda match: match["score"], reverse=True)
+        return matches[:top_k]
     
-    async def load_webpage(self, webpage_url: str, metadata: dict) -> List[str]:
+    async def delete_vectors(self, ids: List[str], namespace: Optional[str] = None) -> bool:
         """
-        Load content from a webpage URL, extract text, and store in Pinecone.
+        Delete vectors by ID.
         
         Args:
-            webpage_url: URL of the webpage to load
-            metadata: Metadata to store with the vectors
+            ids: List of vector IDs to delete
+            namespace: Namespace holding the vectors; every namespace when not given
             
         Returns:
-            List[str]: List of vector IDs created in Pinecone
+            bool: True if deletion successful
         """
         try:
-            self.logger.info(f"Loading webpage from URL: {webpage_url}")
-            
-            # Validate URL format
-            if not re.match(r'^https?://', webpage_url):
-                self.logger.error(f"Invalid URL format: {webpage_url}")
-                raise ValueError(f"Invalid URL format: {webpage_url}. URL must start with http:// or https://")
-            
-            # Use WebBaseLoader to load the webpage
-            try:
-                loader = WebBaseLoader(webpage_url)
-                documents = loader.load()
-                self.logger.info(f"Loaded {len(documents)} document(s) from webpage")
-                
-                # Extract webpage title if available
-                webpage_title = ""
-                if documents and hasattr(documents[0], "metadata") and "title" in documents[0].metadata:
-                    webpage_title = documents[0].metadata["title"]
-                    self.logger.info(f"Extracted webpage title: {webpage_title}")
-                
-                # Split the documents into chunks
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=10000,
-                    chunk_overlap=100
-                )
-                chunks = text_splitter.split_documents(documents)
-                self.logger.info(f"Split webpage into {len(chunks)} chunks")
-                
-                # Store each chunk in Pinecone
-                vector_ids = []
-                for i, chunk in enumerate(chunks):
-                    try:
-                        print(f"[PINECONE] Processing chunk {i+1}/{len(chunks)}...")
-                        # Create a unique ID for each chunk
-                        chunk_id = f"{metadata.get('mongodb_id', str(uuid.uuid4()))}_chunk_{i}"
-                        
-                        # Create text data for embedding
-                        text_data = {
-                            "title": metadata.get("title", webpage_title),
-                            "specified_text": metadata.get("specified_text", ""),
-                            "content": metadata.get("content", ""),
-                            "file_text": chunk.page_content,
-                            "keywords": []
-                        }
-                        
-                        # Add chunk-specific metadata
-                        chunk_metadata = metadata.copy()
-                        chunk_metadata["chunk_id"] = chunk_id
-                        chunk_metadata["chunk_index"] = i
-                        chunk_metadata["total_chunks"] = len(chunks)
-                        chunk_metadata["source_type"] = "webpage"
-                        chunk_metadata["webpage_url"] = webpage_url
-                        
-                        # Handle document metadata safely
-                        if hasattr(chunk, "metadata"):
-                            # Extract only simple values from metadata
-                            safe_metadata = {}
-                            for key, value in chunk.metadata.items():
-                                # Only include simple types that Pinecone accepts
-                                if isinstance(value, (str, int, float, bool)) or (
-                                    isinstance(value, list) and all(isinstance(item, str) for item in value)
-                                ):
-                                    safe_metadata[f"doc_{key}"] = value
-                            
-                            # Add safe metadata to chunk metadata
-                            chunk_metadata.update(safe_metadata)
-                        
-                        # Filter out None values from metadata
-                        chunk_metadata = self._filter_none_values(chunk_metadata)
-                        
-                        # Store in Pinecone
-                        vector_id = await self.upsert_vector(text_data, chunk_metadata)
-                        vector_ids.append(vector_id)
-                    except Exception as chunk_error:
-                        self.logger.error(f"Error processing chunk {i}: {str(chunk_error)}")
-                        # Continue with next chunk
-                        continue
-                
-                if vector_ids:
-                    self.logger.info(f"Successfully stored {len(vector_ids)} vectors in Pinecone")
-                    return vector_ids
-                else:
-                    raise ValueError("Failed to store any chunks in Pinecone")
+            if self.vector_store is not None:
+                await self.vector_store.delete_vectors(ids)
+            else:
+                namespaces = [namespace] if namespace is not None else await self.list_namespaces()
                 
-            except Exception as e:
-                self.logger.error(f"Error processing webpage: {str(e)}")
-                raise
+                async def delete_in(namespace: str):
+                    # Pinecone accepts at most 1000 IDs per delete request
+                    for start in range(0, len(ids), 1000):
+                        await self._run_blocking(
+                            self.index.delete, ids=ids[start:start + 1000], **self._namespace_kwargs(namespace)
+                        )
                 
+                await asyncio.gather(*[delete_in(namespace) for namespace in namespaces])
+            self._invalidate_search_cache()
+            self.logger.info(f"Successfully deleted {len(ids)} vectors")
+            return True
         except Exception as e:
-            self.logger.error(f"Error loading webpage from URL: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Error loading webpage from URL: {str(e)}")
+            self.logger.error(f"Pinecone delete error: {str(e)}")
+            return False
     
-    async def load_file_from_url(self, file_url: str, metadata: dict) -> List[str]:
+    async def update_metadata(self, updates: Dict[str, Dict[str, Any]]) -> bool:
         """
-        Load a file from a URL, extract text, and store in Pinecone.
+        Merge fields into the metadata of stored vectors without re-embedding them.
+        
+        Like Pinecone's set_metadata, given fields are overwritten and fields
+        not given are left as they are.
         
         Args:
-            file_url: URL of the file to load
-            metadata: Metadata to store with the vectors
+            updates: Metadata fields to set, keyed by vector ID
             
         Returns:
-            List[str]: List of vector IDs created in Pinecone
+            bool: True if operation successful
         """
         try:
-            self.logger.info(f"Loading file from URL: {file_url}")
-            
-            # Determine file type from URL
-            file_extension = file_url.split(".")[-1].lower()
-            
-            if file_extension not in ["pdf", "docx", "doc", "txt"]:
-                self.logger.error(f"Unsupported file type: {file_extension}")
-                raise ValueError(f"Unsupported file type: {file_extension}. Supported types are: pdf, docx, doc, txt")
-            
-            # Download the file to a temporary location
-            with tempfile.NamedTemporaryFile(suffix=f".{file_extension}", delete=False) as temp_file:
-                response = requests.get(file_url, stream=True)
-                response.raise_for_status()  # Raise an exception for HTTP errors
-                
-                for chunk in response.iter_content(chunk_size=8192):
-                    temp_file.write(chunk)
-                
-                temp_file_path = temp_file.name
-            
-            self.logger.info(f"File downloaded to temporary location: {temp_file_path}")
-            
-            # Load the document based on file type
-            try:
-                if file_extension == "pdf":
-                    loader = PyPDFLoader(temp_file_path)
-                elif file_extension in ["docx", "doc"]:
-                    loader = Docx2txtLoader(temp_file_path)
-                elif file_extension == "txt":
-                    loader = TextLoader(temp_file_path)
-                else:
-                    # Fallback to unstructured loader
-                    loader = UnstructuredFileLoader(temp_file_path)
-                
-                documents = loader.load()
-                self.logger.info(f"Loaded {len(documents)} document(s) from file")
-                
-                # Split the documents into chunks
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=1000,
-                    chunk_overlap=100
-                )
-                chunks = text_splitter.split_documents(documents)
-                self.logger.info(f"Split documents into {len(chunks)} chunks")
-                
-                # Store each chunk in Pinecone
-                vector_ids = []
-                for i, chunk in enumerate(chunks):
-                    try:
-                        # Create a unique ID for each chunk
-                        chunk_id = f"{metadata.get('mongodb_id', str(uuid.uuid4()))}_chunk_{i}"
-                        
-                        # Create text data for embedding
-                        text_data = {
-                            "title": metadata.get("title", ""),
-                            "specified_text": metadata.get("specified_text", ""),
-                            "content": metadata.get("content", ""),
-                            "file_text": chunk.page_content,
-                            "keywords": []
-                        }
-                        
-                        # Add chunk-specific metadata
-                        chunk_metadata = metadata.copy()
-                        chunk_metadata["chunk_id"] = chunk_id
-                        chunk_metadata["chunk_index"] = i
-                        chunk_metadata["total_chunks"] = len(chunks)
-                        chunk_metadata["source_type"] = "file"
-                        
-                        # Handle document metadata safely
-                        if hasattr(chunk, "metadata"):
-                            # Extract only simple values from metadata
-                            safe_metadata = {}
-                            for key, value in chunk.metadata.items():
-                                # Only include simple types that Pinecone accepts
-                                if isinstance(value, (str, int, float, bool)) or (
-                                    isinstance(value, list) and all(isinstance(item, str) for item in value)
-                                ):
-                                    safe_metadata[f"doc_{key}"] = value
-                            
-                            # Add safe metadata to chunk metadata
-                            chunk_metadata.update(safe_metadata)
-                        
-                        # Filter out None values from metadata
-                        chunk_metadata = self._filter_none_values(chunk_metadata)
-                        
-                        # Store in Pinecone
-                        vector_id = await self.upsert_vector(text_data, chunk_metadata)
-                        vector_ids.append(vector_id)
-                    except Exception as chunk_error:
-                        self.logger.error(f"Error processing chunk {i}: {str(chunk_error)}")
-                        # Continue with next chunk
-                        continue
-                
-                if vector_ids:
-                    self.logger.info(f"Successfully stored {len(vector_ids)} vectors in Pinecone")
-                    
-                    # Clean up the temporary file
-                    os.unlink(temp_file_path)
-                    
-                    return vector_ids
-                else:
-                    # Clean up the temporary file
-                    os.unlink(temp_file_path)
-                    raise ValueError("Failed to store any chunks in Pinecone")
-                
-            except Exception as e:
-                self.logger.error(f"Error processing file: {str(e)}")
-                # Clean up the temporary file in case of error
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-                raise
-                
+            updates = {vector_id: self._with_profile(metadata) for vector_id, metadata in updates.items()}
+            if self.vector_store is not None:
+                await self.vector_store.update_metadata(updates)
+            else:
+                # Pinecone updates one vector per request; the worker pool bounds concurrency
+                await asyncio.gather(*[
+                    self._run_blocking(
+                        self.index.update,
+                        id=vector_id,
+                        set_metadata=metadata,
+                        **self._namespace_kwargs(self.namespace_policy.namespace_for(metadata))
+                    )
+                    for vector_id, metadata in updates.items()
+                ])
+            self._invalidate_search_cache()
+            self.logger.info(f"Successfully updated metadata of {len(updates)} vectors")
+            return True
         except Exception as e:
-            self.logger.error(f"Error loading file from URL: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Error loading file from URL: {str(e)}")
+            self.logger.error(f"Pinecone metadata update error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Pinecone update error: {str(e)}")
     
-    async def generate_embeddings(self, text: str) -> List[float]:
+    async def list_vector_ids(self, prefix: str) -> List[str]:
         """
-        Generate embeddings for text using OpenAI.
+        List the IDs of stored vectors starting with a prefix.
         
         Args:
-            text: Text to generate embeddings for
+            prefix: ID prefix, e.g. "<mongodb_id>_chunk_"
             
         Returns:
-            List[float]: Embedding vector
+            List[str]: Matching vector IDs
         """
-        try:
-            self.logger.debug(f"Generating embeddings for text (length: {len(text)})")
-            # Generate embedding using OpenAI's text-embedding-3 model
-            response = self.openai_client.embeddings.create(
-                input=text,
-                model="text-embedding-3-small"
-            )
+        if self.vector_store is not None:
+            return await self.vector_store.list_vector_ids(prefix)
+        
+        def list_all(namespace: str) -> List[str]:
+            pages = self.index.list(prefix=prefix, **self._namespace_kwargs(namespace))
+            return [vector_id for page in pages for vector_id in page]
+        
+        per_namespace = await asyncio.gather(*[
+            self._run_blocking(list_all, namespace) for namespace in await self.list_namespaces()
+        ])
+        return [vector_id for ids in per_namespace for vector_id in ids]
+    
+    async def fetch_vectors(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get stored vectors by ID, FETCH_BATCH_SIZE IDs per request.
+        
+        Args:
+            ids: List of vector IDs
             
-            # Extract embeddings from response
-            embedding = response.data[0].embedding
-            self.logger.debug(f"Generated embedding with {len(embedding)} dimensions")
+        Returns:
+            Dict[str, Dict[str, Any]]: Vectors with 'id', 'values' and 'metadata', keyed by ID
+        """
+        if self.vector_store is not None:
+            return await self.vector_store.fetch_vectors(ids)
+        
+        batches = [ids[start:start + self.FETCH_BATCH_SIZE] for start in range(0, len(ids), self.FETCH_BATCH_SIZE)]
+        responses = await asyncio.gather(*[
+            self._run_blocking(self.index.fetch, ids=batch, **self._namespace_kwargs(namespace))
+            for namespace in await self.list_namespaces()
+            for batch in batches
+        ])
+        return {
+            vector_id: {"id": vector_id, "values": list(vector.values), "metadata": vector.metadata or {}}
+            for response in responses
+            for vector_id, vector in response.vectors.items()
+        }
+    
+    def _namespace_kwargs(self, namespace: str) -> Dict[str, Any]:
+        """Namespace argument of an index call; omitted for unpartitioned indexes."""
+        return {"namespace": namespace} if self.namespace_policy.partitioned else {}
+    
+    def _group_by_namespace(self, vectors: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Split vectors by the namespace their metadata maps to."""
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for vector in vectors:
+            groups.setdefault(self.namespace_policy.namespace_for(vector.get("metadata")), []).append(vector)
+        if self.namespace_policy.partitioned and self.index_name in PineconeRepository._namespaces:
+            PineconeRepository._namespaces[self.index_name][1].update(groups)
+        return groups
+    
+    async def list_namespaces(self) -> List[str]:
+        """
+        Get the namespaces of the index that a query without a narrowing filter reads.
+        
+        Fixed by the policy where possible; otherwise listed from the index
+        stats, cached for NAMESPACE_CACHE_SECONDS.
+        
+        Returns:
+            List[str]: Namespaces
+        """
+        known = self.namespace_policy.known_namespaces()
+        if known is not None:
+            return known
+        
+        cached = PineconeRepository._namespaces.get(self.index_name)
+        if cached and time.monotonic() - cached[0] < self.NAMESPACE_CACHE_SECONDS:
+            return sorted(cached[1])
+        
+        stats = await self._run_blocking(self.index.describe_index_stats)
+        namespaces = set(stats.namespaces or {}) or {NamespacePolicy.SHARED_NAMESPACE}
+        PineconeRepository._namespaces[self.index_name] = (time.monotonic(), namespaces)
+        return sorted(namespaces)
+    
+    def _with_profile(self, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Prepare a vector's metadata for storage: compact it and record the embedding profile."""
+        metadata = self._compact(metadata or {}) if self.compact_metadata else (metadata or {})
+        return {**metadata, EmbeddingProfile.METADATA_FIELD: self.embedding_profile.name}
+    
+    @classmethod
+    def _compact(cls, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only the compact schema fields of vector metadata."""
+        return {key: value for key, value in metadata.items() if key in cls.COMPACT_METADATA_FIELDS}
+    
+    @staticmethod
+    def parent_id(vector_id: str) -> str:
+        """
+        Get the MongoDB ID of the item a vector belongs to from the vector ID.
+        
+        Chunk IDs are "<mongodb_id>_chunk_<digest>" (or "_chunk_<index>" for
+        older vectors); single-vector items use the MongoDB ID itself.
+        
+        Args:
+            vector_id: Vector ID
             
-            return embedding
+        Returns:
+            str: MongoDB ID
+        """
+        return vector_id.split("_chunk_", 1)[0]
+    
+    async def compact_stored_metadata(self, batch_size: int = 100) -> Dict[str, int]:
+        """
+        Rewrite existing vectors with the compact metadata schema.
+        
+        Pinecone metadata updates merge keys and cannot remove them, so each
+        vector is fetched and upserted again with its stored values; nothing
+        is re-embedded. Vectors that are already compact are skipped, so the
+        migration can be rerun after an interruption.
+        
+        Args:
+            batch_size: Vectors fetched and rewritten per request
             
-        except Exception as e:
-            self.logger.error(f"OpenAI embedding generation error: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Embedding generation error: {str(e)}")
+        Returns:
+            Dict[str, int]: Number of vectors 'scanned' and 'rewritten'
+        """
+        ids = await self.list_vector_ids("")
+        counts = {"scanned": 0, "rewritten": 0}
+        for start in range(0, len(ids), batch_size):
+            vectors = await self.fetch_vectors(ids[start:start + batch_size])
+            counts["scanned"] += len(vectors)
+            rewrites = [
+                {"id": vector_id, "values": vector["values"], "metadata": vector["metadata"]}
+                for vector_id, vector in vectors.items()
+                if set(vector["metadata"]) - set(self.COMPACT_METADATA_FIELDS)
+            ]
+            if rewrites:
+                await self.upsert_vectors(rewrites)
+                counts["rewritten"] += len(rewrites)
+            self.logger.info(f"Compacted metadata: {counts['rewritten']} of {counts['scanned']}/{len(ids)} vectors rewritten")
+        return counts
+    
+    def _invalidate_search_cache(self):
+        """Advance the index epoch so cached search results are not served after a write."""
+        if self.query_cache is not None:
+            self.query_cache.bump_epoch()
+        if self.search_sessions is not None:
+            self.search_sessions.bump_epoch()
     
     def _filter_none_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -383,36 +1367,24 @@ class PineconeRepository:
             str: Vector ID
         """
         try:
-            # Combine all text fields into a single string
-            combined_text = " ".join([
-                text_data.get("title", ""),
-                text_data.get("specified_text", ""),
-                text_data.get("content", ""),
-                text_data.get("file_text", ""),
-                " ".join(text_data.get("keywords", []))
-            ])
+            record = self.build_text_record(text_data, metadata)
+            vector_id = record["id"]
             
             self.logger.debug(f"Upserting vector with metadata: {metadata.get('mongodb_id', 'unknown')}")
             
             # Generate embedding
-            embedding = await self.generate_embeddings(combined_text)
-            
-            # Generate a unique ID if not provided
-            vector_id = metadata.get("id") or str(uuid.uuid4())
-            
-            # Filter out None values from metadata
-            filtered_metadata = self._filter_none_values(metadata)
+            embedding = await self.generate_embeddings(record["text"])
             
             # Upsert to Pinecone
-            self.index.upsert(
-                vectors=[
-                    {
-                        "id": vector_id,
-                        "values": embedding,
-                        "metadata": filtered_metadata
-                    }
-                ]
-            )
+            await self.upsert_vectors([
+                {
+                    "id": vector_id,
+                    "values": embedding,
+                    "metadata": record["metadata"]
+                }
+            ])
+            
+            await self._index_lexical(record["metadata"], [record["text"]])
             
             self.logger.info(f"Successfully upserted vector with ID: {vector_id}")
             return vector_id
@@ -421,6 +1393,41 @@ class PineconeRepository:
             self.logger.error(f"Pinecone upsert error: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Pinecone upsert error: {str(e)}")
     
+    async def upsert_text_records(self, records: List[Dict[str, Any]]) -> List[str]:
+        """
+        Embed and store the text records of many items at once.
+        
+        The texts of all items share token-sized embedding batches (see
+        generate_embeddings_batch) and one bulk upsert, instead of one
+        embedding request and one upsert per item.
+        
+        Args:
+            records: One record per item (see build_text_record)
+            
+        Returns:
+            List[str]: IDs of the records whose embedding failed; they were not stored
+        """
+        if not records:
+            return []
+        embeddings = await self.generate_embeddings_batch([record["text"] for record in records])
+        
+        vectors = []
+        failed_ids = []
+        for record, embedding in zip(records, embeddings):
+            if embedding is None:
+                failed_ids.append(record["id"])
+                continue
+            vectors.append({"id": record["id"], "values": embedding, "metadata": record["metadata"]})
+        if vectors:
+            await self.upsert_vectors(vectors)
+        
+        for record, embedding in zip(records, embeddings):
+            if embedding is not None:
+                await self._index_lexical(record["metadata"], [record["text"]])
+        
+        self.logger.info(f"Stored {len(vectors)}/{len(records)} text records in bulk")
+        return failed_ids
+    
     async def delete_vector(self, vector_id: str) -> bool:
         """
         Delete vector from Pinecone.
@@ -431,16 +1438,74 @@ class PineconeRepository:
         Returns:
             bool: True if deletion successful
         """
-        try:
-            self.logger.info(f"Deleting vector with ID: {vector_id}")
-            self.index.delete(ids=[vector_id])
-            self.logger.info(f"Successfully deleted vector with ID: {vector_id}")
+        self.logger.info(f"Deleting vector with ID: {vector_id}")
+        return await self.delete_vectors([vector_id])
+    
+    async def delete_document(self, mongodb_id: str, vector_ids: List[str]) -> bool:
+        """
+        Delete a data ingestion item's vectors and its keyword index entry.
+        
+        Args:
+            mongodb_id: MongoDB ID of the item
+            vector_ids: IDs of the item's vectors
+            
+        Returns:
+            bool: True if deletion successful
+        """
+        if self.lexical_index is not None:
+            await self._run_blocking(self.lexical_index.remove_document, mongodb_id)
+            self._invalidate_search_cache()
+        if not vector_ids:
             return True
-        except Exception as e:
-            self.logger.error(f"Pinecone delete error: {str(e)}")
-            return False
+        return await self.delete_vectors(vector_ids)
+    
+    @staticmethod
+    def build_metadata_filter(
+        data_type: Optional[str] = None,
+        user_id: Optional[str] = None,
+        title: Optional[str] = None,
+        keywords: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build a metadata filter that is evaluated inside the vector index query.
+        
+        Only exact matches can be pushed down; substring matching (e.g. title_like)
+        has to be applied after the query.
+        
+        Args:
+            data_type: Exact data type
+            user_id: Exact owner user ID
+            title: Exact title (only stored with VECTOR_METADATA_COMPACT disabled)
+            keywords: Match vectors carrying any of these keywords (only stored
+                with VECTOR_METADATA_COMPACT disabled)
+            
+        Returns:
+            Optional[Dict[str, Any]]: Pinecone filter, or None if no condition was given
+        """
+        conditions = []
+        if data_type:
+            conditions.append({"data_type": {"$eq": getattr(data_type, "value", data_type)}})
+        if user_id:
+            conditions.append({"user_id": {"$eq": user_id}})
+        if title:
+            conditions.append({"title": {"$eq": title}})
+        if keywords:
+            conditions.append({"keywords": {"$in": list(keywords)}})
+        
+        if not conditions:
+            return None
+        if len(conditions) == 1:
+            return conditions[0]
+        return {"$and": conditions}
     
-    async def search(self, query: str, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+    async def search(
+        self,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        filter: Optional[Dict[str, Any]] = None,
+        diversify: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         Perform semantic search using query text.
         
@@ -448,58 +1513,25 @@ class PineconeRepository:
             query: Query text
             limit: Maximum number of results
             offset: Number of results to skip (for pagination)
+            filter: Optional metadata filter applied inside the index query
+                (see build_metadata_filter)
+            diversify: Whether to select results by Maximal Marginal Relevance,
+                dropping near-duplicates (vector ranking only, not cached)
             
         Returns:
             List[Dict[str, Any]]: List of search results with metadata and scores
         """
         try:
-            self.logger.info(f"Performing semantic search with query: '{query}' (limit: {limit}, offset: {offset})")
+            self.logger.info(f"Performing semantic search with query: '{query}' (limit: {limit}, offset: {offset}, filter: {filter})")
             
-            # Generate embedding for query
-            query_embedding = await self.generate_embeddings(query)
+            if diversify:
+                formatted_results = await self._diverse_search(query, limit + offset, filter)
+                return formatted_results[offset:offset + limit]
             
             # Query Pinecone with a higher limit to account for chunked documents
             # We'll need to group by mongodb_id later
             raw_limit = (limit + offset) * 3  # Get more results to account for chunking
-            results = self.index.query(
-                vector=query_embedding,
-                top_k=raw_limit,  # Get extra results
-                include_metadata=True
-            )
-            
-            # Group results by mongodb_id and take the highest scoring match
-            grouped_results = {}
-            for match in results.matches:
-                mongodb_id = match.metadata.get("mongodb_id")
-                if not mongodb_id:
-                    continue
-                
-                # If we haven't seen this ID yet, or if this match has a higher score
-                if mongodb_id not in grouped_results or match.score > grouped_results[mongodb_id]["score"]:
-                    # Store the match with its score
-                    grouped_results[mongodb_id] = {
-                        "id": mongodb_id,
-                        "title": match.metadata.get("title"),
-                        "specified_text": match.metadata.get("specified_text"),
-                        "data_type": match.metadata.get("data_type"),
-                        "content": match.metadata.get("content"),
-                        "reference": match.metadata.get("reference"),
-                        "file_url": match.metadata.get("file_url"),
-                        "webpage_url": match.metadata.get("webpage_url"),
-                        "source_type": match.metadata.get("source_type", "text"),
-                        "user_id": match.metadata.get("user_id"),
-                        "similarity_score": match.score,
-                        # Include chunk information if available
-                        "chunk_id": match.metadata.get("chunk_id"),
-                        "chunk_index": match.metadata.get("chunk_index"),
-                        "total_chunks": match.metadata.get("total_chunks"),
-                        # Include source metadata string if available
-                        "source_metadata_str": match.metadata.get("source_metadata_str")
-                    }
-            
-            # Convert to list and sort by score
-            formatted_results = list(grouped_results.values())
-            formatted_results.sort(key=lambda x: x["similarity_score"], reverse=True)
+            formatted_results = await self._ranked_search(query, raw_limit, filter)
             
             # Apply pagination
             paginated_results = formatted_results[offset:offset + limit] if offset > 0 else formatted_results[:limit]
@@ -511,6 +1543,307 @@ class PineconeRepository:
             self.logger.error(f"Pinecone search error: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Semantic search error: {str(e)}")
     
+    async def open_search_session(self, query: str, filter: Optional[Dict[str, Any]] = None) -> SearchSession:
+        """
+        Rank up to SEARCH_SESSION_MAX_RESULTS documents for a query once and keep
+        them for paging.
+        
+        Repeated calls with the same query and filter share the live session, so
+        a count followed by a page costs a single embedding and index query.
+        
+        Args:
+            query: Query text
+            filter: Optional metadata filter applied inside the index query
+            
+        Returns:
+            SearchSession: Session holding the ranked results
+        """
+        try:
+            return await self.search_sessions.get_or_create(
+                self.index_name,
+                query,
+                filter,
+                lambda: self._query_index(query, self.search_session_max_results, filter)
+            )
+        except Exception as e:
+            self.logger.error(f"Pinecone search session error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Semantic search error: {str(e)}")
+    
+    def get_search_session(self, cursor: str) -> Optional[tuple]:
+        """
+        Resolve a cursor returned by an earlier search.
+        
+        Args:
+            cursor: Opaque cursor from SearchSession.cursor
+            
+        Returns:
+            Optional[tuple]: (SearchSession, offset), or None if the session has expired
+                or belongs to an index that no longer serves reads
+            
+        Raises:
+            HTTPException: If the cursor is malformed
+        """
+        try:
+            return self.search_sessions.resolve_cursor(cursor, self.index_name)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    async def _embed_query(self, query: str) -> List[float]:
+        """
+        Get the embedding of a search query, served from the query cache when possible.
+        
+        Args:
+            query: Query text
+            
+        Returns:
+            List[float]: Query embedding
+        """
+        if self.query_cache is None:
+            return await self.generate_embeddings(query)
+        # The cache is shared by every repository in the process, so it holds raw vectors
+        embedding = await self.query_cache.get_or_compute(
+            self.query_cache.embeddings,
+            (self.embedding_model, self.embedding_dimensions, query),
+            lambda: self._raw_embedding(query)
+        )
+        return self.embedding_profile.prepare(embedding)
+    
+    async def _ranked_search(self, query: str, top_k: int, filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Get the ranked, grouped matches for a query, served from the query cache when possible.
+        
+        Cached lists are keyed by the index name and epoch, so an alias
+        switch, upsert or delete invalidates them.
+        
+        Args:
+            query: Query text
+            top_k: Number of raw matches to request from the index
+            filter: Optional Pinecone metadata filter
+            
+        Returns:
+            List[Dict[str, Any]]: Results grouped by mongodb_id, best score first
+        """
+        if self.query_cache is None:
+            return await self._query_index(query, top_k, filter)
+        
+        key = (QueryCache.results_key(query, filter, top_k), self.index_name, self.query_cache.epoch)
+        results = await self.query_cache.get_or_compute(
+            self.query_cache.results,
+            key,
+            lambda: self._query_index(query, top_k, filter)
+        )
+        # Callers annotate results in place; never hand out the cached dicts
+        return [dict(result) for result in results]
+    
+    async def _query_index(self, query: str, top_k: int, filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Rank documents for a query, combining the keyword and vector indexes.
+        
+        The keyword and vector rankings are merged with reciprocal rank
+        fusion, strong keyword matches first. The vector index is always
+        queried, so a lexical index missing items still yields full results.
+        
+        Args:
+            query: Query text
+            top_k: Number of raw matches to request from the index
+            filter: Optional Pinecone metadata filter
+            
+        Returns:
+            List[Dict[str, Any]]: Results grouped by mongodb_id, best first
+        """
+        if self.lexical_index is None:
+            return await self._query_vectors_grouped(query, top_k, filter)
+        
+        lexical, vector_results = await asyncio.gather(
+            self._run_blocking(self.lexical_index.search, query, top_k, filter),
+            self._query_vectors_grouped(query, top_k, filter)
+        )
+        return self._fuse_rankings(self._format_lexical_results(lexical["results"]), vector_results)
+    
+    @staticmethod
+    def _format_lexical_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Shape lexical index results like grouped vector results.
+        
+        Scores are scaled to 0-1 by the best score; strong matches score 1.
+        
+        Args:
+            results: Results of LexicalIndex.search
+            
+        Returns:
+            List[Dict[str, Any]]: Results in the same order
+        """
+        top_score = max((result["score"] for result in results), default=0.0) or 1.0
+        formatted = []
+        for result in results:
+            metadata = result["metadata"]
+            formatted.append({
+                "id": result["id"],
+                "title": metadata.get("title"),
+                "specified_text": metadata.get("specified_text"),
+                "data_type": metadata.get("data_type"),
+                "content": metadata.get("content"),
+                "reference": metadata.get("reference"),
+                "file_url": metadata.get("file_url"),
+                "webpage_url": metadata.get("webpage_url"),
+                "source_type": metadata.get("source_type", "text"),
+                "user_id": metadata.get("user_id"),
+                "similarity_score": 1.0 if result["strong"] else result["score"] / top_score,
+                "chunk_id": None,
+                "chunk_index": None,
+                "source_metadata_str": None,
+                "match_type": "exact" if result["strong"] else "lexical"
+            })
+        return formatted
+    
+    def _fuse_rankings(
+        self,
+        lexical_results: List[Dict[str, Any]],
+        vector_results: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Merge lexical and vector rankings with reciprocal rank fusion.
+        
+        Every document scores 1 / (LEXICAL_RRF_K + rank) per ranking it appears
+        in. Documents found by the vector index keep its fields and similarity
+        score; strong keyword matches ('exact') rank ahead of the rest.
+        
+        Args:
+            lexical_results: Formatted lexical results, best first
+            vector_results: Grouped vector results, best first
+            
+        Returns:
+            List[Dict[str, Any]]: Merged results with 'rrf_score' and
+                'match_type', best first
+        """
+        fused: Dict[str, Dict[str, Any]] = {}
+        for rank, result in enumerate(vector_results, start=1):
+            fused[result["id"]] = {**result, "match_type": "vector", "rrf_score": 1.0 / (self.rrf_k + rank)}
+        for rank, result in enumerate(lexical_results, start=1):
+            score = 1.0 / (self.rrf_k + rank)
+            if result["id"] in fused:
+                fused[result["id"]]["rrf_score"] += score
+                fused[result["id"]]["match_type"] = "exact" if result["match_type"] == "exact" else "hybrid"
+            else:
+                fused[result["id"]] = {**result, "rrf_score": score}
+        
+        results = list(fused.values())
+        results.sort(key=lambda x: (x["match_type"] == "exact", x["rrf_score"]), reverse=True)
+        return results
+    
+    async def _query_vectors_grouped(
+        self,
+        query: str,
+        top_k: int,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Embed the query, query Pinecone and group the matches by mongodb_id.
+        
+        With compact metadata the query returns IDs and scores only: the item
+        is read from the vector ID and display fields are left for the caller
+        to hydrate from MongoDB.
+        
+        Args:
+            query: Query text
+            top_k: Number of raw matches to request from the index
+            filter: Optional Pinecone metadata filter
+            
+        Returns:
+            List[Dict[str, Any]]: Results grouped by mongodb_id, best score first
+        """
+        # Generate embedding for query
+        query_embedding = await self._embed_query(query)
+        
+        matches = await self.query_vectors(
+            query_embedding, top_k=top_k, filter=filter, include_metadata=not self.compact_metadata
+        )
+        return self._group_matches(matches)[0]
+    
+    def _group_matches(self, matches: List[Dict[str, Any]]) -> tuple:
+        """
+        Group index matches by mongodb_id, keeping each document's best match.
+        
+        Args:
+            matches: Matches of query_vectors
+            
+        Returns:
+            tuple: Results best score first, and the best match of each document
+                keyed by mongodb_id
+        """
+        grouped_results = {}
+        best_matches = {}
+        for match in matches:
+            metadata = match["metadata"]
+            mongodb_id = metadata.get("mongodb_id")
+            if not mongodb_id and self.compact_metadata:
+                mongodb_id = self.parent_id(match["id"])
+            if not mongodb_id:
+                continue
+            
+            # If we haven't seen this ID yet, or if this match has a higher score
+            if mongodb_id not in grouped_results or match["score"] > grouped_results[mongodb_id]["similarity_score"]:
+                # Store the match with its score
+                best_matches[mongodb_id] = match
+                grouped_results[mongodb_id] = {
+                    "id": mongodb_id,
+                    "title": metadata.get("title"),
+                    "specified_text": metadata.get("specified_text"),
+                    "data_type": metadata.get("data_type"),
+                    "content": metadata.get("content"),
+                    "reference": metadata.get("reference"),
+                    "file_url": metadata.get("file_url"),
+                    "webpage_url": metadata.get("webpage_url"),
+                    "source_type": metadata.get("source_type", "text"),
+                    "user_id": metadata.get("user_id"),
+                    "similarity_score": match["score"],
+                    # Include chunk information if available
+                    "chunk_id": metadata.get("chunk_id", match["id"] if self.compact_metadata else None),
+                    "chunk_index": metadata.get("chunk_index"),
+                    # Include source metadata string if available
+                    "source_metadata_str": metadata.get("source_metadata_str")
+                }
+        
+        # Convert to list and sort by score
+        formatted_results = list(grouped_results.values())
+        formatted_results.sort(key=lambda x: x["similarity_score"], reverse=True)
+        
+        return formatted_results, best_matches
+    
+    async def _diverse_search(self, query: str, k: int, filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Rank documents by Maximal Marginal Relevance instead of similarity alone.
+        
+        Fetches SEARCH_MMR_FETCH_FACTOR times more candidates with their vector
+        values, groups them by document and selects k documents whose best
+        chunks are relevant to the query but not near-duplicates of each other.
+        
+        Args:
+            query: Query text
+            k: Number of documents to select
+            filter: Optional Pinecone metadata filter
+            
+        Returns:
+            List[Dict[str, Any]]: Selected results in selection order
+        """
+        query_embedding = await self._embed_query(query)
+        matches = await self.query_vectors(
+            query_embedding,
+            top_k=k * self.mmr_fetch_factor,
+            filter=filter,
+            include_values=True,
+            include_metadata=not self.compact_metadata
+        )
+        results, best_matches = self._group_matches(matches)
+        order = maximal_marginal_relevance(
+            query_embedding,
+            [best_matches[result["id"]]["values"] for result in results],
+            k,
+            lambda_mult=self.mmr_lambda
+        )
+        self.logger.debug(f"MMR kept {len(order)} of {len(results)} candidate documents")
+        return [results[index] for index in order]
+    
     # For backward compatibility
     async def semantic_search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -541,7 +1874,7 @@ class PineconeRepository:
             self.logger.debug(f"Generating keywords from text (length: {len(text)})")
             
             # Use OpenAI to generate keywords
-            response = self.openai_client.chat.completions.create(
+            response = await self.openai_client.chat.completions.create(
                 model=self.openai_model,
                 messages=[
                     {"role": "system", "content": f"Generate exactly {max_keywords} relevant keywords in Thai language from the following text. Return only the keywords separated by commas, no explanations:"},
@@ -0,0 +1,186 @@
+"""
+In-process caches for semantic search: query embeddings and ranked results.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from src.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Least-recently-used cache whose entries also expire after a TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entries if full."""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one upstream call.
+
+    The upstream call runs in its own task, which no caller owns: a caller
+    that is cancelled (e.g. on a client disconnect) only stops waiting, while
+    the call goes on for the others and still fills the cache.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.shared_calls = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once for all concurrent callers of key.
+
+        Args:
+            key: Identity of the call
+            fn: Coroutine factory performing the upstream call
+
+        Returns:
+            Any: Result of fn, shared by every waiting caller
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.shared_calls += 1
+        else:
+            task = asyncio.get_running_loop().create_task(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a finished call, marking its exception as retrieved when nobody was waiting."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()
+
+
+class QueryCache:
+    """
+    Two-level cache for semantic search.
+
+    Query embeddings are cached by query text. Ranked match lists are cached by
+    (query, filter, top_k) together with the index epoch, a counter bumped on
+    every upsert or delete so that writes invalidate earlier results. The epoch
+    is per process; in multi-worker deployments the TTL bounds how long another
+    worker's writes can go unseen.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 300,
+        embedding_ttl_seconds: float = 3600,
+        single_flight: bool = True
+    ):
+        self.embeddings = TTLCache(max_entries, embedding_ttl_seconds)
+        self.results = TTLCache(max_entries, ttl_seconds)
+        self.single_flight = SingleFlight() if single_flight else None
+        self.epoch = 0
+
+    def bump_epoch(self) -> int:
+        """Invalidate cached results after the index changed."""
+        self.epoch += 1
+        return self.epoch
+
+    @staticmethod
+    def results_key(query: str, filter: Optional[Dict[str, Any]], top_k: int) -> str:
+        """Build a stable key for a ranked result list."""
+        return json.dumps([query, filter, top_k], sort_keys=True, ensure_ascii=False, default=str)
+
+    async def get_or_compute(self, cache: TTLCache, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return a cached value or compute it, sharing in-flight computations.
+
+        Args:
+            cache: Cache level to use
+            key: Cache key
+            compute: Coroutine factory producing the value on a miss
+
+        Returns:
+            Any: Cached or freshly computed value
+        """
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        async def load():
+            value = await compute()
+            cache.set(key, value)
+            return value
+
+        if self.single_flight is None:
+            return await load()
+        return await self.single_flight.do((id(cache), key), load)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counters for both cache levels."""
+        return {
+            "epoch": self.epoch,
+            "embeddings": dict(self.embeddings.stats, size=len(self.embeddings)),
+            "results": dict(self.results.stats, size=len(self.results)),
+            "shared_calls": self.single_flight.shared_calls if self.single_flight else 0
+        }
+
+
+@lru_cache()
+def get_query_cache() -> Optional[QueryCache]:
+    """
+    Get the process-wide query cache.
+
+    Repositories are created per request, so the cache lives at module level.
+
+    Returns:
+        Optional[QueryCache]: The shared cache, or None if disabled in settings
+    """
+    settings = get_settings()
+    if not settings.QUERY_CACHE_ENABLED:
+        return None
+    return QueryCache(
+        max_entries=settings.QUERY_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.QUERY_CACHE_TTL_SECONDS,
+        embedding_ttl_seconds=settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+        single_flight=settings.QUERY_CACHE_SINGLE_FLIGHT
+    )
@@ -0,0 +1,178 @@
+"""
+Search sessions: a query's ranked result list, computed once and paged from memory.
+"""
+import base64
+import json
+import logging
+import uuid
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.config.settings import get_settings
+from src.interface.repository.pinecone.query_cache import SingleFlight, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class SearchSession:
+    """
+    Ranked results of one (query, filter) search, grouped by mongodb_id.
+
+    Pages and counts are sliced from the stored list, so paging deeper costs
+    nothing extra. Lists derived from it by post-filters (for example title
+    substring matches) are memoized on the session as well.
+    """
+
+    def __init__(
+        self,
+        query: str,
+        filter: Optional[Dict[str, Any]],
+        results: List[Dict[str, Any]],
+        index_name: Optional[str] = None
+    ):
+        self.session_id = uuid.uuid4().hex
+        self.index_name = index_name
+        self.query = query
+        self.filter = filter
+        self.results = results
+        self.filtered_results: Dict[str, List[Dict[str, Any]]] = {}
+
+    @property
+    def total(self) -> int:
+        """Number of distinct documents matched."""
+        return len(self.results)
+
+    def page(self, offset: int, limit: int, results: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Get one page of results.
+
+        Args:
+            offset: Number of results to skip
+            limit: Maximum number of results
+            results: Derived result list to page instead of the full ranking
+
+        Returns:
+            List[Dict[str, Any]]: Copies of the results on the page
+        """
+        source = self.results if results is None else results
+        return [dict(result) for result in source[offset:offset + limit]]
+
+    def cursor(self, offset: int) -> str:
+        """
+        Build an opaque cursor pointing at offset within this session.
+
+        Args:
+            offset: Position of the first result of the page
+
+        Returns:
+            str: URL-safe cursor
+        """
+        payload = json.dumps({"s": self.session_id, "o": offset}).encode("utf-8")
+        return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, int]:
+        """
+        Decode a cursor into (session_id, offset).
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            return str(payload["s"]), int(payload["o"])
+        except Exception as e:
+            raise ValueError(f"Invalid search cursor: {cursor}") from e
+
+
+class SearchSessionStore:
+    """
+    TTL cache of search sessions, addressable by (index, query, filter) for
+    repeat requests and by session ID for cursors.
+
+    Index writes advance the epoch: later requests open fresh sessions, while
+    cursors into existing sessions keep paging the snapshot they started on.
+    Sessions belong to the index they ranked, so once the index alias points
+    elsewhere neither repeat requests nor cursors reach them.
+    """
+
+    def __init__(self, max_sessions: int = 256, ttl_seconds: float = 600):
+        self._by_key = TTLCache(max_sessions, ttl_seconds)
+        self._by_id = TTLCache(max_sessions, ttl_seconds)
+        self._single_flight = SingleFlight()
+        self.epoch = 0
+
+    def bump_epoch(self):
+        """Stop reusing sessions opened before an index write."""
+        self.epoch += 1
+
+    @staticmethod
+    def _key(index_name: str, query: str, filter: Optional[Dict[str, Any]], epoch: int) -> str:
+        return json.dumps([index_name, query, filter, epoch], sort_keys=True, ensure_ascii=False, default=str)
+
+    async def get_or_create(
+        self,
+        index_name: str,
+        query: str,
+        filter: Optional[Dict[str, Any]],
+        rank: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    ) -> SearchSession:
+        """
+        Get the live session for a search, ranking it once if there is none.
+
+        Args:
+            index_name: Index the results are ranked from
+            query: Query text
+            filter: Metadata filter
+            rank: Coroutine factory returning the ranked, grouped results
+
+        Returns:
+            SearchSession: The session
+        """
+        key = self._key(index_name, query, filter, self.epoch)
+        session = self._by_key.get(key)
+        if session is not None:
+            return session
+
+        async def create() -> SearchSession:
+            created = SearchSession(query, filter, await rank(), index_name=index_name)
+            self._by_key.set(key, created)
+            self._by_id.set(created.session_id, created)
+            logger.info(f"Opened search session {created.session_id} with {created.total} results")
+            return created
+
+        return await self._single_flight.do(key, create)
+
+    def resolve_cursor(self, cursor: str, index_name: str) -> Optional[Tuple[SearchSession, int]]:
+        """
+        Find the session and offset a cursor points at.
+
+        Args:
+            cursor: Cursor from SearchSession.cursor
+            index_name: Index currently serving reads
+
+        Returns:
+            Optional[Tuple[SearchSession, int]]: Session and offset, or None if the
+                session expired or was ranked from another index
+        """
+        session_id, offset = SearchSession.decode_cursor(cursor)
+        session = self._by_id.get(session_id)
+        if session is None or session.index_name != index_name:
+            return None
+        return session, offset
+
+
+@lru_cache()
+def get_search_session_store() -> SearchSessionStore:
+    """
+    Get the process-wide search session store.
+
+    Returns:
+        SearchSessionStore: The shared store
+    """
+    settings = get_settings()
+    return SearchSessionStore(
+        max_sessions=settings.SEARCH_SESSION_MAX_SESSIONS,
+        ttl_seconds=settings.SEARCH_SESSION_TTL_SECONDS
+    )
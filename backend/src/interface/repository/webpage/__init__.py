@@ -0,0 +1,4 @@
+from src.interface.repository.webpage.webpage_cache import LocalWebpageCache, S3WebpageCache, WebpageCache
+from src.interface.repository.webpage.webpage_fetcher import WebpageFetcher
+
+__all__ = ["LocalWebpageCache", "S3WebpageCache", "WebpageCache", "WebpageFetcher"]
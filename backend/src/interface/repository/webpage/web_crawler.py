@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import re
+import xml.etree.ElementTree as ElementTree
+from html.parser import HTMLParser
+from typing import Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+import httpx
+
+from src.interface.repository.webpage.webpage_fetcher import WebpageFetcher
+
+logger = logging.getLogger(__name__)
+
+
+class _LinkParser(HTMLParser):
+    """Collects the href of every <a> tag."""
+
+    def __init__(self):
+        super().__init__()
+        self.links: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.links.append(href)
+
+
+class WebCrawler:
+    """
+    Crawls a site breadth-first from a seed page or a sitemap.
+
+    Every page goes through the WebpageFetcher (so the webpage cache is filled
+    and revalidated) on one shared HTTP client. Fetches are bounded globally
+    and per host, and fetched pages are handed to the consumer through a
+    bounded queue, so a slow consumer slows the crawl down instead of
+    buffering the whole site.
+    """
+
+    # Nested sitemap indexes followed at most
+    MAX_SITEMAP_DEPTH = 3
+
+    def __init__(
+        self,
+        fetcher: WebpageFetcher,
+        max_concurrency: int = 16,
+        per_host_concurrency: int = 4,
+        max_pages: int = 1000
+    ):
+        """
+        Args:
+            fetcher: Fetcher of the pages
+            max_concurrency: Pages fetched at once overall
+            per_host_concurrency: Pages fetched at once from one host
+            max_pages: Pages fetched at most per crawl
+        """
+        self.fetcher = fetcher
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self.max_pages = max_pages
+        self.stats: Dict[str, int] = {"fetched": 0, "not_modified": 0, "failed": 0, "skipped": 0}
+
+    @staticmethod
+    def extract_links(url: str, body: bytes, encoding: Optional[str] = None) -> List[str]:
+        """
+        Get the absolute http(s) links of a page, without fragments, in page order.
+
+        Args:
+            url: Page URL, to resolve relative links against
+            body: Response body
+            encoding: Charset from the response headers
+
+        Returns:
+            List[str]: Unique links
+        """
+        parser = _LinkParser()
+        parser.feed(body.decode(encoding or "utf-8", errors="replace"))
+        links = []
+        for href in parser.links:
+            link = urldefrag(urljoin(url, href.strip()))[0]
+            if link.startswith(("http://", "https://")):
+                links.append(link)
+        return list(dict.fromkeys(links))
+
+    @staticmethod
+    def parse_sitemap(body: bytes) -> Dict[str, List[str]]:
+        """
+        Get the URLs listed in a sitemap or sitemap index.
+
+        Args:
+            body: Sitemap XML
+
+        Returns:
+            Dict[str, List[str]]: Page URLs under 'pages', nested sitemaps under 'sitemaps'
+        """
+        root = ElementTree.fromstring(body)
+        locations = [
+            element.text.strip() for element in root.iter()
+            if element.tag.rsplit("}", 1)[-1] == "loc" and element.text
+        ]
+        if root.tag.rsplit("}", 1)[-1] == "sitemapindex":
+            return {"pages": [], "sitemaps": locations}
+        return {"pages": locations, "sitemaps": []}
+
+    async def _sitemap_pages(self, client: httpx.AsyncClient, sitemap_url: str) -> List[str]:
+        """Get the page URLs of a sitemap, following sitemap indexes."""
+        pages: List[str] = []
+        sitemaps = [sitemap_url]
+        for _ in range(self.MAX_SITEMAP_DEPTH):
+            nested: List[str] = []
+            for url in sitemaps:
+                response = await client.get(url)
+                response.raise_for_status()
+                parsed = self.parse_sitemap(response.content)
+                pages.extend(parsed["pages"])
+                nested.extend(parsed["sitemaps"])
+            if not nested:
+                break
+            sitemaps = nested
+        return list(dict.fromkeys(pages))
+
+    async def crawl(
+        self,
+        seed_url: str,
+        include_pattern: Optional[str] = None,
+        depth: int = 1,
+        sitemap: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Fetch the pages of a site.
+
+        Links are followed up to depth hops from the seed (or from the sitemap
+        pages). Without include_pattern only pages on the seed's host are
+        crawled; with it, only URLs matching the pattern (re.search) are,
+        though the seed page itself is always fetched and followed.
+
+        Args:
+            seed_url: First page, or the sitemap with sitemap=True
+            include_pattern: Regular expression URLs must match
+            depth: Link hops followed from the seed
+            sitemap: Whether seed_url is a sitemap (or sitemap index)
+
+        Yields:
+            Dict[str, Any]: 'url', 'depth' and the 'page' (see WebpageFetcher.fetch),
+                in completion order
+        """
+        include = re.compile(include_pattern) if include_pattern else None
+        seed_host = urlsplit(seed_url).netloc
+
+        def allowed(url: str) -> bool:
+            if include is not None:
+                return bool(include.search(url))
+            return urlsplit(url).netloc == seed_host
+
+        pages: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrency * 2)
+        slots = asyncio.Semaphore(self.max_concurrency)
+        host_slots: Dict[str, asyncio.Semaphore] = {}
+        seen = set()
+        done = object()
+
+        async with httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=WebpageFetcher.TIMEOUT,
+            limits=httpx.Limits(max_connections=self.max_concurrency)
+        ) as client:
+
+            async def visit(url: str, level: int) -> List[str]:
+                host_slot = host_slots.setdefault(urlsplit(url).netloc, asyncio.Semaphore(self.per_host_concurrency))
+                # Wait for the host first, so a busy host does not hold global slots
+                async with host_slot, slots:
+                    try:
+                        page = await self.fetcher.fetch(url, client=client)
+                    except Exception as e:
+                        self.stats["failed"] += 1
+                        logger.warning(f"Crawl fetch of {url} failed: {str(e)}")
+                        return []
+                self.stats["not_modified" if page["not_modified"] else "fetched"] += 1
+                if url != seed_url or include is None or include.search(url):
+                    await pages.put({"url": url, "depth": level, "page": page})
+                if level >= depth:
+                    return []
+                return await asyncio.get_running_loop().run_in_executor(
+                    None, self.extract_links, url, page["body"], page["encoding"]
+                )
+
+            async def produce():
+                try:
+                    if sitemap:
+                        frontier = [url for url in await self._sitemap_pages(client, seed_url) if allowed(url)]
+                    else:
+                        frontier = [seed_url]
+                    for level in range(depth + 1):
+                        frontier = [url for url in dict.fromkeys(frontier) if url not in seen]
+                        room = self.max_pages - len(seen)
+                        if len(frontier) > room:
+                            self.stats["skipped"] += len(frontier) - room
+                            frontier = frontier[:max(room, 0)]
+                        if not frontier:
+                            break
+                        seen.update(frontier)
+                        links = await asyncio.gather(*(visit(url, level) for url in frontier))
+                        frontier = [link for page_links in links for link in page_links if allowed(link)]
+                finally:
+                    await pages.put(done)
+
+            producer = asyncio.create_task(produce())
+            try:
+                while (item := await pages.get()) is not done:
+                    yield item
+                await producer
+            finally:
+                producer.cancel()
+        logger.info(f"Crawl of {seed_url} finished: {self.stats}")
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+
+class WebpageCache(ABC):
+    """
+    Raw webpage responses keyed by URL, kept for conditional re-fetching.
+
+    An entry is a JSON-serializable dict (validators, content hash, which
+    indexes the content was ingested into) plus the response body. Methods are
+    blocking; callers run them off the event loop.
+    """
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Storage key of a URL."""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    @abstractmethod
+    def get(self, url: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """
+        Get the cached response of a URL.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], bytes]]: Entry and body, or None if not cached
+        """
+
+    @abstractmethod
+    def put(self, url: str, entry: Dict[str, Any], body: Optional[bytes] = None):
+        """
+        Store the response of a URL.
+
+        Args:
+            url: Page URL
+            entry: Entry to store
+            body: Response body; None keeps the cached body
+        """
+
+
+class LocalWebpageCache(WebpageCache):
+    """
+    Webpage cache in a local directory, bounded in size.
+
+    When the bodies exceed max_bytes, the least recently used entries are
+    removed (file modification times are touched on every hit).
+    """
+
+    # One instance per directory; repositories are created per request
+    _instances: Dict[str, "LocalWebpageCache"] = {}
+
+    def __init__(self, path: str, max_bytes: int):
+        """
+        Open or create a webpage cache.
+
+        Args:
+            path: Directory holding the cached responses
+            max_bytes: Maximum total size of the cached bodies
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+        self._sizes: Dict[str, int] = {}
+        for name in os.listdir(path):
+            if name.endswith(".body"):
+                self._sizes[name[:-len(".body")]] = os.path.getsize(os.path.join(path, name))
+
+    @classmethod
+    def get_instance(cls, path: str, max_bytes: int) -> "LocalWebpageCache":
+        """
+        Get the shared cache for a directory, opening it on first use.
+
+        Args:
+            path: Directory holding the cached responses
+            max_bytes: Maximum total size of the cached bodies
+
+        Returns:
+            LocalWebpageCache: The cache for path
+        """
+        key = os.path.abspath(path)
+        if key not in cls._instances:
+            cls._instances[key] = cls(path, max_bytes)
+        return cls._instances[key]
+
+    def _files(self, key: str) -> Tuple[str, str]:
+        return os.path.join(self.path, f"{key}.json"), os.path.join(self.path, f"{key}.body")
+
+    def get(self, url: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        entry_file, body_file = self._files(self.key(url))
+        with self._lock:
+            try:
+                with open(entry_file, encoding="utf-8") as f:
+                    entry = json.load(f)
+                with open(body_file, "rb") as f:
+                    body = f.read()
+            except (OSError, ValueError):
+                return None
+            os.utime(body_file)
+        return entry, body
+
+    def put(self, url: str, entry: Dict[str, Any], body: Optional[bytes] = None):
+        key = self.key(url)
+        entry_file, body_file = self._files(key)
+        with self._lock:
+            if body is not None:
+                with open(f"{body_file}.tmp", "wb") as f:
+                    f.write(body)
+                os.replace(f"{body_file}.tmp", body_file)
+                self._sizes[key] = len(body)
+            with open(f"{entry_file}.tmp", "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(f"{entry_file}.tmp", entry_file)
+            if body is not None:
+                self._evict(keep=key)
+
+    def _evict(self, keep: str):
+        """Remove least recently used entries until the bodies fit in max_bytes."""
+        total = sum(self._sizes.values())
+        if total <= self.max_bytes:
+            return
+        by_age = sorted(
+            (key for key in self._sizes if key != keep),
+            key=lambda key: os.path.getmtime(self._files(key)[1])
+        )
+        for key in by_age:
+            if total <= self.max_bytes:
+                break
+            for file in self._files(key):
+                if os.path.exists(file):
+                    os.unlink(file)
+            total -= self._sizes.pop(key)
+        logger.debug(f"Webpage cache evicted down to {total} bytes")
+
+
+class S3WebpageCache(WebpageCache):
+    """
+    Webpage cache in an S3 bucket, shared by every server.
+
+    Size is not bounded here; expire old objects with a lifecycle rule on the prefix.
+    """
+
+    def __init__(self, bucket_name: str, prefix: str, s3_client=None):
+        """
+        Args:
+            bucket_name: Bucket holding the cached responses
+            prefix: Key prefix of the cached responses
+            s3_client: boto3 S3 client; created from the default credentials if None
+        """
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+        self.s3 = s3_client or boto3.client("s3")
+
+    def get(self, url: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        key = f"{self.prefix}{self.key(url)}"
+        try:
+            entry = json.loads(self.s3.get_object(Bucket=self.bucket_name, Key=f"{key}.json")["Body"].read())
+            body = self.s3.get_object(Bucket=self.bucket_name, Key=f"{key}.body")["Body"].read()
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("NoSuchKey", "404"):
+                logger.warning(f"Webpage cache read failed for {url}: {str(e)}")
+            return None
+        return entry, body
+
+    def put(self, url: str, entry: Dict[str, Any], body: Optional[bytes] = None):
+        key = f"{self.prefix}{self.key(url)}"
+        if body is not None:
+            self.s3.put_object(Bucket=self.bucket_name, Key=f"{key}.body", Body=body)
+        self.s3.put_object(
+            Bucket=self.bucket_name,
+            Key=f"{key}.json",
+            Body=json.dumps(entry, ensure_ascii=False).encode("utf-8"),
+            ContentType="application/json"
+        )
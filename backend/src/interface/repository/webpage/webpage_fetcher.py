@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from langchain_core.documents import Document
+
+from src.interface.repository.webpage.webpage_cache import WebpageCache
+
+logger = logging.getLogger(__name__)
+
+
+class WebpageFetcher:
+    """
+    Fetches webpages, revalidating cached copies with conditional requests.
+
+    A cached page is re-requested with If-None-Match / If-Modified-Since; on
+    304 Not Modified the cached body is reused without downloading it again.
+    Every fetch reports the SHA-256 of the body and the hashes it was last
+    ingested with, so callers can skip chunking and embedding a page whose
+    content did not change.
+    """
+
+    TIMEOUT = 60.0
+
+    # Same headers WebBaseLoader sends
+    HEADERS = {
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.5",
+    }
+
+    # Process-wide counters, see get_stats
+    stats: Dict[str, int] = {"fetched": 0, "not_modified": 0, "bytes_downloaded": 0}
+
+    def __init__(self, cache: Optional[WebpageCache] = None):
+        """
+        Args:
+            cache: Cache of raw responses; without one every fetch downloads the page
+        """
+        self.cache = cache
+
+    async def _run_blocking(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def fetch(self, url: str, client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+        """
+        Get a page, downloading it only if it changed since it was cached.
+
+        Cache failures are logged and the page is downloaded as if uncached.
+
+        Args:
+            url: Page URL
+            client: Shared HTTP client (e.g. of a crawl); a new one per fetch if None
+
+        Returns:
+            Dict[str, Any]: 'body' (bytes), 'encoding', 'content_hash',
+                'not_modified' (whether the server answered 304) and the
+                'ingested' content hashes keyed by ingestion target
+        """
+        cached = None
+        if self.cache is not None:
+            try:
+                cached = await self._run_blocking(self.cache.get, url)
+            except Exception as e:
+                logger.warning(f"Webpage cache read failed for {url}: {str(e)}")
+
+        headers = dict(self.HEADERS)
+        if cached:
+            entry = cached[0]
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        if client is not None:
+            response = await client.get(url, headers=headers)
+        else:
+            async with httpx.AsyncClient(follow_redirects=True, timeout=self.TIMEOUT) as own_client:
+                response = await own_client.get(url, headers=headers)
+
+        if cached and response.status_code == 304:
+            entry, body = cached
+            self.stats["not_modified"] += 1
+            logger.info(f"Webpage not modified: {url}")
+            entry["checked_at"] = time.time()
+            await self._store(url, entry)
+            return {**self._result(entry, body), "not_modified": True}
+
+        response.raise_for_status()
+        body = response.content
+        self.stats["fetched"] += 1
+        self.stats["bytes_downloaded"] += len(body)
+        content_hash = hashlib.sha256(body).hexdigest()
+        entry = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "encoding": response.charset_encoding,
+            "content_hash": content_hash,
+            # Hashes are per ingestion target, so an unchanged body stays ingested
+            "ingested": cached[0].get("ingested", {}) if cached else {},
+            "checked_at": time.time(),
+        }
+        await self._store(url, entry, body)
+        return {**self._result(entry, body), "not_modified": False}
+
+    @staticmethod
+    def _result(entry: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+        return {
+            "body": body,
+            "encoding": entry.get("encoding"),
+            "content_hash": entry["content_hash"],
+            "ingested": dict(entry.get("ingested", {})),
+        }
+
+    async def _store(self, url: str, entry: Dict[str, Any], body: Optional[bytes] = None):
+        if self.cache is None:
+            return
+        try:
+            await self._run_blocking(self.cache.put, url, entry, body)
+        except Exception as e:
+            logger.warning(f"Webpage cache write failed for {url}: {str(e)}")
+
+    async def mark_ingested(self, url: str, target: str, content_hash: str):
+        """
+        Record that a page's content was chunked and embedded into a target.
+
+        Args:
+            url: Page URL
+            target: Ingestion target, e.g. '<index name>:<item id>'
+            content_hash: Hash of the ingested body
+        """
+        if self.cache is None:
+            return
+        try:
+            cached = await self._run_blocking(self.cache.get, url)
+        except Exception as e:
+            logger.warning(f"Webpage cache read failed for {url}: {str(e)}")
+            return
+        if not cached or cached[0].get("content_hash") != content_hash:
+            return
+        entry = cached[0]
+        entry.setdefault("ingested", {})[target] = content_hash
+        await self._store(url, entry)
+
+    @staticmethod
+    def parse(url: str, body: bytes, encoding: Optional[str] = None) -> Document:
+        """
+        Extract the text of a page the way WebBaseLoader does.
+
+        Args:
+            url: Page URL
+            body: Response body
+            encoding: Charset from the response headers; detected from the page if None
+
+        Returns:
+            Document: Page text with 'source', 'title', 'description' and 'language' metadata
+        """
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(body, "html.parser", from_encoding=encoding)
+        metadata = {"source": url}
+        if title := soup.find("title"):
+            metadata["title"] = title.get_text()
+        if description := soup.find("meta", attrs={"name": "description"}):
+            metadata["description"] = description.get("content", "No description found.")
+        if html := soup.find("html"):
+            metadata["language"] = html.get("lang", "No language found.")
+        return Document(page_content=soup.get_text(), metadata=metadata)
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, int]:
+        """
+        Get the process-wide fetch counters.
+
+        Returns:
+            Dict[str, int]: Pages 'fetched', pages 'not_modified' and 'bytes_downloaded'
+        """
+        return dict(cls.stats)
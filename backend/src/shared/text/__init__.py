@@ -0,0 +1,5 @@
+from src.shared.text.tokens import count_tokens, truncate_to_tokens
+from src.shared.text.chunking import TokenChunker
+from src.shared.text.keywords import KeywordExtractor
+
+__all__ = ["count_tokens", "truncate_to_tokens", "TokenChunker", "KeywordExtractor"]
@@ -0,0 +1,146 @@
+"""
+Token-sized text chunking that keeps Thai sentences and legal sections intact.
+"""
+import re
+from typing import List, Tuple
+
+from src.shared.text.tokens import DEFAULT_ENCODING, count_tokens, truncate_to_tokens
+
+# Headings that start a new section in Thai legal text ("มาตรา 5", "หมวด ๒", ...)
+# and Markdown headings
+SECTION_PATTERN = re.compile(
+    r"^[ \t]*(?:(?:มาตรา|หมวด|ส่วนที่|ลักษณะ|บรรพ|บทที่|ภาค)[ \t]*[0-9๐-๙]|บทเฉพาะกาล|#{1,6}[ \t])",
+    re.MULTILINE
+)
+
+# Places a chunk may end inside a section: paragraph and line breaks, Latin
+# sentence ends, and the spaces Thai uses between sentences and clauses
+# (Thai has no spaces between words, so any space next to Thai text qualifies)
+BOUNDARY_PATTERN = re.compile(
+    r"\n[ \t]*\n\s*|\n|(?<=[.!?])[ \t]+|(?<=[\u0E00-\u0E7F])[ \t]+|[ \t]+(?=[\u0E00-\u0E7F])"
+)
+
+
+class TokenChunker:
+    """
+    Splits text into chunks of at most max_tokens tokens.
+
+    Sections (see SECTION_PATTERN) are kept whole whenever they fit, and small
+    neighbouring sections share a chunk. Larger sections are split at sentence
+    boundaries, with overlap_tokens of trailing sentences repeated at the start
+    of the next chunk of the same section. Only a single sentence longer than
+    max_tokens is cut mid-sentence.
+    """
+
+    def __init__(self, max_tokens: int = 500, overlap_tokens: int = 50, encoding_name: str = DEFAULT_ENCODING):
+        """
+        Args:
+            max_tokens: Maximum tokens per chunk
+            overlap_tokens: Tokens of context repeated between chunks of one section
+            encoding_name: tiktoken encoding used to count tokens
+        """
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = max(0, min(overlap_tokens, max_tokens // 2))
+        self.encoding_name = encoding_name
+
+    def _count(self, text: str) -> int:
+        return count_tokens(text, self.encoding_name)
+
+    def _sections(self, text: str) -> List[str]:
+        starts = sorted({0, *(match.start() for match in SECTION_PATTERN.finditer(text))})
+        return [text[start:end] for start, end in zip(starts, starts[1:] + [len(text)]) if text[start:end].strip()]
+
+    def _sentences(self, section: str) -> List[str]:
+        """Split a section into pieces that each keep their trailing separator."""
+        pieces = []
+        start = 0
+        for match in BOUNDARY_PATTERN.finditer(section):
+            if match.end() > start and match.start() > start:
+                pieces.append(section[start:match.end()])
+                start = match.end()
+        if start < len(section):
+            pieces.append(section[start:])
+        return pieces
+
+    def _hard_split(self, text: str) -> List[str]:
+        """Cut an over-long sentence into max_tokens pieces, at a space when one is near."""
+        parts = []
+        while text:
+            head = truncate_to_tokens(text, self.max_tokens, self.encoding_name) or text[:1]
+            cut = head.rfind(" ")
+            if len(head) < len(text) and cut > len(head) // 2:
+                head = head[:cut + 1]
+            parts.append(head)
+            text = text[len(head):]
+        return parts
+
+    def _units(self, text: str) -> List[Tuple[int, str, int]]:
+        """Get the (section number, text, tokens) units chunks are packed from."""
+        units = []
+        for section_number, section in enumerate(self._sections(text)):
+            tokens = self._count(section)
+            if tokens <= self.max_tokens:
+                units.append((section_number, section, tokens))
+                continue
+            for sentence in self._sentences(section):
+                tokens = self._count(sentence)
+                if tokens <= self.max_tokens:
+                    units.append((section_number, sentence, tokens))
+                else:
+                    units.extend((section_number, part, self._count(part)) for part in self._hard_split(sentence))
+        return units
+
+    def split_text(self, text: str) -> List[str]:
+        """
+        Split text into chunks.
+
+        Args:
+            text: Text to split
+
+        Returns:
+            List[str]: Non-empty chunks in document order
+        """
+        chunks: List[str] = []
+        current: List[Tuple[int, str, int]] = []
+        current_tokens = 0
+
+        for unit in self._units(text):
+            if current and current_tokens + unit[2] > self.max_tokens:
+                chunks.append("".join(part for _, part, _ in current).strip())
+
+                # Repeat the tail of the chunk when the next one continues its section
+                overlap: List[Tuple[int, str, int]] = []
+                overlap_tokens = 0
+                for previous in reversed(current):
+                    if previous[0] != unit[0] or overlap_tokens + previous[2] > self.overlap_tokens:
+                        break
+                    overlap.insert(0, previous)
+                    overlap_tokens += previous[2]
+                if overlap_tokens + unit[2] > self.max_tokens:
+                    overlap, overlap_tokens = [], 0
+                current, current_tokens = overlap, overlap_tokens
+
+            current.append(unit)
+            current_tokens += unit[2]
+
+        if current:
+            chunks.append("".join(part for _, part, _ in current).strip())
+        return [chunk for chunk in chunks if chunk]
+
+    def split_documents(self, documents: list) -> list:
+        """
+        Split LangChain documents, copying each document's metadata to its chunks.
+
+        Args:
+            documents: Documents with page_content and metadata
+
+        Returns:
+            list: Chunk documents of the same type
+        """
+        return [
+            type(document)(page_content=chunk, metadata=dict(document.metadata))
+            for document in documents
+            for chunk in self.split_text(document.page_content)
+        ]
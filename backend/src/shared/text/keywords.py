@@ -0,0 +1,210 @@
+"""
+Keyword extraction from Thai and English text without a language model.
+"""
+import math
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Set
+
+# Thai word segmentation is optional; without it every space-delimited Thai
+# run is treated as a single word
+try:
+    from pythainlp.tokenize import word_tokenize
+except ImportError:
+    word_tokenize = None
+
+_THAI_DIGITS = str.maketrans("๐๑๒๓๔๕๖๗๘๙", "0123456789")
+
+_WORD_PATTERN = re.compile(r"[\u0E01-\u0E4E]+|[^\W_\u0E00-\u0E7F]+(?:[-'][^\W_\u0E00-\u0E7F]+)*")
+_THAI_PATTERN = re.compile(r"[\u0E01-\u0E4E]")
+
+# Keyword candidates never span these
+_PHRASE_BREAK_PATTERN = re.compile(r"[\n\r\t.,;:!?()\[\]{}\"'“”‘’/|•]+|\s{2,}")
+
+STOPWORDS = frozenset({
+    # English
+    "a", "an", "and", "are", "as", "at", "be", "been", "but", "by", "can", "for", "from", "has", "have",
+    "he", "her", "his", "if", "in", "into", "is", "it", "its", "not", "of", "on", "or", "she", "so",
+    "that", "the", "their", "them", "then", "there", "they", "this", "to", "was", "were", "which",
+    "who", "will", "with", "would", "you", "your",
+    # Thai
+    "และ", "หรือ", "ที่", "ซึ่ง", "อัน", "ของ", "ใน", "จาก", "กับ", "แก่", "แต่", "โดย", "เพื่อ", "ตาม",
+    "ให้", "ได้", "เป็น", "มี", "ไม่", "จะ", "ว่า", "ก็", "นี้", "นั้น", "ไป", "มา", "อยู่", "แล้ว", "ถ้า",
+    "หาก", "เมื่อ", "คือ", "ทั้ง", "อื่น", "ต้อง", "การ", "ความ", "แห่ง", "ยัง", "ถึง", "เช่น", "ดัง",
+    "ต่อ", "ไว้", "ด้วย", "อาจ", "กว่า", "เอง", "บาง", "ทุก", "เขา", "เรา", "ท่าน",
+})
+
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFC", text or "").translate(_THAI_DIGITS)
+
+
+def segment(text: str) -> List[List[str]]:
+    """
+    Split text into phrases of words.
+
+    Phrases end at punctuation and line breaks. Thai runs are segmented into
+    words with pythainlp when it is installed; otherwise each Thai run is a
+    single word and a phrase of its own.
+
+    Args:
+        text: Text to segment
+
+    Returns:
+        List[List[str]]: Phrases, each a list of words in text order
+    """
+    phrases = []
+    for part in _PHRASE_BREAK_PATTERN.split(_normalize(text)):
+        words: List[str] = []
+        for match in _WORD_PATTERN.finditer(part):
+            run = match.group()
+            if not _THAI_PATTERN.match(run):
+                words.append(run)
+            elif word_tokenize is not None:
+                words.extend(word for word in word_tokenize(run, engine="newmm", keep_whitespace=False) if word.strip())
+            else:
+                if words:
+                    phrases.append(words)
+                phrases.append([run])
+                words = []
+        if words:
+            phrases.append(words)
+    return phrases
+
+
+class KeywordExtractor:
+    """
+    Ranks the words and short phrases of a text as keywords.
+
+    Candidates are runs of up to max_ngram words without stopwords. Each is
+    scored by TF-IDF, where document frequencies come from the corpus the
+    text belongs to, and boosted when it appears early in the text or in the
+    title (as YAKE does with position and casing features).
+    """
+
+    # Score multiplier for candidates that appear in the title
+    TITLE_BOOST = 2.0
+
+    # Score multiplier per extra word, so a phrase beats its own words when
+    # they are equally frequent
+    PHRASE_BOOST = 1.2
+
+    # Longest Thai run kept as a single candidate when it cannot be segmented
+    MAX_UNSEGMENTED_LENGTH = 20
+
+    def __init__(self, max_ngram: int = 2, min_length: int = 2):
+        """
+        Args:
+            max_ngram: Most words in one keyword
+            min_length: Fewest characters in one keyword
+        """
+        self.max_ngram = max(1, max_ngram)
+        self.min_length = min_length
+
+    def _is_candidate(self, words: List[str]) -> bool:
+        if any(word.lower() in STOPWORDS or word.isdigit() for word in words):
+            return False
+        if len(words) == 1 and _THAI_PATTERN.match(words[0]) and len(words[0]) > self.MAX_UNSEGMENTED_LENGTH:
+            return False
+        return len("".join(words)) >= self.min_length
+
+    @staticmethod
+    def _join(words: List[str]) -> str:
+        # Thai words are written without spaces between them
+        joined = words[0]
+        for previous, word in zip(words, words[1:]):
+            thai = _THAI_PATTERN.match(previous[-1]) and _THAI_PATTERN.match(word[0])
+            joined += word if thai else f" {word}"
+        return joined
+
+    def candidates(self, text: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Find the keyword candidates of a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per lower-cased candidate, its first
+                written 'text', occurrence 'count', 'first' word position and
+                number of 'words'
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        position = 0
+        for words in segment(text):
+            for start in range(len(words)):
+                for size in range(1, self.max_ngram + 1):
+                    window = words[start:start + size]
+                    if len(window) < size or not self._is_candidate(window):
+                        continue
+                    keyword = self._join(window)
+                    key = keyword.lower()
+                    if key in found:
+                        found[key]["count"] += 1
+                    else:
+                        found[key] = {"text": keyword, "count": 1, "first": position + start, "words": size}
+            position += len(words)
+        return found
+
+    def terms(self, text: str) -> Set[str]:
+        """
+        Get the distinct candidates of a text, as counted in corpus statistics.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set[str]: Lower-cased candidates
+        """
+        return set(self.candidates(text))
+
+    def extract(
+        self,
+        text: str,
+        title: str = "",
+        max_keywords: int = 5,
+        document_count: int = 0,
+        document_frequencies: Optional[Dict[str, int]] = None
+    ) -> List[str]:
+        """
+        Extract the best keywords of a text.
+
+        Args:
+            text: Text to extract keywords from (including the title)
+            title: Title of the text; its candidates are boosted
+            max_keywords: Maximum number of keywords
+            document_count: Number of documents in the corpus
+            document_frequencies: Number of corpus documents containing each candidate
+
+        Returns:
+            List[str]: Keywords, best first
+        """
+        candidates = self.candidates(text)
+        if not candidates:
+            return []
+        document_frequencies = document_frequencies or {}
+        title_terms = self.terms(title) if title else set()
+        total_words = max(candidate["first"] for candidate in candidates.values()) + 1
+
+        scored = []
+        for key, candidate in candidates.items():
+            idf = math.log((document_count + 1) / (document_frequencies.get(key, 0) + 1)) + 1
+            position_weight = 1.5 - candidate["first"] / (2 * total_words)
+            score = (1 + math.log(candidate["count"])) * idf * position_weight
+            score *= self.PHRASE_BOOST ** (candidate["words"] - 1)
+            if key in title_terms:
+                score *= self.TITLE_BOOST
+            scored.append((score, candidate["first"], key, candidate["text"]))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+
+        # Skip candidates overlapping a better keyword ("ค่าจ้าง" after "ค่าจ้างขั้นต่ำ")
+        keywords: List[str] = []
+        selected: List[str] = []
+        for _, _, key, keyword in scored:
+            if any(key in other or other in key for other in selected):
+                continue
+            selected.append(key)
+            keywords.append(keyword)
+            if len(keywords) >= max_keywords:
+                break
+        return keywords
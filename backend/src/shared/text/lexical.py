@@ -0,0 +1,68 @@
+"""
+Tokenization for lexical (keyword) matching of Thai and English text.
+"""
+import re
+import unicodedata
+from typing import List, Set
+
+# Thai digits are indexed as Arabic digits so "มาตรา ๔๒๐" matches "มาตรา 420"
+_THAI_DIGITS = str.maketrans("๐๑๒๓๔๕๖๗๘๙", "0123456789")
+
+_TOKEN_PATTERN = re.compile(r"[\u0E01-\u0E4E]+|[^\W_\u0E00-\u0E7F]+")
+_THAI_PATTERN = re.compile(r"[\u0E01-\u0E4E]")
+
+# Legal section references ("มาตรา 420", "ม. 420", "section 420")
+_ANCHOR_PATTERN = re.compile(r"(?:มาตรา|ม\.|section|sec\.)\s*(\d+(?:/\d+)?)", re.IGNORECASE)
+
+
+def normalize(text: str) -> str:
+    """
+    Normalize text for matching: NFC, Arabic digits, lower case, single spaces.
+
+    Args:
+        text: Text to normalize
+
+    Returns:
+        str: Normalized text
+    """
+    text = unicodedata.normalize("NFC", text or "").translate(_THAI_DIGITS).lower()
+    return " ".join(text.split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index terms.
+
+    Latin words and numbers are terms as they are. Thai is written without
+    spaces between words, so Thai runs are indexed as overlapping character
+    bigrams, which match any word inside the run without a dictionary.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List[str]: Terms in text order, with repeats
+    """
+    terms = []
+    for match in _TOKEN_PATTERN.finditer(normalize(text)):
+        run = match.group()
+        if not _THAI_PATTERN.match(run):
+            terms.append(run)
+        elif len(run) == 1:
+            terms.append(run)
+        else:
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+def legal_anchors(text: str) -> Set[str]:
+    """
+    Find legal section references, as "มาตรา:<number>" terms.
+
+    Args:
+        text: Text to scan
+
+    Returns:
+        Set[str]: Section reference terms
+    """
+    return {f"มาตรา:{number}" for number in _ANCHOR_PATTERN.findall(normalize(text))}
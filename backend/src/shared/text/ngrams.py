@@ -0,0 +1,50 @@
+"""
+Character n-grams for indexed substring ("contains") matching.
+
+Thai is written without spaces between words, so neither word tokens nor
+MongoDB's text index can find a word inside a title. Every substring of at
+least NGRAM_SIZE characters shares all of its n-grams with the text that
+contains it, so an index of n-grams narrows a "contains" filter to a few
+candidates, which are then checked exactly.
+"""
+from typing import Dict, Iterable, List, Optional
+
+from src.shared.text.lexical import normalize
+
+NGRAM_SIZE = 3
+
+
+def ngrams(text: str, size: int = NGRAM_SIZE) -> List[str]:
+    """
+    Get the distinct character n-grams of normalized text.
+
+    Args:
+        text: Text to split
+        size: Characters per n-gram
+
+    Returns:
+        List[str]: N-grams in first-occurrence order; empty for text shorter
+            than size
+    """
+    text = normalize(text)
+    return list(dict.fromkeys(text[i:i + size] for i in range(len(text) - size + 1)))
+
+
+def ngram_tokens(values: Iterable[Optional[str]], size: int = NGRAM_SIZE) -> List[str]:
+    """
+    Get the n-gram tokens stored for a field, e.g. a title or every keyword.
+
+    N-grams never span two values, so a pattern only matches within one.
+
+    Args:
+        values: Values of the field
+        size: Characters per n-gram
+
+    Returns:
+        List[str]: Distinct n-grams of all values
+    """
+    tokens: Dict[str, None] = {}
+    for value in values:
+        if value:
+            tokens.update(dict.fromkeys(ngrams(value, size)))
+    return list(tokens)
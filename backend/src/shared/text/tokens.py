@@ -0,0 +1,86 @@
+"""
+Token counting helpers shared by the embedding and chunking code.
+"""
+import logging
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# OpenAI embedding models (text-embedding-3-*) use the cl100k_base encoding
+DEFAULT_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(encoding_name: str):
+    """
+    Load a tiktoken encoding once per process.
+
+    Returns None when tiktoken or the encoding file is unavailable (for example
+    in an offline container), in which case callers fall back to an estimate.
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        logger.warning(f"tiktoken encoding '{encoding_name}' unavailable, using estimated token counts: {str(e)}")
+        return None
+
+
+def _estimate_tokens(text: str) -> int:
+    """
+    Conservative token estimate used when tiktoken is unavailable.
+
+    ASCII text averages about four characters per token; Thai and other
+    non-ASCII scripts are counted as one token per character so batches are
+    never under-estimated.
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def count_tokens(text: str, encoding_name: str = DEFAULT_ENCODING) -> int:
+    """
+    Count tokens in text.
+
+    Args:
+        text: Text to count
+        encoding_name: tiktoken encoding name
+
+    Returns:
+        int: Number of tokens
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding(encoding_name)
+    if encoding is None:
+        return _estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, encoding_name: str = DEFAULT_ENCODING) -> str:
+    """
+    Truncate text so that it fits in max_tokens.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Maximum number of tokens to keep
+        encoding_name: tiktoken encoding name
+
+    Returns:
+        str: The original text if it fits, otherwise its longest prefix that fits
+    """
+    if count_tokens(text, encoding_name) <= max_tokens:
+        return text
+    encoding = _get_encoding(encoding_name)
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+
+    # Binary search the longest prefix whose estimate fits
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if _estimate_tokens(text[:mid]) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low]
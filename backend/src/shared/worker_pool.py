@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_seconds(attempt: int, base: float, cap: float) -> float:
+    """
+    Get the delay before retrying a task that failed attempt times.
+
+    Args:
+        attempt: Failed attempts so far (1 for the first failure)
+        base: Delay after the first failure
+        cap: Longest delay
+
+    Returns:
+        float: base doubled per further failure, at most cap
+    """
+    return min(cap, base * 2 ** max(attempt - 1, 0))
+
+
+async def process_in_order(
+    items: AsyncIterator[T],
+    handle: Callable[[T], Awaitable[bool]],
+    key: Callable[[T], str],
+    concurrency: int,
+    total: int = 0,
+    on_checkpoint: Optional[Callable[[Optional[str], int], Awaitable[None]]] = None,
+    checkpoint_every: int = 100,
+    progress_interval: float = 10.0,
+    label: str = "items"
+) -> int:
+    """
+    Process a stream of items with a pool of workers and ordered checkpoints.
+
+    Items finish out of order, so the checkpoint is the key of the last item
+    in stream order below which every item is done: a job restarted after it
+    redoes the items that were in flight, but never skips one. Reading stops
+    while every worker is busy and the queue is full, so memory stays bounded
+    however long the stream is. Throughput and ETA are logged every
+    progress_interval seconds.
+
+    Args:
+        items: Items in a stable order (e.g. a cursor sorted by _id)
+        handle: Processes one item; returns whether it succeeded. Exceptions
+            are logged and count as failures.
+        key: Checkpoint key of an item
+        concurrency: Number of items processed at once
+        total: Expected number of items, for the ETA; 0 if unknown
+        on_checkpoint: Called with the checkpoint key and the number of items
+            done, every checkpoint_every items and at the end
+        checkpoint_every: Items between checkpoints
+        progress_interval: Seconds between progress log lines
+        label: What the items are called in progress logs
+
+    Returns:
+        int: Number of items handled successfully
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    pending = deque()  # keys in stream order, not yet below the checkpoint
+    finished = set()
+    checkpoint_lock = asyncio.Lock()
+    state = {"done": 0, "succeeded": 0, "checkpoint": None, "saved_at": 0, "logged_at": time.perf_counter()}
+    started = time.perf_counter()
+
+    def log_progress():
+        elapsed = time.perf_counter() - started
+        rate = state["done"] / elapsed if elapsed else 0.0
+        if not total:
+            logger.info(f"Processed {state['done']} {label} ({rate:.1f} docs/s)")
+            return
+        remaining = max(total - state["done"], 0)
+        eta = f"{remaining / rate:.0f}s" if rate else "unknown"
+        logger.info(f"Processed {state['done']}/{total} {label} ({rate:.1f} docs/s, ETA {eta})")
+
+    async def checkpoint():
+        async with checkpoint_lock:
+            state["saved_at"] = state["done"]
+            await on_checkpoint(state["checkpoint"], state["done"])
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            item_key = key(item)
+            try:
+                if await handle(item):
+                    state["succeeded"] += 1
+            except Exception as e:
+                logger.error(f"Processing {item_key} failed: {str(e)}")
+
+            state["done"] += 1
+            finished.add(item_key)
+            while pending and pending[0] in finished:
+                state["checkpoint"] = pending.popleft()
+                finished.discard(state["checkpoint"])
+
+            if on_checkpoint and state["done"] - state["saved_at"] >= checkpoint_every:
+                try:
+                    await checkpoint()
+                except Exception as e:
+                    # Retried with the next checkpoint; a crash before then redoes more items
+                    logger.warning(f"Failed to save checkpoint: {str(e)}")
+            if time.perf_counter() - state["logged_at"] >= progress_interval:
+                state["logged_at"] = time.perf_counter()
+                log_progress()
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    try:
+        async for item in items:
+            pending.append(key(item))
+            await queue.put(item)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+
+    if on_checkpoint:
+        await checkpoint()
+    if state["done"]:
+        log_progress()
+    return state["succeeded"]
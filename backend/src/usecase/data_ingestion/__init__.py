@@ -1,3 +1,4 @@
 from src.usecase.data_ingestion.data_ingestion_usecase import DataIngestionUseCase
+from src.usecase.data_ingestion.ingestion_job_usecase import IngestionJobUseCase
 
-__all__ = ["DataIngestionUseCase"] 
\ No newline at end of file
+__all__ = ["DataIngestionUseCase", "IngestionJobUseCase"] 
\ No newline at end of file
@@ -0,0 +1,110 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from src.config.settings import get_settings
+from src.domain.models.data_ingestion import DataType
+from src.interface.repository.database.db_repository import webpage_fetcher
+from src.interface.repository.pinecone.ingestion_pipeline import IngestionPipeline, IngestionProgress
+from src.interface.repository.webpage.web_crawler import WebCrawler
+from src.shared.worker_pool import process_in_order
+from src.usecase.data_ingestion.data_ingestion_usecase import DataIngestionUseCase
+
+
+class CrawlUseCase:
+    """
+    Use case for ingesting a multi-page site (e.g. a legal code) as one job.
+
+    Pages come from a WebCrawler and are chunked, embedded and upserted by a
+    pool of workers while the crawl continues. Every page becomes one data
+    ingestion item with its webpage_url (see DataIngestionUseCase.ingest_page);
+    a page crawled again updates its item incrementally, and a page whose
+    content did not change is skipped.
+    """
+
+    # Seconds between pages/s log lines
+    PROGRESS_INTERVAL = 10.0
+
+    def __init__(self):
+        """Initialize with required repositories."""
+        self.ingestion = DataIngestionUseCase()
+        self.settings = get_settings()
+        self.logger = logging.getLogger(__name__)
+
+    async def crawl(
+        self,
+        seed_url: str,
+        data_type: DataType,
+        reference: str,
+        include_pattern: Optional[str] = None,
+        depth: int = 1,
+        sitemap: bool = False,
+        user_id: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        progress: Optional[IngestionProgress] = None
+    ) -> Dict[str, Any]:
+        """
+        Crawl a site and ingest every page.
+
+        Args:
+            seed_url: First page, or the sitemap with sitemap=True
+            data_type: Data type of new items
+            reference: Reference of new items
+            include_pattern: Regular expression page URLs must match
+                (see WebCrawler.crawl); the seed's host by default
+            depth: Link hops followed from the seed
+            sitemap: Whether seed_url is a sitemap
+            user_id: User the new items belong to
+            max_pages: Pages fetched at most; CRAWL_MAX_PAGES by default
+            concurrency: Pages ingested at once; CRAWL_INGEST_CONCURRENCY by default
+            progress: Progress of the job, with page counts updated as pages finish
+
+        Returns:
+            Dict[str, Any]: Page counts ('created', 'updated', 'unchanged'),
+                'failed' URLs, crawler 'fetch' stats, 'seconds',
+                'pages_per_second' and the ingestion pipeline 'stages' stats
+        """
+        crawler = WebCrawler(
+            webpage_fetcher(),
+            max_concurrency=self.settings.CRAWL_MAX_CONCURRENCY,
+            per_host_concurrency=self.settings.CRAWL_PER_HOST_CONCURRENCY,
+            max_pages=max_pages or self.settings.CRAWL_MAX_PAGES
+        )
+        counts = {"created": 0, "updated": 0, "unchanged": 0, "failed": 0}
+        failed: List[str] = []
+        if progress is not None:
+            progress.set_stage("crawling")
+            progress.counts = counts
+
+        async def ingest(item: Dict[str, Any]) -> bool:
+            try:
+                outcome = await self.ingestion.ingest_page(item["url"], item["page"], data_type, reference, user_id)
+            except Exception as e:
+                self.logger.error(f"Ingestion of crawled page {item['url']} failed: {str(e)}")
+                failed.append(item["url"])
+                counts["failed"] += 1
+                return False
+            counts[outcome] += 1
+            return True
+
+        self.logger.info(f"Crawling {seed_url} (depth {depth}, include: {include_pattern or 'same host'})")
+        started = time.perf_counter()
+        await process_in_order(
+            crawler.crawl(seed_url, include_pattern=include_pattern, depth=depth, sitemap=sitemap),
+            ingest,
+            key=lambda item: item["url"],
+            concurrency=max(1, concurrency or self.settings.CRAWL_INGEST_CONCURRENCY),
+            progress_interval=self.PROGRESS_INTERVAL,
+            label="crawled pages"
+        )
+        seconds = time.perf_counter() - started
+        pages = sum(counts.values())
+        return {
+            **counts,
+            "failed": failed,
+            "fetch": dict(crawler.stats),
+            "seconds": round(seconds, 2),
+            "pages_per_second": round(pages / seconds, 2) if seconds else 0.0,
+            "stages": IngestionPipeline.get_stats(),
+        }
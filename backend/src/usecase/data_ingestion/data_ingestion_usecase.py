@@ -1,28 +1,57 @@
+import asyncio
 import logging
 import os
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from fastapi import UploadFile, HTTPException
 
 from src.domain.models.data_ingestion import DataIngestion, DataType
 from src.domain.models.user import User
 from src.domain.entity.data_ingestion import ListDataIngestionResponse
+from src.config.settings import get_settings
+from src.infrastructure.services.keyword_extraction_service import KeywordExtractionService
 from src.infrastructure.services.text_extraction_service import TextExtractionService
-from src.interface.repository.database.db_repository import data_ingestion_repository, s3_repository, pinecone_repository
+from src.interface.repository.mongodb.substring_filter import SubstringFilter
+from src.interface.repository.pinecone.ingestion_pipeline import IngestionProgress
+from src.interface.repository.pinecone.pinecone_repository import PineconeRepository
+from src.interface.repository.pinecone.search_session import SearchSession
+from src.interface.repository.database.db_repository import (
+    data_ingestion_repository, s3_repository, pinecone_repository, keyword_stats_repository
+)
 
 
 class DataIngestionUseCase:
     """Use case for handling data ingestion operations."""
+    
+    # Fields update_data_ingestion may change
+    UPDATABLE_FIELDS = (
+        "title", "specified_text", "data_type", "content",
+        "reference", "keywords", "file_url", "webpage_url"
+    )
 
-    def __init__(self):
-        """Initialize with required repositories and services."""
+    def __init__(self, vector_repository: Optional[PineconeRepository] = None):
+        """
+        Initialize with required repositories and services.
+        
+        Args:
+            vector_repository: Vector repository to use instead of the one serving
+                the index alias (e.g. a reindex target)
+        """
         # Get repositories through factory functions
         self.data_ingestion_repository = data_ingestion_repository()
         # self.s3_repository = s3_repository()
-        self.pinecone_repository = pinecone_repository()
+        self.pinecone_repository = vector_repository or pinecone_repository()
         
         # Initialize services
+        settings = get_settings()
         self.text_extraction_service = TextExtractionService()
+        self.keyword_extraction_service = KeywordExtractionService(
+            stats_repository=keyword_stats_repository(),
+            llm_fallback=self.pinecone_repository.generate_keywords if settings.KEYWORD_EXTRACTION_LLM_FALLBACK else None,
+            min_keywords=settings.KEYWORD_EXTRACTION_MIN_KEYWORDS
+        )
+        self.max_keywords = settings.KEYWORD_EXTRACTION_MAX_KEYWORDS
+        self.bulk_source_concurrency = settings.BULK_INGESTION_SOURCE_CONCURRENCY
         self.logger = logging.getLogger(__name__)
     
     def _filter_none_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -41,15 +70,18 @@ class DataIngestionUseCase:
         self,
         data_ingestion: DataIngestion,
         file_url: Optional[str] = None,
-        user: Optional[User] = None
+        user: Optional[User] = None,
+        progress: Optional[IngestionProgress] = None
     ) -> DataIngestion:
         """
         Submit data ingestion with JSON payload.
         
         Args:
-            data_ingestion: DataIngestion object with all required fields
+            data_ingestion: DataIngestion object with all required fields; an
+                id set beforehand (e.g. by a queued job) is kept
             file_url: Optional URL to a file (overrides data_ingestion.file_url if provided)
             user: User who is submitting the data
+            progress: Progress of the ingestion job, updated stage by stage
             
         Returns:
             DataIngestion: Created data ingestion with IDs
@@ -91,62 +123,45 @@ class DataIngestionUseCase:
                 if not data_ingestion.reference:
                     data_ingestion.reference = data_ingestion.webpage_url
             
+            if progress is None:
+                progress = IngestionProgress()
+            
             # If keywords are empty, generate them
             if not data_ingestion.keywords:
+                progress.set_stage("keywords")
                 # Combine title, specified_text, content, and file_text for keyword generation
                 combined_text = f"{data_ingestion.title} {data_ingestion.specified_text} {data_ingestion.content or ''} {file_text}"
-                generated_keywords = await self.pinecone_repository.generate_keywords(combined_text)
+                generated_keywords = await self.keyword_extraction_service.extract(
+                    combined_text, title=data_ingestion.title, max_keywords=self.max_keywords
+                )
                 data_ingestion.keywords = generated_keywords
             
             # Save to MongoDB
+            progress.set_stage("saving")
             created_data_ingestion = await self.data_ingestion_repository.create(data_ingestion)
+            await self.keyword_extraction_service.add_to_corpus([self._corpus_text(created_data_ingestion)])
             
-            # Create metadata for Pinecone
-            metadata = {
-                "mongodb_id": created_data_ingestion.id,
-                "title": data_ingestion.title,
-                "specified_text": data_ingestion.specified_text,
-                "data_type": data_ingestion.data_type,
-                "content": data_ingestion.content,
-                "reference": data_ingestion.reference,
-                "has_file": bool(data_ingestion.file_url),
-                "user_id": data_ingestion.user_id
-            }
-            
-            # Add optional fields only if they are not None
-            if data_ingestion.file_url:
-                metadata["file_url"] = data_ingestion.file_url
-            
-            if data_ingestion.webpage_url:
-                metadata["webpage_url"] = data_ingestion.webpage_url
-            
-            # Filter out any None values from metadata
-            metadata = self._filter_none_values(metadata)
-            
-            # Create text data for embedding
-            text_data = {
-                "title": data_ingestion.title,
-                "specified_text": data_ingestion.specified_text,
-                "content": data_ingestion.content or "",
-                "keywords": created_data_ingestion.keywords,
-                "file_text": file_text
-            }
-            
-            # Filter out any None values from text_data
-            text_data = self._filter_none_values(text_data)
+            # Create metadata and text data for Pinecone
+            metadata = self._build_vector_metadata(created_data_ingestion)
+            text_data = self._build_text_data(created_data_ingestion, file_text)
             
             # Store in Pinecone
+            progress.set_stage("ingesting")
             pinecone_id = None
+            chunk_ids = []
             
             # If we have a file URL, load the file content into Pinecone
             if data_ingestion.file_url and data_ingestion.file_type in ["pdf", "doc", "docx", "txt"]:
                 try:
                     # Load file from URL and store chunks in Pinecone
-                    vector_ids = await self.pinecone_repository.load_file_from_url(data_ingestion.file_url, metadata)
+                    vector_ids = await self.pinecone_repository.load_file_from_url(
+                        data_ingestion.file_url, metadata, progress=progress
+                    )
                     
                     if vector_ids:
                         # Use the first vector ID as the main pinecone_id
                         pinecone_id = vector_ids[0]
+                        chunk_ids = vector_ids
                         self.logger.info(f"Loaded file from URL into Pinecone with {len(vector_ids)} chunks")
                 except Exception as e:
                     self.logger.error(f"Error loading file from URL into Pinecone: {str(e)}")
@@ -156,11 +171,14 @@ class DataIngestionUseCase:
             elif data_ingestion.webpage_url:
                 try:
                     # Load webpage and store chunks in Pinecone
-                    vector_ids = await self.pinecone_repository.load_webpage(data_ingestion.webpage_url, metadata)
+                    vector_ids = await self.pinecone_repository.load_webpage(
+                        data_ingestion.webpage_url, metadata, progress=progress
+                    )
                     
                     if vector_ids:
                         # Use the first vector ID as the main pinecone_id
                         pinecone_id = vector_ids[0]
+                        chunk_ids = vector_ids
                         self.logger.info(f"Loaded webpage from URL into Pinecone with {len(vector_ids)} chunks")
                 except Exception as e:
                     self.logger.error(f"Error loading webpage from URL into Pinecone: {str(e)}")
@@ -170,13 +188,16 @@ class DataIngestionUseCase:
             # store the regular text data
             if not pinecone_id:
                 pinecone_id = await self.pinecone_repository.upsert_vector(text_data, metadata)
+                chunk_ids = [pinecone_id]
             
-            # Update DataIngestion with Pinecone ID
+            # Update DataIngestion with Pinecone IDs
+            progress.set_stage("finishing")
             await self.data_ingestion_repository.update(
                 created_data_ingestion.id,
-                {"pinecone_id": pinecone_id}
+                {"pinecone_id": pinecone_id, "chunk_ids": chunk_ids}
             )
             created_data_ingestion.pinecone_id = pinecone_id
+            created_data_ingestion.chunk_ids = chunk_ids
             
             return created_data_ingestion
             
@@ -184,6 +205,547 @@ class DataIngestionUseCase:
             self.logger.error(f"Data ingestion submission error: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Data ingestion submission error: {str(e)}")
     
+    async def _load_source(self, data_ingestion: DataIngestion, metadata: Dict[str, Any]) -> List[str]:
+        """
+        Load an item's file or webpage into Pinecone, like submit_data_ingestion does.
+        
+        Args:
+            data_ingestion: Saved data ingestion item
+            metadata: Vector metadata of the item
+            
+        Returns:
+            List[str]: Vector IDs of the chunks; empty when the item has no
+                source or loading it failed
+        """
+        try:
+            if data_ingestion.file_url and data_ingestion.file_type in ["pdf", "doc", "docx", "txt"]:
+                return await self.pinecone_repository.load_file_from_url(data_ingestion.file_url, metadata)
+            if data_ingestion.webpage_url:
+                return await self.pinecone_repository.load_webpage(data_ingestion.webpage_url, metadata)
+        except Exception as e:
+            self.logger.error(f"Error loading source of {data_ingestion.id} into Pinecone: {str(e)}")
+        return []
+    
+    async def submit_data_ingestion_bulk(
+        self,
+        data_ingestions: List[DataIngestion],
+        user: Optional[User] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Submit many data ingestion items at once.
+        
+        Missing keywords are extracted in one pass, the items are written with
+        one insert_many, and the texts of all items without a file or webpage
+        share embedding batches and one bulk upsert. Files and webpages are
+        still loaded per item, a few at a time. Items that cannot be stored
+        are left out of MongoDB; the others are kept.
+        
+        Args:
+            data_ingestions: Items to submit
+            user: User who is submitting the data
+            
+        Returns:
+            List[Dict[str, Any]]: Per item, in input order: 'id', 'status'
+                ('created' or 'failed'), 'chunks' and 'error'
+        """
+        results = [{"id": None, "status": "failed", "chunks": 0, "error": None} for _ in data_ingestions]
+        
+        valid = []
+        for i, data_ingestion in enumerate(data_ingestions):
+            if user:
+                data_ingestion.user_id = str(user.id)
+            if data_ingestion.webpage_url and not data_ingestion.file_url:
+                if not re.match(r'^https?://', data_ingestion.webpage_url):
+                    results[i]["error"] = f"Invalid URL format: {data_ingestion.webpage_url}. URL must start with http:// or https://"
+                    continue
+                if not data_ingestion.reference:
+                    data_ingestion.reference = data_ingestion.webpage_url
+            valid.append(i)
+        
+        # Keywords of all items in one pass; the per-item LLM fallback is skipped
+        missing_keywords = [i for i in valid if not data_ingestions[i].keywords]
+        if missing_keywords:
+            keywords = await self.keyword_extraction_service.extract_batch([
+                {
+                    "text": f"{data_ingestions[i].title} {data_ingestions[i].specified_text} {data_ingestions[i].content or ''}",
+                    "title": data_ingestions[i].title
+                }
+                for i in missing_keywords
+            ], max_keywords=self.max_keywords)
+            for i, item_keywords in zip(missing_keywords, keywords):
+                data_ingestions[i].keywords = item_keywords
+        
+        errors = await self.data_ingestion_repository.create_many([data_ingestions[i] for i in valid])
+        stored = []
+        for position, i in enumerate(valid):
+            if position in errors:
+                results[i]["error"] = errors[position]
+            else:
+                stored.append(i)
+        if not stored:
+            return results
+        await self.keyword_extraction_service.add_to_corpus([self._corpus_text(data_ingestions[i]) for i in stored])
+        
+        chunk_ids: Dict[int, List[str]] = {}
+        records: Dict[int, Dict[str, Any]] = {}
+        try:
+            metadata = {i: self._build_vector_metadata(data_ingestions[i]) for i in stored}
+            sources = [
+                i for i in stored
+                if data_ingestions[i].webpage_url
+                or (data_ingestions[i].file_url and data_ingestions[i].file_type in ["pdf", "doc", "docx", "txt"])
+            ]
+            if sources:
+                slots = asyncio.Semaphore(max(1, self.bulk_source_concurrency))
+                
+                async def load(i: int) -> List[str]:
+                    async with slots:
+                        return await self._load_source(data_ingestions[i], metadata[i])
+                
+                for i, vector_ids in zip(sources, await asyncio.gather(*(load(i) for i in sources))):
+                    if vector_ids:
+                        chunk_ids[i] = vector_ids
+            
+            # Everything without source chunks shares the embedding batches
+            records = {
+                i: self.pinecone_repository.build_text_record(self._build_text_data(data_ingestions[i]), metadata[i])
+                for i in stored if i not in chunk_ids
+            }
+            failed_ids = set(await self.pinecone_repository.upsert_text_records(list(records.values())))
+            for i, record in records.items():
+                if record["id"] in failed_ids:
+                    results[i]["error"] = "Embedding failed"
+                else:
+                    chunk_ids[i] = [record["id"]]
+        except Exception as e:
+            self.logger.error(f"Bulk data ingestion error: {str(e)}")
+            error = getattr(e, "detail", None) or str(e)
+            for i in stored:
+                if i in records or i not in chunk_ids:
+                    chunk_ids.pop(i, None)
+                    results[i]["error"] = error
+            if records:
+                try:
+                    await self.pinecone_repository.delete_vectors([record["id"] for record in records.values()])
+                except Exception as cleanup_error:
+                    self.logger.warning(f"Failed to remove vectors of the failed bulk batch: {str(cleanup_error)}")
+        
+        unstored = [i for i in stored if i not in chunk_ids]
+        if unstored:
+            await self.data_ingestion_repository.delete_many([data_ingestions[i].id for i in unstored])
+            await self.keyword_extraction_service.remove_from_corpus(
+                [self._corpus_text(data_ingestions[i]) for i in unstored]
+            )
+        
+        await self.data_ingestion_repository.set_chunk_ids_many(
+            {data_ingestions[i].id: ids for i, ids in chunk_ids.items()}
+        )
+        for i, ids in chunk_ids.items():
+            data_ingestions[i].chunk_ids = ids
+            data_ingestions[i].pinecone_id = ids[0]
+            results[i].update({"id": data_ingestions[i].id, "status": "created", "chunks": len(ids), "error": None})
+        
+        self.logger.info(
+            f"Bulk submitted {len(chunk_ids)}/{len(data_ingestions)} items "
+            f"({len(records)} text records embedded together)"
+        )
+        return results
+    
+    def _corpus_text(self, data_ingestion: Any) -> str:
+        """
+        Get the text of an item counted in the keyword corpus statistics.
+        
+        Args:
+            data_ingestion: DataIngestion or a dict with its text fields
+            
+        Returns:
+            str: Corpus text of the item
+        """
+        fields = data_ingestion if isinstance(data_ingestion, dict) else data_ingestion.dict()
+        return KeywordExtractionService.corpus_text(
+            fields.get("title") or "",
+            fields.get("specified_text") or "",
+            fields.get("content")
+        )
+    
+    def _build_vector_metadata(self, data_ingestion: DataIngestion) -> Dict[str, Any]:
+        """
+        Build the Pinecone metadata stored with every vector of an item.
+        
+        Args:
+            data_ingestion: Saved data ingestion item
+            
+        Returns:
+            Dict[str, Any]: Metadata without None values
+        """
+        metadata = {
+            "mongodb_id": data_ingestion.id,
+            "title": data_ingestion.title,
+            "specified_text": data_ingestion.specified_text,
+            "data_type": data_ingestion.data_type,
+            "content": data_ingestion.content,
+            "reference": data_ingestion.reference,
+            "has_file": bool(data_ingestion.file_url),
+            "user_id": data_ingestion.user_id,
+            "keywords": data_ingestion.keywords
+        }
+        
+        # Add optional fields only if they are not None
+        if data_ingestion.file_url:
+            metadata["file_url"] = data_ingestion.file_url
+        
+        if data_ingestion.webpage_url:
+            metadata["webpage_url"] = data_ingestion.webpage_url
+        
+        # Filter out any None values from metadata
+        return self._filter_none_values(metadata)
+    
+    def _build_text_data(self, data_ingestion: DataIngestion, file_text: str = "") -> Dict[str, Any]:
+        """
+        Build the text fields embedded for an item without a file or webpage.
+        
+        Args:
+            data_ingestion: Data ingestion item
+            file_text: Extracted file text, if any
+            
+        Returns:
+            Dict[str, Any]: Text data without None values
+        """
+        text_data = {
+            "title": data_ingestion.title,
+            "specified_text": data_ingestion.specified_text,
+            "content": data_ingestion.content or "",
+            "keywords": data_ingestion.keywords,
+            "file_text": file_text
+        }
+        return self._filter_none_values(text_data)
+    
+    async def _reingest(
+        self,
+        data_ingestion: DataIngestion,
+        metadata: Dict[str, Any],
+        previous_ids: List[str],
+        refresh_metadata: bool
+    ) -> Dict[str, Any]:
+        """
+        Re-chunk an item's source and sync its vectors with the new chunks.
+        
+        Only an item without a file or webpage, or whose source has no text,
+        is stored as a single text vector. A source that fails to load raises,
+        so the item keeps its stored chunks instead of losing them to a
+        transient error.
+        
+        Args:
+            data_ingestion: Data ingestion item
+            metadata: Vector metadata of the item
+            previous_ids: Vector IDs the item had before
+            refresh_metadata: Whether the item's metadata changed
+            
+        Returns:
+            Dict[str, Any]: Sync result with 'ids' and 'embedded'/'updated'/'deleted' counts
+        """
+        try:
+            if data_ingestion.file_url and data_ingestion.file_type in ["pdf", "doc", "docx", "txt"]:
+                result = await self.pinecone_repository.ingest_file(
+                    data_ingestion.file_url, metadata, previous_ids, refresh_metadata
+                )
+            elif data_ingestion.webpage_url:
+                result = await self.pinecone_repository.ingest_webpage(
+                    data_ingestion.webpage_url, metadata, previous_ids, refresh_metadata
+                )
+            else:
+                result = None
+        except Exception as e:
+            self.logger.error(f"Error re-loading source of {data_ingestion.id}: {str(e)}")
+            raise
+        if result and result["ids"]:
+            return result
+        
+        record = self.pinecone_repository.build_text_record(self._build_text_data(data_ingestion), metadata)
+        return await self.pinecone_repository.sync_chunks(
+            [record],
+            previous_ids=previous_ids,
+            refresh_metadata=refresh_metadata
+        )
+    
+    async def reingest(
+        self,
+        data_ingestion: DataIngestion,
+        previous_ids: List[str],
+        refresh_metadata: bool
+    ) -> Dict[str, Any]:
+        """
+        Re-chunk an item's source into this use case's vector repository (e.g. a reindex target).
+        
+        Args:
+            data_ingestion: Data ingestion item
+            previous_ids: Vector IDs the item has in the repository
+            refresh_metadata: Whether the stored vectors' metadata must be rewritten
+            
+        Returns:
+            Dict[str, Any]: Sync result with 'ids' and 'embedded'/'updated'/'deleted' counts
+        """
+        metadata = self._build_vector_metadata(data_ingestion)
+        return await self._reingest(data_ingestion, metadata, previous_ids, refresh_metadata)
+    
+    async def backfill_lexical_index(self) -> Dict[str, int]:
+        """
+        Add the items of MongoDB the lexical index is missing, and drop deleted ones.
+        
+        Missing items are indexed from their title, specified text, content and
+        keywords; the text of their file or webpage chunks is added when they
+        are next ingested.
+        
+        Returns:
+            Dict[str, int]: Numbers of items 'added' and 'removed'
+        """
+        async def documents():
+            async for data_ingestion in self.data_ingestion_repository.stream():
+                metadata = self._build_vector_metadata(data_ingestion)
+                record = self.pinecone_repository.build_text_record(self._build_text_data(data_ingestion), metadata)
+                yield metadata, [record["text"]]
+        
+        return await self.pinecone_repository.backfill_lexical_index(documents())
+    
+    async def _stored_vector_ids(self, data_ingestion: DataIngestion) -> List[str]:
+        """
+        Get the vector IDs currently stored for an item.
+        
+        Items ingested before chunk IDs were recorded only know their first
+        vector, so their chunks are found by ID prefix instead.
+        
+        Args:
+            data_ingestion: Data ingestion item
+            
+        Returns:
+            List[str]: Vector IDs, in document order when known
+        """
+        if data_ingestion.chunk_ids:
+            return list(data_ingestion.chunk_ids)
+        
+        vector_ids = await self.pinecone_repository.list_vector_ids(f"{data_ingestion.id}_chunk_")
+        if data_ingestion.pinecone_id and data_ingestion.pinecone_id not in vector_ids:
+            vector_ids.append(data_ingestion.pinecone_id)
+        return vector_ids
+    
+    async def update_data_ingestion(
+        self,
+        data_id: str,
+        updates: Dict[str, Any],
+        user: Optional[User] = None
+    ) -> DataIngestion:
+        """
+        Update an item and re-ingest its source incrementally.
+        
+        The source is re-chunked and every chunk is identified by a hash of its
+        text, so only new or changed chunks are embedded. Chunks that no longer
+        exist are deleted in bulk. Passing no updates refreshes a changed file
+        or webpage.
+        
+        Args:
+            data_id: Data ingestion ID
+            updates: Fields to change
+            user: User performing the update
+            
+        Returns:
+            DataIngestion: Updated data ingestion
+        """
+        existing = await self.data_ingestion_repository.get_by_id(data_id)
+        
+        if not existing:
+            raise HTTPException(status_code=404, detail="Data ingestion not found")
+        
+        try:
+            updates = {
+                field: value for field, value in updates.items()
+                if field in self.UPDATABLE_FIELDS
+            }
+            
+            # Keep the derived file fields in line with a new file URL
+            if updates.get("file_url"):
+                file_name = updates["file_url"].split("/")[-1]
+                updates["file_name"] = file_name
+                if "." in file_name and file_name.split(".")[-1].lower() in ["pdf", "doc", "docx", "txt"]:
+                    updates["file_type"] = file_name.split(".")[-1].lower()
+            
+            updated = DataIngestion(**{**existing.dict(), **updates})
+            
+            previous_metadata = self._build_vector_metadata(existing)
+            metadata = self._build_vector_metadata(updated)
+            
+            previous_ids = await self._stored_vector_ids(existing)
+            
+            # Vectors cannot move between namespaces; store them again in the new one
+            namespace_policy = self.pinecone_repository.namespace_policy
+            previous_namespace = namespace_policy.namespace_for(previous_metadata)
+            if previous_ids and namespace_policy.namespace_for(metadata) != previous_namespace:
+                await self.pinecone_repository.delete_vectors(previous_ids, namespace=previous_namespace)
+                previous_ids = []
+            
+            result = await self._reingest(
+                updated,
+                metadata,
+                previous_ids,
+                refresh_metadata=metadata != previous_metadata
+            )
+            if result.get("unchanged") and not updates:
+                self.logger.info(f"Source of {data_id} unchanged; nothing re-ingested")
+                return existing
+            self.logger.info(
+                f"Re-ingested {data_id}: {result['embedded']} chunks embedded, "
+                f"{result['updated']} metadata updates, {result['deleted']} deleted"
+            )
+            
+            chunk_ids = result["ids"]
+            updates["chunk_ids"] = chunk_ids
+            updates["pinecone_id"] = chunk_ids[0] if chunk_ids else None
+            await self.data_ingestion_repository.update(data_id, updates)
+            
+            if self._corpus_text(updated) != self._corpus_text(existing):
+                await self.keyword_extraction_service.remove_from_corpus([self._corpus_text(existing)])
+                await self.keyword_extraction_service.add_to_corpus([self._corpus_text(updated)])
+            
+            return DataIngestion(**{**updated.dict(), **updates})
+        except HTTPException:
+            raise
+        except Exception as e:
+            self.logger.error(f"Data ingestion update error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Data ingestion update error: {str(e)}")
+    
+    def _page_fields(self, url: str, document: Any) -> Dict[str, str]:
+        """
+        Get the title and specified text of a parsed webpage.
+        
+        Args:
+            url: Page URL, the title of a page without one
+            document: Parsed page (see PineconeRepository.parse_webpage)
+            
+        Returns:
+            Dict[str, str]: 'title' and 'specified_text' (the description, or the title)
+        """
+        title = " ".join((document.metadata.get("title") or url).split())
+        description = document.metadata.get("description")
+        return {
+            "title": title,
+            "specified_text": description if description and description != "No description found." else title,
+        }
+    
+    async def ingest_page(
+        self,
+        url: str,
+        page: Dict[str, Any],
+        data_type: DataType,
+        reference: str,
+        user_id: Optional[str] = None
+    ) -> str:
+        """
+        Create or update the item of a fetched webpage (e.g. a crawled page).
+        
+        A page whose content did not change since its vectors were built is
+        skipped without parsing. A changed page is parsed once; when its title
+        or description changed, the item's title, specified text and keywords
+        are refreshed along with its chunks.
+        
+        Args:
+            url: Page URL
+            page: Page fetched with WebpageFetcher.fetch
+            data_type: Data type of a new item
+            reference: Reference of a new item
+            user_id: User a new item belongs to
+            
+        Returns:
+            str: 'created', 'updated' or 'unchanged'
+            
+        Raises:
+            ValueError: If the page has no text to ingest; a new page's item is not kept
+        """
+        existing = await self.data_ingestion_repository.get_by_webpage_url(url)
+        previous_ids = []
+        if existing:
+            previous_ids = await self._stored_vector_ids(existing)
+            if self.pinecone_repository.webpage_unchanged(page, self._build_vector_metadata(existing), previous_ids):
+                return "unchanged"
+        
+        document = await self.pinecone_repository.parse_webpage(url, page)
+        page = {**page, "document": document}
+        fields = self._page_fields(url, document)
+        
+        if existing:
+            return await self._update_page(existing, page, fields, previous_ids)
+        return await self._create_page(url, page, fields, data_type, reference, user_id)
+    
+    async def _page_keywords(self, page: Dict[str, Any], fields: Dict[str, str]) -> List[str]:
+        """Extract the keywords of a parsed page from its title and text."""
+        return await self.keyword_extraction_service.extract(
+            f"{fields['title']} {page['document'].page_content}", title=fields["title"], max_keywords=self.max_keywords
+        )
+    
+    async def _create_page(
+        self,
+        url: str,
+        page: Dict[str, Any],
+        fields: Dict[str, str],
+        data_type: DataType,
+        reference: str,
+        user_id: Optional[str]
+    ) -> str:
+        """Create the item of a new page; the item is removed again if its chunks cannot be stored."""
+        created = await self.data_ingestion_repository.create(DataIngestion(
+            **fields,
+            data_type=data_type,
+            reference=reference,
+            keywords=await self._page_keywords(page, fields),
+            webpage_url=url,
+            user_id=user_id
+        ))
+        
+        metadata = self._build_vector_metadata(created)
+        try:
+            result = await self.pinecone_repository.ingest_webpage(url, metadata, page=page)
+            if not result["ids"]:
+                # An item without vectors could never be found
+                raise ValueError(f"No text to ingest on {url}")
+        except BaseException:
+            await self.data_ingestion_repository.delete(created.id)
+            raise
+        await self.keyword_extraction_service.add_to_corpus([self._corpus_text(created)])
+        chunk_ids = result["ids"]
+        await self.data_ingestion_repository.update(created.id, {"chunk_ids": chunk_ids, "pinecone_id": chunk_ids[0]})
+        return "created"
+    
+    async def _update_page(
+        self,
+        existing: DataIngestion,
+        page: Dict[str, Any],
+        fields: Dict[str, str],
+        previous_ids: List[str]
+    ) -> str:
+        """Sync the item of a changed page with its new chunks, title and description."""
+        updates: Dict[str, Any] = {field: value for field, value in fields.items() if getattr(existing, field) != value}
+        if updates:
+            updates["keywords"] = await self._page_keywords(page, fields)
+        updated = DataIngestion(**{**existing.dict(), **updates})
+        
+        metadata = self._build_vector_metadata(updated)
+        result = await self.pinecone_repository.ingest_webpage(
+            existing.webpage_url,
+            metadata,
+            previous_ids,
+            refresh_metadata=metadata != self._build_vector_metadata(existing),
+            page=page
+        )
+        chunk_ids = result["ids"]
+        updates["chunk_ids"] = chunk_ids
+        updates["pinecone_id"] = chunk_ids[0] if chunk_ids else None
+        await self.data_ingestion_repository.update(existing.id, updates)
+        
+        if self._corpus_text(updated) != self._corpus_text(existing):
+            await self.keyword_extraction_service.remove_from_corpus([self._corpus_text(existing)])
+            await self.keyword_extraction_service.add_to_corpus([self._corpus_text(updated)])
+        if not chunk_ids:
+            raise ValueError(f"No text to ingest on {existing.webpage_url}")
+        return "updated"
+    
     async def get_data_ingestion(self, data_id: str, user: Optional[User] = None) -> DataIngestion:
         """
         Get data ingestion by ID.
@@ -236,30 +798,67 @@ class DataIngestionUseCase:
                     
                 return results
             else:
-                # Search in Pinecone
-                search_results = await self.pinecone_repository.search(
-                    query=query,
-                    limit=limit,
-                    offset=skip
-                )
+                # Page the ranked results of the query's search session
+                session, _ = await self._resolve_search_session(query)
+                search_results = session.page(skip, limit)
+                
+                # Get full data from MongoDB for the page in one query
+                scores = {result["id"]: result["similarity_score"] for result in search_results}
+                data_items = await self.data_ingestion_repository.find_by_ids(list(scores))
                 
-                # Get full data from MongoDB for each result
                 results = []
-                for result in search_results:
-                    mongodb_id = result["id"]
-                    data_item = await self.data_ingestion_repository.find_by_id(mongodb_id)
-                    
-                    if data_item:
-                        # Convert to dict and add similarity score
-                        item_dict = data_item.dict()
-                        item_dict["similarity_score"] = result["similarity_score"]
-                        results.append(item_dict)
+                for data_item in data_items:
+                    # Convert to dict and add similarity score
+                    item_dict = data_item.dict()
+                    item_dict["similarity_score"] = scores[data_item.id]
+                    results.append(item_dict)
                 
                 return results
         except Exception as e:
             self.logger.error(f"Error searching data ingestion: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error searching data: {str(e)}")
     
+    def _filter_criteria(self, data_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the MongoDB criteria of the exact list filters.
+        
+        Args:
+            data_type: Optional data type to filter by
+            
+        Returns:
+            Dict[str, Any]: Filter criteria, empty without filters
+        """
+        return {"data_type": data_type} if data_type else {}
+    
+    def _substring_filters(self, keywords: Optional[str] = None, title: Optional[str] = None) -> Dict[str, str]:
+        """
+        Build the "contains" filters of a list request (see SubstringFilter).
+        
+        Args:
+            keywords: Optional substring of any keyword
+            title: Optional substring of the title
+            
+        Returns:
+            Dict[str, str]: Substrings keyed by field
+        """
+        return {field: value for field, value in (("keywords", keywords), ("title", title)) if value}
+    
+    def _sort_params(self, sort_field: Optional[str], sort_order: Optional[str]) -> Optional[Dict[str, int]]:
+        """
+        Build the MongoDB sort of a list request.
+        
+        Args:
+            sort_field: Field to sort by
+            sort_order: Sort order (asc or desc)
+            
+        Returns:
+            Optional[Dict[str, int]]: Sort, or None for the default order
+        """
+        if not sort_field:
+            return None
+        # Convert sort order to 1 (ascending) or -1 (descending)
+        return {sort_field: -1 if sort_order and sort_order.lower() == 'desc' else 1}
+    
     async def list_data_ingestion(
         self, 
         query: str = "", 
@@ -290,35 +889,18 @@ class DataIngestionUseCase:
             List[DataIngestion]: List of data ingestion items
         """
         try:
-            # Prepare sort parameters
-            sort_params = None
-            if sort_field:
-                # Convert sort order to 1 (ascending) or -1 (descending)
-                sort_direction = -1 if sort_order and sort_order.lower() == 'desc' else 1
-                sort_params = {sort_field: sort_direction}
-            
-            # Build filter criteria
-            filter_criteria = {}
-            if data_type:
-                filter_criteria["data_type"] = data_type
-            
-            # Add keywords filter if provided
-            if keywords:
-                # Use regex to search for keywords that contain the provided string
-                filter_criteria["keywords"] = {"$regex": keywords, "$options": "i"}
-            
-            # Add title filter if provided
-            if title:
-                # Use regex to search for title containing the provided string
-                filter_criteria["title"] = {"$regex": title, "$options": "i"}
+            sort_params = self._sort_params(sort_field, sort_order)
+            
+            filter_criteria = self._filter_criteria(data_type)
             
             if not query and (data_type or keywords or title):
                 # If only filter criteria are provided (no full-text search)
-                data_items = await self.data_ingestion_repository.find_by_criteria(
+                data_items, _ = await self.data_ingestion_repository.find_page(
                     criteria=filter_criteria,
                     skip=skip,
                     limit=limit,
-                    sort=sort_params
+                    sort=sort_params,
+                    like=self._substring_filters(keywords, title)
                 )
                 return data_items
             elif not query:
@@ -330,36 +912,16 @@ class DataIngestionUseCase:
                 )
                 return data_items
             else:
-                # Search in Pinecone with query
-                search_results = await self.pinecone_repository.search(
-                    query=query,
-                    limit=limit,
-                    offset=skip
-                )
-                
-                # Get full data from MongoDB for each result
-                results = []
-                for result in search_results:
-                    mongodb_id = result["id"]
-                    data_item = await self.data_ingestion_repository.find_by_id(mongodb_id)
-                    
-                    # Apply filters if provided
-                    if data_item:
-                        if data_type and data_item.data_type != data_type:
-                            continue
-                        
-                        if keywords and not any(keywords.lower() in keyword.lower() for keyword in data_item.keywords):
-                            continue
-                        
-                        if title and title.lower() not in data_item.title.lower():
-                            continue
-                        
-                        results.append(data_item)
+                # Page the query's search session; data_type is filtered inside the index query
+                session, _ = await self._resolve_search_session(query, data_type)
+                ranked_results = await self._session_results(session, keywords, title)
                 
                 # For Pinecone results, we can't easily apply MongoDB sorting
                 # We could implement manual sorting here if needed
                 
-                return results
+                return await self._hydrate_results(session.page(skip, limit, ranked_results))
+        except HTTPException:
+            raise
         except Exception as e:
             self.logger.error(f"Error listing data ingestion: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error listing data: {str(e)}")
@@ -386,65 +948,113 @@ class DataIngestionUseCase:
             int: Total count of matching items
         """
         try:
-            # Build filter criteria
-            filter_criteria = {}
-            if data_type:
-                filter_criteria["data_type"] = data_type
-            
-            # Add keywords filter if provided
-            if keywords:
-                # Use regex to search for keywords that contain the provided string
-                filter_criteria["keywords"] = {"$regex": keywords, "$options": "i"}
-            
-            # Add title filter if provided
-            if title:
-                # Use regex to search for title containing the provided string
-                filter_criteria["title"] = {"$regex": title, "$options": "i"}
+            filter_criteria = self._filter_criteria(data_type)
             
             if not query and (data_type or keywords or title):
                 # If only filter criteria are provided (no full-text search)
-                return await self.data_ingestion_repository.count_by_criteria(filter_criteria)
+                return await self.data_ingestion_repository.count_by_criteria(
+                    filter_criteria, like=self._substring_filters(keywords, title)
+                )
             elif not query:
                 # If no filters, count all items
                 return await self.data_ingestion_repository.count()
             else:
-                # For query-based search, we need to get IDs from Pinecone
-                search_results = await self.pinecone_repository.search(
-                    query=query,
-                    limit=1000  # Use a large limit to get most matches for counting
-                )
-                
-                if not data_type and not keywords and not title:
-                    return len(search_results)
-                
-                # Apply filters
-                filtered_count = 0
-                for result in search_results:
-                    mongodb_id = result["id"]
-                    data_item = await self.data_ingestion_repository.find_by_id(mongodb_id)
-                    
-                    if not data_item:
-                        continue
-                    
-                    # Apply data_type filter
-                    if data_type and data_item.data_type != data_type:
-                        continue
-                    
-                    # Apply keywords filter
-                    if keywords and not any(keywords.lower() in keyword.lower() for keyword in data_item.keywords):
-                        continue
-                    
-                    # Apply title filter
-                    if title and title.lower() not in data_item.title.lower():
-                        continue
-                    
-                    filtered_count += 1
-                
-                return filtered_count
+                # For query-based search, count the query's search session;
+                # data_type is filtered inside the index query
+                session, _ = await self._resolve_search_session(query, data_type)
+                ranked_results = await self._session_results(session, keywords, title)
+                return len(ranked_results)
+        except HTTPException:
+            raise
         except Exception as e:
             self.logger.error(f"Error counting data ingestion: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error counting data: {str(e)}")
     
+    async def _resolve_search_session(
+        self,
+        query: str,
+        data_type: Optional[str] = None,
+        cursor: Optional[str] = None,
+        skip: int = 0
+    ) -> Tuple[SearchSession, int]:
+        """
+        Get the search session to page, and the offset to page from.
+        
+        A live cursor wins over query and skip. Expired cursors fall back to
+        re-running the search from skip.
+        
+        Args:
+            query: Text query
+            data_type: Optional data type to filter by
+            cursor: Optional cursor from a previous page
+            skip: Offset to use when no live cursor is given
+            
+        Returns:
+            Tuple[SearchSession, int]: Session and offset
+        """
+        if cursor:
+            resolved = self.pinecone_repository.get_search_session(cursor)
+            if resolved is not None:
+                return resolved
+            self.logger.info("Search cursor has expired, re-running the search")
+        
+        session = await self.pinecone_repository.open_search_session(
+            query,
+            filter=self.pinecone_repository.build_metadata_filter(data_type=data_type)
+        )
+        return session, skip
+    
+    async def _session_results(
+        self,
+        session: SearchSession,
+        keywords: Optional[str] = None,
+        title: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a session's ranked results narrowed by the substring filters.
+        
+        The vector index cannot evaluate substring filters, so the session's
+        documents are checked against MongoDB in one query per filter combination and
+        the surviving list is kept on the session for later pages and counts.
+        
+        Args:
+            session: Search session
+            keywords: Optional keywords substring filter
+            title: Optional title substring filter
+            
+        Returns:
+            List[Dict[str, Any]]: Ranked results passing the filters
+        """
+        if not keywords and not title:
+            return session.results
+        
+        key = (keywords, title)
+        if key not in session.filtered_results:
+            documents = await self.data_ingestion_repository.find_by_ids(
+                [result["id"] for result in session.results],
+                projection={"keywords": 1, "title": 1}
+            )
+            documents = {document["id"]: document for document in documents}
+            substring_filter = SubstringFilter(self._substring_filters(keywords, title))
+            filtered = [
+                result for result in session.results
+                if result["id"] in documents and substring_filter.matches(documents[result["id"]])
+            ]
+            session.filtered_results[key] = filtered
+        return session.filtered_results[key]
+    
+    async def _hydrate_results(self, results: List[Dict[str, Any]]) -> List[DataIngestion]:
+        """
+        Load the MongoDB documents for a page of search results, keeping rank order.
+        
+        Args:
+            results: Search results with 'id'
+            
+        Returns:
+            List[DataIngestion]: Documents that still exist
+        """
+        return await self.data_ingestion_repository.find_by_ids([result["id"] for result in results])
+    
     async def delete_data_ingestion(self, data_id: str, user: Optional[User] = None) -> bool:
         """
         Delete data ingestion and associated resources.
@@ -462,9 +1072,9 @@ class DataIngestionUseCase:
         if not data_ingestion:
             raise HTTPException(status_code=404, detail="Data ingestion not found")
         
-        # Delete from Pinecone if ID exists
-        if data_ingestion.pinecone_id:
-            await self.pinecone_repository.delete_vector(data_ingestion.pinecone_id)
+        # Delete all of the item's chunks from Pinecone and the keyword index
+        vector_ids = await self._stored_vector_ids(data_ingestion)
+        await self.pinecone_repository.delete_document(data_ingestion.id, vector_ids)
         
         # Delete file from S3 if URL exists
         # if data_ingestion.file_url:
@@ -472,9 +1082,72 @@ class DataIngestionUseCase:
         
         # Delete from MongoDB
         deleted = await self.data_ingestion_repository.delete(data_id)
+        if deleted:
+            await self.keyword_extraction_service.remove_from_corpus([self._corpus_text(data_ingestion)])
         
         return deleted
     
+    async def backfill_keywords(self, batch_size: int = 1000, overwrite: bool = False) -> Dict[str, int]:
+        """
+        Extract keywords for many items in one pass, without the LLM.
+        
+        Items are read in batches; each batch costs one statistics query and
+        one bulk write. Vector metadata keeps the old keywords until the item
+        is re-ingested.
+        
+        Args:
+            batch_size: Items per batch
+            overwrite: Whether items that already have keywords are redone
+            
+        Returns:
+            Dict[str, int]: Number of items 'processed' and 'updated'
+        """
+        criteria = None if overwrite else {"$or": [{"keywords": {"$size": 0}}, {"keywords": None}]}
+        counts = {"processed": 0, "updated": 0}
+        
+        async def flush(batch: List[Dict[str, Any]]):
+            keywords = await self.keyword_extraction_service.extract_batch(
+                [{"text": self._corpus_text(item), "title": item.get("title")} for item in batch],
+                max_keywords=self.max_keywords
+            )
+            counts["processed"] += len(batch)
+            counts["updated"] += await self.data_ingestion_repository.set_keywords_many({
+                item["id"]: item_keywords for item, item_keywords in zip(batch, keywords) if item_keywords
+            })
+            self.logger.info(f"Keyword backfill: {counts['processed']} items processed, {counts['updated']} updated")
+        
+        batch: List[Dict[str, Any]] = []
+        async for item in self.data_ingestion_repository.iter_text_fields(criteria):
+            batch.append(item)
+            if len(batch) >= batch_size:
+                await flush(batch)
+                batch = []
+        if batch:
+            await flush(batch)
+        return counts
+    
+    async def rebuild_keyword_statistics(self, batch_size: int = 1000) -> int:
+        """
+        Recount the keyword corpus statistics over the whole collection.
+        
+        Args:
+            batch_size: Items counted per bulk write
+            
+        Returns:
+            int: Number of items counted
+        """
+        stats_repository = self.keyword_extraction_service.stats_repository
+        if stats_repository is None:
+            raise RuntimeError("Keyword statistics are unavailable")
+        
+        extractor = self.keyword_extraction_service.extractor
+        
+        async def term_sets():
+            async for item in self.data_ingestion_repository.iter_text_fields():
+                yield extractor.terms(self._corpus_text(item))
+        
+        return await stats_repository.rebuild(term_sets(), batch_size=batch_size)
+    
     async def process_list_data_ingestion(
         self,
         page: int = 1,
@@ -489,6 +1162,7 @@ class DataIngestionUseCase:
         _pageSize: Optional[int] = None,
         _sort: Optional[str] = None,
         _order: Optional[str] = None,
+        cursor: Optional[str] = None,
         user: Optional[User] = None
     ) -> ListDataIngestionResponse:
         """
@@ -507,6 +1181,7 @@ class DataIngestionUseCase:
             _pageSize: Alternative page size parameter (used by refine)
             _sort: Field to sort by (used by refine)
             _order: Sort order (asc or desc, used by refine)
+            cursor: Cursor from a previous query page; pages the same ranked results
             user: User performing the request
             
         Returns:
@@ -523,31 +1198,31 @@ class DataIngestionUseCase:
             actual_data_type = data_type_like if data_type_like is not None else data_type
             actual_keywords = keywords_like if keywords_like is not None else keywords
             
-            # Get total count for pagination
-            total_count = await self.count_data_ingestion(
-                query=query, 
-                data_type=actual_data_type, 
-                keywords=actual_keywords,
-                title=actual_title,
-                user=user
-            )
+            skip = (actual_page - 1) * actual_page_size
+            next_cursor = None
+            
+            if query:
+                # Count and page from one search session, so the query is
+                # embedded and ranked once rather than once per call
+                session, skip = await self._resolve_search_session(query, actual_data_type, cursor, skip)
+                ranked_results = await self._session_results(session, actual_keywords, actual_title)
+                total_count = len(ranked_results)
+                actual_page = skip // actual_page_size + 1
+                result_items = await self._hydrate_results(session.page(skip, actual_page_size, ranked_results))
+                if skip + actual_page_size < total_count:
+                    next_cursor = session.cursor(skip + actual_page_size)
+            else:
+                # Page and count the filtered items together
+                result_items, total_count = await self.data_ingestion_repository.find_page(
+                    criteria=self._filter_criteria(actual_data_type),
+                    skip=skip,
+                    limit=actual_page_size,
+                    sort=self._sort_params(_sort, _order),
+                    like=self._substring_filters(actual_keywords, actual_title)
+                )
             
             # Calculate pagination values
             total_pages = (total_count + actual_page_size - 1) // actual_page_size
-            skip = (actual_page - 1) * actual_page_size
-            
-            # Get search results with pagination and sorting
-            result_items = await self.list_data_ingestion(
-                query=query,
-                data_type=actual_data_type,
-                keywords=actual_keywords,
-                title=actual_title,
-                skip=skip,
-                limit=actual_page_size,
-                sort_field=_sort,
-                sort_order=_order,
-                user=user
-            )
             
             # Return standardized response using the ListDataIngestionResponse class
             return ListDataIngestionResponse(
@@ -555,8 +1230,11 @@ class DataIngestionUseCase:
                 page=actual_page,
                 page_size=actual_page_size,
                 total_page=total_pages,
-                total_data=total_count
+                total_data=total_count,
+                next_cursor=next_cursor
             )
+        except HTTPException:
+            raise
         except Exception as e:
             self.logger.error(f"Error processing list data ingestion: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error processing list data: {str(e)}") 
\ No newline at end of file
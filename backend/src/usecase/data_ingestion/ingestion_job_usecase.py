@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+from src.config.settings import get_settings
+from src.domain.models.data_ingestion import DataIngestion, DataType
+from src.domain.models.user import User
+from src.interface.repository.database.db_repository import data_ingestion_repository, ingestion_job_repository
+from src.interface.repository.pinecone.ingestion_pipeline import IngestionProgress
+from src.shared.worker_pool import backoff_seconds
+from src.usecase.data_ingestion.crawl_usecase import CrawlUseCase
+from src.usecase.data_ingestion.data_ingestion_usecase import DataIngestionUseCase
+
+
+class IngestionJobUseCase:
+    """
+    Use case for running ingestion work as queued jobs.
+
+    Submissions are stored in the ingestion job queue and answered at once;
+    a pool of async workers in every server claims jobs by priority, runs
+    them, and heartbeats their per-stage progress to MongoDB, where the status
+    endpoint reads it. Failed runs are retried with exponential backoff.
+    """
+
+    KINDS = ("submit", "crawl")
+
+    # Wakes idle workers of this process when a job is enqueued
+    _wakeup: Optional[asyncio.Event] = None
+
+    def __init__(self):
+        """Initialize with required repositories."""
+        self.job_repository = ingestion_job_repository()
+        self.settings = get_settings()
+        self.logger = logging.getLogger(__name__)
+
+    async def _enqueue(self, kind: str, payload: Dict[str, Any], user: Optional[User], priority: int) -> Dict[str, Any]:
+        job = await self.job_repository.enqueue(
+            kind,
+            payload,
+            user_id=str(user.id) if user else None,
+            priority=priority,
+            max_attempts=self.settings.INGESTION_JOB_MAX_ATTEMPTS
+        )
+        if IngestionJobUseCase._wakeup is not None:
+            IngestionJobUseCase._wakeup.set()
+        self.logger.info(f"Queued {kind} job {job['_id']} (priority {priority})")
+        return job
+
+    async def submit(self, data_ingestion: DataIngestion, user: Optional[User] = None, priority: int = 0) -> Dict[str, Any]:
+        """
+        Queue the submission of a data ingestion item.
+
+        The item's ID is assigned now, so it is known before the job runs.
+
+        Args:
+            data_ingestion: Item to submit
+            user: User submitting it
+            priority: Higher runs first
+
+        Returns:
+            Dict[str, Any]: The job document
+        """
+        data_ingestion.id = str(ObjectId())
+        if user:
+            data_ingestion.user_id = str(user.id)
+        return await self._enqueue("submit", {"data_ingestion": data_ingestion.model_dump(mode="json")}, user, priority)
+
+    async def crawl(
+        self,
+        seed_url: str,
+        data_type: DataType,
+        reference: str,
+        include_pattern: Optional[str] = None,
+        depth: int = 1,
+        sitemap: bool = False,
+        max_pages: Optional[int] = None,
+        user: Optional[User] = None,
+        priority: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Queue the crawl of a site (see CrawlUseCase.crawl).
+
+        Returns:
+            Dict[str, Any]: The job document
+        """
+        payload = {
+            "seed_url": seed_url,
+            "data_type": DataType(data_type).value,
+            "reference": reference,
+            "include_pattern": include_pattern,
+            "depth": depth,
+            "sitemap": sitemap,
+            "max_pages": max_pages,
+        }
+        return await self._enqueue("crawl", payload, user, priority)
+
+    async def get_job(self, job_id: str, user: Optional[User] = None) -> Dict[str, Any]:
+        """
+        Get the status of a job.
+
+        Args:
+            job_id: Job ID
+            user: User asking; only the submitter and admins see a job
+
+        Returns:
+            Dict[str, Any]: Job status with progress, result and error
+        """
+        job = await self.job_repository.get(job_id)
+        # Jobs without a submitter (scripts, crawls) are visible to admins only
+        if not job or (user and not user.is_admin and job.get("user_id") != str(user.id)):
+            raise HTTPException(status_code=404, detail="Ingestion job not found")
+        return {
+            "job_id": job["_id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "priority": job["priority"],
+            "attempts": job["attempts"],
+            "max_attempts": job["max_attempts"],
+            "progress": job.get("progress") or {},
+            "result": job.get("result"),
+            "error": job.get("error"),
+            "created_at": job["created_at"],
+            "started_at": job.get("started_at"),
+            "finished_at": job.get("finished_at"),
+            "run_after": job.get("run_after"),
+        }
+
+    async def _run_submit(self, job: Dict[str, Any], progress: IngestionProgress) -> Dict[str, Any]:
+        data_ingestion = DataIngestion(**job["payload"]["data_ingestion"])
+        ingestion = DataIngestionUseCase()
+        # A failed earlier run may have left the item behind; start over
+        if job["attempts"] > 1 and await data_ingestion_repository().get_by_id(data_ingestion.id):
+            await ingestion.delete_data_ingestion(data_ingestion.id)
+        created = await ingestion.submit_data_ingestion(data_ingestion, progress=progress)
+        return {"data_ingestion_id": created.id, "chunks": len(created.chunk_ids)}
+
+    async def _run_crawl(self, job: Dict[str, Any], progress: IngestionProgress) -> Dict[str, Any]:
+        payload = job["payload"]
+        return await CrawlUseCase().crawl(
+            payload["seed_url"],
+            data_type=DataType(payload["data_type"]),
+            reference=payload["reference"],
+            include_pattern=payload.get("include_pattern"),
+            depth=payload.get("depth", 1),
+            sitemap=payload.get("sitemap", False),
+            user_id=job.get("user_id"),
+            max_pages=payload.get("max_pages"),
+            progress=progress
+        )
+
+    async def _run(self, job: Dict[str, Any]):
+        """
+        Run a claimed job, heartbeating its progress until it finishes.
+
+        When a heartbeat finds the job taken over by another worker (this one
+        looked stale), the run is cancelled and records nothing.
+        """
+        job_id, worker_id = job["_id"], job["worker_id"]
+        progress = IngestionProgress()
+        progress.set_stage("starting")
+        lost = False
+
+        async def heartbeat(run: asyncio.Task):
+            nonlocal lost
+            while True:
+                await asyncio.sleep(self.settings.INGESTION_JOB_HEARTBEAT_SECONDS)
+                try:
+                    owned = await self.job_repository.heartbeat(job_id, worker_id, progress.to_dict())
+                except Exception as e:
+                    self.logger.warning(f"Failed to record progress of job {job_id}: {str(e)}")
+                    continue
+                if not owned:
+                    lost = True
+                    self.logger.warning(f"Job {job_id} was taken over by another worker; stopping {worker_id}")
+                    run.cancel()
+                    return
+
+        try:
+            if job["attempts"] > job["max_attempts"]:
+                raise RuntimeError("Gave up: the job's worker stopped responding too often")
+            handler = {"submit": self._run_submit, "crawl": self._run_crawl}[job["kind"]]
+            run = asyncio.create_task(handler(job, progress))
+            heartbeat_task = asyncio.create_task(heartbeat(run))
+            try:
+                result = await run
+            finally:
+                heartbeat_task.cancel()
+        except asyncio.CancelledError:
+            if lost:
+                return
+            raise
+        except Exception as e:
+            error = getattr(e, "detail", None) or str(e)
+            retry_at = None
+            if job["attempts"] < job["max_attempts"]:
+                delay = backoff_seconds(
+                    job["attempts"],
+                    self.settings.INGESTION_JOB_RETRY_BASE_SECONDS,
+                    self.settings.INGESTION_JOB_RETRY_MAX_SECONDS
+                )
+                retry_at = datetime.utcnow() + timedelta(seconds=delay)
+            self.logger.error(
+                f"Job {job_id} failed (attempt {job['attempts']}/{job['max_attempts']}): {error}"
+                + (f"; retrying at {retry_at.isoformat()}" if retry_at else "")
+            )
+            if not await self.job_repository.fail(job_id, worker_id, error, progress.to_dict(), retry_at):
+                self.logger.warning(f"Job {job_id} was taken over by another worker; failure not recorded")
+            return
+
+        progress.set_stage("done")
+        if not await self.job_repository.complete(job_id, worker_id, result, progress.to_dict()):
+            self.logger.warning(f"Job {job_id} was taken over by another worker; result not recorded")
+            return
+        self.logger.info(f"Job {job_id} completed: {result}")
+
+    async def worker(self, worker_id: str):
+        """
+        Claim and run jobs until cancelled.
+
+        Args:
+            worker_id: Name of the worker, recorded on the jobs it runs
+        """
+        while True:
+            try:
+                job = await self.job_repository.claim(worker_id, self.settings.INGESTION_JOB_STALE_SECONDS)
+            except Exception as e:
+                self.logger.warning(f"Worker {worker_id} failed to claim a job: {str(e)}")
+                job = None
+            if job:
+                await self._run(job)
+                continue
+            IngestionJobUseCase._wakeup.clear()
+            try:
+                await asyncio.wait_for(IngestionJobUseCase._wakeup.wait(), self.settings.INGESTION_JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_workers(self, count: Optional[int] = None):
+        """
+        Run a pool of workers until cancelled (e.g. for the server's lifetime).
+
+        Args:
+            count: Number of workers; INGESTION_JOB_WORKERS by default
+        """
+        IngestionJobUseCase._wakeup = asyncio.Event()
+        count = count or self.settings.INGESTION_JOB_WORKERS
+        prefix = f"{socket.gethostname()}-{uuid.uuid4().hex[:6]}"
+        self.logger.info(f"Starting {count} ingestion job workers")
+        await asyncio.gather(*(self.worker(f"{prefix}-{i}") for i in range(count)))
@@ -0,0 +1,257 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+
+from src.config.settings import get_settings
+from src.interface.repository.database.db_repository import (
+    data_ingestion_repository, index_alias_repository, pinecone_repository, reindex_job_repository
+)
+from src.interface.repository.pinecone.embedding_profile import EmbeddingProfile
+from src.shared.worker_pool import process_in_order
+from src.usecase.data_ingestion.data_ingestion_usecase import DataIngestionUseCase
+
+
+class ReindexUseCase:
+    """
+    Use case for rebuilding the vector index under another embedding profile.
+
+    The new index is filled from MongoDB while the current one keeps serving.
+    Items are streamed with one cursor and re-extracted, chunked and embedded
+    by a pool of workers; the full pass records checkpoints so a crashed job
+    resumes where it stopped. Items written during the pass are copied again
+    in catch-up passes, then the index alias is switched in one update, so
+    reads move to the new index at once and the old index stays intact for
+    a rollback.
+    """
+
+    # Catch-up passes before the switch; items still changing are picked up after it
+    MAX_CATCH_UP_PASSES = 3
+
+    # Seconds between docs/s and ETA log lines
+    PROGRESS_INTERVAL = 10.0
+
+    def __init__(self):
+        """Initialize with required repositories."""
+        self.data_ingestion_repository = data_ingestion_repository()
+        self.index_alias_repository = index_alias_repository()
+        self.reindex_job_repository = reindex_job_repository()
+        self.settings = get_settings()
+        self.logger = logging.getLogger(__name__)
+
+    async def current_target(self) -> Dict[str, Any]:
+        """
+        Get the index currently serving reads.
+
+        Returns:
+            Dict[str, Any]: 'index_name' and 'profile'
+        """
+        target = await self.index_alias_repository.get()
+        if target:
+            return target
+        return {"index_name": self.settings.PINECONE_INDEX_NAME, "profile": self.settings.EMBEDDING_PROFILE}
+
+    def default_index_name(self, profile: EmbeddingProfile) -> str:
+        """
+        Name the index built for a profile.
+
+        Args:
+            profile: Embedding profile
+
+        Returns:
+            str: Index name (lower case letters, digits and dashes, as Pinecone requires)
+        """
+        return f"{self.settings.PINECONE_INDEX_NAME}-{profile.name}".lower().replace("_", "-")
+
+    async def _copy(
+        self,
+        ingestion: DataIngestionUseCase,
+        criteria: Optional[Dict[str, Any]],
+        target_ids: Dict[str, List[str]],
+        concurrency: int,
+        job: Optional[Dict[str, Any]] = None,
+        failed_ids: Optional[List[str]] = None
+    ) -> int:
+        """
+        Ingest matching items into the target index with a pool of workers.
+
+        Items copied before are synced incrementally against the vector IDs
+        they got in the target (target_ids, updated in place). With a job,
+        progress and the new vector IDs are checkpointed every
+        REINDEX_CHECKPOINT_EVERY items.
+
+        Args:
+            ingestion: Use case writing to the target index
+            criteria: Filter of the items to copy
+            target_ids: Vector IDs in the target index, keyed by item ID
+            concurrency: Number of items processed at once
+            job: Reindex job to checkpoint, for the full pass
+            failed_ids: IDs of items that failed (updated in place)
+
+        Returns:
+            int: Number of items copied
+        """
+        if failed_ids is None:
+            failed_ids = []
+        unsaved: Dict[str, List[str]] = {}
+
+        async def copy_item(item) -> bool:
+            try:
+                result = await ingestion.reingest(
+                    item, previous_ids=target_ids.get(item.id, []), refresh_metadata=item.id in target_ids
+                )
+            except Exception as e:
+                self.logger.error(f"Reindex of {item.id} failed: {str(e)}")
+                if item.id not in failed_ids:
+                    failed_ids.append(item.id)
+                return False
+            target_ids[item.id] = result["ids"]
+            unsaved[item.id] = result["ids"]
+            if item.id in failed_ids:
+                failed_ids.remove(item.id)
+            return True
+
+        async def save_checkpoint(checkpoint_id: Optional[str], done: int):
+            batch = dict(unsaved)
+            unsaved.clear()
+            try:
+                await self.reindex_job_repository.save_chunk_ids(job["_id"], batch)
+                await self.reindex_job_repository.checkpoint(
+                    job["_id"], checkpoint_id or job["checkpoint_id"], job["processed"] + done, list(failed_ids)
+                )
+            except Exception:
+                for item_id, ids in batch.items():
+                    unsaved.setdefault(item_id, ids)
+                raise
+
+        return await process_in_order(
+            self.data_ingestion_repository.stream(criteria),
+            copy_item,
+            key=lambda item: item.id,
+            concurrency=concurrency,
+            total=await self.data_ingestion_repository.count_by_criteria(criteria or {}),
+            on_checkpoint=save_checkpoint if job else None,
+            checkpoint_every=self.settings.REINDEX_CHECKPOINT_EVERY,
+            progress_interval=self.PROGRESS_INTERVAL,
+            label="items into the new index"
+        )
+
+    async def reindex(
+        self,
+        profile_name: str,
+        index_name: Optional[str] = None,
+        switch: bool = True,
+        concurrency: Optional[int] = None,
+        resume: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Build a new index for a profile and switch reads to it.
+
+        Args:
+            profile_name: Embedding profile of the new index
+            index_name: Name of the new index; derived from the profile by default
+            switch: Whether to point the index alias at the new index when done
+            concurrency: Number of items processed at once; REINDEX_CONCURRENCY by default
+            resume: Whether to continue an unfinished job into the same index
+
+        Returns:
+            Dict[str, Any]: 'job_id', 'index_name', 'profile', number of items
+                'copied', 'failed' item IDs, 'switched' and the 'previous' target
+        """
+        profile = EmbeddingProfile.from_settings(profile_name)
+        index_name = index_name or self.default_index_name(profile)
+        concurrency = max(1, concurrency or self.settings.REINDEX_CONCURRENCY)
+        previous = await self.current_target()
+        if index_name == previous["index_name"]:
+            raise ValueError(f"Index {index_name} is already serving reads")
+
+        ingestion = DataIngestionUseCase(vector_repository=pinecone_repository(index_name, profile.name))
+        job = await self.reindex_job_repository.find_unfinished(index_name, profile.name) if resume else None
+        if job:
+            target_ids = await self.reindex_job_repository.load_chunk_ids(job["_id"])
+            self.logger.info(f"Resuming reindex job {job['_id']} after {job['processed']} items")
+        else:
+            total = await self.data_ingestion_repository.count()
+            job = await self.reindex_job_repository.create(index_name, profile.name, total)
+            target_ids = {}
+        failed_ids = list(job.get("failed_ids", []))
+        self.logger.info(
+            f"Reindexing into {index_name} with profile {profile.name} and {concurrency} workers "
+            f"(serving: {previous['index_name']})"
+        )
+
+        try:
+            criteria = {"_id": {"$gt": ObjectId(job["checkpoint_id"])}} if job["checkpoint_id"] else None
+            copied = job["processed"] - len(failed_ids)
+            copied += await self._copy(ingestion, criteria, target_ids, concurrency, job, failed_ids)
+
+            # Items written since the job started, plus items to retry
+            since = job["created_at"]
+            for _ in range(self.MAX_CATCH_UP_PASSES):
+                pass_started = datetime.utcnow()
+                changed = await self._copy(ingestion, self._catch_up_criteria(since, failed_ids), target_ids, concurrency, failed_ids=failed_ids)
+                since = pass_started
+                if not changed:
+                    break
+        except BaseException:
+            await self.reindex_job_repository.finish(job["_id"], status="interrupted")
+            raise
+
+        result = {
+            "job_id": job["_id"],
+            "index_name": index_name,
+            "profile": profile.name,
+            "copied": copied,
+            "failed": failed_ids,
+            "switched": False,
+            "previous": previous,
+        }
+        if failed_ids:
+            self.logger.warning(f"{len(failed_ids)} items could not be reindexed: {failed_ids[:20]}")
+        if not switch:
+            # Keep the job resumable, so a later run only catches up and switches
+            await self.reindex_job_repository.save_chunk_ids(job["_id"], target_ids)
+            await self.reindex_job_repository.finish(job["_id"], status="built", failed_ids=failed_ids)
+            return result
+
+        await self.index_alias_repository.switch(index_name, profile.name)
+        await self.data_ingestion_repository.set_chunk_ids_many(target_ids)
+
+        # Other processes follow the alias within INDEX_ALIAS_REFRESH_SECONDS;
+        # copy what they wrote to the old index meanwhile
+        await asyncio.sleep(self.settings.INDEX_ALIAS_REFRESH_SECONDS)
+        late_ids = {}
+        async for item in self.data_ingestion_repository.stream({"updated_at": {"$gte": since}}):
+            late_ids[item.id] = target_ids.get(item.id, [])
+        if late_ids:
+            await self._copy(ingestion, {"updated_at": {"$gte": since}}, late_ids, concurrency)
+            await self.data_ingestion_repository.set_chunk_ids_many(late_ids)
+
+        await self.reindex_job_repository.finish(job["_id"], failed_ids=failed_ids)
+        self.logger.info(f"Reads now served from {index_name}; {previous['index_name']} can be deleted once verified")
+        result["switched"] = True
+        return result
+
+    @staticmethod
+    def _catch_up_criteria(since: datetime, failed_ids: List[str]) -> Dict[str, Any]:
+        """Filter of items changed since a time or failed before."""
+        changed = {"updated_at": {"$gte": since}}
+        if not failed_ids:
+            return changed
+        return {"$or": [changed, {"_id": {"$in": [ObjectId(item_id) for item_id in failed_ids]}}]}
+
+    async def switch(self, index_name: str, profile_name: str) -> Dict[str, Any]:
+        """
+        Point reads at an existing index, e.g. to roll back a reindex.
+
+        Args:
+            index_name: Index to serve from
+            profile_name: Embedding profile of that index
+
+        Returns:
+            Dict[str, Any]: The new target
+        """
+        EmbeddingProfile.from_settings(profile_name)
+        return await self.index_alias_repository.switch(index_name, profile_name)
@@ -30,7 +30,8 @@ class IFileUseCase:
     
     async def get_file_resources(self, user: User, limit: int = 10, offset: int = 0, 
                                 filter_params: Dict[str, Any] = None, 
-                                sort_params: List[Tuple[str, int]] = None) -> Tuple[List[FileResource], int]:
+                                sort_params: List[Tuple[str, int]] = None,
+                                like: Optional[Dict[str, str]] = None) -> Tuple[List[FileResource], int]:
         """Get file resources for a user"""
         pass
 
@@ -141,7 +142,8 @@ class FileUseCase(IFileUseCase):
     
     async def get_file_resources(self, user: User, limit: int = 10, offset: int = 0,
                                 filter_params: Dict[str, Any] = None, 
-                                sort_params: List[Tuple[str, int]] = None) -> Tuple[List[FileResource], int]:
+                                sort_params: List[Tuple[str, int]] = None,
+                                like: Optional[Dict[str, str]] = None) -> Tuple[List[FileResource], int]:
         """
         Get file resources for a user
         
@@ -151,6 +153,7 @@ class FileUseCase(IFileUseCase):
             offset: Offset for pagination
             filter_params: Optional filter parameters
             sort_params: Optional sort parameters [(field, direction)]
+            like: Optional case-insensitive substrings keyed by field (file_name)
             
         Returns:
             Tuple of (list of FileResource objects, total count)
@@ -173,11 +176,12 @@ class FileUseCase(IFileUseCase):
                 filter_params, 
                 limit=limit, 
                 offset=offset, 
-                sort=sort_params
+                sort=sort_params,
+                like=like
             )
             
             # Count total matching resources
-            count = await self.file_resource_repo.count(filter_params)
+            count = await self.file_resource_repo.count(filter_params, like=like)
             
             return resources, count
         except Exception as e:
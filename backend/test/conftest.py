@@ -7,6 +7,8 @@ from typing import Generator
 # Set test environment
 os.environ["ENVIRONMENT"] = "test"
 os.environ["MONGODB_URI"] = "mongodb://localhost:27017/conversa_test"
+os.environ["MONGO_URI"] = "mongodb://localhost:27017"
+os.environ["MONGO_DB"] = "conversa_test"
 os.environ["JWT_SECRET_KEY"] = "test_secret_key"
 os.environ["JWT_ALGORITHM"] = "HS256"
 os.environ["JWT_ACCESS_TOKEN_EXPIRE_MINUTES"] = "30"
@@ -1,13 +1,11 @@
-import io
 import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from fastapi import UploadFile
 from fastapi.testclient import TestClient
 
 from src.domain.models.data_ingestion import DataIngestion, DataType
 from src.domain.entity.data_ingestion import DataTypeEnum
-from src.usecase.data_ingestion import DataIngestionUseCase
+from src.usecase.data_ingestion import DataIngestionUseCase, IngestionJobUseCase
 from main import app
 
 
@@ -47,47 +45,43 @@ def sample_data_ingestion():
     )
 
 
+@pytest.fixture
+def mock_ingestion_job_usecase():
+    """Fixture for mocking IngestionJobUseCase."""
+    mock_usecase = AsyncMock(spec=IngestionJobUseCase)
+    mock_usecase.submit = AsyncMock()
+    mock_usecase.get_job = AsyncMock()
+    return mock_usecase
+
+
 @pytest.mark.asyncio
-@patch("src.infrastructure.fastapi.routes.data_ingestion_routes.get_data_ingestion_usecase")
-async def test_submit_data_ingestion(mock_get_usecase, mock_data_ingestion_usecase, sample_data_ingestion):
-    """Test submitting data ingestion."""
+@patch("src.infrastructure.fastapi.routes.data_ingestion_routes.get_ingestion_job_usecase")
+async def test_submit_data_ingestion(mock_get_usecase, mock_ingestion_job_usecase):
+    """Test that submitting data ingestion queues a job and answers 202 at once."""
     # Set up mock
-    mock_get_usecase.return_value = mock_data_ingestion_usecase
-    mock_data_ingestion_usecase.submit_data_ingestion.return_value = sample_data_ingestion
-    
-    # Create a file
-    test_file_content = b"test file content"
-    test_file = UploadFile(
-        filename="test.pdf",
-        file=io.BytesIO(test_file_content),
-        content_type="application/pdf"
-    )
+    mock_get_usecase.return_value = mock_ingestion_job_usecase
+    mock_ingestion_job_usecase.submit.return_value = {"_id": "job_id", "status": "queued"}
     
-    # Prepare form data
-    form_data = {
+    payload = {
         "title": "Test Title",
         "specified_text": "Sample specified text",
         "data_type": DataTypeEnum.LEGAL_TEXT,
-        "law": "Sample Law",
         "reference": "Sample Reference",
-        "keywords": ["keyword1", "keyword2"]
+        "keywords": ["keyword1", "keyword2"],
+        "file_url": "https://example.com/file.pdf"
     }
     
-    # Test the API endpoint with multipart form
-    files = {"file": ("test.pdf", test_file_content, "application/pdf")}
-    response = client.post("/api/data-ingestion/", data=form_data, files=files)
+    response = client.post("/api/data-ingestion/", json=payload)
     
     # Assertions
-    assert response.status_code == 201
+    assert response.status_code == 202
     result = response.json()
-    assert result["title"] == "Test Title"
-    assert result["specified_text"] == "Sample specified text"
-    assert result["data_type"] == DataType.LEGAL_TEXT.value
-    assert "id" in result
-    assert "file_url" in result
+    assert result["job_id"] == "job_id"
+    assert result["status"] == "queued"
+    assert result["status_url"] == "/api/data-ingestion/jobs/job_id"
     
-    # Verify usecase was called with correct parameters
-    mock_data_ingestion_usecase.submit_data_ingestion.assert_called_once()
+    # Verify usecase was called
+    mock_ingestion_job_usecase.submit.assert_called_once()
 
 
 @pytest.mark.asyncio
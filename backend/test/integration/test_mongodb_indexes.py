@@ -0,0 +1,223 @@
+"""Check that the queries repositories issue are served by a declared index (needs a local MongoDB)."""
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient
+
+from src.interface.repository.mongodb import thread_repository
+from src.interface.repository.mongodb.data_ingestion_repository import DataIngestionRepository
+from src.interface.repository.mongodb.embedding_cache_repository import EmbeddingCacheRepository
+from src.interface.repository.mongodb.file_resource_repository import FileResourceRepository
+from src.interface.repository.mongodb.index_registry import IndexRegistry
+from src.interface.repository.mongodb.ingestion_job_repository import IngestionJobRepository
+from src.interface.repository.mongodb.keyword_stats_repository import KeywordStatsRepository
+from src.interface.repository.mongodb.reindex_job_repository import ReindexJobRepository
+from src.interface.repository.mongodb.thread_repository import MongoDBThreadRepository
+from src.interface.repository.mongodb.user_repository import MongoDBUserRepository
+from src.interface.repository.mongodb.user_verification_repository import MongoDBUserVerificationRepository
+
+MONGO_URI = "mongodb://localhost:27017"
+NOW = datetime.utcnow()
+
+# Unrelated documents stored in every collection; a query reading them is not selective
+NOISE = 50
+
+
+def mongodb_available() -> bool:
+    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+        return True
+    except Exception:
+        return False
+    finally:
+        client.close()
+
+
+pytestmark = pytest.mark.skipif(not mongodb_available(), reason="MongoDB is not available")
+
+
+class RecordingCursor:
+    """Cursor recording the sort applied to its query."""
+
+    def __init__(self, cursor, query):
+        self._cursor = cursor
+        self._query = query
+
+    def sort(self, key, direction=None):
+        self._query["sort"] = [(key, direction)] if isinstance(key, str) else list(key)
+        self._cursor = self._cursor.sort(key, direction)
+        return self
+
+    def skip(self, skip):
+        self._cursor = self._cursor.skip(skip)
+        return self
+
+    def limit(self, limit):
+        self._cursor = self._cursor.limit(limit)
+        return self
+
+    def __aiter__(self):
+        return self._cursor.__aiter__()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class RecordingCollection:
+    """Collection passing every call on, recording the filter and sort of each query."""
+
+    def __init__(self, collection, queries):
+        self._collection = collection
+        self._queries = queries
+
+    def _record(self, query, sort=None):
+        recorded = {"collection": self._collection.name, "filter": query or {}, "sort": sort}
+        self._queries.append(recorded)
+        return recorded
+
+    def find(self, filter=None, *args, **kwargs):
+        return RecordingCursor(self._collection.find(filter, *args, **kwargs), self._record(filter, kwargs.get("sort")))
+
+    async def find_one(self, filter=None, *args, **kwargs):
+        self._record(filter, kwargs.get("sort"))
+        return await self._collection.find_one(filter, *args, **kwargs)
+
+    async def find_one_and_update(self, filter, *args, **kwargs):
+        self._record(filter, kwargs.get("sort"))
+        return await self._collection.find_one_and_update(filter, *args, **kwargs)
+
+    async def count_documents(self, filter, *args, **kwargs):
+        self._record(filter)
+        return await self._collection.count_documents(filter, *args, **kwargs)
+
+    async def update_one(self, filter, *args, **kwargs):
+        self._record(filter)
+        return await self._collection.update_one(filter, *args, **kwargs)
+
+    async def update_many(self, filter, *args, **kwargs):
+        self._record(filter)
+        return await self._collection.update_many(filter, *args, **kwargs)
+
+    async def delete_many(self, filter, *args, **kwargs):
+        self._record(filter)
+        return await self._collection.delete_many(filter, *args, **kwargs)
+
+    def aggregate(self, pipeline, *args, **kwargs):
+        stages = {name: value for stage in pipeline for name, value in stage.items()}
+        self._record(stages.get("$match"), list(stages["$sort"].items()) if "$sort" in stages else None)
+        return self._collection.aggregate(pipeline, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+class RecordingDatabase:
+    """Database handing out recording collections."""
+
+    def __init__(self, db):
+        self.db = db
+        self.queries = []
+
+    def __getitem__(self, name):
+        return RecordingCollection(self.db[name], self.queries)
+
+    def __getattr__(self, name):
+        return self[name]
+
+
+def is_id_lookup(query) -> bool:
+    """Whether a filter selects documents by _id, which MongoDB always serves from the _id index."""
+    condition = query.get("_id")
+    return condition is not None and (not isinstance(condition, dict) or "$in" in condition)
+
+
+# Repository calls whose queries must be selective
+CALLS = [
+    ("get_thread", lambda db: MongoDBThreadRepository(db).get_thread("t1")),
+    ("list_threads_by_user", lambda db: MongoDBThreadRepository(db).list_threads_by_user("u1")),
+    ("get_by_email", lambda db: MongoDBUserRepository(db).get_by_email("a@example.com")),
+    ("get_user_id_by_refresh_token", lambda db: MongoDBUserRepository(db).get_user_id_by_refresh_token("token")),
+    ("invalidate_refresh_token", lambda db: MongoDBUserRepository(db).invalidate_refresh_token("token")),
+    ("verification get_by_email", lambda db: MongoDBUserVerificationRepository(db).get_by_email("a@example.com")),
+    ("verification get_by_code", lambda db: MongoDBUserVerificationRepository(db).get_by_code("123456")),
+    ("delete_expired", lambda db: MongoDBUserVerificationRepository(db).delete_expired(NOW)),
+    ("file find", lambda db: FileResourceRepository(db).find({"user_create": "a@example.com"}, sort=[("created_at", -1)])),
+    ("file find like", lambda db: FileResourceRepository(db).find(
+        {"user_create": "a@example.com"}, sort=[("created_at", -1)], like={"file_name": "report"}
+    )),
+    ("file count like", lambda db: FileResourceRepository(db).count({"user_create": "a@example.com"}, like={"file_name": "report"})),
+    ("find_all", lambda db: DataIngestionRepository(db).find_all()),
+    ("find_page", lambda db: DataIngestionRepository(db).find_page({})),
+    ("find_page data_type", lambda db: DataIngestionRepository(db).find_page({"data_type": "FAQ"})),
+    ("find_page title like", lambda db: DataIngestionRepository(db).find_page({}, like={"title": "labour"})),
+    ("find_page keywords like", lambda db: DataIngestionRepository(db).find_page(
+        {"data_type": "FAQ"}, like={"keywords": "ค่าจ้าง"}
+    )),
+    ("count_by_criteria", lambda db: DataIngestionRepository(db).count_by_criteria({"data_type": "FAQ"})),
+    ("get_by_pinecone_id", lambda db: DataIngestionRepository(db).get_by_pinecone_id("p1")),
+    ("get_by_webpage_url", lambda db: DataIngestionRepository(db).get_by_webpage_url("https://law.example/1")),
+    ("evict_overflow", lambda db: EmbeddingCacheRepository(db, max_entries=NOISE - 5).evict_overflow()),
+    ("remove_documents", lambda db: KeywordStatsRepository(db).remove_documents([{"labour"}])),
+    ("find_unfinished", lambda db: ReindexJobRepository(db).find_unfinished("i", "p")),
+    ("load_chunk_ids", lambda db: ReindexJobRepository(db).load_chunk_ids("j1")),
+    ("claim", lambda db: IngestionJobRepository(db).claim("w1", stale_after=60)),
+]
+
+
+def plan_stages(plan):
+    """Collect the stage names of an explain plan."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(plan_stages(value))
+    return stages
+
+
+@pytest_asyncio.fixture
+async def indexed_db(monkeypatch):
+    """A scratch database with the declared indexes built and NOISE unrelated documents per collection."""
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client["conversa_test_indexes"]
+    await IndexRegistry.reconcile(db)
+    for collection in IndexRegistry.specs():
+        await db[collection].insert_many([{"noise": i} for i in range(NOISE)])
+
+    recording = RecordingDatabase(db)
+
+    async def connected_db():
+        return recording
+
+    monkeypatch.setattr(thread_repository.MongoDB, "reconnect_if_needed", connected_db)
+    yield recording
+    await client.drop_database("conversa_test_indexes")
+    client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name, call", CALLS, ids=[name for name, _ in CALLS])
+async def test_repository_queries_use_an_index(indexed_db, name, call):
+    """Test that explain() shows an index scan that skips the unrelated documents."""
+    await call(indexed_db)
+
+    queries = [query for query in indexed_db.queries if not is_id_lookup(query["filter"])]
+    assert queries, f"{name} issued no query to check"
+    for query in queries:
+        cursor = indexed_db.db[query["collection"]].find(query["filter"])
+        if query["sort"]:
+            cursor = cursor.sort(query["sort"])
+
+        explanation = await cursor.explain()
+
+        stages = plan_stages(explanation["queryPlanner"]["winningPlan"])
+        assert "COLLSCAN" not in stages, query
+        assert any("IXSCAN" in stage for stage in stages), (query, stages)
+        stats = explanation["executionStats"]
+        assert stats["totalDocsExamined"] - stats["nReturned"] < NOISE // 2, (query, stats)
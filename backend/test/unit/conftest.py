@@ -0,0 +1,44 @@
+"""Shared fixtures for unit tests."""
+import logging
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.interface.repository.local.local_vector_store import LocalVectorStore
+from src.interface.repository.pinecone.embedding_profile import EmbeddingProfile
+from src.interface.repository.pinecone.pinecone_repository import PineconeRepository
+
+
+@pytest.fixture
+def make_pinecone_repo(tmp_path):
+    """
+    Create PineconeRepositories without connecting to Pinecone or OpenAI.
+
+    Repositories use a 3-dimension test profile over a local vector store, with
+    no Pinecone index, caches, search sessions or lexical index. Keyword
+    arguments override any attribute, e.g. embeddings mocked by the test.
+    """
+    if PineconeRepository._executor is None:
+        PineconeRepository._executor = ThreadPoolExecutor(max_workers=4)
+
+    def make(**attributes):
+        repo = PineconeRepository.__new__(PineconeRepository)
+        repo.embedding_profile = attributes.pop("embedding_profile", EmbeddingProfile("test", "text-embedding-3-small", 3))
+        repo.embedding_model = repo.embedding_profile.model
+        repo.embedding_dimensions = repo.embedding_profile.dimensions
+        repo.logger = logging.getLogger(__name__)
+        repo.index_name = "test-index"
+        repo.index = None
+        if "vector_store" not in attributes:
+            repo.vector_store = LocalVectorStore(str(tmp_path / "vectors"), dimension=repo.embedding_dimensions)
+        repo.embedding_cache = None
+        repo.query_cache = None
+        repo.search_sessions = None
+        repo.lexical_index = None
+        repo.rrf_k = 60
+        repo.upsert_batch_size = 100
+        repo.embedding_max_concurrency = 4
+        for name, value in attributes.items():
+            setattr(repo, name, value)
+        return repo
+
+    return make
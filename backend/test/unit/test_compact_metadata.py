@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import AsyncMock
+
+
+FULL_METADATA = {
+    "mongodb_id": "doc1",
+    "title": "Labour Protection Act",
+    "specified_text": "Section 118",
+    "content": "Long legal text " * 50,
+    "data_type": "FAQ",
+    "user_id": "u1",
+    "chunk_index": 0,
+    "source_type": "file",
+    "doc_page": 3,
+}
+
+
+@pytest.fixture
+def compact_repo(make_pinecone_repo):
+    """Create a PineconeRepository storing compact metadata in a local vector store."""
+    return make_pinecone_repo(compact_metadata=True, generate_embeddings=AsyncMock(return_value=[1.0, 0.0, 0.0]))
+
+
+@pytest.mark.asyncio
+async def test_vectors_store_only_compact_fields_and_search_by_id(compact_repo):
+    """Test that display fields are dropped on write and searches need no metadata."""
+    await compact_repo.upsert_vectors([
+        {"id": "doc1_chunk_aaa", "values": [1, 0, 0], "metadata": FULL_METADATA},
+        {"id": "doc2_chunk_bbb", "values": [0, 1, 0], "metadata": {**FULL_METADATA, "mongodb_id": "doc2"}},
+    ])
+
+    stored = await compact_repo.vector_store.fetch_vectors(["doc1_chunk_aaa"])
+    assert set(stored["doc1_chunk_aaa"]["metadata"]) == {
+        "mongodb_id", "data_type", "user_id", "chunk_index", "source_type", "embedding_profile"
+    }
+
+    results = await compact_repo.search("anything", limit=5)
+    assert [result["id"] for result in results] == ["doc1", "doc2"]
+    assert results[0]["chunk_id"] == "doc1_chunk_aaa"
+    assert results[0]["title"] is None
+
+    # Filters on compact fields still run inside the index
+    filtered = await compact_repo.search("anything", limit=5, filter={"mongodb_id": {"$eq": "doc2"}})
+    assert [result["id"] for result in filtered] == ["doc2"]
+
+
+@pytest.mark.asyncio
+async def test_compact_stored_metadata_rewrites_existing_vectors_once(compact_repo):
+    """Test that the migration shrinks old vectors in place without re-embedding."""
+    await compact_repo.vector_store.upsert_vectors([
+        {"id": "doc1_chunk_aaa", "values": [0.6, 0.8, 0], "metadata": FULL_METADATA},
+        {"id": "doc1_chunk_bbb", "values": [0, 0, 1], "metadata": {"mongodb_id": "doc1", "chunk_index": 1}},
+    ])
+
+    counts = await compact_repo.compact_stored_metadata(batch_size=1)
+
+    # The second vector has nothing to drop
+    assert counts == {"scanned": 2, "rewritten": 1}
+    stored = await compact_repo.vector_store.fetch_vectors(["doc1_chunk_aaa"])
+    assert "content" not in stored["doc1_chunk_aaa"]["metadata"]
+    assert stored["doc1_chunk_aaa"]["values"] == pytest.approx([0.6, 0.8, 0])
+    compact_repo.generate_embeddings.assert_not_called()
+
+    assert await compact_repo.compact_stored_metadata() == {"scanned": 2, "rewritten": 0}
@@ -0,0 +1,183 @@
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from src.domain.models.data_ingestion import DataIngestion
+from src.interface.repository.mongodb.data_ingestion_repository import DataIngestionRepository
+from src.shared.text.ngrams import ngrams
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self.documents.sort(key=lambda document: document[field], reverse=direction < 0)
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+
+class FakeCollection:
+    """Collection answering $in queries in storage order, as MongoDB does."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.queries = []
+        self.inserts = 0
+
+    def aggregate(self, pipeline):
+        """Evaluate the $match (equality only), $sort and $facet paging pipeline of find_page."""
+        self.queries.append(pipeline)
+        match, sort, facet = pipeline[0]["$match"], pipeline[1]["$sort"], pipeline[2]["$facet"]
+        matches = [dict(document) for document in self.documents if all(document.get(k) == v for k, v in match.items())]
+        for field, direction in reversed(list(sort.items())):
+            matches.sort(key=lambda document: document[field], reverse=direction < 0)
+        skip, limit = facet["items"][0]["$skip"], facet["items"][1]["$limit"]
+        return FakeCursor([{
+            "items": matches[skip:skip + limit],
+            "total": [{"count": len(matches)}] if matches else [],
+        }])
+
+    async def insert_many(self, documents, ordered=True):
+        self.inserts += 1
+        stored = {document["_id"] for document in self.documents}
+        errors = []
+        for index, document in enumerate(documents):
+            if document["_id"] in stored:
+                errors.append({"index": index, "code": 11000, "errmsg": "E11000 duplicate key error"})
+            else:
+                stored.add(document["_id"])
+                self.documents.append(document)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+    @staticmethod
+    def _matches(document, query):
+        """Evaluate $in, $all and equality conditions."""
+        for field, condition in query.items():
+            value = document.get(field)
+            if isinstance(condition, dict) and "$in" in condition:
+                if value not in condition["$in"]:
+                    return False
+            elif isinstance(condition, dict) and "$all" in condition:
+                if not set(condition["$all"]) <= set(value or []):
+                    return False
+            elif value != condition:
+                return False
+        return True
+
+    def find(self, query, projection=None):
+        self.queries.append((query, projection))
+        matches = []
+        for document in self.documents:
+            if self._matches(document, query):
+                if projection and not any(projection.values()):
+                    document = {key: value for key, value in document.items() if key not in projection}
+                elif projection:
+                    document = {key: value for key, value in document.items() if key == "_id" or key in projection}
+                matches.append(dict(document))
+        return FakeCursor(matches)
+
+
+def build_document(title):
+    return {
+        "_id": ObjectId(),
+        "title": title,
+        "specified_text": "text",
+        "data_type": "FAQ",
+        "reference": "ref",
+        "keywords": [title.lower()],
+    }
+
+
+@pytest.fixture
+def repository():
+    documents = [build_document(title) for title in ["A", "B", "C", "D"]]
+    repository = DataIngestionRepository({"data_ingestion": FakeCollection(documents)})
+    return repository, [str(document["_id"]) for document in documents]
+
+
+@pytest.mark.asyncio
+async def test_find_by_ids_keeps_ranking_order_in_one_query(repository):
+    """Test that hits are loaded with one $in query and returned in rank order."""
+    repository, ids = repository
+    before = dict(DataIngestionRepository.stats)
+    ranked = [ids[2], ids[0], str(ObjectId()), ids[3], ids[0], "not-an-id"]
+
+    items = await repository.find_by_ids(ranked)
+
+    assert [item.title for item in items] == ["C", "A", "D"]
+    assert len(repository.collection.queries) == 1
+    assert DataIngestionRepository.stats["round_trips_saved"] - before["round_trips_saved"] == 3
+    assert await repository.find_by_ids([]) == []
+    assert len(repository.collection.queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_find_by_ids_with_projection_returns_partial_documents(repository):
+    """Test that projected lookups return dicts with only the requested fields."""
+    repository, ids = repository
+
+    documents = await repository.find_by_ids([ids[1], ids[0]], projection={"title": 1})
+
+    assert documents == [{"id": ids[1], "title": "B"}, {"id": ids[0], "title": "A"}]
+
+
+@pytest.mark.asyncio
+async def test_create_many_inserts_once_and_reports_rejected_entries(repository):
+    """Test that entries get IDs up front, are written with one insert_many, and rejects are reported by position."""
+    repository, ids = repository
+    entries = [
+        DataIngestion(title=title, specified_text="text", data_type="FAQ", reference="ref", keywords=[])
+        for title in ["E", "F", "G"]
+    ]
+    entries[1].id = ids[0]
+
+    errors = await repository.create_many(entries)
+
+    assert list(errors) == [1]
+    assert repository.collection.inserts == 1
+    assert all(entry.id for entry in entries)
+    stored = await repository.find_by_ids([entries[0].id, entries[2].id])
+    assert [item.title for item in stored] == ["E", "G"]
+
+
+@pytest.mark.asyncio
+async def test_find_page_pages_and_counts_in_one_aggregation(repository):
+    """Test that a filtered page and its total come from a single $facet round trip."""
+    repository, _ = repository
+    repository.collection.documents[1]["data_type"] = "FICTION"
+
+    items, total = await repository.find_page({"data_type": "FAQ"}, skip=1, limit=1, sort={"title": -1})
+
+    assert [item.title for item in items] == ["C"]
+    assert total == 3
+    assert len(repository.collection.queries) == 1
+    assert "$facet" in repository.collection.queries[0][-1]
+    assert await repository.find_page({"data_type": "LEGAL"}) == ([], 0)
+
+
+@pytest.mark.asyncio
+async def test_find_page_with_substring_filter_uses_ngram_tokens():
+    """Test that a "contains" filter is looked up by n-gram tokens, checked exactly, then paged."""
+    titles = ["ค่าชดเชยเลิกจ้าง", "การเลิกจ้างงาน", "ค่าจ้างขั้นต่ำ", "จ้างเลิกงาน"]
+    repository = DataIngestionRepository({"data_ingestion": FakeCollection([])})
+    for title in titles:
+        document = build_document(title)
+        document.update(repository._tokens(document))
+        repository.collection.documents.append(document)
+
+    items, total = await repository.find_page({"data_type": "FAQ"}, skip=1, limit=5, sort={"title": 1}, like={"title": "เลิกจ้าง"})
+
+    assert total == 2
+    assert [item.title for item in items] == ["ค่าชดเชยเลิกจ้าง"]
+    lookup, projection = repository.collection.queries[0]
+    assert lookup["title_ngrams"] == {"$all": ngrams("เลิกจ้าง")}
+    assert projection == {"title": 1}
@@ -0,0 +1,135 @@
+import logging
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from langchain_core.documents import Document
+
+from src.domain.models.data_ingestion import DataIngestion
+from src.usecase.data_ingestion.data_ingestion_usecase import DataIngestionUseCase
+
+
+@pytest.fixture
+def pinecone_repo(make_pinecone_repo):
+    """Create a PineconeRepository backed by a local vector store with mocked embeddings."""
+    return make_pinecone_repo(
+        generate_embeddings_batch=AsyncMock(side_effect=lambda texts: [[1.0, 0.0, 0.0] for _ in texts])
+    )
+
+
+@pytest.fixture
+def use_case(pinecone_repo):
+    use_case = DataIngestionUseCase.__new__(DataIngestionUseCase)
+    use_case.pinecone_repository = pinecone_repo
+    use_case.logger = logging.getLogger(__name__)
+    return use_case
+
+
+def build_item(**fields):
+    return DataIngestion(**{
+        "id": "doc1", "title": "Labour Act", "specified_text": "Severance pay", "data_type": "FAQ",
+        "reference": "ref", "keywords": [], **fields
+    })
+
+
+def build_page(content_hash="v2", ingested=None):
+    return {"body": b"<html></html>", "encoding": "utf-8", "content_hash": content_hash, "ingested": ingested or {}}
+
+
+def parsed(title, text="Section 118"):
+    return Document(page_content=text, metadata={"title": title, "description": "No description found."})
+
+
+@pytest.fixture
+def page_use_case(use_case, pinecone_repo):
+    """A use case with in-memory item and keyword stores, ingesting pages into index 'legal-index'."""
+    pinecone_repo.index_name = "legal-index"
+    pinecone_repo.parse_webpage = AsyncMock(return_value=parsed("Labour Act"))
+    pinecone_repo.ingest_webpage = AsyncMock(return_value={"ids": ["doc1_chunk_a"], "embedded": 1})
+    use_case.data_ingestion_repository = MagicMock(
+        get_by_webpage_url=AsyncMock(return_value=None),
+        create=AsyncMock(side_effect=lambda item: item.model_copy(update={"id": "doc1"})),
+        update=AsyncMock(),
+        delete=AsyncMock(),
+    )
+    use_case.keyword_extraction_service = MagicMock(
+        extract=AsyncMock(return_value=["severance"]),
+        add_to_corpus=AsyncMock(),
+        remove_from_corpus=AsyncMock(),
+    )
+    use_case.max_keywords = 10
+    return use_case
+
+
+async def store_chunks(repo, paragraphs):
+    chunks = [Document(page_content=paragraph) for paragraph in paragraphs]
+    records = repo._build_chunk_records(chunks, {"mongodb_id": "doc1", "title": "Labour Act"}, source_type="webpage")
+    return (await repo.sync_chunks(records))["ids"]
+
+
+@pytest.mark.asyncio
+async def test_reingest_keeps_stored_chunks_when_the_source_fails(use_case, pinecone_repo):
+    """Test that a failed webpage load raises instead of replacing the chunks with one text vector."""
+    previous_ids = await store_chunks(pinecone_repo, ["section 1", "section 2", "section 3"])
+    pinecone_repo.ingest_webpage = AsyncMock(side_effect=TimeoutError("fetch timed out"))
+    item = build_item(webpage_url="https://law.example/act")
+
+    with pytest.raises(TimeoutError):
+        await use_case._reingest(item, {"mongodb_id": "doc1"}, previous_ids, refresh_metadata=True)
+
+    assert sorted(await pinecone_repo.list_vector_ids("doc1_")) == sorted(previous_ids)
+
+
+@pytest.mark.asyncio
+async def test_reingest_stores_one_text_vector_for_an_item_without_a_source(use_case, pinecone_repo):
+    """Test that only an item without a file or webpage falls back to a single text vector."""
+    result = await use_case._reingest(build_item(), {"mongodb_id": "doc1"}, [], refresh_metadata=False)
+
+    assert len(result["ids"]) == 1
+    assert await pinecone_repo.list_vector_ids("doc1") == result["ids"]
+
+
+@pytest.mark.asyncio
+async def test_new_page_without_text_is_not_kept(page_use_case, pinecone_repo):
+    """Test that a page yielding no chunks fails without leaving an item or corpus entry behind."""
+    pinecone_repo.ingest_webpage.return_value = {"ids": [], "embedded": 0}
+
+    with pytest.raises(ValueError):
+        await page_use_case.ingest_page("https://law.example/1", build_page(), "FAQ", "ref")
+
+    page_use_case.data_ingestion_repository.delete.assert_awaited_once_with("doc1")
+    page_use_case.keyword_extraction_service.add_to_corpus.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_page_is_skipped_without_parsing(page_use_case, pinecone_repo):
+    """Test that a page built from the same content is neither parsed nor ingested again."""
+    page_use_case.data_ingestion_repository.get_by_webpage_url.return_value = build_item(
+        webpage_url="https://law.example/1", chunk_ids=["doc1_chunk_a"]
+    )
+    page = build_page(content_hash="v1", ingested={"legal-index:doc1": "v1"})
+
+    assert await page_use_case.ingest_page("https://law.example/1", page, "FAQ", "ref") == "unchanged"
+    pinecone_repo.parse_webpage.assert_not_awaited()
+    pinecone_repo.ingest_webpage.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_changed_page_refreshes_title_and_keywords(page_use_case, pinecone_repo):
+    """Test that a re-crawled page with a new title updates the item's fields, vectors and corpus entry."""
+    existing = build_item(webpage_url="https://law.example/1", chunk_ids=["doc1_chunk_old"], keywords=["old"])
+    page_use_case.data_ingestion_repository.get_by_webpage_url.return_value = existing
+    pinecone_repo.parse_webpage.return_value = parsed("Labour Protection Act B.E. 2541")
+    page = build_page(ingested={"legal-index:doc1": "v1"})
+
+    assert await page_use_case.ingest_page("https://law.example/1", page, "FAQ", "ref") == "updated"
+
+    updates = page_use_case.data_ingestion_repository.update.await_args.args[1]
+    assert updates["title"] == "Labour Protection Act B.E. 2541"
+    assert updates["specified_text"] == "Labour Protection Act B.E. 2541"
+    assert updates["keywords"] == ["severance"]
+    assert updates["chunk_ids"] == ["doc1_chunk_a"]
+    call = pinecone_repo.ingest_webpage.await_args
+    assert call.args[2] == ["doc1_chunk_old"]
+    assert call.kwargs["refresh_metadata"] is True
+    assert call.args[1]["title"] == "Labour Protection Act B.E. 2541"
+    page_use_case.keyword_extraction_service.remove_from_corpus.assert_awaited_once()
@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+
+from src.interface.repository.pinecone.embedding_batcher import EmbeddingBatcher, upsert_in_batches
+
+
+def test_plan_batches_respects_token_and_size_limits():
+    """Test that batches are split by token budget and item count."""
+    batcher = EmbeddingBatcher(embed_batch=None, max_batch_tokens=10, max_batch_size=3)
+
+    texts = ["a" * 16] * 7
+    batches = batcher.plan_batches(texts)
+
+    assert [i for batch in batches for i in batch] == list(range(7))
+    assert all(len(batch) <= 3 for batch in batches)
+
+
+@pytest.mark.asyncio
+async def test_embed_preserves_order_and_limits_concurrency():
+    """Test that batched embeddings come back in input order under the concurrency limit."""
+    in_flight = 0
+    max_in_flight = 0
+    calls = []
+
+    async def embed_batch(texts):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        calls.append(list(texts))
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [[float(len(text))] for text in texts]
+
+    batcher = EmbeddingBatcher(embed_batch=embed_batch, max_batch_tokens=100000, max_batch_size=2, max_concurrency=2)
+    texts = ["x" * n for n in range(1, 10)]
+
+    result = await batcher.embed(texts)
+
+    assert result == [[float(n)] for n in range(1, 10)]
+    assert len(calls) == 5
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_embed_marks_failed_batch_as_none():
+    """Test that a failing batch does not abort the other batches."""
+    async def embed_batch(texts):
+        if "bad" in texts:
+            raise RuntimeError("rate limited")
+        return [[1.0] for _ in texts]
+
+    batcher = EmbeddingBatcher(embed_batch=embed_batch, max_batch_size=1)
+
+    result = await batcher.embed(["good", "bad", "good"])
+
+    assert result == [[1.0], None, [1.0]]
+
+
+@pytest.mark.asyncio
+async def test_upsert_in_batches_sends_bulk_requests():
+    """Test that vectors are upserted in fixed-size bulk requests."""
+    batches = []
+
+    async def upsert_batch(batch):
+        batches.append(batch)
+
+    vectors = [{"id": str(i), "values": [0.0], "metadata": {}} for i in range(250)]
+    count = await upsert_in_batches(upsert_batch, vectors, batch_size=100)
+
+    assert count == 250
+    assert sorted(len(batch) for batch in batches) == [50, 100, 100]
@@ -0,0 +1,52 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.interface.repository.mongodb.embedding_cache_repository import EmbeddingCacheRepository
+from src.interface.repository.pinecone.embedding_profile import EmbeddingProfile
+
+
+@pytest.fixture
+def pinecone_repo_with_cache(make_pinecone_repo):
+    """Create a PineconeRepository with a mocked embedding cache and batcher."""
+    repo = make_pinecone_repo(embedding_profile=EmbeddingProfile("test", "text-embedding-3-small", 1536))
+    repo.embedding_cache = MagicMock()
+    repo.embedding_cache.get_many = AsyncMock()
+    repo.embedding_cache.set_many = AsyncMock()
+    repo.embedding_batcher = MagicMock()
+    repo.embedding_batcher.embed = AsyncMock()
+    return repo
+
+
+def test_make_key_normalizes_text_and_scopes_by_model():
+    """Test that cache keys ignore whitespace differences but not model settings."""
+    key = EmbeddingCacheRepository.make_key("text-embedding-3-small", 1536, "มาตรา 420  ผู้ใด\n")
+
+    assert key == EmbeddingCacheRepository.make_key("text-embedding-3-small", 1536, " มาตรา 420 ผู้ใด")
+    assert key != EmbeddingCacheRepository.make_key("text-embedding-3-small", 512, "มาตรา 420 ผู้ใด")
+    assert key != EmbeddingCacheRepository.make_key("text-embedding-3-large", 1536, "มาตรา 420 ผู้ใด")
+
+
+@pytest.mark.asyncio
+async def test_generate_embeddings_batch_only_embeds_misses(pinecone_repo_with_cache):
+    """Test that cached texts are not re-embedded and duplicate misses are embedded once."""
+    repo = pinecone_repo_with_cache
+    repo.embedding_cache.get_many.return_value = [[1.0], None, None]
+    repo.embedding_batcher.embed.return_value = [[2.0]]
+
+    result = await repo.generate_embeddings_batch(["cached", "new", "new"])
+
+    assert result == [[1.0], [2.0], [2.0]]
+    repo.embedding_batcher.embed.assert_called_once_with(["new"])
+    repo.embedding_cache.set_many.assert_called_once_with("text-embedding-3-small", 1536, ["new"], [[2.0]])
+
+
+@pytest.mark.asyncio
+async def test_generate_embeddings_batch_skips_api_on_full_hit(pinecone_repo_with_cache):
+    """Test that a fully cached batch makes no embedding request."""
+    repo = pinecone_repo_with_cache
+    repo.embedding_cache.get_many.return_value = [[1.0], [3.0]]
+
+    result = await repo.generate_embeddings_batch(["a", "b"])
+
+    assert result == [[1.0], [3.0]]
+    repo.embedding_batcher.embed.assert_not_called()
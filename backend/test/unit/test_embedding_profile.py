@@ -0,0 +1,94 @@
+import math
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from src.interface.repository.pinecone.embedding_profile import EmbeddingProfile
+from src.interface.repository.pinecone.query_cache import QueryCache
+
+
+PROFILES = {
+    "small-1536": {"model": "text-embedding-3-small", "dimensions": 1536},
+    "small-512": {"model": "text-embedding-3-small", "dimensions": 512, "normalize": True},
+    "ada": {"model": "text-embedding-ada-002", "dimensions": 1536},
+}
+
+
+def test_request_kwargs_shorten_only_text_embedding_3_models():
+    """Test that dimensions are only requested from models that support them."""
+    assert EmbeddingProfile.from_settings("small-512", PROFILES).request_kwargs() == {
+        "model": "text-embedding-3-small", "dimensions": 512
+    }
+    assert EmbeddingProfile.from_settings("ada", PROFILES).request_kwargs() == {"model": "text-embedding-ada-002"}
+
+    with pytest.raises(ValueError):
+        EmbeddingProfile.from_settings("missing", PROFILES)
+
+
+def test_prepare_normalizes_shortened_vectors():
+    """Test that normalizing profiles rescale vectors to unit length."""
+    assert EmbeddingProfile.from_settings("small-1536", PROFILES).prepare([3.0, 4.0]) == [3.0, 4.0]
+
+    prepared = EmbeddingProfile.from_settings("small-512", PROFILES).prepare([3.0, 4.0])
+    assert prepared == pytest.approx([0.6, 0.8])
+    assert math.sqrt(sum(value * value for value in prepared)) == pytest.approx(1.0)
+    assert EmbeddingProfile.from_settings("small-512", PROFILES).prepare([0.0, 0.0]) == [0.0, 0.0]
+
+
+@pytest.mark.asyncio
+async def test_upserted_vectors_record_their_profile(make_pinecone_repo):
+    """Test that every stored vector carries the name of the profile that produced it."""
+    repo = make_pinecone_repo(embedding_profile=EmbeddingProfile("small-3", "text-embedding-3-small", 3))
+    store = repo.vector_store
+
+    await repo.upsert_vectors([{"id": "a_chunk_0", "values": [1, 0, 0], "metadata": {"mongodb_id": "a"}}])
+    await repo.update_metadata({"a_chunk_0": {"mongodb_id": "a", "title": "A"}})
+
+    matches = await store.query_vectors([1, 0, 0], top_k=1)
+    assert matches[0]["metadata"][EmbeddingProfile.METADATA_FIELD] == "small-3"
+    assert matches[0]["metadata"]["title"] == "A"
+
+
+class DictEmbeddingCache:
+    """Embedding cache keeping entries in a dict."""
+
+    def __init__(self):
+        self.entries = {}
+
+    async def get_many(self, model, dimensions, texts):
+        return [self.entries.get((model, dimensions, text)) for text in texts]
+
+    async def set_many(self, model, dimensions, texts, embeddings):
+        for text, embedding in zip(texts, embeddings):
+            self.entries[(model, dimensions, text)] = embedding
+        return len(texts)
+
+
+def repo_for(make_pinecone_repo, profile, embedding_cache, query_cache):
+    """Create a repository whose model always returns the vector [3, 4]."""
+    repo = make_pinecone_repo(
+        embedding_profile=profile, embedding_cache=embedding_cache, query_cache=query_cache, vector_store=None
+    )
+    repo.openai_client = MagicMock()
+    repo.openai_client.embeddings.create = AsyncMock(
+        side_effect=lambda input, **kwargs: SimpleNamespace(data=[SimpleNamespace(index=0, embedding=[3.0, 4.0])])
+    )
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_profiles_sharing_model_and_dimensions_share_caches_safely(make_pinecone_repo):
+    """Test that cached vectors are prepared for the profile reading them, not the one that stored them."""
+    embedding_cache, query_cache = DictEmbeddingCache(), QueryCache(max_entries=10, ttl_seconds=60)
+    normalized = repo_for(
+        make_pinecone_repo, EmbeddingProfile("unit", "text-embedding-3-small", 2, normalize=True), embedding_cache, query_cache
+    )
+    raw = repo_for(make_pinecone_repo, EmbeddingProfile("raw", "text-embedding-3-small", 2), embedding_cache, query_cache)
+
+    assert await normalized._embed_query("มาตรา 420") == pytest.approx([0.6, 0.8])
+    assert await raw._embed_query("มาตรา 420") == [3.0, 4.0]
+    assert await normalized.generate_embeddings("มาตรา 420") == pytest.approx([0.6, 0.8])
+    assert await raw.generate_embeddings("มาตรา 420") == [3.0, 4.0]
+
+    normalized.openai_client.embeddings.create.assert_awaited_once()
+    raw.openai_client.embeddings.create.assert_not_awaited()
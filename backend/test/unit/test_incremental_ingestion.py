@@ -0,0 +1,86 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from langchain_core.documents import Document
+
+
+@pytest.fixture
+def pinecone_repo(make_pinecone_repo):
+    """Create a PineconeRepository backed by a local vector store with mocked embeddings."""
+    return make_pinecone_repo(
+        generate_embeddings_batch=AsyncMock(side_effect=lambda texts: [[1.0, 0.0, 0.0] for _ in texts])
+    )
+
+
+def build_records(repo, paragraphs):
+    chunks = [Document(page_content=paragraph) for paragraph in paragraphs]
+    return repo._build_chunk_records(chunks, {"mongodb_id": "doc1", "title": "Doc"}, source_type="file")
+
+
+@pytest.mark.asyncio
+async def test_sync_chunks_embeds_only_changed_chunks(pinecone_repo):
+    """Test that re-ingesting an edited document embeds one chunk and deletes the stale one."""
+    paragraphs = [f"paragraph {i}" for i in range(100)]
+    first = await pinecone_repo.sync_chunks(build_records(pinecone_repo, paragraphs))
+    assert first["embedded"] == 100
+
+    paragraphs[42] = "paragraph 42, edited"
+    second = await pinecone_repo.sync_chunks(build_records(pinecone_repo, paragraphs), previous_ids=first["ids"])
+
+    assert second["embedded"] == 1
+    assert second["deleted"] == 1
+    assert second["updated"] == 0
+    assert pinecone_repo.generate_embeddings_batch.await_args.args[0] == [build_records(pinecone_repo, paragraphs)[42]["text"]]
+    assert sorted(await pinecone_repo.list_vector_ids("doc1_chunk_")) == sorted(second["ids"])
+
+
+@pytest.mark.asyncio
+async def test_sync_chunks_updates_metadata_of_moved_chunks(pinecone_repo):
+    """Test that chunks shifted by a removal keep their vectors but get new positions."""
+    paragraphs = ["a", "b", "c"]
+    first = await pinecone_repo.sync_chunks(build_records(pinecone_repo, paragraphs))
+
+    second = await pinecone_repo.sync_chunks(build_records(pinecone_repo, ["b", "c"]), previous_ids=first["ids"])
+
+    assert second == {"ids": first["ids"][1:], "embedded": 0, "updated": 2, "deleted": 1}
+    stored = await pinecone_repo.vector_store.fetch_vectors(second["ids"])
+    assert [stored[vector_id]["metadata"]["chunk_index"] for vector_id in second["ids"]] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_appending_a_paragraph_rewrites_no_earlier_chunk(pinecone_repo):
+    """Test that a longer document only embeds its new chunk and leaves the others' metadata alone."""
+    paragraphs = [f"paragraph {i}" for i in range(50)]
+    first = await pinecone_repo.sync_chunks(build_records(pinecone_repo, paragraphs))
+    pinecone_repo.vector_store.update_metadata = AsyncMock()
+
+    second = await pinecone_repo.sync_chunks(build_records(pinecone_repo, paragraphs + ["appendix"]), previous_ids=first["ids"])
+
+    assert second["embedded"] == 1 and second["updated"] == 0 and second["deleted"] == 0
+    pinecone_repo.vector_store.update_metadata.assert_not_awaited()
+    stored = await pinecone_repo.vector_store.fetch_vectors(second["ids"][:1])
+    assert "total_chunks" not in stored[second["ids"][0]]["metadata"]
+
+
+def test_duplicate_chunks_get_distinct_ids(pinecone_repo):
+    """Test that repeated chunk text does not collapse into one vector ID."""
+    records = build_records(pinecone_repo, ["same", "same", "other"])
+    assert len({record["id"] for record in records}) == 3
+
+
+@pytest.mark.asyncio
+async def test_upsert_text_records_shares_one_embedding_call_across_items(pinecone_repo):
+    """Test that the text records of many items are embedded together and failures are reported."""
+    pinecone_repo.generate_embeddings_batch = AsyncMock(
+        side_effect=lambda texts: [None if "broken" in text else [1.0, 0.0, 0.0] for text in texts]
+    )
+    records = [
+        pinecone_repo.build_text_record({"title": f"FAQ {i}", "specified_text": text}, {"mongodb_id": f"item{i}"})
+        for i, text in enumerate(["answer", "broken answer", "another answer"])
+    ]
+
+    failed = await pinecone_repo.upsert_text_records(records)
+
+    assert failed == [records[1]["id"]]
+    assert pinecone_repo.generate_embeddings_batch.await_count == 1
+    assert len(pinecone_repo.vector_store) == 2
@@ -0,0 +1,52 @@
+import logging
+import pytest
+
+from src.interface.repository.mongodb.index_registry import IndexRegistry
+
+
+class FakeCollection:
+    def __init__(self, indexes):
+        self.indexes = indexes
+        self.created = []
+
+    async def index_information(self):
+        return dict(self.indexes)
+
+    async def create_indexes(self, models):
+        for model in models:
+            self.created.append(model.document["name"])
+            self.indexes[model.document["name"]] = {"key": list(model.document["key"].items())}
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Start from an empty registry."""
+    monkeypatch.setattr(IndexRegistry, "_specs", {})
+    return IndexRegistry
+
+
+@pytest.mark.asyncio
+async def test_reconcile_builds_missing_indexes_and_reports_drift(registry, caplog):
+    """Test that missing indexes are built in one call while drifted and undeclared ones are only reported."""
+    registry.register("threads", [("thread_id", 1)])
+    registry.register("threads", [("user_id", 1), ("is_archived", 1), ("updated_at", -1)])
+    registry.register("users", [("email", 1)], unique=True)
+    db = {
+        "threads": FakeCollection({"_id_": {"key": [("_id", 1)]}, "legacy_1": {"key": [("legacy", 1)]}}),
+        "users": FakeCollection({"_id_": {"key": [("_id", 1)]}, "email_1": {"key": [("email", 1)]}}),
+    }
+
+    with caplog.at_level(logging.WARNING):
+        report = await registry.reconcile(db)
+
+    assert db["threads"].created == ["thread_id_1", "user_id_1_is_archived_1_updated_at_-1"]
+    assert db["users"].created == []
+    assert report == {
+        "created": ["threads.thread_id_1", "threads.user_id_1_is_archived_1_updated_at_-1"],
+        "drifted": ["users.email_1"],
+        "undeclared": ["threads.legacy_1"],
+    }
+    assert "unique=None instead of True" in caplog.text
+
+    # A second run finds everything in place
+    assert (await registry.reconcile(db))["created"] == []
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from src.domain.models.user import User
+from src.interface.repository.mongodb.ingestion_job_repository import IngestionJobRepository
+from src.usecase.data_ingestion.ingestion_job_usecase import IngestionJobUseCase
+
+
+def matches(document, query):
+    """Evaluate $or, $lt, $lte and equality conditions."""
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(matches(document, branch) for branch in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = document.get(field)
+            if value is None:
+                return False
+            if "$lt" in condition and not value < condition["$lt"]:
+                return False
+            if "$lte" in condition and not value <= condition["$lte"]:
+                return False
+        elif document.get(field) != condition:
+            return False
+    return True
+
+
+class FakeCollection:
+    """Collection answering the queue's queries like MongoDB does."""
+
+    def __init__(self):
+        self.documents = []
+
+    async def insert_one(self, document):
+        self.documents.append(dict(document))
+
+    async def find_one(self, query):
+        found = [document for document in self.documents if matches(document, query)]
+        return dict(found[0]) if found else None
+
+    async def find_one_and_update(self, query, update, sort, return_document):
+        found = [document for document in self.documents if matches(document, query)]
+        for field, direction in reversed(sort):
+            found.sort(key=lambda document: document[field], reverse=direction < 0)
+        if not found:
+            return None
+        self._apply(found[0], update)
+        return dict(found[0])
+
+    async def update_one(self, query, update):
+        found = [document for document in self.documents if matches(document, query)]
+        if found:
+            self._apply(found[0], update)
+        return SimpleNamespace(matched_count=len(found[:1]))
+
+    @staticmethod
+    def _apply(document, update):
+        document.update(update.get("$set", {}))
+        for field, amount in update.get("$inc", {}).items():
+            document[field] = document.get(field, 0) + amount
+
+
+@pytest.fixture
+def repository():
+    return IngestionJobRepository({"ingestion_jobs": FakeCollection()})
+
+
+@pytest.fixture
+def use_case(repository):
+    use_case = IngestionJobUseCase.__new__(IngestionJobUseCase)
+    use_case.job_repository = repository
+    use_case.settings = SimpleNamespace(
+        INGESTION_JOB_HEARTBEAT_SECONDS=0.01,
+        INGESTION_JOB_RETRY_BASE_SECONDS=30.0,
+        INGESTION_JOB_RETRY_MAX_SECONDS=600.0,
+    )
+    use_case.logger = logging.getLogger(__name__)
+    return use_case
+
+
+def make_runnable(repository, job_id):
+    """Move a queued job's retry time into the past."""
+    for document in repository.collection.documents:
+        if document["_id"] == job_id:
+            document["run_after"] -= timedelta(hours=1)
+
+
+@pytest.mark.asyncio
+async def test_claim_takes_the_highest_priority_runnable_job_first(repository):
+    """Test that claims go by priority, then age, and skip jobs waiting for a retry."""
+    low = await repository.enqueue("submit", {}, priority=0)
+    high = await repository.enqueue("submit", {}, priority=5)
+    waiting = await repository.enqueue("submit", {}, priority=9)
+    repository.collection.documents[2]["run_after"] = datetime.utcnow() + timedelta(minutes=5)
+
+    first = await repository.claim("w1", stale_after=60)
+    second = await repository.claim("w1", stale_after=60)
+
+    assert [first["_id"], second["_id"]] == [high["_id"], low["_id"]]
+    assert first["status"] == "running" and first["attempts"] == 1 and first["worker_id"] == "w1"
+    assert await repository.claim("w1", stale_after=60) is None
+    assert (await repository.get(waiting["_id"]))["status"] == "queued"
+
+
+@pytest.mark.asyncio
+async def test_stale_job_is_taken_over_and_the_old_worker_cannot_write(repository):
+    """Test that a job without heartbeats is claimed again and only its new worker records the outcome."""
+    job = await repository.enqueue("submit", {})
+    await repository.claim("w1", stale_after=60)
+    assert await repository.claim("w2", stale_after=60) is None
+
+    repository.collection.documents[0]["heartbeat_at"] = datetime.utcnow() - timedelta(minutes=5)
+    taken = await repository.claim("w2", stale_after=60)
+
+    assert taken["worker_id"] == "w2" and taken["attempts"] == 2
+    assert not await repository.heartbeat(job["_id"], "w1", {})
+    assert not await repository.complete(job["_id"], "w1", {"chunks": 1}, {})
+    assert not await repository.fail(job["_id"], "w1", "late", {}, retry_at=datetime.utcnow())
+    assert (await repository.get(job["_id"]))["status"] == "running"
+
+    assert await repository.complete(job["_id"], "w2", {"chunks": 2}, {})
+    stored = await repository.get(job["_id"])
+    assert stored["status"] == "completed" and stored["result"] == {"chunks": 2}
+
+
+@pytest.mark.asyncio
+async def test_failed_runs_are_retried_with_backoff_then_given_up(repository, use_case):
+    """Test that failures requeue the job with growing delays until max_attempts is reached."""
+    async def broken(job, progress):
+        raise RuntimeError("embedding service down")
+
+    use_case._run_submit = broken
+    job = await repository.enqueue("submit", {}, max_attempts=3)
+
+    delays = []
+    for _ in range(3):
+        claimed = await repository.claim("w1", stale_after=60)
+        before = datetime.utcnow()
+        await use_case._run(claimed)
+        stored = await repository.get(job["_id"])
+        if stored["status"] == "queued":
+            delays.append(round((stored["run_after"] - before).total_seconds()))
+            make_runnable(repository, job["_id"])
+
+    assert delays == [30, 60]
+    assert stored["status"] == "failed"
+    assert stored["attempts"] == 3
+    assert stored["error"] == "embedding service down"
+    assert stored["finished_at"] is not None
+    assert await repository.claim("w1", stale_after=60) is None
+
+
+@pytest.mark.asyncio
+async def test_worker_stops_when_its_job_is_taken_over(repository, use_case):
+    """Test that a worker whose job was claimed by another stops the run and records nothing."""
+    started, cancelled = asyncio.Event(), asyncio.Event()
+
+    async def slow(job, progress):
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return {"chunks": 1}
+
+    use_case._run_submit = slow
+    job = await repository.enqueue("submit", {})
+    claimed = await repository.claim("w1", stale_after=60)
+
+    run = asyncio.create_task(use_case._run(claimed))
+    await started.wait()
+    repository.collection.documents[0]["worker_id"] = "w2"
+    await asyncio.wait_for(run, timeout=1)
+
+    assert cancelled.is_set()
+    stored = await repository.get(job["_id"])
+    assert stored["status"] == "running" and stored["worker_id"] == "w2" and stored["result"] is None
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_visible_to_their_submitter_and_admins_only(repository, use_case):
+    """Test that other users, including for jobs without a submitter, get a 404."""
+    owned = await repository.enqueue("submit", {}, user_id="u1")
+    unowned = await repository.enqueue("crawl", {})
+    owner = User(id="u1", email="owner@example.com")
+    other = User(id="u2", email="other@example.com")
+    admin = User(id="u3", email="admin@example.com", is_admin=True)
+
+    assert (await use_case.get_job(owned["_id"], user=owner))["kind"] == "submit"
+    assert (await use_case.get_job(unowned["_id"], user=admin))["kind"] == "crawl"
+    for job, user in [(owned, other), (unowned, owner)]:
+        with pytest.raises(HTTPException) as error:
+            await use_case.get_job(job["_id"], user=user)
+        assert error.value.status_code == 404
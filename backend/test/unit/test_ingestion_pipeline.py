@@ -0,0 +1,109 @@
+import asyncio
+import pytest
+
+from langchain_core.documents import Document
+
+from src.interface.repository.pinecone.ingestion_pipeline import IngestionPipeline, IngestionProgress
+
+
+@pytest.fixture
+def pinecone_repo(make_pinecone_repo):
+    """Create a PineconeRepository backed by a local vector store with slow fake embeddings."""
+    repo = make_pinecone_repo(events=[])
+
+    async def generate_embeddings_batch(texts):
+        repo.events.append("embed")
+        await asyncio.sleep(0.01)
+        return [[1.0, 0.0, 0.0] for _ in texts]
+
+    repo.generate_embeddings_batch = generate_embeddings_batch
+    return repo
+
+
+def pages(repo, count):
+    async def generate():
+        for i in range(count):
+            repo.events.append("page")
+            yield Document(page_content=f"page {i} first half\n\npage {i} second half")
+    return generate()
+
+
+def build_record(repo):
+    return lambda chunk, index, seen: repo._build_chunk_record(chunk, index, {"mongodb_id": "doc1"}, "file", seen)
+
+
+def split(document):
+    return [Document(page_content=part) for part in document.page_content.split("\n\n")]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_overlaps_embedding_with_extraction(pinecone_repo):
+    """Test that embedding starts before the last page is extracted and every chunk is stored in order."""
+    pipeline = IngestionPipeline(pinecone_repo, queue_size=2, embed_batch_size=4, upsert_batch_size=8, embed_workers=2)
+
+    result = await pipeline.run(pages(pinecone_repo, 50), split, build_record(pinecone_repo))
+
+    assert len(result["ids"]) == 100
+    assert result["embedded"] == 100
+    assert len(pinecone_repo.vector_store) == 100
+    stored = await pinecone_repo.vector_store.fetch_vectors(result["ids"])
+    assert [stored[vector_id]["metadata"]["chunk_index"] for vector_id in result["ids"]] == list(range(100))
+
+    # The first chunks are embedded while later pages are still being extracted
+    events = pinecone_repo.events
+    last_page = len(events) - 1 - events[::-1].index("page")
+    assert events.index("embed") < last_page
+    assert set(result["metrics"]) == {"extract", "chunk", "embed", "upsert"}
+    assert result["metrics"]["chunk"]["items"] == 100
+    assert IngestionPipeline.get_stats()["upsert"]["items"] >= 100
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_stored_chunks_and_deletes_orphans(pinecone_repo):
+    """Test that re-ingesting through the pipeline only embeds chunks that changed."""
+    pipeline = IngestionPipeline(pinecone_repo, queue_size=2, embed_batch_size=4, upsert_batch_size=8, embed_workers=2)
+    first = await pipeline.run(pages(pinecone_repo, 10), split, build_record(pinecone_repo))
+
+    async def edited():
+        for i in range(10):
+            text = f"page {i} first half\n\npage {i} second half"
+            yield Document(page_content=text.replace("page 3 second", "page 3 edited second"))
+
+    second = await pipeline.run(edited(), split, build_record(pinecone_repo), previous_ids=first["ids"])
+
+    assert second["embedded"] == 1
+    assert second["deleted"] == 1
+    assert second["updated"] == 0
+    assert sorted(await pinecone_repo.vector_store.list_vector_ids("doc1_")) == sorted(second["ids"])
+
+
+@pytest.mark.asyncio
+async def test_pipeline_removes_new_vectors_when_a_stage_fails(pinecone_repo):
+    """Test that a failed ingestion does not leave partial vectors behind."""
+    pipeline = IngestionPipeline(pinecone_repo, queue_size=1, embed_batch_size=2, upsert_batch_size=2, embed_workers=1)
+
+    async def failing():
+        for i in range(20):
+            if i == 10:
+                raise RuntimeError("parse error")
+            yield Document(page_content=f"page {i}")
+            await asyncio.sleep(0.01)
+
+    with pytest.raises(RuntimeError):
+        await pipeline.run(failing(), split, build_record(pinecone_repo))
+    assert len(pinecone_repo.vector_store) == 0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_reports_progress(pinecone_repo):
+    """Test that a run counts its chunks and stage metrics into the job's progress."""
+    pipeline = IngestionPipeline(pinecone_repo, queue_size=2, embed_batch_size=4, upsert_batch_size=8)
+    progress = IngestionProgress()
+    progress.set_stage("ingesting")
+
+    await pipeline.run(pages(pinecone_repo, 5), split, build_record(pinecone_repo), progress=progress)
+
+    reported = progress.to_dict()
+    assert reported["stage"] == "ingesting"
+    assert reported["chunks_total"] == reported["chunks_done"] == 10
+    assert {"chunk", "embed"} <= set(reported["stages"])
@@ -0,0 +1,59 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.infrastructure.services.keyword_extraction_service import KeywordExtractionService
+from src.shared.text.keywords import KeywordExtractor, segment
+
+
+def test_segment_breaks_phrases_at_punctuation():
+    """Test that phrases end at punctuation and Thai runs stay whole without a segmenter."""
+    phrases = segment("Minimum wage, ค่าจ้าง ขั้นต่ำ")
+    assert phrases[0] == ["Minimum", "wage"]
+    assert ["ค่าจ้าง"] in phrases and ["ขั้นต่ำ"] in phrases
+
+
+def test_extract_prefers_rare_terms_titles_and_phrases():
+    """Test TF-IDF ranking with title boost, phrase preference and stopword removal."""
+    extractor = KeywordExtractor()
+    text = "The minimum wage applies to every employer. Minimum wage rates change yearly. Employer duties."
+
+    keywords = extractor.extract(text, max_keywords=3)
+    assert keywords[0] == "minimum wage"
+    assert "the" not in [keyword.lower() for keyword in keywords]
+
+    # A term found in every corpus document is worth less than a rare one
+    common = extractor.extract(text, max_keywords=1, document_count=100, document_frequencies={"minimum wage": 100})
+    assert common != ["minimum wage"]
+
+    assert extractor.extract(text, title="Employer duties", max_keywords=1) == ["employer"]
+
+
+@pytest.mark.asyncio
+async def test_extract_batch_uses_one_statistics_query():
+    """Test that a batch fetches corpus statistics once and never calls the LLM."""
+    stats = MagicMock()
+    stats.get_frequencies = AsyncMock(return_value=(10, {}))
+    llm = AsyncMock(return_value=["llm"])
+    service = KeywordExtractionService(stats_repository=stats, llm_fallback=llm)
+
+    documents = [{"text": f"Snow White story number {i}", "title": "Snow White"} for i in range(50)]
+    results = await service.extract_batch(documents, max_keywords=2)
+
+    assert len(results) == 50
+    assert all(keywords and keywords[0] == "Snow White" for keywords in results)
+    stats.get_frequencies.assert_awaited_once()
+    llm.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_extract_falls_back_to_llm_only_when_local_extraction_is_thin():
+    """Test that the LLM is only asked when too few local keywords are found."""
+    llm = AsyncMock(return_value=["a", "b", "c"])
+    service = KeywordExtractionService(llm_fallback=llm, min_keywords=3)
+
+    local = await service.extract("Labour protection, severance pay, working hours", max_keywords=3)
+    assert len(local) == 3
+    llm.assert_not_called()
+
+    assert await service.extract("the and of", max_keywords=3) == ["a", "b", "c"]
+    llm.assert_awaited_once_with("the and of", 3)
@@ -0,0 +1,134 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from src.interface.repository.local.lexical_index import LexicalIndex
+from src.shared.text.lexical import legal_anchors, tokenize
+
+
+@pytest.fixture
+def lexical_index(tmp_path):
+    """Create an empty lexical index."""
+    return LexicalIndex(str(tmp_path / "lexical"))
+
+
+@pytest.fixture
+def pinecone_repo(make_pinecone_repo, lexical_index):
+    """Create a PineconeRepository with a lexical index, a local vector store and mocked embeddings."""
+    return make_pinecone_repo(lexical_index=lexical_index, generate_embeddings=AsyncMock(return_value=[1.0, 0.0, 0.0]))
+
+
+def test_tokenize_and_legal_anchors():
+    """Test that Thai runs become bigrams and section references are normalized."""
+    assert tokenize("Labour ค่าจ้าง") == ["labour", "ค่", "่า", "าจ", "จ้", "้า", "าง"]
+    assert legal_anchors("ตาม มาตรา ๔๒๐ และ ม. 421/1") == {"มาตรา:420", "มาตรา:421/1"}
+
+
+def test_search_ranks_and_flags_strong_matches(lexical_index):
+    """Test BM25 ranking, strong matches and filters."""
+    lexical_index.index_document(
+        "d1", {"title": "ประมวลกฎหมายแพ่งและพาณิชย์", "data_type": "ตัวบทกฎหมาย"},
+        ["มาตรา 420 ผู้ใดจงใจหรือประมาทเลินเล่อ ทำต่อบุคคลอื่นโดยผิดกฎหมาย"]
+    )
+    lexical_index.index_document(
+        "d2", {"title": "ค่าชดเชยเลิกจ้าง", "keywords": ["ค่าชดเชย"], "data_type": "FAQ"},
+        ["นายจ้างต้องจ่ายค่าชดเชยเมื่อเลิกจ้าง"]
+    )
+
+    by_section = lexical_index.search("มาตรา 420")
+    assert by_section["strong"]
+    assert by_section["results"][0]["id"] == "d1"
+
+    by_keyword = lexical_index.search("ค่าชดเชย")
+    assert by_keyword["strong"]
+    assert by_keyword["results"][0]["id"] == "d2"
+
+    loose = lexical_index.search("จ่ายเงิน")
+    assert not loose["strong"]
+    assert loose["results"][0]["id"] == "d2"
+
+    filtered = lexical_index.search("มาตรา 420", filter={"data_type": {"$eq": "FAQ"}})
+    assert not filtered["strong"]
+    assert "d1" not in [result["id"] for result in filtered["results"]]
+
+
+def test_index_persists_and_updates_incrementally(tmp_path):
+    """Test that documents survive a reopen and can be replaced and removed."""
+    path = str(tmp_path / "lexical")
+    index = LexicalIndex(path)
+    index.index_document("d1", {"title": "Snow White"}, ["poisoned apple"])
+    index.index_document("d2", {"title": "Cinderella"}, ["glass slipper"])
+
+    reopened = LexicalIndex(path)
+    assert len(reopened) == 2
+    assert reopened.search("apple")["results"][0]["id"] == "d1"
+
+    reopened.index_document("d1", {"title": "Snow White"}, ["seven dwarfs"])
+    assert reopened.search("apple")["results"] == []
+    reopened.remove_document("d2")
+    assert reopened.search("slipper")["results"] == []
+    assert len(LexicalIndex(path)) == 1
+
+
+@pytest.mark.asyncio
+async def test_strong_lexical_match_ranks_first_among_vector_results(pinecone_repo):
+    """Test that an exact title match leads the results and vector results are still fused in."""
+    await pinecone_repo.vector_store.upsert_vectors([
+        {"id": "d2_chunk_a", "values": [1.0, 0.0, 0.0], "metadata": {"mongodb_id": "d2", "title": "Cinderella"}},
+        {"id": "d1_chunk_a", "values": [0.6, 0.8, 0.0], "metadata": {"mongodb_id": "d1", "title": "Snow White"}},
+    ])
+    pinecone_repo.lexical_index.index_document("d1", {"title": "Snow White"}, ["a princess and seven dwarfs"])
+
+    results = await pinecone_repo.search("snow white")
+
+    assert [result["id"] for result in results] == ["d1", "d2"]
+    assert [result["match_type"] for result in results] == ["exact", "vector"]
+    pinecone_repo.generate_embeddings.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_backfill_adds_missing_items_and_removes_deleted_ones(pinecone_repo):
+    """Test that a backfill indexes only the items the index lacks and drops those that no longer exist."""
+    pinecone_repo.lexical_index.index_document("d1", {"title": "Snow White"}, ["poisoned apple", "seven dwarfs"])
+    pinecone_repo.lexical_index.index_document("d2", {"title": "Cinderella"}, ["glass slipper"])
+
+    async def documents():
+        yield {"mongodb_id": "d1", "title": "Snow White"}, ["Snow White"]
+        yield {"mongodb_id": "d3", "title": "Rapunzel"}, ["a tower in the woods"]
+
+    counts = await pinecone_repo.backfill_lexical_index(documents())
+
+    assert counts == {"added": 1, "removed": 1}
+    assert sorted(pinecone_repo.lexical_index.document_ids()) == ["d1", "d3"]
+    assert pinecone_repo.lexical_index.search("dwarfs")["results"][0]["id"] == "d1"
+    assert pinecone_repo.lexical_index.search("tower")["results"][0]["id"] == "d3"
+
+
+@pytest.mark.asyncio
+async def test_weak_lexical_match_is_fused_with_vector_results(pinecone_repo):
+    """Test that lexical and vector rankings are merged with reciprocal rank fusion."""
+    await pinecone_repo.vector_store.upsert_vectors([
+        {"id": "d1_chunk_a", "values": [1.0, 0.0, 0.0], "metadata": {"mongodb_id": "d1", "title": "Snow White"}},
+        {"id": "d2_chunk_a", "values": [0.6, 0.8, 0.0], "metadata": {"mongodb_id": "d2", "title": "Cinderella"}},
+    ])
+    pinecone_repo.lexical_index.index_document("d2", {"title": "Cinderella"}, ["a glass slipper at midnight"])
+    pinecone_repo.lexical_index.index_document("d3", {"title": "Rapunzel"}, ["a tower and a glass window"])
+
+    results = await pinecone_repo.search("glass slipper")
+
+    assert [result["id"] for result in results] == ["d2", "d1", "d3"]
+    assert [result["match_type"] for result in results] == ["hybrid", "vector", "lexical"]
+    pinecone_repo.generate_embeddings.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_delete_document_removes_lexical_entry(pinecone_repo):
+    """Test that deleting an item removes it from the lexical index and the vectors."""
+    vector_id = await pinecone_repo.upsert_vector(
+        {"title": "Snow White", "content": "poisoned apple"},
+        {"mongodb_id": "d1", "title": "Snow White"}
+    )
+
+    await pinecone_repo.delete_document("d1", [vector_id])
+
+    assert len(pinecone_repo.lexical_index) == 0
+    assert await pinecone_repo.vector_store.list_vector_ids("") == []
@@ -0,0 +1,105 @@
+import threading
+import pytest
+from unittest.mock import AsyncMock
+
+from src.interface.repository.local.local_vector_store import LocalVectorStore
+from src.interface.repository.local.metadata_filter import matches_filter
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create an empty local vector store with 3 dimensions."""
+    return LocalVectorStore(str(tmp_path), dimension=3)
+
+
+def test_matches_filter_supports_pinecone_operators():
+    """Test equality, $in, list-valued metadata and $and/$or."""
+    metadata = {"data_type": "FICTION", "user_id": "u1", "keywords": ["a", "b"], "chunk_index": 3}
+
+    assert matches_filter(metadata, {"data_type": "FICTION"})
+    assert matches_filter(metadata, {"data_type": {"$in": ["FAQ", "FICTION"]}})
+    assert matches_filter(metadata, {"keywords": {"$eq": "b"}})
+    assert matches_filter(metadata, {"$and": [{"user_id": "u1"}, {"chunk_index": {"$gte": 3}}]})
+    assert not matches_filter(metadata, {"$or": [{"user_id": "u2"}, {"data_type": {"$ne": "FICTION"}}]})
+
+
+@pytest.mark.asyncio
+async def test_query_returns_top_k_by_cosine_similarity(store):
+    """Test that queries rank vectors by cosine similarity."""
+    await store.upsert_vectors([
+        {"id": "x", "values": [1, 0, 0], "metadata": {"data_type": "FAQ"}},
+        {"id": "y", "values": [0, 1, 0], "metadata": {"data_type": "FICTION"}},
+        {"id": "xy", "values": [1, 1, 0], "metadata": {"data_type": "FICTION"}},
+    ])
+
+    matches = await store.query_vectors([2, 0.1, 0], top_k=2)
+
+    assert [match["id"] for match in matches] == ["x", "xy"]
+    assert matches[0]["score"] == pytest.approx(0.9988, abs=1e-3)
+    assert matches[0]["metadata"] == {"data_type": "FAQ"}
+
+
+@pytest.mark.asyncio
+async def test_query_applies_metadata_filter(store):
+    """Test that filters are applied inside the query."""
+    await store.upsert_vectors([
+        {"id": "x", "values": [1, 0, 0], "metadata": {"data_type": "FAQ"}},
+        {"id": "y", "values": [0, 1, 0], "metadata": {"data_type": "FICTION"}},
+    ])
+
+    matches = await store.query_vectors([1, 0, 0], top_k=5, filter={"data_type": "FICTION"})
+
+    assert [match["id"] for match in matches] == ["y"]
+
+
+@pytest.mark.asyncio
+async def test_store_work_runs_off_the_event_loop_thread(store, monkeypatch):
+    """Test that queries scan the matrix on the store's thread, not the event loop's."""
+    threads = []
+    exact_query = store._exact_query
+
+    def recording_exact_query(*args):
+        threads.append(threading.current_thread())
+        return exact_query(*args)
+
+    monkeypatch.setattr(store, "_exact_query", recording_exact_query)
+    await store.upsert_vectors([{"id": "x", "values": [1, 0, 0], "metadata": {}}])
+    await store.query_vectors([1, 0, 0], top_k=1)
+
+    assert threads and threads[0] is not threading.current_thread()
+
+
+@pytest.mark.asyncio
+async def test_delete_reuses_rows_and_data_persists(tmp_path):
+    """Test that deletes free rows and the store reloads from disk."""
+    store = LocalVectorStore(str(tmp_path), dimension=3)
+    await store.upsert_vectors([
+        {"id": "x", "values": [1, 0, 0], "metadata": {}},
+        {"id": "y", "values": [0, 1, 0], "metadata": {}},
+    ])
+    await store.delete_vectors(["x"])
+    await store.upsert_vectors([{"id": "z", "values": [0, 0, 1], "metadata": {"n": 1}}])
+
+    reopened = LocalVectorStore(str(tmp_path), dimension=3)
+    matches = await reopened.query_vectors([0, 0, 1], top_k=5)
+
+    assert len(reopened) == 2
+    assert [match["id"] for match in matches][0] == "z"
+    assert "x" not in [match["id"] for match in matches]
+
+
+@pytest.mark.asyncio
+async def test_pinecone_repository_searches_local_backend(make_pinecone_repo, store):
+    """Test the repository's search flow end to end against the local backend."""
+    repo = make_pinecone_repo(vector_store=store, generate_embeddings=AsyncMock(return_value=[1, 0, 0]))
+
+    await repo.upsert_vectors([
+        {"id": "doc1_chunk_0", "values": [1, 0, 0], "metadata": {"mongodb_id": "doc1", "title": "A"}},
+        {"id": "doc1_chunk_1", "values": [0.9, 0.1, 0], "metadata": {"mongodb_id": "doc1", "title": "A"}},
+        {"id": "doc2_chunk_0", "values": [0, 1, 0], "metadata": {"mongodb_id": "doc2", "title": "B"}},
+    ])
+
+    results = await repo.search("anything", limit=5)
+
+    assert [result["id"] for result in results] == ["doc1", "doc2"]
+    assert results[0]["title"] == "A"
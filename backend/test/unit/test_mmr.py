@@ -0,0 +1,49 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from src.interface.repository.pinecone.mmr import maximal_marginal_relevance
+
+
+def test_mmr_skips_near_duplicates():
+    """Test that a near-duplicate of the best candidate loses to a distinct one."""
+    query = [1.0, 0.0, 0.0]
+    candidates = [
+        [0.9, 0.1, 0.0],    # most relevant
+        [0.89, 0.11, 0.0],  # almost the same as the first
+        [0.7, 0.0, 0.7],    # less relevant, but different
+    ]
+
+    assert maximal_marginal_relevance(query, candidates, k=2) == [0, 2]
+    # Relevance only keeps the similarity order
+    assert maximal_marginal_relevance(query, candidates, k=3, lambda_mult=1.0) == [0, 1, 2]
+
+
+def test_mmr_edge_cases():
+    """Test empty candidates, k larger than the candidates and zero vectors."""
+    assert maximal_marginal_relevance([1.0, 0.0], [], k=3) == []
+    assert maximal_marginal_relevance([1.0, 0.0], [[1.0, 0.0]], k=0) == []
+    assert sorted(maximal_marginal_relevance([1.0, 0.0], [[1.0, 0.0], [0.0, 0.0]], k=5)) == [0, 1]
+
+
+@pytest.fixture
+def repo(make_pinecone_repo):
+    """Create a PineconeRepository over a local vector store."""
+    return make_pinecone_repo(generate_embeddings=AsyncMock(return_value=[1.0, 0.0, 0.0]))
+
+
+@pytest.mark.asyncio
+async def test_diversified_search_drops_duplicate_documents(repo):
+    """Test that a diversified search returns distinct documents first."""
+    await repo.upsert_vectors([
+        {"id": "doc1_chunk_a", "values": [0.9, 0.1, 0.0], "metadata": {"mongodb_id": "doc1", "title": "Original"}},
+        {"id": "doc2_chunk_a", "values": [0.89, 0.11, 0.0], "metadata": {"mongodb_id": "doc2", "title": "Copy"}},
+        {"id": "doc3_chunk_a", "values": [0.7, 0.0, 0.7], "metadata": {"mongodb_id": "doc3", "title": "Other"}},
+    ])
+
+    plain = await repo.search("anything", limit=2)
+    assert [result["id"] for result in plain] == ["doc1", "doc2"]
+
+    diverse = await repo.search("anything", limit=2, diversify=True)
+    assert [result["id"] for result in diverse] == ["doc1", "doc3"]
+    assert diverse[1]["title"] == "Other"
+    assert "values" not in diverse[0]
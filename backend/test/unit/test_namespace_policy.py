@@ -0,0 +1,113 @@
+import pytest
+from types import SimpleNamespace
+
+from src.domain.models.data_ingestion import DataType
+from src.interface.repository.pinecone.embedding_profile import EmbeddingProfile
+from src.interface.repository.pinecone.namespace_policy import NamespacePolicy
+from src.interface.repository.pinecone.pinecone_repository import PineconeRepository
+
+
+class NamespacedIndex:
+    """Synchronous stand-in for a Pinecone Index that keeps vectors per namespace."""
+
+    def __init__(self):
+        self.namespaces = {}
+        self.queried = []
+        self.fetched = []
+
+    def upsert(self, vectors, namespace=""):
+        for vector in vectors:
+            self.namespaces.setdefault(namespace, {})[vector["id"]] = vector
+
+    def query(self, vector, top_k, filter=None, namespace="", **kwargs):
+        self.queried.append(namespace)
+        stored = self.namespaces.get(namespace, {}).values()
+        scored = sorted(stored, key=lambda item: -sum(a * b for a, b in zip(vector, item["values"])))
+        return SimpleNamespace(matches=[
+            SimpleNamespace(id=item["id"], score=sum(a * b for a, b in zip(vector, item["values"])), metadata=item["metadata"])
+            for item in scored[:top_k]
+        ])
+
+    def delete(self, ids, namespace=""):
+        for vector_id in ids:
+            self.namespaces.get(namespace, {}).pop(vector_id, None)
+
+    def fetch(self, ids, namespace=""):
+        self.fetched.append(len(ids))
+        stored = self.namespaces.get(namespace, {})
+        return SimpleNamespace(vectors={
+            vector_id: SimpleNamespace(values=stored[vector_id]["values"], metadata=stored[vector_id]["metadata"])
+            for vector_id in ids if vector_id in stored
+        })
+
+    def describe_index_stats(self):
+        return SimpleNamespace(namespaces={namespace: {} for namespace in self.namespaces})
+
+
+def test_policy_maps_metadata_and_filters_to_namespaces():
+    """Test namespace choice per policy and narrowing by $eq, $in and $and filters."""
+    by_type = NamespacePolicy("data_type")
+    assert by_type.namespace_for({"data_type": DataType.FICTION}) == "fiction"
+    assert by_type.namespace_for({"data_type": DataType.LEGAL_TEXT.value}) == "legal_text"
+    assert by_type.namespaces_for_filter({"data_type": {"$eq": "FAQ"}}) == ["faq"]
+    assert by_type.namespaces_for_filter(
+        {"$and": [{"user_id": "u1"}, {"data_type": {"$in": ["FAQ", "FICTION"]}}]}
+    ) == ["faq", "fiction"]
+    assert len(by_type.namespaces_for_filter(None)) == len(DataType) + 1
+
+    by_user = NamespacePolicy("user")
+    assert by_user.namespace_for({"user_id": "u1"}) == "user-u1"
+    assert by_user.namespace_for({}) == "shared"
+    assert by_user.namespaces_for_filter({"data_type": "FAQ"}) is None
+
+    assert NamespacePolicy().namespace_for({"data_type": "FAQ"}) == ""
+    with pytest.raises(ValueError):
+        NamespacePolicy("tenant")
+
+
+@pytest.fixture
+def namespaced_repo(make_pinecone_repo):
+    """Create a PineconeRepository partitioned by data type over an in-memory index."""
+    return make_pinecone_repo(
+        embedding_profile=EmbeddingProfile("test", "text-embedding-3-small", 2),
+        namespace_policy=NamespacePolicy("data_type"),
+        index=NamespacedIndex(),
+        vector_store=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_repository_writes_per_namespace_and_fans_out_queries(namespaced_repo):
+    """Test that filtered queries read one namespace and unfiltered ones merge all."""
+    await namespaced_repo.upsert_vectors([
+        {"id": "a_chunk_0", "values": [1.0, 0.0], "metadata": {"mongodb_id": "a", "data_type": "FICTION"}},
+        {"id": "b_chunk_0", "values": [0.9, 0.1], "metadata": {"mongodb_id": "b", "data_type": "FAQ"}},
+        {"id": "c_chunk_0", "values": [0.0, 1.0], "metadata": {"mongodb_id": "c", "data_type": "FAQ"}},
+    ])
+    assert set(namespaced_repo.index.namespaces) == {"fiction", "faq"}
+
+    fiction = await namespaced_repo.query_vectors([1.0, 0.0], top_k=5, filter={"data_type": {"$eq": "FICTION"}})
+    assert [match["id"] for match in fiction] == ["a_chunk_0"]
+    assert namespaced_repo.index.queried == ["fiction"]
+
+    merged = await namespaced_repo.query_vectors([1.0, 0.0], top_k=2)
+    assert [match["id"] for match in merged] == ["a_chunk_0", "b_chunk_0"]
+    assert len(namespaced_repo.index.queried) == 1 + len(DataType) + 1
+
+    await namespaced_repo.delete_vectors(["b_chunk_0"])
+    assert "b_chunk_0" not in namespaced_repo.index.namespaces["faq"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_splits_ids_into_batches(namespaced_repo):
+    """Test that fetching many vectors sends bounded ID lists and merges the responses."""
+    await namespaced_repo.upsert_vectors([
+        {"id": f"doc_chunk_{i}", "values": [1.0, 0.0], "metadata": {"mongodb_id": "doc", "data_type": "FAQ" if i % 2 else "FICTION"}}
+        for i in range(250)
+    ])
+
+    fetched = await namespaced_repo.fetch_vectors([f"doc_chunk_{i}" for i in range(250)])
+
+    assert len(fetched) == 250
+    assert fetched["doc_chunk_7"]["metadata"]["data_type"] == "FAQ"
+    assert max(namespaced_repo.index.fetched) == PineconeRepository.FETCH_BATCH_SIZE
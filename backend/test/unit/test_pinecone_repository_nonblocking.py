@@ -0,0 +1,122 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import httpx
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from src.interface.repository.pinecone import pinecone_repository
+from src.interface.repository.pinecone.pinecone_repository import PineconeRepository
+from src.interface.repository.pinecone.embedding_profile import EmbeddingProfile
+
+
+BLOCKING_CALL_SECONDS = 0.3
+
+
+class SlowIndex:
+    """Synchronous stand-in for a Pinecone Index with slow network calls."""
+
+    def query(self, **kwargs):
+        time.sleep(BLOCKING_CALL_SECONDS)
+        match = SimpleNamespace(id="a_chunk_0", score=0.9, metadata={"mongodb_id": "a", "title": "A"})
+        return SimpleNamespace(matches=[match])
+
+    def upsert(self, vectors):
+        time.sleep(BLOCKING_CALL_SECONDS)
+
+    def delete(self, ids):
+        time.sleep(BLOCKING_CALL_SECONDS)
+
+
+@pytest.fixture
+def pinecone_repo(make_pinecone_repo):
+    """Create a PineconeRepository with a slow synchronous index and a mocked async OpenAI client."""
+    repo = make_pinecone_repo(
+        embedding_profile=EmbeddingProfile("test", "text-embedding-3-small", 1536), index=SlowIndex(), vector_store=None
+    )
+
+    async def create_embeddings(input, model, **kwargs):
+        await asyncio.sleep(0.05)
+        return SimpleNamespace(data=[SimpleNamespace(index=0, embedding=[0.1, 0.2])])
+
+    repo.openai_client = MagicMock()
+    repo.openai_client.embeddings.create = AsyncMock(side_effect=create_embeddings)
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive_during_search_and_upsert(pinecone_repo):
+    """Test that in-flight searches, upserts and deletes do not block the event loop."""
+    max_gap = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal max_gap
+        last = time.monotonic()
+        while not done.is_set():
+            await asyncio.sleep(0.01)
+            now = time.monotonic()
+            max_gap = max(max_gap, now - last)
+            last = now
+
+    async def workload():
+        try:
+            await asyncio.gather(
+                pinecone_repo.search("มาตรา 420", limit=5),
+                pinecone_repo.upsert_vectors([{"id": "a", "values": [0.1, 0.2], "metadata": {}}]),
+                pinecone_repo.delete_vector("a")
+            )
+        finally:
+            done.set()
+
+    started = time.monotonic()
+    await asyncio.gather(ticker(), workload())
+    elapsed = time.monotonic() - started
+
+    assert max_gap < BLOCKING_CALL_SECONDS / 2
+    # The three blocking calls overlapped instead of running back to back
+    assert elapsed < BLOCKING_CALL_SECONDS * 2.5
+
+
+class RecordingFile:
+    """Temporary file recording the thread each write runs on."""
+
+    def __init__(self, file):
+        self.file = file
+        self.name = file.name
+        self.write_threads = []
+
+    def write(self, data):
+        self.write_threads.append(threading.current_thread())
+        return self.file.write(data)
+
+    def close(self):
+        self.file.close()
+
+
+@pytest.mark.asyncio
+async def test_download_writes_to_disk_off_the_event_loop(pinecone_repo, monkeypatch):
+    """Test that downloaded chunks are written by the worker pool, not the event loop thread."""
+    body = b"x" * (PineconeRepository.DOWNLOAD_CHUNK_SIZE * 3)
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    client = httpx.AsyncClient
+    monkeypatch.setattr(pinecone_repository.httpx, "AsyncClient", lambda **kwargs: client(transport=transport, **kwargs))
+    files = []
+    named_temporary_file = tempfile.NamedTemporaryFile
+    monkeypatch.setattr(
+        pinecone_repository.tempfile, "NamedTemporaryFile",
+        lambda **kwargs: files.append(RecordingFile(named_temporary_file(**kwargs))) or files[-1]
+    )
+
+    path = await pinecone_repo._download_to_temp_file("https://files.example/act.pdf", "pdf")
+    try:
+        with open(path, "rb") as downloaded:
+            assert downloaded.read() == body
+    finally:
+        os.unlink(path)
+
+    assert files[0].write_threads
+    assert threading.current_thread() not in files[0].write_threads
@@ -0,0 +1,101 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from src.domain.models.data_ingestion import DataType
+from src.interface.repository.local.local_vector_store import LocalVectorStore
+from src.interface.repository.pinecone.pinecone_repository import PineconeRepository
+from src.interface.repository.pinecone.embedding_profile import EmbeddingProfile
+from src.interface.repository.pinecone.search_session import SearchSession, SearchSessionStore
+
+
+@pytest.fixture
+def local_store(tmp_path):
+    """Create an empty local vector store with 3 dimensions."""
+    return LocalVectorStore(str(tmp_path), dimension=3)
+
+
+@pytest.fixture
+def pinecone_repo(make_pinecone_repo, local_store):
+    """Create a PineconeRepository backed by a local vector store with mocked embeddings."""
+    return make_pinecone_repo(
+        embedding_profile=EmbeddingProfile("test", "text-embedding-3-small", 1536),
+        index_name="legal-index",
+        vector_store=local_store,
+        generate_embeddings=AsyncMock(return_value=[1, 0, 0])
+    )
+
+
+def test_build_metadata_filter():
+    """Test that exact-match conditions are combined into one index filter."""
+    assert PineconeRepository.build_metadata_filter() is None
+    assert PineconeRepository.build_metadata_filter(data_type=DataType.FICTION) == {"data_type": {"$eq": "FICTION"}}
+    assert PineconeRepository.build_metadata_filter(data_type="FAQ", user_id="u1") == {
+        "$and": [{"data_type": {"$eq": "FAQ"}}, {"user_id": {"$eq": "u1"}}]
+    }
+
+
+@pytest.mark.asyncio
+async def test_search_fills_page_with_filtered_matches(pinecone_repo):
+    """Test that a filtered search returns a full page even when other types rank higher."""
+    vectors = [
+        {"id": f"faq{i}_chunk_0", "values": [1, 0.01 * i, 0], "metadata": {"mongodb_id": f"faq{i}", "data_type": "FAQ"}}
+        for i in range(10)
+    ] + [
+        {"id": f"fic{i}_chunk_0", "values": [0.5, 1, 0.01 * i], "metadata": {"mongodb_id": f"fic{i}", "data_type": "FICTION"}}
+        for i in range(5)
+    ]
+    await pinecone_repo.upsert_vectors(vectors)
+
+    results = await pinecone_repo.search(
+        "story",
+        limit=5,
+        filter=PineconeRepository.build_metadata_filter(data_type=DataType.FICTION)
+    )
+
+    assert len(results) == 5
+    assert all(result["data_type"] == "FICTION" for result in results)
+
+
+@pytest.mark.asyncio
+async def test_search_session_pages_one_ranking(pinecone_repo):
+    """Test that counts and pages come from a single ranking and cursors resume it."""
+    pinecone_repo.search_sessions = SearchSessionStore()
+    pinecone_repo.search_session_max_results = 1000
+    await pinecone_repo.upsert_vectors([
+        {"id": f"doc{i}_chunk_0", "values": [1, 0.01 * i, 0], "metadata": {"mongodb_id": f"doc{i}"}}
+        for i in range(25)
+    ])
+
+    session = await pinecone_repo.open_search_session("query")
+    assert session.total == 25
+    assert await pinecone_repo.open_search_session("query") is session
+    assert pinecone_repo.generate_embeddings.await_count == 1
+
+    resumed, offset = pinecone_repo.get_search_session(session.cursor(20))
+    assert resumed is session
+    assert [result["id"] for result in resumed.page(offset, 10)] == [result["id"] for result in session.results[20:]]
+
+    # Writes start a new session, but existing cursors keep their snapshot
+    await pinecone_repo.delete_vectors(["doc0_chunk_0"])
+    assert (await pinecone_repo.open_search_session("query")).total == 24
+    assert pinecone_repo.get_search_session(session.cursor(0))[0] is session
+
+
+@pytest.mark.asyncio
+async def test_search_sessions_do_not_outlive_an_index_switch(pinecone_repo):
+    """Test that after the alias moves to another index, sessions and cursors of the old one are not served."""
+    pinecone_repo.search_sessions = SearchSessionStore()
+    pinecone_repo.search_session_max_results = 1000
+    await pinecone_repo.upsert_vectors([{"id": "doc0_chunk_0", "values": [1, 0, 0], "metadata": {"mongodb_id": "doc0"}}])
+    session = await pinecone_repo.open_search_session("query")
+
+    pinecone_repo.index_name = "legal-index-small-512"
+
+    assert await pinecone_repo.open_search_session("query") is not session
+    assert pinecone_repo.get_search_session(session.cursor(0)) is None
+
+
+def test_search_session_rejects_malformed_cursor():
+    """Test that a malformed cursor is reported rather than silently ignored."""
+    with pytest.raises(ValueError):
+        SearchSession.decode_cursor("not-a-cursor")
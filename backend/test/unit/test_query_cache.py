@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from src.interface.repository.pinecone.embedding_profile import EmbeddingProfile
+from src.interface.repository.pinecone.query_cache import QueryCache, SingleFlight, TTLCache
+
+
+@pytest.fixture
+def pinecone_repo_with_query_cache(make_pinecone_repo):
+    """Create a PineconeRepository with a query cache and a mocked index query."""
+    return make_pinecone_repo(
+        embedding_profile=EmbeddingProfile("test", "text-embedding-3-small", 1536),
+        query_cache=QueryCache(max_entries=10, ttl_seconds=60),
+        vector_store=None,
+        _query_index=AsyncMock(return_value=[{"id": "1", "similarity_score": 0.9}])
+    )
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test that the cache evicts the least recently used entry when full."""
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries():
+    """Test that entries are not served after their TTL."""
+    cache = TTLCache(max_entries=2, ttl_seconds=-1)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_concurrent_calls():
+    """Test that concurrent identical calls share one upstream call."""
+    flight = SingleFlight()
+    calls = 0
+
+    async def upstream():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do("key", upstream) for _ in range(5)))
+
+    assert results == ["result"] * 5
+    assert calls == 1
+    assert flight.shared_calls == 4
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_a_cancelled_leader():
+    """Test that cancelling the first caller does not fail the callers sharing its call."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def upstream():
+        await release.wait()
+        return "result"
+
+    leader = asyncio.create_task(flight.do("key", upstream))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", upstream))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    release.set()
+
+    assert await follower == "result"
+    assert leader.cancelled()
+    assert await flight.do("key", upstream) == "result"
+
+
+@pytest.mark.asyncio
+async def test_ranked_search_is_cached_until_index_epoch_changes(pinecone_repo_with_query_cache):
+    """Test that repeated searches hit the cache and writes invalidate it."""
+    repo = pinecone_repo_with_query_cache
+
+    first = await repo._ranked_search("มาตรา 420", 30)
+    first[0]["similarity_score"] = 0.0
+    second = await repo._ranked_search("มาตรา 420", 30)
+
+    assert second == [{"id": "1", "similarity_score": 0.9}]
+    assert repo._query_index.call_count == 1
+
+    repo._invalidate_search_cache()
+    await repo._ranked_search("มาตรา 420", 30)
+
+    assert repo._query_index.call_count == 2
@@ -0,0 +1,238 @@
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from bson import ObjectId
+
+from src.domain.models.data_ingestion import DataIngestion
+from src.interface.repository.local.local_vector_store import LocalVectorStore
+from src.interface.repository.pinecone.embedding_profile import EmbeddingProfile
+from src.usecase.data_ingestion import reindex_usecase
+from src.usecase.data_ingestion.data_ingestion_usecase import DataIngestionUseCase
+from src.usecase.data_ingestion.reindex_usecase import ReindexUseCase
+
+DIMENSIONS = 512
+LONG_AGO = datetime.utcnow() - timedelta(days=1)
+
+
+class Crash(BaseException):
+    """Stops a run the way a killed process does, without the use case handling it."""
+
+
+def matches(item, criteria):
+    """Evaluate the filters the reindex streams items with."""
+    for field, condition in (criteria or {}).items():
+        if field == "$or":
+            if not any(matches(item, branch) for branch in condition):
+                return False
+        elif field == "_id":
+            item_id = ObjectId(item.id)
+            if "$gt" in condition and not item_id > condition["$gt"]:
+                return False
+            if "$in" in condition and item_id not in condition["$in"]:
+                return False
+        elif field == "updated_at" and not item.updated_at >= condition["$gte"]:
+            return False
+    return True
+
+
+class FakeDataIngestionRepository:
+    """Items kept in _id order, streamed like the MongoDB cursor."""
+
+    def __init__(self, items):
+        self.items = items
+        self.chunk_ids = {}
+        self.streamed = []
+
+    async def stream(self, criteria=None):
+        for item in self.items:
+            if matches(item, criteria):
+                self.streamed.append(item.id)
+                yield item
+
+    async def count(self):
+        return len(self.items)
+
+    async def count_by_criteria(self, criteria):
+        return len([item for item in self.items if matches(item, criteria)])
+
+    async def set_chunk_ids_many(self, chunk_ids):
+        self.chunk_ids.update(chunk_ids)
+
+
+class FakeReindexJobRepository:
+    """Jobs and per-item vector IDs kept in memory across runs."""
+
+    def __init__(self):
+        self.jobs = []
+        self.items = {}
+
+    async def create(self, index_name, profile, total):
+        job = {
+            "_id": str(ObjectId()), "index_name": index_name, "profile": profile, "status": "running",
+            "checkpoint_id": None, "processed": 0, "failed_ids": [], "total": total, "created_at": datetime.utcnow(),
+        }
+        self.jobs.append(job)
+        return dict(job)
+
+    async def find_unfinished(self, index_name, profile):
+        for job in reversed(self.jobs):
+            if job["index_name"] == index_name and job["profile"] == profile and job["status"] != "completed":
+                return dict(job)
+        return None
+
+    async def save_chunk_ids(self, job_id, chunk_ids):
+        self.items.setdefault(job_id, {}).update(chunk_ids)
+
+    async def checkpoint(self, job_id, checkpoint_id, processed, failed_ids):
+        self._job(job_id).update(checkpoint_id=checkpoint_id, processed=processed, failed_ids=list(failed_ids))
+
+    async def load_chunk_ids(self, job_id):
+        return dict(self.items.get(job_id, {}))
+
+    async def finish(self, job_id, status="completed", failed_ids=None):
+        self._job(job_id)["status"] = status
+        if failed_ids is not None:
+            self._job(job_id)["failed_ids"] = failed_ids
+
+    def _job(self, job_id):
+        return next(job for job in self.jobs if job["_id"] == job_id)
+
+
+class FakeIndexAliasRepository:
+    """Alias target, recording the vectors the target index held when reads moved to it."""
+
+    def __init__(self, store):
+        self.store = store
+        self.target = {"index_name": "legal-index", "profile": "small-1536"}
+        self.switched_with = None
+
+    async def get(self):
+        return self.target
+
+    async def switch(self, index_name, profile):
+        self.switched_with = sorted(await self.store.list_vector_ids(""))
+        self.target = {"index_name": index_name, "profile": profile}
+        return self.target
+
+
+def embed_count(embedded, fragment):
+    """Number of embedded texts containing a fragment."""
+    return sum(count for text, count in embedded.items() if fragment in text)
+
+
+def build_item(number):
+    return DataIngestion(
+        id=str(ObjectId()), title=f"Section {number}", specified_text=f"Labour Act section {number}",
+        data_type="FAQ", reference="ref", keywords=[], updated_at=LONG_AGO
+    )
+
+
+@pytest.fixture
+def target_store(tmp_path):
+    return LocalVectorStore(str(tmp_path), dimension=DIMENSIONS)
+
+
+@pytest.fixture
+def embedded():
+    """Texts sent to the embedding model, counted across runs."""
+    return Counter()
+
+
+@pytest.fixture
+def target_repo(make_pinecone_repo, target_store, embedded):
+    """A target repository over a local store whose embedding model can be made to crash."""
+    repo = make_pinecone_repo(
+        index_name="legal-index-small-512",
+        embedding_profile=EmbeddingProfile("small-512", "text-embedding-3-small", DIMENSIONS, normalize=True),
+        vector_store=target_store,
+        crash_on=None
+    )
+
+    async def embed(texts):
+        if any(repo.crash_on and repo.crash_on in text for text in texts):
+            raise Crash()
+        embedded.update(texts)
+        return [[1.0] + [0.0] * (DIMENSIONS - 1) for _ in texts]
+
+    repo.generate_embeddings_batch = AsyncMock(side_effect=embed)
+    return repo
+
+
+@pytest.fixture
+def reindex(monkeypatch, target_repo, target_store):
+    """A reindex use case over five items, copying into target_repo."""
+    def ingestion_for(vector_repository):
+        ingestion = DataIngestionUseCase.__new__(DataIngestionUseCase)
+        ingestion.pinecone_repository = vector_repository
+        ingestion.logger = logging.getLogger(__name__)
+        return ingestion
+
+    monkeypatch.setattr(reindex_usecase, "pinecone_repository", lambda index_name, profile_name: target_repo)
+    monkeypatch.setattr(reindex_usecase, "DataIngestionUseCase", ingestion_for)
+
+    use_case = ReindexUseCase.__new__(ReindexUseCase)
+    use_case.data_ingestion_repository = FakeDataIngestionRepository([build_item(number) for number in range(1, 6)])
+    use_case.reindex_job_repository = FakeReindexJobRepository()
+    use_case.index_alias_repository = FakeIndexAliasRepository(target_store)
+    use_case.settings = SimpleNamespace(
+        PINECONE_INDEX_NAME="legal-index",
+        REINDEX_CONCURRENCY=1,
+        REINDEX_CHECKPOINT_EVERY=2,
+        INDEX_ALIAS_REFRESH_SECONDS=0,
+    )
+    use_case.logger = logging.getLogger(__name__)
+    return use_case
+
+
+@pytest.mark.asyncio
+async def test_interrupted_reindex_resumes_without_re_embedding(reindex, target_repo, embedded):
+    """Test that a resumed job embeds only what the crashed run did not, then switches reads."""
+    items = reindex.data_ingestion_repository.items
+    target_repo.crash_on = "Section 5"
+
+    with pytest.raises(Crash):
+        await reindex.reindex("small-512")
+
+    job = reindex.reindex_job_repository.jobs[0]
+    assert job["status"] == "interrupted"
+    assert job["checkpoint_id"] == items[3].id and job["processed"] == 4
+    assert reindex.index_alias_repository.switched_with is None
+    assert reindex.data_ingestion_repository.chunk_ids == {}
+
+    # An item edited while the job was down is picked up by the catch-up pass
+    items[1] = items[1].model_copy(update={"specified_text": "Labour Act section 2 (amended)", "updated_at": datetime.utcnow()})
+    target_repo.crash_on = None
+    reindex.data_ingestion_repository.streamed.clear()
+    result = await reindex.reindex("small-512")
+
+    assert result["job_id"] == job["_id"] and result["switched"] and result["copied"] == 5
+    assert job["status"] == "completed"
+    assert [embed_count(embedded, f"Section {number}") for number in range(1, 6)] == [1, 2, 1, 1, 1]
+    assert embed_count(embedded, "amended") == 1
+    assert reindex.data_ingestion_repository.streamed == [items[4].id, items[1].id]
+
+    chunk_ids = reindex.data_ingestion_repository.chunk_ids
+    assert set(chunk_ids) == {item.id for item in items}
+    assert reindex.index_alias_repository.switched_with == sorted(ids[0] for ids in chunk_ids.values())
+
+
+@pytest.mark.asyncio
+async def test_built_index_is_switched_by_a_later_run_without_copying_again(reindex, embedded):
+    """Test that a job built without switching keeps reads on the old index until a later run switches them."""
+    built = await reindex.reindex("small-512", switch=False)
+
+    assert not built["switched"] and built["copied"] == 5
+    assert reindex.reindex_job_repository.jobs[0]["status"] == "built"
+    assert reindex.index_alias_repository.target["index_name"] == "legal-index"
+
+    embedded.clear()
+    switched = await reindex.reindex("small-512")
+
+    assert switched["job_id"] == built["job_id"] and switched["switched"]
+    assert sum(embedded.values()) == 0
+    assert reindex.index_alias_repository.target == {"index_name": "legal-index-small-512", "profile": "small-512"}
+    assert len(reindex.index_alias_repository.switched_with) == 5
@@ -0,0 +1,47 @@
+from src.interface.repository.mongodb.substring_filter import SubstringFilter
+from src.shared.text.ngrams import ngram_tokens, ngrams
+
+
+def test_ngrams_are_distinct_and_normalized():
+    """Test that n-grams are taken from normalized text without repeats."""
+    assert ngrams("Aaaa  B") == ["aaa", "aa ", "a b"]
+    assert ngrams("มาตรา ๑๐") == ngrams("มาตรา 10")
+    assert ngrams("ab") == []
+
+
+def test_ngram_tokens_do_not_span_values():
+    """Test that the tokens of a list field only hold n-grams of each value."""
+    tokens = ngram_tokens(["abc", "def", None])
+
+    assert tokens == ["abc", "def"]
+    assert "cde" not in tokens
+
+
+def test_tokens_are_stored_per_field():
+    """Test that token fields are named after their field and accept strings and lists."""
+    tokens = SubstringFilter.tokens({"title": "ค่าชดเชย", "keywords": ["ลาออก"]})
+
+    assert set(tokens) == {"title_ngrams", "keywords_ngrams"}
+    assert "ชดเ" in tokens["title_ngrams"]
+    assert tokens["keywords_ngrams"] == ngrams("ลาออก")
+
+
+def test_criteria_use_tokens_and_fall_back_to_an_escaped_regex():
+    """Test that long patterns become $all lookups and short ones a literal regex."""
+    substring_filter = SubstringFilter({"title": "Labour", "keywords": "a.", "file_name": ""})
+
+    assert substring_filter.criteria() == {
+        "title_ngrams": {"$all": ngrams("labour")},
+        "keywords": {"$regex": r"a\.", "$options": "i"},
+    }
+    assert not SubstringFilter({"title": None})
+
+
+def test_matches_checks_candidates_exactly():
+    """Test that a candidate holding every n-gram in another order is rejected."""
+    substring_filter = SubstringFilter({"title": "abcab", "keywords": "ค่าจ้าง"})
+    document = {"title": "xx ABCAB yy", "keywords": ["วันหยุด", "ค่าจ้างขั้นต่ำ"]}
+
+    assert substring_filter.matches(document)
+    assert not substring_filter.matches({**document, "title": "bcabc"})
+    assert not substring_filter.matches({**document, "keywords": []})
@@ -0,0 +1,62 @@
+from langchain_core.documents import Document
+
+from src.shared.text import TokenChunker, count_tokens
+
+SENTENCE = "นายจ้างต้องจ่ายค่าจ้างให้แก่ลูกจ้างตามที่ตกลงกันไว้"
+
+
+def test_chunks_respect_token_limit_and_thai_sentences():
+    """Test that long Thai sections are cut between sentences, never inside one."""
+    chunker = TokenChunker(max_tokens=200, overlap_tokens=0)
+    text = "มาตรา 1 " + " ".join([SENTENCE] * 40)
+
+    chunks = chunker.split_text(text)
+
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 200 for chunk in chunks)
+    for chunk in chunks:
+        assert all(part in ("มาตรา", "1", SENTENCE) for part in chunk.split(" "))
+
+
+def test_small_sections_share_chunks_and_sections_stay_whole():
+    """Test that chunk boundaries fall on มาตรา headings when sections fit."""
+    chunker = TokenChunker(max_tokens=200, overlap_tokens=20)
+    sections = [f"มาตรา {i} {SENTENCE}" for i in range(1, 9)]
+
+    chunks = chunker.split_text("\n".join(sections))
+
+    assert len(chunks) < len(sections)
+    assert all(chunk.startswith("มาตรา") for chunk in chunks)
+    assert sum(chunk.count("มาตรา") for chunk in chunks) == len(sections)
+
+
+def test_overlap_repeats_context_within_a_section():
+    """Test that consecutive chunks of one section share trailing sentences."""
+    chunker = TokenChunker(max_tokens=200, overlap_tokens=60)
+    sentences = [f"{SENTENCE}{i}" for i in range(12)]
+
+    chunks = chunker.split_text(" ".join(sentences))
+
+    assert len(chunks) > 1
+    assert chunks[0].split(" ")[-1] == chunks[1].split(" ")[0]
+
+
+def test_split_documents_copies_metadata():
+    """Test that chunks keep the metadata of the page they came from."""
+    chunker = TokenChunker(max_tokens=50, overlap_tokens=0)
+    chunks = chunker.split_documents([Document(page_content="word " * 200, metadata={"page": 3})])
+
+    assert len(chunks) > 1
+    assert all(chunk.metadata == {"page": 3} for chunk in chunks)
+
+
+def test_chunker_profile_follows_data_type(make_pinecone_repo):
+    """Test that the repository sizes chunks by the data type's profile."""
+    repo = make_pinecone_repo(chunking_profiles={
+        "default": {"max_tokens": 500, "overlap_tokens": 50},
+        "FAQ": {"max_tokens": 300, "overlap_tokens": 0},
+    })
+
+    assert repo.get_chunker("FAQ").max_tokens == 300
+    assert repo.get_chunker("FICTION").max_tokens == 500
+    assert repo.get_chunker(None).max_tokens == 500
@@ -0,0 +1,96 @@
+import asyncio
+import httpx
+import pytest
+
+from src.interface.repository.webpage import web_crawler
+from src.interface.repository.webpage.web_crawler import WebCrawler
+from src.interface.repository.webpage.webpage_fetcher import WebpageFetcher
+
+SITE = {
+    "https://law.example/code/": '<a href="/code/1">1</a> <a href="2#s">2</a> <a href="/about">About</a>',
+    "https://law.example/code/1": '<a href="/code/1/notes">Notes</a> <a href="https://other.example/x">x</a>',
+    "https://law.example/code/2": "Section 2",
+    "https://law.example/code/1/notes": "Notes",
+    "https://law.example/about": "About",
+}
+
+SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://law.example/code/1</loc></url>
+  <url><loc>https://law.example/code/2</loc></url>
+  <url><loc>https://law.example/about</loc></url>
+</urlset>"""
+
+
+@pytest.fixture
+def site(monkeypatch):
+    """Serve SITE, recording the most requests in flight at once."""
+    state = {"in_flight": 0, "max_in_flight": 0, "requests": []}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        state["requests"].append(url)
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        if url == "https://law.example/sitemap.xml":
+            return httpx.Response(200, content=SITEMAP)
+        if url not in SITE:
+            return httpx.Response(404)
+        return httpx.Response(200, text=SITE[url], headers={"Content-Type": "text/html; charset=utf-8"})
+
+    client = httpx.AsyncClient
+    monkeypatch.setattr(
+        web_crawler.httpx, "AsyncClient",
+        lambda **kwargs: client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    return state
+
+
+@pytest.mark.asyncio
+async def test_crawl_follows_links_within_depth_and_pattern(site):
+    """Test that links are followed breadth-first up to the depth, matching the include pattern."""
+    crawler = WebCrawler(WebpageFetcher(), max_concurrency=4, per_host_concurrency=2)
+
+    pages = [page async for page in crawler.crawl("https://law.example/code/", include_pattern=r"/code/\d", depth=1)]
+
+    assert sorted(page["url"] for page in pages) == ["https://law.example/code/1", "https://law.example/code/2"]
+    # The seed is fetched and followed, but does not match the pattern
+    assert "https://law.example/code/" in site["requests"]
+    assert "https://law.example/code/1/notes" not in site["requests"]
+    assert site["max_in_flight"] <= 2
+
+
+@pytest.mark.asyncio
+async def test_crawl_stays_on_seed_host_and_respects_max_pages(site):
+    """Test that without a pattern only the seed's host is crawled, up to max_pages."""
+    crawler = WebCrawler(WebpageFetcher(), max_pages=4)
+
+    pages = [page async for page in crawler.crawl("https://law.example/code/", depth=5)]
+
+    assert len(pages) == 4
+    assert not any("other.example" in url for url in site["requests"])
+    assert crawler.stats["skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_crawl_sitemap(site):
+    """Test that sitemap pages are fetched without following their links at depth 0."""
+    crawler = WebCrawler(WebpageFetcher())
+
+    pages = [
+        page async for page in crawler.crawl(
+            "https://law.example/sitemap.xml", include_pattern="/code/", depth=0, sitemap=True
+        )
+    ]
+
+    assert sorted(page["url"] for page in pages) == ["https://law.example/code/1", "https://law.example/code/2"]
+    assert pages[0]["page"]["body"]
+
+
+def test_extract_links_resolves_and_deduplicates():
+    """Test that relative links are resolved and fragments dropped."""
+    body = '<a href="a#x">A</a><a href="/a">A again</a><a href="mailto:x@y">mail</a>'.encode("utf-8")
+
+    assert WebCrawler.extract_links("https://law.example/", body) == ["https://law.example/a"]
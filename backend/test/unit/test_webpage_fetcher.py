@@ -0,0 +1,74 @@
+import httpx
+import pytest
+
+from src.interface.repository.webpage import webpage_fetcher
+from src.interface.repository.webpage.webpage_cache import LocalWebpageCache
+from src.interface.repository.webpage.webpage_fetcher import WebpageFetcher
+
+URL = "https://example.com/labour-act"
+PAGE = "<html><title>Labour Protection Act</title><body>Section 118</body></html>".encode("utf-8")
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Serve PAGE with an ETag, answering 304 to a matching If-None-Match."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=PAGE, headers={"ETag": '"v1"', "Content-Type": "text/html; charset=utf-8"})
+
+    client = httpx.AsyncClient
+    monkeypatch.setattr(
+        webpage_fetcher.httpx, "AsyncClient",
+        lambda **kwargs: client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    return requests
+
+
+@pytest.mark.asyncio
+async def test_cached_page_is_revalidated(server, tmp_path):
+    """Test that a cached page is requested conditionally and reused on 304."""
+    fetcher = WebpageFetcher(LocalWebpageCache(str(tmp_path), max_bytes=1024 * 1024))
+
+    first = await fetcher.fetch(URL)
+    second = await fetcher.fetch(URL)
+
+    assert first["not_modified"] is False
+    assert second["not_modified"] is True
+    assert second["body"] == PAGE
+    assert second["content_hash"] == first["content_hash"]
+    assert "If-None-Match" not in server[0].headers
+    assert server[1].headers["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_unchanged_webpage_is_not_re_embedded(server, tmp_path, make_pinecone_repo):
+    """Test that re-ingesting an unchanged page keeps its vectors without chunking or embedding."""
+    fetcher = WebpageFetcher(LocalWebpageCache(str(tmp_path), max_bytes=1024 * 1024))
+    page = await fetcher.fetch(URL)
+    await fetcher.mark_ingested(URL, "legal-index:doc1", page["content_hash"])
+
+    repo = make_pinecone_repo(index_name="legal-index", vector_store=None, webpage_fetcher=fetcher)
+
+    result = await repo.ingest_webpage(URL, {"mongodb_id": "doc1"}, previous_ids=["doc1_chunk_a", "doc1_chunk_b"])
+
+    assert result["unchanged"] is True
+    assert result["ids"] == ["doc1_chunk_a", "doc1_chunk_b"]
+    assert result["embedded"] == 0
+
+    # Another index holding the same item was not built from this content yet
+    other = await fetcher.fetch(URL)
+    assert other["ingested"] == {"legal-index:doc1": page["content_hash"]}
+
+
+def test_local_cache_evicts_least_recently_used(tmp_path):
+    """Test that the local cache stays under its size limit."""
+    cache = LocalWebpageCache(str(tmp_path), max_bytes=10)
+    cache.put("https://a", {"content_hash": "a"}, b"123456")
+    cache.put("https://b", {"content_hash": "b"}, b"123456")
+
+    assert cache.get("https://a") is None
+    assert cache.get("https://b") == ({"content_hash": "b"}, b"123456")
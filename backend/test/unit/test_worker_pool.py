@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+
+from src.shared.worker_pool import backoff_seconds, process_in_order
+
+
+async def stream(keys):
+    for key in keys:
+        yield key
+
+
+@pytest.mark.asyncio
+async def test_process_in_order_overlaps_items_and_checkpoints_in_stream_order():
+    """Test that workers overlap and checkpoints never pass an unfinished item."""
+    keys = [f"{i:03d}" for i in range(40)]
+    state = {"in_flight": 0, "max_in_flight": 0}
+    done = set()
+    checkpoints = []
+
+    async def handle(key):
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        # Later items often finish first
+        await asyncio.sleep(0.001 * (5 - int(key) % 5))
+        state["in_flight"] -= 1
+        done.add(key)
+        if key == "007":
+            raise RuntimeError("extraction failed")
+        return key != "013"
+
+    async def on_checkpoint(checkpoint, count):
+        if checkpoint is not None:
+            assert all(key in done for key in keys if key <= checkpoint)
+        checkpoints.append((checkpoint, count))
+
+    succeeded = await process_in_order(
+        stream(keys), handle, key=lambda key: key, concurrency=4, total=len(keys),
+        on_checkpoint=on_checkpoint, checkpoint_every=5
+    )
+
+    assert succeeded == 38
+    assert 1 < state["max_in_flight"] <= 4
+    assert len(checkpoints) >= 8
+    assert checkpoints[-1] == ("039", 40)
+
+
+@pytest.mark.asyncio
+async def test_process_in_order_survives_failed_checkpoints():
+    """Test that a failing checkpoint store does not stop the workers."""
+    calls = []
+
+    async def handle(key):
+        return True
+
+    async def on_checkpoint(checkpoint, count):
+        calls.append(count)
+        if len(calls) == 1:
+            raise ConnectionError("database unavailable")
+
+    succeeded = await process_in_order(
+        stream(range(10)), handle, key=str, concurrency=2, on_checkpoint=on_checkpoint, checkpoint_every=3
+    )
+
+    assert succeeded == 10
+    assert calls[-1] == 10
+
+
+def test_backoff_seconds_doubles_up_to_the_cap():
+    """Test that retry delays double per failure and never exceed the cap."""
+    assert [backoff_seconds(attempt, 10, 60) for attempt in range(1, 6)] == [10, 20, 40, 60, 60]